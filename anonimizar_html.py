@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Anonimiza uma página capturada do site (debug_page_N.html, page_source salvo) para entrar no
+corpus offline (fixtures/corpus): remove scripts, estilos, imagens e atributos de rastreio,
+troca ruas, telefones, e-mails, CEPs e IDs de anúncio por valores fictícios determinísticos
+(a mesma entrada gera sempre a mesma saída) e mantém a estrutura que os seletores usam
+(class, data-cy, data-testid, href).
+
+Ao adicionar ao corpus, os valores esperados saem da extração por seletores e ficam marcados
+com "revisar": true no manifesto até alguém conferi-los contra a página.
+
+Uso: python anonimizar_html.py entrada.html [nome_no_corpus.html] [descrição]
+"""
+
+import hashlib
+import json
+import os
+import re
+import sys
+
+from bs4 import BeautifulSoup, Comment
+
+from gerar_corpus import RUAS, DIRETORIO_PADRAO
+
+TAGS_REMOVIDAS = ('script', 'style', 'noscript', 'iframe', 'img', 'picture', 'source', 'video', 'link', 'template')
+ATRIBUTOS_MANTIDOS = {'class', 'data-cy', 'data-testid', 'href', 'aria-label', 'disabled', 'lang', 'charset'}
+DATA_CY_ENDERECO = 'rp-cardProperty-street-txt'
+
+PADRAO_TELEFONE = re.compile(r'\(?\b\d{2}\)?\s?9?\d{4}[-\s]?\d{4}\b')
+PADRAO_EMAIL = re.compile(r'[\w.+-]+@[\w-]+\.[\w.-]+')
+PADRAO_CEP = re.compile(r'\b\d{5}-\d{3}\b')
+PADRAO_ID_ANUNCIO = re.compile(r'id-(\d{6,})')
+PADRAO_NUMERO_RUA = re.compile(r',\s*(\d+)')
+
+
+def _hash(texto):
+    return int(hashlib.sha1(texto.encode('utf-8')).hexdigest()[:12], 16)
+
+
+def id_ficticio(id_real):
+    """ID de anúncio fictício (sempre o mesmo para o mesmo ID real; começa com 9)"""
+    return f"9{_hash(id_real) % 10 ** 9:09d}"
+
+
+def rua_ficticia(endereco):
+    """'Rua Real de Tal, 123' -> 'Rua Fictícia, 123' (o número é mantido: ele não identifica a rua)"""
+    numero = PADRAO_NUMERO_RUA.search(endereco)
+    rua = RUAS[_hash(endereco) % len(RUAS)]
+    return f"{rua}, {numero.group(1)}" if numero else rua
+
+
+def _limpar_texto(texto):
+    texto = PADRAO_EMAIL.sub('contato@exemplo.com', texto)
+    texto = PADRAO_CEP.sub('00000-000', texto)
+    # Telefones só fora de valores em reais (preços com 8+ dígitos seriam confundidos)
+    if 'R$' not in texto:
+        texto = PADRAO_TELEFONE.sub('(00) 00000-0000', texto)
+    return texto
+
+
+def _limpar_href(href):
+    if href.startswith(('tel:', 'mailto:')) or 'wa.me' in href or 'whatsapp' in href.lower():
+        return 'https://wa.me/5500000000000'
+    href = href.split('?')[0].split('#')[0] or '#'
+    return PADRAO_ID_ANUNCIO.sub(lambda m: f"id-{id_ficticio(m.group(1))}", href)
+
+
+def anonimizar(html):
+    """HTML anonimizado (str) com a mesma estrutura de cards"""
+    soup = BeautifulSoup(html, 'html.parser')
+    for elemento in soup.find_all(TAGS_REMOVIDAS):
+        elemento.decompose()
+    for comentario in soup.find_all(string=lambda s: isinstance(s, Comment)):
+        comentario.extract()
+    for svg in soup.find_all('svg'):
+        svg.clear()
+        svg.attrs = {}
+    for meta in soup.find_all('meta'):
+        if 'charset' not in meta.attrs:
+            meta.decompose()
+
+    for elemento in soup.find_all(True):
+        elemento.attrs = {nome: valor for nome, valor in elemento.attrs.items() if nome in ATRIBUTOS_MANTIDOS}
+        if 'href' in elemento.attrs:
+            elemento['href'] = _limpar_href(elemento['href'])
+        if elemento.get('data-cy') == DATA_CY_ENDERECO:
+            elemento.string = rua_ficticia(elemento.get_text().strip())
+
+    for texto in soup.find_all(string=True):
+        limpo = _limpar_texto(texto)
+        if limpo != texto:
+            texto.replace_with(limpo)
+    return str(soup)
+
+
+def adicionar_ao_corpus(entrada, nome=None, descricao=None, diretorio=DIRETORIO_PADRAO):
+    """Anonimiza `entrada`, grava no corpus e registra no manifesto com os valores esperados a revisar"""
+    from zap_scraper import ZapScraper, SELETOR_CARD_CSS  # Pesado: só quando for gravar o esperado
+
+    with open(entrada, encoding='utf-8') as f:
+        html = f.read()
+    if not html.strip():
+        raise ValueError(f"{entrada} está vazio: salve a página de novo (ZapScraper.debug_salvar_html)")
+    anonimo = anonimizar(html)
+    nome = nome or f"real_{os.path.splitext(os.path.basename(entrada))[0]}.html"
+    caminho_manifesto = os.path.join(diretorio, 'manifesto.json')
+    with open(caminho_manifesto, encoding='utf-8') as f:
+        manifesto = json.load(f)
+    if any(e['arquivo'] == nome for e in manifesto['arquivos']):
+        raise ValueError(f"{nome} já está no corpus")
+
+    cards = BeautifulSoup(anonimo, 'html.parser').select(SELETOR_CARD_CSS)
+    if not cards:
+        raise ValueError(f"Nenhum card ({SELETOR_CARD_CSS}) em {entrada}: página de bloqueio ou layout novo?")
+    scraper = ZapScraper()
+    esperado = [scraper._extrair_dados_anuncio_seletores(card) for card in cards]
+
+    with open(os.path.join(diretorio, nome), 'w', encoding='utf-8') as f:
+        f.write(anonimo)
+    manifesto['arquivos'].append({
+        'arquivo': nome, 'tipo': 'pagina', 'layout': 'real',
+        'descricao': descricao or f"Página real anonimizada ({os.path.basename(entrada)})",
+        'revisar': True, 'esperado': esperado,
+    })
+    with open(caminho_manifesto, 'w', encoding='utf-8') as f:
+        json.dump(manifesto, f, ensure_ascii=False, indent=1)
+        f.write('\n')
+    print(f"✅ {nome}: {len(cards)} cards adicionados ao corpus")
+    print("⚠️ Confira os valores esperados no manifesto e remova \"revisar\": true; "
+          "depois rode python benchmark_corpus.py --atualizar-linha-base")
+    return nome
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+    try:
+        adicionar_ao_corpus(sys.argv[1], *sys.argv[2:4])
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
@@ -12,7 +12,7 @@ import warnings
 warnings.filterwarnings("ignore")
 
 # Importar as funções do scraper
-from zap_scraper import ZapScraper
+from zap_scraper import ZapScraper, obter_pool_drivers
 from excel_formatter import ExcelFormatter
 
 def criar_pasta_arquivos():
@@ -229,8 +229,8 @@ def executar_scraping(url):
     st.markdown('</div>', unsafe_allow_html=True)
     
     try:
-        # Inicializar scraper
-        scraper = ZapScraper()
+        # Inicializar scraper (navegador reaproveitado do pool entre execuções)
+        scraper = ZapScraper(pool=obter_pool_drivers())
         
         # Simular progresso (em uma implementação real, isso seria baseado no progresso real)
         status_text.text("🔄 Inicializando navegador...")
@@ -5,7 +5,7 @@ from datetime import datetime
 import time
 
 # Importar módulos criados
-from zap_scraper import ZapScraper
+from zap_scraper import ZapScraper, obter_pool_drivers
 from laudo_formulario import LaudoFormulario
 from pesquisa_localidade_ia_final import PesquisaLocalidadeIAFinal
 from gerador_laudo_docx import GeradorLaudoDocx
@@ -14,7 +14,7 @@ from excel_formatter import ExcelFormatter
 
 class AppLaudoCompleto:
     def __init__(self):
-        self.scraper = ZapScraper()
+        self.scraper = ZapScraper(pool=obter_pool_drivers())
         self.formulario = LaudoFormulario()
         self.pesquisa_localidade = PesquisaLocalidadeIAFinal()
         self.gerador_docx = GeradorLaudoDocx()
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark e regressão offline do parse de cards sobre o corpus versionado (fixtures/corpus):
+cards/s, memória (tracemalloc) e precisão por campo de extrair_dados_anuncio contra os valores
+esperados do manifesto, para cada backend de parsers_html e para a extração por seletores.
+
+Falha (saída 1) quando a vazão de alguma configuração cai mais que a tolerância abaixo da
+linha de base (fixtures/corpus/linha_base.json) ou quando a precisão de algum campo piora.
+A vazão é comparada relativa a uma calibração da máquina (laço fixo em Python puro), para a
+linha de base valer em máquinas diferentes.
+
+Uso: python benchmark_corpus.py [repeticoes] [--tolerancia=0.25] [--atualizar-linha-base]
+"""
+
+import gc
+import io
+import json
+import os
+import re
+import sys
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+
+from parsers_html import PARSERS, obter_parser
+from zap_scraper import ZapScraper, SELETOR_CARD_CSS
+
+DIRETORIO_CORPUS = os.path.join("fixtures", "corpus")
+ARQUIVO_LINHA_BASE = os.path.join(DIRETORIO_CORPUS, "linha_base.json")
+TOLERANCIA_PADRAO = 0.25  # Queda de vazão aceita antes de falhar
+RODADAS = 3  # Melhor de N rodadas, para ruído da máquina não virar regressão
+
+CAMPOS = ['Descrição', 'Endereco', 'M2', 'Quartos', 'Banheiros', 'Vagas', 'Preco', 'Condominio', 'IPTU', 'R$/M2', 'URL']
+PADRAO_CALIBRACAO = re.compile(r'R\$\s*([\d.,]+)')
+
+
+def carregar_corpus(diretorio=DIRETORIO_CORPUS):
+    """[(entrada do manifesto, html)] na ordem do manifesto"""
+    with open(os.path.join(diretorio, 'manifesto.json'), encoding='utf-8') as f:
+        manifesto = json.load(f)
+    if manifesto.get('versao') != 1:
+        raise ValueError(f"Versão de manifesto não suportada: {manifesto.get('versao')}")
+    corpus = []
+    for entrada in manifesto['arquivos']:
+        with open(os.path.join(diretorio, entrada['arquivo']), encoding='utf-8') as f:
+            corpus.append((entrada, f.read()))
+    return corpus
+
+
+def configuracoes():
+    """(nome, parser_html, extracao_compilada) de cada caminho de extração disponível"""
+    lista = [(f"compilado/{nome}", nome, True) for nome in PARSERS]
+    lista.append(("seletores/html.parser", 'html.parser', False))
+    return lista
+
+
+def criar_scraper(parser_html, extracao_compilada):
+    scraper = ZapScraper()
+    scraper.parser_html = parser_html
+    scraper.extracao_compilada = extracao_compilada
+    return scraper
+
+
+def extrair_arquivo(scraper, parser, html):
+    """Uma linha por card do arquivo (None nos descartados), na ordem do documento"""
+    return [scraper.extrair_dados_anuncio(card, parser) for card in parser.cards(html, SELETOR_CARD_CSS)]
+
+
+def extrair_corpus(scraper, parser, corpus):
+    with redirect_stdout(io.StringIO()):
+        return [extrair_arquivo(scraper, parser, html) for _, html in corpus]
+
+
+def _igual(esperado, obtido):
+    if isinstance(esperado, float) and isinstance(obtido, (int, float)):
+        return abs(esperado - obtido) <= 1e-9 * max(1.0, abs(esperado))
+    return esperado == obtido
+
+
+def precisao(corpus, resultados):
+    """Por campo: acertos / cards em que o campo existe no esperado ou no obtido.
+
+    'Registro' conta se o card foi aceito ou descartado como o esperado. Card a mais ou a menos
+    no arquivo (seletor de card quebrado) conta como erro em todos os campos. Na lista de erros,
+    o card aceito/descartado errado aparece só uma vez, como erro de 'Registro'.
+    Retorna ({campo: fração}, [(arquivo, índice, campo, esperado, obtido)] dos erros).
+    """
+    acertos = dict.fromkeys(['Registro'] + CAMPOS, 0)
+    totais = dict.fromkeys(['Registro'] + CAMPOS, 0)
+    erros = []
+    for (entrada, _), obtidos in zip(corpus, resultados):
+        esperados = entrada['esperado']
+        for indice in range(max(len(esperados), len(obtidos))):
+            esperado = esperados[indice] if indice < len(esperados) else None
+            obtido = obtidos[indice] if indice < len(obtidos) else None
+            sobrando = indice >= len(esperados) or indice >= len(obtidos)
+            totais['Registro'] += 1
+            registro_certo = not sobrando and (esperado is None) == (obtido is None)
+            if registro_certo:
+                acertos['Registro'] += 1
+            else:
+                erros.append((entrada['arquivo'], indice, 'Registro', esperado is not None, obtido is not None))
+            for campo in CAMPOS:
+                valor_esperado = esperado.get(campo) if esperado else None
+                valor_obtido = obtido.get(campo) if obtido else None
+                if valor_esperado is None and valor_obtido is None:
+                    continue
+                totais[campo] += 1
+                if not sobrando and _igual(valor_esperado, valor_obtido):
+                    acertos[campo] += 1
+                elif registro_certo:  # Card aceito/descartado errado já aparece como erro de 'Registro'
+                    erros.append((entrada['arquivo'], indice, campo, valor_esperado, valor_obtido))
+    return {campo: acertos[campo] / totais[campo] for campo in totais if totais[campo]}, erros
+
+
+def calibrar(iteracoes=200000):
+    """Operações/s de um laço fixo em Python puro (regex, strings, dicts): a 'velocidade da máquina'"""
+    texto = "Cond. R$ 1.350 • IPTU R$ 390"
+    melhor = None
+    for _ in range(RODADAS):
+        inicio = time.perf_counter()
+        acumulado = {}
+        for i in range(iteracoes):
+            valor = PADRAO_CALIBRACAO.search(texto).group(1).replace('.', '')
+            acumulado[i & 255] = acumulado.get(i & 255, 0) + len(valor)
+        tempo = time.perf_counter() - inicio
+        melhor = tempo if melhor is None else min(melhor, tempo)
+    return iteracoes / melhor
+
+
+def medir_vazao(scraper, parser, corpus, repeticoes):
+    """cards/s (parse da página + extração), melhor de RODADAS rodadas de `repeticoes` passagens"""
+    cards = sum(len(entrada['esperado']) for entrada, _ in corpus)
+    melhor = None
+    with redirect_stdout(io.StringIO()):
+        for _ in range(RODADAS):
+            inicio = time.perf_counter()
+            for _ in range(repeticoes):
+                for _, html in corpus:
+                    extrair_arquivo(scraper, parser, html)
+            tempo = time.perf_counter() - inicio
+            melhor = tempo if melhor is None else min(melhor, tempo)
+    return cards * repeticoes / melhor
+
+
+def medir_memoria(scraper, parser, corpus):
+    """(pico do parse da página em KB, pico médio da extração de um card em KB, KB retidos após a passagem)"""
+    extrair_corpus(scraper, parser, corpus)  # Aquece caches (parser, perfil, regexes)
+    gc.collect()
+    picos_pagina, picos_card = [], []
+    tracemalloc.start()
+    try:
+        inicio, _ = tracemalloc.get_traced_memory()
+        with redirect_stdout(io.StringIO()):
+            for _, html in corpus:
+                tracemalloc.reset_peak()
+                base = tracemalloc.get_traced_memory()[0]
+                cards = parser.cards(html, SELETOR_CARD_CSS)
+                picos_pagina.append(tracemalloc.get_traced_memory()[1] - base)
+                for card in cards:
+                    tracemalloc.reset_peak()
+                    base = tracemalloc.get_traced_memory()[0]
+                    scraper.extrair_dados_anuncio(card, parser)
+                    picos_card.append(tracemalloc.get_traced_memory()[1] - base)
+                del cards
+        gc.collect()  # Árvores do BeautifulSoup têm ciclos: só o coletor as libera
+        retido = tracemalloc.get_traced_memory()[0] - inicio
+    finally:
+        tracemalloc.stop()
+    return max(picos_pagina) / 1024, sum(picos_card) / len(picos_card) / 1024, retido / 1024
+
+
+def carregar_linha_base(caminho=ARQUIVO_LINHA_BASE):
+    if not os.path.exists(caminho):
+        return None
+    with open(caminho, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def salvar_linha_base(medicoes, calibracao, caminho=ARQUIVO_LINHA_BASE):
+    linha_base = {
+        'versao': 1,
+        'calibracao': round(calibracao),
+        'configuracoes': {
+            nome: {
+                'vazao_relativa': round(m['vazao_relativa'], 4),
+                'cards_s': round(m['cards_s']),
+                'precisao': {campo: round(valor, 6) for campo, valor in m['precisao'].items()},
+            }
+            for nome, m in medicoes.items()
+        },
+    }
+    with open(caminho, 'w', encoding='utf-8') as f:
+        json.dump(linha_base, f, ensure_ascii=False, indent=1)
+        f.write('\n')
+    print(f"💾 Linha de base salva em {caminho}")
+
+
+def comparar_com_linha_base(medicoes, linha_base, tolerancia):
+    """Lista de regressões (texto); configurações sem linha de base só geram aviso"""
+    regressoes = []
+    for nome, medicao in medicoes.items():
+        base = linha_base['configuracoes'].get(nome)
+        if base is None:
+            print(f"⚠️ {nome}: sem linha de base (rode com --atualizar-linha-base)")
+            continue
+        minimo = base['vazao_relativa'] * (1 - tolerancia)
+        if medicao['vazao_relativa'] < minimo:
+            regressoes.append(f"{nome}: vazão relativa {medicao['vazao_relativa']:.3f} < {minimo:.3f} "
+                              f"({medicao['vazao_relativa'] / base['vazao_relativa'] - 1:+.0%} da linha de base)")
+        for campo, valor_base in base['precisao'].items():
+            valor = medicao['precisao'].get(campo, 0.0)
+            if valor < valor_base - 1e-6:
+                regressoes.append(f"{nome}: precisão de {campo} caiu de {valor_base:.1%} para {valor:.1%}")
+    for nome in linha_base['configuracoes']:
+        if nome not in medicoes:
+            print(f"⚠️ {nome}: backend não instalado, sem comparação")
+    return regressoes
+
+
+def imprimir_precisao(medicoes):
+    nomes = list(medicoes)
+    print("\n🎯 PRECISÃO POR CAMPO")
+    print(f"  {'campo':<12}" + "".join(f"{nome:>24}" for nome in nomes))
+    for campo in ['Registro'] + CAMPOS:
+        valores = [medicoes[nome]['precisao'].get(campo) for nome in nomes]
+        print(f"  {campo:<12}" + "".join(f"{'-' if v is None else f'{v:.1%}':>24}" for v in valores))
+
+
+def imprimir_erros(erros, limite=8):
+    por_campo = {}
+    for erro in erros:
+        por_campo.setdefault(erro[2], []).append(erro)
+    for campo, lista in por_campo.items():
+        print(f"  {campo}: {len(lista)} erro(s)")
+        for arquivo, indice, _, esperado, obtido in lista[:limite]:
+            print(f"    {arquivo} card {indice}: esperado={esperado!r} obtido={obtido!r}")
+
+
+def main():
+    argumentos = [a for a in sys.argv[1:] if not a.startswith('--')]
+    repeticoes = int(argumentos[0]) if argumentos else 5
+    atualizar = '--atualizar-linha-base' in sys.argv
+    tolerancia = TOLERANCIA_PADRAO
+    for argumento in sys.argv[1:]:
+        if argumento.startswith('--tolerancia='):
+            tolerancia = float(argumento.split('=', 1)[1])
+
+    corpus = carregar_corpus()
+    total_cards = sum(len(entrada['esperado']) for entrada, _ in corpus)
+    a_revisar = sum(1 for entrada, _ in corpus if entrada.get('revisar'))
+    print("⏱️ BENCHMARK DO CORPUS OFFLINE (parse + extrair_dados_anuncio)")
+    print("=" * 40)
+    print(f"📄 {len(corpus)} arquivos, {total_cards} cards, {repeticoes} repetições x melhor de {RODADAS}")
+    if a_revisar:
+        print(f"⚠️ {a_revisar} arquivo(s) com valores esperados ainda não revisados (revisar: true no manifesto)")
+
+    calibracao = calibrar()
+    print(f"🖥️ Calibração da máquina: {calibracao:,.0f} op/s")
+
+    medicoes = {}
+    erros_por_config = {}
+    for nome, parser_html, compilada in configuracoes():
+        scraper = criar_scraper(parser_html, compilada)
+        parser = obter_parser(parser_html)
+        resultados = extrair_corpus(scraper, parser, corpus)
+        precisao_campos, erros = precisao(corpus, resultados)
+        cards_s = medir_vazao(scraper, parser, corpus, repeticoes)
+        pico_pagina, pico_card, retido = medir_memoria(scraper, parser, corpus)
+        medicoes[nome] = {
+            'cards_s': cards_s,
+            'vazao_relativa': cards_s / calibracao * 1000,  # Cards por mil operações da calibração
+            'precisao': precisao_campos,
+        }
+        erros_por_config[nome] = erros
+        print(f"  {nome:<24} {cards_s:>9,.0f} cards/s | pico {pico_pagina:>6,.0f} KB/página, "
+              f"{pico_card:>5,.1f} KB/card | retido {retido:>5,.0f} KB | {len(erros)} erro(s)")
+
+    imprimir_precisao(medicoes)
+    for nome, erros in erros_por_config.items():
+        if erros:
+            print(f"\n🔎 Erros de {nome}:")
+            imprimir_erros(erros)
+            break  # Os caminhos costumam errar nos mesmos cards; os demais aparecem na tabela
+
+    if atualizar:
+        salvar_linha_base(medicoes, calibracao)
+        return
+
+    linha_base = carregar_linha_base()
+    if linha_base is None:
+        print(f"\n⚠️ Sem linha de base em {ARQUIVO_LINHA_BASE} (rode com --atualizar-linha-base)")
+        return
+    regressoes = comparar_com_linha_base(medicoes, linha_base, tolerancia)
+    if regressoes:
+        print(f"\n❌ {len(regressoes)} regressão(ões) em relação à linha de base (tolerância de vazão {tolerancia:.0%}):")
+        for regressao in regressoes:
+            print(f"  - {regressao}")
+        sys.exit(1)
+    print(f"\n✅ Sem regressões (tolerância de vazão {tolerancia:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark da extração de cards: outerHTML por card vs snapshot único da página,
+e extração por seletores vs extrator compilado (uma passagem pela árvore do card)
+
+Uso: python benchmark_extracao.py [arquivo.html] [repeticoes] [latencia_ms]
+
+A primeira comparação isola o snapshot: os dois lados usam a extração por seletores e o
+html.parser (o extrator compilado e os backends de parse têm comparações próprias aqui e em
+benchmark_parsers.py). A latência (padrão 0) simula o round-trip HTTP do WebDriver que o
+modo antigo paga em cada get_attribute('outerHTML'), ex.: 5 ms.
+"""
+
+import io
+import sys
+import time
+from contextlib import redirect_stdout
+
+from bs4 import BeautifulSoup
+from zap_scraper import ZapScraper, SELETOR_CARD_CSS
+from extrator_cards import extrair_card
+
+ARQUIVO_PADRAO = "fixtures/pagina_resultados.html"
+LATENCIA_PADRAO_MS = 0.0
+
+
+def modo_por_card(scraper, html_cards, latencia_s):
+    """Simula o modo antigo: um outerHTML e um BeautifulSoup por card"""
+    anuncios = []
+    for html_card in html_cards:
+        if latencia_s:
+            time.sleep(latencia_s)
+        dados = scraper.extrair_dados_anuncio(BeautifulSoup(html_card, 'html.parser'))
+        if dados:
+            anuncios.append(dados)
+    return anuncios
+
+
+def medir(funcao, repeticoes):
+    """Executa a função N vezes e retorna (tempo total, último resultado)"""
+    inicio = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        for _ in range(repeticoes):
+            resultado = funcao()
+    return time.perf_counter() - inicio, resultado
+
+
+def main():
+    arquivo = sys.argv[1] if len(sys.argv) > 1 else ARQUIVO_PADRAO
+    repeticoes = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    latencia_s = float(sys.argv[3] if len(sys.argv) > 3 else LATENCIA_PADRAO_MS) / 1000
+
+    with open(arquivo, encoding='utf-8') as f:
+        html = f.read()
+
+    # Mesmo extrator e mesmo parser nos dois modos: só o snapshot muda
+    scraper = ZapScraper()
+    scraper.extracao_compilada = False
+    scraper.parser_html = 'html.parser'
+    # outerHTML de cada card, como o WebDriver devolveria
+    html_cards = [str(card) for card in BeautifulSoup(html, 'html.parser').select(SELETOR_CARD_CSS)]
+    if not html_cards:
+        print(f"❌ Nenhum card encontrado em {arquivo}")
+        sys.exit(1)
+
+    tempo_antes, anuncios_antes = medir(lambda: modo_por_card(scraper, html_cards, latencia_s), repeticoes)
+    tempo_depois, anuncios_depois = medir(lambda: scraper.extrair_anuncios_html(html), repeticoes)
+
+    total_cards = len(html_cards) * repeticoes
+    print("⏱️ BENCHMARK DE EXTRAÇÃO (seletores + html.parser nos dois modos)")
+    print("=" * 40)
+    print(f"📄 Arquivo: {arquivo} ({len(html_cards)} cards, {repeticoes} repetições)")
+    if latencia_s:
+        print(f"🌐 Latência simulada por outerHTML: {latencia_s * 1000:.1f} ms")
+    print(f"🐢 outerHTML por card: {total_cards / tempo_antes:,.0f} cards/s")
+    print(f"🚀 Snapshot único:     {total_cards / tempo_depois:,.0f} cards/s")
+    print(f"📈 Ganho: {tempo_antes / tempo_depois:.1f}x")
+
+    if anuncios_antes != anuncios_depois:
+        print("❌ Os dois modos produziram resultados diferentes!")
+        sys.exit(1)
+    print(f"✅ Resultados idênticos ({len(anuncios_depois)} anúncios)")
+
+    # Só a extração, com a árvore já parseada: seletores x extrator compilado
+    cards = BeautifulSoup(html, 'html.parser').select(SELETOR_CARD_CSS)
+    tempo_seletores, por_seletores = medir(lambda: [scraper._extrair_dados_anuncio_seletores(c) for c in cards], repeticoes)
+    tempo_compilado, por_compilado = medir(lambda: [extrair_card(c) for c in cards], repeticoes)
+    total_cards = len(cards) * repeticoes
+    print("\n⏱️ EXTRAÇÃO POR CARD (árvore já parseada)")
+    print("=" * 40)
+    print(f"🐢 Seletores: {total_cards / tempo_seletores:,.0f} cards/s")
+    print(f"🚀 Compilado: {total_cards / tempo_compilado:,.0f} cards/s")
+    print(f"📈 Ganho: {tempo_seletores / tempo_compilado:.1f}x")
+
+    if por_seletores != por_compilado:
+        print("❌ O extrator compilado produziu resultados diferentes!")
+        sys.exit(1)
+    print(f"✅ Resultados idênticos ({sum(1 for d in por_compilado if d)} anúncios)")
+
+
+if __name__ == "__main__":
+    main()
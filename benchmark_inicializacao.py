@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark da partida do navegador: mediana de configure_driver a frio e a quente
+
+Uso: python benchmark_inicializacao.py [repeticoes] [--headless]
+
+A frio: caches de user-agents e do chromedriver patcheado apagados antes de cada partida.
+A quente: caches em memória/disco preservados (situação normal a partir da 2ª execução).
+"""
+
+import statistics
+import sys
+import time
+
+from zap_scraper import ZapScraper
+from cache_driver import limpar_cache_user_agents, descartar_chromedriver, carregar_user_agents
+
+
+def medir_partida(headless):
+    """Tempo (s) de um configure_driver, ou None se o navegador não abriu"""
+    scraper = ZapScraper()
+    scraper.headless = headless
+    inicio = time.perf_counter()
+    ok = scraper.configure_driver()
+    segundos = time.perf_counter() - inicio
+    scraper.liberar_driver()
+    return segundos if ok else None
+
+
+def main():
+    argumentos = [a for a in sys.argv[1:] if not a.startswith('--')]
+    repeticoes = int(argumentos[0]) if argumentos else 5
+    headless = '--headless' in sys.argv
+
+    print(f"🚀 BENCHMARK DE PARTIDA DO NAVEGADOR ({'headless' if headless else 'com janela'}, {repeticoes} repetições)")
+    print("=" * 60)
+
+    frio = []
+    for i in range(repeticoes):
+        limpar_cache_user_agents()
+        descartar_chromedriver()
+        segundos = medir_partida(headless)
+        if segundos is None:
+            print("❌ Não foi possível iniciar o navegador")
+            sys.exit(1)
+        frio.append(segundos)
+        print(f"  a frio  #{i + 1}: {segundos:.2f}s")
+
+    carregar_user_agents()
+    quente = []
+    for i in range(repeticoes):
+        segundos = medir_partida(headless)
+        if segundos is None:
+            print("❌ Não foi possível iniciar o navegador")
+            sys.exit(1)
+        quente.append(segundos)
+        print(f"  a quente #{i + 1}: {segundos:.2f}s")
+
+    mediana_frio = statistics.median(frio)
+    mediana_quente = statistics.median(quente)
+    print("\n📊 RESULTADO")
+    print(f"  Mediana a frio:   {mediana_frio:.2f}s")
+    print(f"  Mediana a quente: {mediana_quente:.2f}s")
+    print(f"  Ganho: {mediana_frio - mediana_quente:.2f}s por navegador ({mediana_frio / mediana_quente:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
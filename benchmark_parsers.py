@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark dos backends de parse HTML: parse da página + extração dos cards, por backend instalado
+
+Uso: python benchmark_parsers.py [arquivo.html] [repeticoes]
+"""
+
+import io
+import sys
+import time
+from contextlib import redirect_stdout
+
+from parsers_html import PARSERS, obter_parser
+from zap_scraper import SELETOR_CARD_CSS
+from extrator_cards import extrair_card
+
+ARQUIVO_PADRAO = "fixtures/pagina_resultados.html"
+
+
+def parse_e_extracao(parser, html):
+    return [extrair_card(card, parser) for card in parser.cards(html, SELETOR_CARD_CSS)]
+
+
+def medir(funcao, repeticoes):
+    """Executa a função N vezes e retorna (tempo total, último resultado)"""
+    inicio = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        for _ in range(repeticoes):
+            resultado = funcao()
+    return time.perf_counter() - inicio, resultado
+
+
+def main():
+    arquivo = sys.argv[1] if len(sys.argv) > 1 else ARQUIVO_PADRAO
+    repeticoes = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    with open(arquivo, encoding='utf-8') as f:
+        html = f.read()
+
+    print("⏱️ BENCHMARK DOS PARSERS HTML (parse + extração)")
+    print("=" * 40)
+    referencia = None
+    tempo_referencia = None
+    for nome in PARSERS:
+        parser = obter_parser(nome)
+        tempo, anuncios = medir(lambda: parse_e_extracao(parser, html), repeticoes)
+        if referencia is None:
+            referencia, tempo_referencia = anuncios, tempo
+            print(f"📄 Arquivo: {arquivo} ({len(anuncios)} cards, {repeticoes} repetições)")
+        total_cards = len(anuncios) * repeticoes
+        ganho = tempo_referencia / tempo
+        print(f"{'✅' if anuncios == referencia else '❌'} {nome:<12} {total_cards / tempo:>10,.0f} cards/s  ({ganho:.1f}x)")
+        if anuncios != referencia:
+            print(f"❌ {nome} produziu resultados diferentes do html.parser!")
+            sys.exit(1)
+
+    faltando = [nome for nome in ('lxml', 'selectolax') if nome not in PARSERS]
+    if faltando:
+        print(f"⚠️ Não instalados: {', '.join(faltando)} (pip install {' '.join(faltando)})")
+
+
+if __name__ == "__main__":
+    main()
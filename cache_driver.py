@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Caches da inicialização do Chrome: pool de user-agents carregado uma vez (e salvo em disco)
+e binário do chromedriver já patcheado pelo undetected_chromedriver, reaproveitado entre execuções
+"""
+
+import json
+import os
+import random
+import shutil
+import threading
+import time
+
+PASTA_CACHE = os.path.join("arquivos", "cache")
+CAMINHO_USER_AGENTS = os.path.join(PASTA_CACHE, "user_agents.json")
+VALIDADE_USER_AGENTS = 7 * 24 * 3600  # Renovar o pool uma vez por semana
+TAMANHO_POOL_USER_AGENTS = 50
+
+# Usados se o fake_useragent falhar (sem rede e sem cache em disco)
+USER_AGENTS_RESERVA = [
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36",
+]
+
+_user_agents = None
+_lock_user_agents = threading.Lock()
+_lock_chromedriver = threading.Lock()
+
+
+def _gerar_user_agents(tamanho):
+    """Sorteia user-agents com o fake_useragent (carrega o data set uma única vez)"""
+    from fake_useragent import UserAgent
+    ua = UserAgent()
+    pool = set()
+    for _ in range(tamanho * 4):  # O data set repete valores; limita as tentativas
+        pool.add(ua.random)
+        if len(pool) >= tamanho:
+            break
+    return sorted(pool)
+
+
+def carregar_user_agents(caminho=CAMINHO_USER_AGENTS, forcar=False):
+    """Retorna o pool de user-agents: memória, depois disco (se válido), depois fake_useragent"""
+    global _user_agents
+    with _lock_user_agents:
+        if _user_agents and not forcar:
+            return _user_agents
+        if not forcar and os.path.exists(caminho):
+            try:
+                with open(caminho, encoding='utf-8') as f:
+                    dados = json.load(f)
+                if time.time() - dados.get('criado_em', 0) < VALIDADE_USER_AGENTS and dados.get('user_agents'):
+                    _user_agents = dados['user_agents']
+                    return _user_agents
+            except (OSError, ValueError):
+                pass
+        try:
+            _user_agents = _gerar_user_agents(TAMANHO_POOL_USER_AGENTS)
+        except Exception as e:
+            print(f"Erro ao gerar user-agents ({e}); usando a lista de reserva")
+            _user_agents = list(USER_AGENTS_RESERVA)
+            return _user_agents
+        pasta = os.path.dirname(caminho)
+        if pasta and not os.path.exists(pasta):
+            os.makedirs(pasta)
+        with open(caminho, 'w', encoding='utf-8') as f:
+            json.dump({'criado_em': time.time(), 'user_agents': _user_agents}, f, indent=2)
+        return _user_agents
+
+
+def user_agent_aleatorio():
+    """Sorteia um user-agent do pool em cache"""
+    return random.choice(carregar_user_agents())
+
+
+def limpar_cache_user_agents(caminho=CAMINHO_USER_AGENTS):
+    """Descarta o pool em memória e em disco (usado no benchmark de partida a frio)"""
+    global _user_agents
+    with _lock_user_agents:
+        _user_agents = None
+        if os.path.exists(caminho):
+            os.remove(caminho)
+
+
+def caminho_chromedriver(version_main=None):
+    """Caminho do chromedriver patcheado em cache para a versão do Chrome"""
+    nome = f"chromedriver_{version_main or 'atual'}" + (".exe" if os.name == 'nt' else "")
+    return os.path.abspath(os.path.join(PASTA_CACHE, nome))
+
+
+def obter_chromedriver_patcheado(version_main=None):
+    """Retorna o chromedriver patcheado em cache, baixando e patcheando só na primeira vez
+
+    Sem driver_executable_path, o undetected_chromedriver apaga, baixa e patcheia o binário
+    a cada uc.Chrome(); com um binário já patcheado ele só verifica a assinatura e segue.
+    """
+    from undetected_chromedriver.patcher import Patcher
+    destino = caminho_chromedriver(version_main)
+    with _lock_chromedriver:
+        if os.path.exists(destino) and Patcher(executable_path=destino).is_binary_patched():
+            return destino
+        print("Baixando e patcheando o chromedriver (apenas na primeira execução)...")
+        patcher = Patcher(version_main=version_main or 0)
+        patcher.auto()
+        if not os.path.exists(PASTA_CACHE):
+            os.makedirs(PASTA_CACHE)
+        shutil.copy2(patcher.executable_path, destino)
+        os.chmod(destino, 0o755)
+        return destino
+
+
+def descartar_chromedriver(version_main=None):
+    """Remove o binário em cache (ex.: o Chrome foi atualizado e a versão não casa mais)"""
+    destino = caminho_chromedriver(version_main)
+    with _lock_chromedriver:
+        if os.path.exists(destino):
+            os.remove(destino)
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CheckpointStore - Persistência em SQLite do progresso de uma extração (páginas concluídas,
+linhas coletadas e chaves de duplicatas) para retomar crawls interrompidos
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+CAMINHO_PADRAO = os.path.join("arquivos", "checkpoints.db")
+
+
+class CheckpointStore:
+    def __init__(self, caminho=CAMINHO_PADRAO):
+        pasta = os.path.dirname(caminho)
+        if pasta and not os.path.exists(pasta):
+            os.makedirs(pasta)
+        self.caminho = caminho
+        self._lock = threading.Lock()  # Workers paralelos gravam pela mesma conexão
+        self.conexao = sqlite3.connect(caminho, check_same_thread=False)
+        self.conexao.execute("PRAGMA journal_mode=WAL")
+        self.conexao.execute("PRAGMA synchronous=NORMAL")
+        self.conexao.executescript("""
+            CREATE TABLE IF NOT EXISTS execucoes (
+                run_id TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                max_paginas INTEGER NOT NULL,
+                status TEXT NOT NULL,
+                criado_em REAL NOT NULL,
+                atualizado_em REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS paginas (
+                run_id TEXT NOT NULL,
+                pagina INTEGER NOT NULL,
+                concluida_em REAL NOT NULL,
+                PRIMARY KEY (run_id, pagina)
+            );
+            CREATE TABLE IF NOT EXISTS linhas (
+                run_id TEXT NOT NULL,
+                pagina INTEGER NOT NULL,
+                dados TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS chaves (
+                run_id TEXT NOT NULL,
+                chave TEXT NOT NULL,
+                PRIMARY KEY (run_id, chave)
+            );
+        """)
+        self.conexao.commit()
+
+    @staticmethod
+    def novo_run_id():
+        """Gera um identificador de execução legível (o sufixo aleatório separa execuções do mesmo segundo)"""
+        return f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+
+    def obter_execucao(self, run_id):
+        """Retorna os dados da execução ou None se não existir"""
+        with self._lock:
+            linha = self.conexao.execute(
+                "SELECT run_id, url, max_paginas, status, criado_em, atualizado_em FROM execucoes WHERE run_id = ?",
+                (run_id,),
+            ).fetchone()
+        if linha is None:
+            return None
+        chaves = ('run_id', 'url', 'max_paginas', 'status', 'criado_em', 'atualizado_em')
+        return dict(zip(chaves, linha))
+
+    def iniciar(self, run_id, url, max_paginas):
+        """Registra uma nova execução (ou atualiza o limite de páginas de uma existente)"""
+        agora = time.time()
+        with self._lock, self.conexao:
+            self.conexao.execute(
+                """INSERT INTO execucoes (run_id, url, max_paginas, status, criado_em, atualizado_em)
+                   VALUES (?, ?, ?, 'em_andamento', ?, ?)
+                   ON CONFLICT(run_id) DO UPDATE SET max_paginas = excluded.max_paginas,
+                                                     status = 'em_andamento',
+                                                     atualizado_em = excluded.atualizado_em""",
+                (run_id, url, max_paginas, agora, agora),
+            )
+
+    def salvar_pagina(self, run_id, pagina, linhas, chaves):
+        """Grava, em uma única transação, a página concluída, suas linhas novas e as chaves vistas"""
+        agora = time.time()
+        with self._lock, self.conexao:
+            self.conexao.executemany(
+                "INSERT INTO linhas (run_id, pagina, dados) VALUES (?, ?, ?)",
+                [(run_id, pagina, json.dumps(dados, ensure_ascii=False)) for dados in linhas],
+            )
+            self.conexao.executemany(
+                "INSERT OR IGNORE INTO chaves (run_id, chave) VALUES (?, ?)",
+                [(run_id, str(chave)) for chave in chaves],
+            )
+            self.conexao.execute(
+                "INSERT OR REPLACE INTO paginas (run_id, pagina, concluida_em) VALUES (?, ?, ?)",
+                (run_id, pagina, agora),
+            )
+            self.conexao.execute(
+                "UPDATE execucoes SET atualizado_em = ? WHERE run_id = ?", (agora, run_id)
+            )
+
+    def carregar(self, run_id):
+        """Retorna (páginas concluídas, linhas, chaves) salvas para a execução"""
+        with self._lock:
+            paginas = {p for (p,) in self.conexao.execute(
+                "SELECT pagina FROM paginas WHERE run_id = ?", (run_id,))}
+            linhas = [json.loads(d) for (d,) in self.conexao.execute(
+                "SELECT dados FROM linhas WHERE run_id = ? ORDER BY rowid", (run_id,))]
+            chaves = {c for (c,) in self.conexao.execute(
+                "SELECT chave FROM chaves WHERE run_id = ?", (run_id,))}
+        return paginas, linhas, chaves
+
+    def finalizar(self, run_id, status='concluida'):
+        """Marca a execução como concluída ou, com páginas pendentes, 'interrompida' (retomável)"""
+        with self._lock, self.conexao:
+            self.conexao.execute(
+                "UPDATE execucoes SET status = ?, atualizado_em = ? WHERE run_id = ?",
+                (status, time.time(), run_id),
+            )
+
+    def fechar(self):
+        self.conexao.close()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ClienteHTTP - Busca páginas de resultados via HTTP puro (keep-alive, HTTP/2, gzip)
+antes de recorrer ao Chrome
+"""
+
+import re
+import ssl
+import certifi
+import httpx
+
+try:
+    import h2  # noqa: F401  # HTTP/2 só é habilitado se o pacote h2 estiver instalado
+    HTTP2_DISPONIVEL = True
+except ImportError:
+    HTTP2_DISPONIVEL = False
+
+# Status que indicam bloqueio/limitação em vez de "página não existe"
+STATUS_BLOQUEIO = {401, 403, 405, 429, 503}
+
+# Marcadores conhecidos de páginas de desafio/captcha (Cloudflare, PerimeterX, hCaptcha, reCAPTCHA)
+MARCADORES_BLOQUEIO = re.compile(
+    r"cf-challenge|challenge-platform|cf_chl_|just a moment\.\.\.|attention required"
+    r"|px-captcha|perimeterx|h-captcha|g-recaptcha|captcha-delivery|access denied"
+    r"|acesso negado|verifique se você é humano",
+    re.IGNORECASE,
+)
+
+CABECALHOS_PADRAO = {
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'pt-BR,pt;q=0.9,en;q=0.6',
+    'Accept-Encoding': 'gzip, deflate',
+    'Cache-Control': 'no-cache',
+    'Upgrade-Insecure-Requests': '1',
+}
+
+
+_CONTEXTO_SSL = None
+
+
+def contexto_ssl():
+    """Contexto TLS compartilhado pelos clientes (um por proxy)
+
+    Carregar os certificados custa dezenas de ms de CPU; cada httpx.Client criaria o seu.
+    """
+    global _CONTEXTO_SSL
+    if _CONTEXTO_SSL is None:
+        _CONTEXTO_SSL = ssl.create_default_context(cafile=certifi.where())
+    return _CONTEXTO_SSL
+
+
+def pagina_bloqueada(status=200):
+    """Triagem pelo status HTTP (bloqueio/limitação), antes do parse
+
+    O conteúdo (marcadores de desafio) é julgado depois do parse por
+    throttle_adaptativo.detectar_bloqueio, que sabe quantos cards a página tem: um widget
+    de reCAPTCHA numa página com anúncios não é bloqueio.
+    """
+    return status in STATUS_BLOQUEIO
+
+
+def resposta_com_erro(status):
+    """Erro HTTP que não é bloqueio nem "página não existe" (404): 500, 502, 504...
+
+    O corpo não tem cards e pareceria o fim dos resultados; a página deve ser refeita.
+    """
+    return status >= 400 and status != 404 and status not in STATUS_BLOQUEIO
+
+
+class ClienteHTTP:
+    def __init__(self, user_agent=None, timeout=20, max_conexoes=10, proxy=None):
+        cabecalhos = dict(CABECALHOS_PADRAO)
+        if user_agent:
+            cabecalhos['User-Agent'] = user_agent
+        self.cliente = httpx.Client(
+            http2=HTTP2_DISPONIVEL,
+            headers=cabecalhos,
+            timeout=timeout,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=max_conexoes, max_keepalive_connections=max_conexoes),
+            proxy=proxy,
+            verify=contexto_ssl(),
+        )
+
+    def obter(self, url):
+        """Busca a URL e retorna (html, status, bloqueada)"""
+        resposta = self.cliente.get(url)
+        html = resposta.text
+        return html, resposta.status_code, pagina_bloqueada(resposta.status_code)
+
+    def fechar(self):
+        """Fecha as conexões mantidas abertas"""
+        self.cliente.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.fechar()
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+DriverPool - Pool de navegadores Chrome reaproveitados entre execuções do scraper
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+
+
+class DriverPool:
+    def __init__(self, fabrica, tamanho_maximo=2, max_paginas_por_driver=50, limite_memoria_mb=1024):
+        """
+        Args:
+            fabrica (callable): função sem argumentos que cria um driver configurado
+            tamanho_maximo (int): número máximo de navegadores abertos ao mesmo tempo
+            max_paginas_por_driver (int): páginas processadas antes de reciclar o navegador
+            limite_memoria_mb (float): heap JS (MB) acima do qual o navegador é reciclado
+        """
+        self.fabrica = fabrica
+        self.tamanho_maximo = max(1, int(tamanho_maximo))
+        self.max_paginas_por_driver = max_paginas_por_driver
+        self.limite_memoria_mb = limite_memoria_mb
+        self._livres = []  # Drivers disponíveis para checkout
+        self._info = {}  # id(driver) -> {'driver', 'paginas', 'criado_em'}
+        self._condicao = threading.Condition()
+        self._fechado = False
+        self.estatisticas = {'criados': 0, 'reutilizados': 0, 'reciclados': 0, 'mortos': 0}
+
+    def esta_vivo(self, driver):
+        """Verifica se o navegador ainda responde"""
+        try:
+            driver.current_url
+            return len(driver.window_handles) > 0
+        except Exception:
+            return False
+
+    def uso_memoria_mb(self, driver):
+        """Retorna o heap JS usado pela aba atual em MB (None se indisponível)"""
+        try:
+            usado = driver.execute_script(
+                "return (window.performance && performance.memory) ? performance.memory.usedJSHeapSize : null;"
+            )
+            return usado / (1024 * 1024) if usado else None
+        except Exception:
+            return None
+
+    def _precisa_reciclar(self, driver, info):
+        """Indica se o navegador atingiu o limite de páginas ou de memória"""
+        if info and self.max_paginas_por_driver and info['paginas'] >= self.max_paginas_por_driver:
+            print(f"♻️ Reciclando navegador após {info['paginas']} páginas")
+            return True
+        if self.limite_memoria_mb:
+            memoria = self.uso_memoria_mb(driver)
+            if memoria is not None and memoria >= self.limite_memoria_mb:
+                print(f"♻️ Reciclando navegador com {memoria:.0f} MB de heap")
+                return True
+        return False
+
+    def _fechar_driver(self, driver):
+        """Fecha o navegador (fora do lock: quit() pode demorar)"""
+        try:
+            driver.quit()
+        except Exception as e:
+            print(f"Erro ao fechar navegador do pool: {e}")
+
+    def checkout(self, timeout=None):
+        """Retira um navegador saudável do pool, criando um novo se necessário
+
+        As verificações de saúde e o quit() conversam com o navegador e rodam fora do lock:
+        um navegador travado não segura o checkout e a devolução dos outros workers.
+        """
+        limite = time.time() + timeout if timeout is not None else None
+        while True:
+            with self._condicao:
+                while True:
+                    if self._fechado:
+                        raise RuntimeError("Pool de navegadores já foi fechado")
+                    if self._livres:
+                        driver = self._livres.pop()  # Segue contado em _info enquanto é verificado
+                        break
+                    if len(self._info) < self.tamanho_maximo:
+                        # Reservar a vaga antes de criar, para não ultrapassar o tamanho máximo
+                        driver = None
+                        marcador = object()
+                        self._info[id(marcador)] = {'driver': None, 'paginas': 0, 'criado_em': time.time()}
+                        break
+                    restante = None if limite is None else limite - time.time()
+                    if restante is not None and restante <= 0:
+                        raise TimeoutError("Nenhum navegador disponível no pool")
+                    self._condicao.wait(restante)
+
+            if driver is None:
+                return self._criar(marcador)
+            if self.esta_vivo(driver):
+                with self._condicao:
+                    self.estatisticas['reutilizados'] += 1
+                return driver
+            print("⚠️ Navegador do pool não responde, descartando...")
+            with self._condicao:
+                self.estatisticas['mortos'] += 1
+                self._info.pop(id(driver), None)
+                self._condicao.notify()
+            self._fechar_driver(driver)
+
+    def _criar(self, marcador):
+        """Cria o navegador na vaga reservada por `marcador`"""
+        try:
+            driver = self.fabrica()
+        except Exception:
+            with self._condicao:
+                self._info.pop(id(marcador), None)
+                self._condicao.notify()
+            raise
+
+        with self._condicao:
+            self._info.pop(id(marcador), None)
+            self._info[id(driver)] = {'driver': driver, 'paginas': 0, 'criado_em': time.time()}
+            self.estatisticas['criados'] += 1
+        return driver
+
+    def devolver(self, driver, paginas_processadas=0, descartar=False):
+        """Devolve o navegador ao pool, reciclando-o se estiver morto ou desgastado"""
+        if driver is None:
+            return
+        with self._condicao:
+            info = self._info.get(id(driver))
+            if info is not None:
+                info['paginas'] += paginas_processadas
+            descartar = descartar or self._fechado or info is None
+
+        # Saúde e memória fora do lock; o navegador segue contado em _info até sair daqui
+        motivo = None
+        if not descartar:
+            if not self.esta_vivo(driver):
+                motivo = 'mortos'
+            elif self._precisa_reciclar(driver, info):
+                motivo = 'reciclados'
+
+        with self._condicao:
+            if descartar or motivo or self._fechado:
+                if motivo:
+                    self.estatisticas[motivo] += 1
+                self._info.pop(id(driver), None)
+                descartar = True
+            else:
+                self._livres.append(driver)
+            self._condicao.notify()
+        if descartar:
+            self._fechar_driver(driver)
+
+    @contextmanager
+    def driver(self, timeout=None):
+        """Context manager: with pool.driver() as driver: ..."""
+        driver = self.checkout(timeout)
+        try:
+            yield driver
+        except Exception:
+            self.devolver(driver, descartar=not self.esta_vivo(driver))
+            raise
+        else:
+            self.devolver(driver)
+
+    def fechar(self):
+        """Fecha todos os navegadores livres e impede novos checkouts"""
+        with self._condicao:
+            self._fechado = True
+            livres, self._livres = self._livres, []
+            for driver in livres:
+                self._info.pop(id(driver), None)
+            self._condicao.notify_all()
+        for driver in livres:
+            self._fechar_driver(driver)
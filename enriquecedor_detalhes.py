@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Enriquecimento pelas páginas de detalhe: descrição completa, condomínio, área total,
+comodidades e data de publicação dos anúncios selecionados (ex.: comparáveis do laudo),
+com concorrência limitada e cache em disco por URL com validade
+"""
+
+import asyncio
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+
+import httpx
+from bs4 import BeautifulSoup
+
+from cliente_http import CABECALHOS_PADRAO, HTTP2_DISPONIVEL, pagina_bloqueada
+from throttle_adaptativo import detectar_bloqueio
+from cache_driver import PASTA_CACHE, user_agent_aleatorio
+from extrator_cards import url_generica
+from extrator_json import extrair_estado_next, _numero
+from limitador_taxa import LimitadorTaxa
+
+CAMINHO_CACHE_DETALHES = os.path.join(PASTA_CACHE, "detalhes.db")
+VALIDADE_DETALHES = 7 * 24 * 3600  # Laudos da mesma região na mesma semana não buscam de novo
+
+# Códigos de comodidade da API -> rótulo exibido no site
+COMODIDADES = {
+    'POOL': 'Piscina', 'GYM': 'Academia', 'ELEVATOR': 'Elevador', 'PARTY_HALL': 'Salão de festas',
+    'PLAYGROUND': 'Playground', 'BARBECUE_GRILL': 'Churrasqueira', 'SAUNA': 'Sauna',
+    'CONCIERGE_24H': 'Portaria 24h', 'SECURITY_24_HOURS': 'Segurança 24h', 'GATED_COMMUNITY': 'Condomínio fechado',
+    'SPORTS_COURT': 'Quadra poliesportiva', 'TENNIS_COURT': 'Quadra de tênis', 'GAMES_ROOM': 'Salão de jogos',
+    'GOURMET_SPACE': 'Espaço gourmet', 'COWORKING': 'Coworking', 'LAUNDRY': 'Lavanderia',
+    'GOURMET_BALCONY': 'Varanda gourmet', 'BALCONY': 'Varanda', 'AIR_CONDITIONING': 'Ar-condicionado',
+    'FURNISHED': 'Mobiliado', 'AMERICAN_KITCHEN': 'Cozinha americana', 'PETS_ALLOWED': 'Aceita pets',
+    'BACKYARD': 'Quintal', 'FIREPLACE': 'Lareira', 'HOME_OFFICE': 'Escritório',
+}
+
+# Comodidades do prédio/condomínio (as demais são da unidade)
+COMODIDADES_CONDOMINIO = {
+    'Piscina', 'Academia', 'Elevador', 'Salão de festas', 'Playground', 'Churrasqueira', 'Sauna',
+    'Portaria 24h', 'Segurança 24h', 'Condomínio fechado', 'Quadra poliesportiva', 'Quadra de tênis',
+    'Salão de jogos', 'Espaço gourmet', 'Coworking', 'Lavanderia',
+}
+
+PADRAO_VALOR = re.compile(r'R\$\s*([\d.]+(?:,\d+)?)')
+PADRAO_AREA = re.compile(r'(\d+(?:[.,]\d+)?)\s*m²')
+PADRAO_DATA = re.compile(r'publicado em (\d{2})/(\d{2})/(\d{4})', re.IGNORECASE)
+PADRAO_BR = re.compile(r'<br\s*/?>', re.IGNORECASE)
+
+
+class CacheDetalhes:
+    """HTML das páginas de detalhe em SQLite (comprimido), válido por `validade` segundos"""
+
+    def __init__(self, caminho=CAMINHO_CACHE_DETALHES, validade=VALIDADE_DETALHES):
+        pasta = os.path.dirname(caminho)
+        if pasta and not os.path.exists(pasta):
+            os.makedirs(pasta)
+        self.validade = validade
+        self._lock = threading.Lock()
+        self.conexao = sqlite3.connect(caminho, check_same_thread=False)
+        self.conexao.execute("PRAGMA journal_mode=WAL")
+        self.conexao.execute(
+            "CREATE TABLE IF NOT EXISTS detalhes (url TEXT PRIMARY KEY, html BLOB NOT NULL, obtido_em REAL NOT NULL)"
+        )
+        self.conexao.commit()
+
+    def obter(self, url):
+        """HTML em cache ainda válido, ou None"""
+        with self._lock:
+            linha = self.conexao.execute("SELECT html, obtido_em FROM detalhes WHERE url = ?", (url,)).fetchone()
+        if linha is None or time.time() - linha[1] > self.validade:
+            return None
+        return zlib.decompress(linha[0]).decode('utf-8')
+
+    def salvar(self, url, html):
+        with self._lock, self.conexao:
+            self.conexao.execute(
+                "INSERT OR REPLACE INTO detalhes (url, html, obtido_em) VALUES (?, ?, ?)",
+                (url, zlib.compress(html.encode('utf-8')), time.time()),
+            )
+
+    def limpar_expirados(self):
+        """Remove entradas vencidas; retorna quantas foram removidas"""
+        with self._lock, self.conexao:
+            cursor = self.conexao.execute("DELETE FROM detalhes WHERE obtido_em < ?", (time.time() - self.validade,))
+        return cursor.rowcount
+
+    def fechar(self):
+        self.conexao.close()
+
+
+def _rotulo_comodidade(codigo):
+    return COMODIDADES.get(codigo, codigo.replace('_', ' ').capitalize())
+
+
+def _valor_reais(texto):
+    """'R$ 1.350' -> 1350.0"""
+    match = PADRAO_VALOR.search(texto or '')
+    if not match:
+        return None
+    return float(match.group(1).replace('.', '').replace(',', '.'))
+
+
+def _encontrar_listagem_detalhe(estado):
+    """Procura no estado da página o anúncio (dicionário com descrição e comodidades/datas)"""
+    pilha = [estado]
+    while pilha:
+        no = pilha.pop()
+        if isinstance(no, dict):
+            if 'description' in no and ('amenities' in no or 'createdAt' in no or 'pricingInfos' in no):
+                return no
+            pilha.extend(no.values())
+        elif isinstance(no, list):
+            pilha.extend(no)
+    return None
+
+
+def _campos_estado(listagem):
+    campos = {}
+    descricao = listagem.get('description')
+    if descricao:
+        campos['Descricao_Completa'] = PADRAO_BR.sub('\n', descricao).strip()
+    area_total = _numero(listagem.get('totalAreas'))
+    if area_total:
+        campos['Area_Total'] = area_total
+    precos = listagem.get('pricingInfos') or []
+    preco = next((p for p in precos if p.get('businessType') == 'SALE'), precos[0] if precos else {})
+    condominio = _numero(preco.get('monthlyCondoFee'))
+    if condominio:
+        campos['Condominio'] = condominio
+    iptu = _numero(preco.get('yearlyIptu'))
+    if iptu:
+        campos['IPTU'] = iptu
+    comodidades = [_rotulo_comodidade(c) for c in listagem.get('amenities') or []]
+    if comodidades:
+        campos['_comodidades'] = comodidades
+    data = listagem.get('createdAt') or listagem.get('publishedAt')
+    if data:
+        campos['Data_Publicacao'] = data[:10]
+    return campos
+
+
+def _campos_dom(soup):
+    campos = {}
+    bloco = soup.select_one('[data-testid="description-content"]')
+    if bloco:
+        for quebra in bloco.find_all('br'):
+            quebra.replace_with('\n')
+        campos['Descricao_Completa'] = bloco.get_text().strip()
+    else:
+        meta = soup.find("meta", attrs={"name": "description"}) or soup.find("meta", attrs={"property": "og:description"})
+        if meta and meta.get('content'):
+            campos['Descricao_Completa'] = meta['content'].strip()
+
+    area = soup.select_one('[data-testid="total-area"]')
+    if area:
+        match = PADRAO_AREA.search(area.get_text())
+        if match:
+            campos['Area_Total'] = float(match.group(1).replace(',', '.'))
+    for campo, seletor in (('Condominio', '[data-testid="condo-fee"]'), ('IPTU', '[data-testid="iptu"]')):
+        elemento = soup.select_one(seletor)
+        valor = _valor_reais(elemento.get_text()) if elemento else None
+        if valor:
+            campos[campo] = valor
+
+    comodidades = [li.get_text(strip=True) for li in soup.select('[data-testid="amenities"] li')]
+    if comodidades:
+        campos['_comodidades'] = comodidades
+
+    match = PADRAO_DATA.search(soup.get_text(" "))
+    if match:
+        dia, mes, ano = match.groups()
+        campos['Data_Publicacao'] = f"{ano}-{mes}-{dia}"
+    return campos
+
+
+def extrair_campos_detalhe(html):
+    """Extrai os campos da página de detalhe: estado JSON primeiro, DOM para o que faltar"""
+    campos = {}
+    estado = extrair_estado_next(html)
+    listagem = _encontrar_listagem_detalhe(estado) if estado else None
+    if listagem:
+        campos = _campos_estado(listagem)
+    if len(campos) < 6:  # Estado ausente ou incompleto: completar pelo DOM
+        for campo, valor in _campos_dom(BeautifulSoup(html, 'html.parser')).items():
+            campos.setdefault(campo, valor)
+
+    comodidades = campos.pop('_comodidades', [])
+    condominio = [c for c in comodidades if c in COMODIDADES_CONDOMINIO]
+    unidade = [c for c in comodidades if c not in COMODIDADES_CONDOMINIO]
+    if condominio:
+        campos['Detalhes_Condominio'] = ", ".join(condominio)
+    if unidade:
+        campos['Comodidades'] = ", ".join(unidade)
+    return campos
+
+
+def _numero_valido(valor):
+    """Valor numérico presente (linhas vindas de DataFrame trazem NaN no lugar de None)"""
+    return valor is not None and not (isinstance(valor, float) and math.isnan(valor))
+
+
+def tem_pagina_detalhe(anuncio):
+    """Anúncio com URL de detalhe real (a genérica, montada sem link, só daria 404)"""
+    url = anuncio.get('URL')
+    return isinstance(url, str) and bool(url) and not url_generica(url)
+
+
+def selecionar_comparaveis(anuncios, n=10, area=None, quartos=None):
+    """Os N anúncios com página de detalhe mais parecidos com o imóvel avaliado (área e quartos); sem área vão para o fim"""
+    candidatos = [a for a in anuncios if tem_pagina_detalhe(a)]
+    if area:
+        def distancia(anuncio):
+            if not _numero_valido(anuncio.get('M2')):
+                return math.inf
+            diferenca = abs(anuncio['M2'] - area) / area
+            if quartos is not None and _numero_valido(anuncio.get('Quartos')):
+                diferenca += 0.25 * abs(anuncio['Quartos'] - quartos)
+            return diferenca
+        candidatos.sort(key=distancia)
+    return candidatos[:n]
+
+
+class EnriquecedorDetalhes:
+    def __init__(self, max_simultaneos=4, cache=None, taxa_por_segundo=2.0, rajada=4, timeout=20, limitador=None):
+        """
+        Args:
+            max_simultaneos (int): páginas de detalhe buscadas ao mesmo tempo
+            cache (CacheDetalhes): cache em disco (padrão arquivos/cache/detalhes.db, 7 dias; False desliga)
+            taxa_por_segundo / rajada: limite de taxa por host (token bucket)
+            timeout (float): timeout de cada requisição
+            limitador (LimitadorTaxa): token bucket compartilhado com outras buscas ao mesmo host
+        """
+        self.max_simultaneos = max_simultaneos
+        self.cache = CacheDetalhes() if cache is None else cache or None
+        self.limitador = limitador or LimitadorTaxa(taxa_por_segundo, rajada)
+        self.timeout = timeout
+        self.estatisticas = {'cache': 0, 'buscados': 0, 'falhas': 0}
+
+    def _criar_cliente(self):
+        cabecalhos = dict(CABECALHOS_PADRAO)
+        cabecalhos['User-Agent'] = user_agent_aleatorio()
+        return httpx.AsyncClient(
+            http2=HTTP2_DISPONIVEL,
+            headers=cabecalhos,
+            timeout=self.timeout,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=self.max_simultaneos, max_keepalive_connections=self.max_simultaneos),
+        )
+
+    async def obter_html(self, cliente, semaforo, url):
+        """HTML da página de detalhe: do cache se válido, senão da rede; retorna (html, buscado)
+
+        O HTML buscado só vai para o cache depois do parse (em obter_campos), quando se sabe
+        que não é um desafio.
+        """
+        html = self.cache.obter(url) if self.cache else None
+        if html is not None:
+            self.estatisticas['cache'] += 1
+            return html, False
+        async with semaforo:
+            await self.limitador.aguardar(url)
+            try:
+                resposta = await cliente.get(url)
+            except Exception as e:
+                print(f"\nErro ao buscar detalhe {url}: {e}")
+                self.estatisticas['falhas'] += 1
+                return None, True
+        if resposta.status_code != 200 or pagina_bloqueada(resposta.status_code):
+            print(f"\n🛑 Detalhe {url} bloqueado ou indisponível (status {resposta.status_code})")
+            self.estatisticas['falhas'] += 1
+            return None, True
+        return resposta.text, True
+
+    async def obter_campos(self, cliente, semaforo, url):
+        """Campos da página de detalhe da URL ({} em falha, bloqueio ou desafio)"""
+        html, buscado = await self.obter_html(cliente, semaforo, url)
+        if html is None:
+            return {}
+        try:
+            campos = await asyncio.to_thread(extrair_campos_detalhe, html)
+        except Exception as e:
+            print(f"\nErro ao extrair detalhe {url}: {e}")
+            self.estatisticas['falhas'] += 1
+            return {}
+        if buscado:
+            if detectar_bloqueio(html, 200, len(campos)):
+                print(f"\n🛑 Detalhe {url} com desafio no lugar do anúncio")
+                self.estatisticas['falhas'] += 1
+                return {}
+            self.estatisticas['buscados'] += 1
+            if self.cache:
+                self.cache.salvar(url, html)
+        return campos
+
+    async def enriquecer_async(self, anuncios):
+        """Busca cada URL uma única vez e mescla os campos nos anúncios (in-place)"""
+        urls = list(dict.fromkeys(a['URL'] for a in anuncios if tem_pagina_detalhe(a)))
+        semaforo = asyncio.Semaphore(self.max_simultaneos)
+        async with self._criar_cliente() as cliente:
+            campos = await asyncio.gather(*(self.obter_campos(cliente, semaforo, url) for url in urls))
+        por_url = dict(zip(urls, campos))
+        for anuncio in anuncios:
+            anuncio.update(por_url.get(anuncio.get('URL'), {}))
+        return anuncios
+
+    def enriquecer(self, anuncios):
+        """Versão síncrona: retorna os mesmos anúncios com os campos de detalhe"""
+        inicio = time.perf_counter()
+        self.estatisticas = {'cache': 0, 'buscados': 0, 'falhas': 0}
+        asyncio.run(self.enriquecer_async(anuncios))
+        print(f"\n🔎 Detalhes: {self.estatisticas['buscados']} buscados, {self.estatisticas['cache']} do cache, "
+              f"{self.estatisticas['falhas']} falhas em {time.perf_counter() - inicio:.1f}s")
+        return anuncios
+
+
+def main():
+    """Uso: python enriquecedor_detalhes.py <planilha.xlsx|dados.csv> [n] [area] [quartos]"""
+    import sys
+    import pandas as pd
+
+    if len(sys.argv) < 2:
+        print("❌ Uso: python enriquecedor_detalhes.py <planilha.xlsx|dados.csv> [n_comparaveis] [area_m2] [quartos]")
+        sys.exit(1)
+    caminho = sys.argv[1]
+    n = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    area = float(sys.argv[3]) if len(sys.argv) > 3 else None
+    quartos = int(sys.argv[4]) if len(sys.argv) > 4 else None
+
+    df = pd.read_excel(caminho) if caminho.lower().endswith('.xlsx') else pd.read_csv(caminho)
+    comparaveis = selecionar_comparaveis(df.to_dict('records'), n=n, area=area, quartos=quartos)
+    print(f"🏘️ {len(comparaveis)} comparáveis selecionados de {len(df)} anúncios")
+    enriquecidos = EnriquecedorDetalhes().enriquecer(comparaveis)
+
+    base, _ = os.path.splitext(caminho)
+    destino = f"{base}_detalhes.csv"
+    pd.DataFrame(enriquecidos).to_csv(destino, index=False, encoding='utf-8-sig')
+    print(f"💾 Comparáveis enriquecidos salvos em: {destino}")
+
+
+if __name__ == "__main__":
+    main()
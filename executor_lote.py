@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ExecutorLote - Executa várias URLs de busca a partir de um manifesto, em um pool limitado
+de workers, com prioridades, novas tentativas e uma saída separada por URL
+
+Manifesto em JSON (lista de objetos) ou CSV com as colunas:
+    url, max_paginas (padrão 5), prioridade (maior primeiro, padrão 0), nome (opcional)
+"""
+
+import csv
+import heapq
+import json
+import os
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+from zap_scraper import ZapScraper, obter_pool_drivers
+from checkpoint import CheckpointStore
+from sinks import SINKS, criar_sink
+from pool_proxies import PoolProxies, carregar_proxies
+from indice_anuncios import IndiceAnuncios
+
+
+def carregar_manifesto(caminho):
+    """Lê o manifesto (JSON ou CSV) e retorna a lista de itens normalizados"""
+    with open(caminho, encoding='utf-8') as f:
+        if caminho.lower().endswith('.json'):
+            entradas = json.load(f)
+        else:
+            entradas = [linha for linha in csv.DictReader(f) if (linha.get('url') or '').strip()]
+
+    itens, nomes = [], set()
+    for ordem, entrada in enumerate(entradas):
+        url = entrada['url'].strip()
+        nome = (entrada.get('nome') or '').strip() or nome_particao(url)
+        base, sufixo = nome, 2
+        while nome in nomes:  # Duas buscas com o mesmo nome não podem dividir a partição
+            nome, sufixo = f"{base}_{sufixo}", sufixo + 1
+        nomes.add(nome)
+        itens.append({
+            'url': url,
+            'max_paginas': int(entrada.get('max_paginas') or 5),
+            'prioridade': int(entrada.get('prioridade') or 0),
+            'nome': nome,
+            'ordem': ordem,
+        })
+    return itens
+
+
+def nome_particao(url):
+    """Deriva um nome de pasta a partir do caminho da URL de busca"""
+    caminho = re.sub(r'^https?://[^/]+', '', url).split('?')[0]
+    nome = re.sub(r'[^0-9A-Za-z]+', '_', caminho).strip('_')
+    return nome or 'busca'
+
+
+class ExecutorLote:
+    def __init__(self, num_workers=2, max_tentativas=3, espera_base=5, formato_saida='csv',
+                 pasta_saida=None, fabrica_scraper=None, checkpoint=None, proxies=None,
+                 indice=None):
+        """
+        Args:
+            num_workers (int): URLs processadas ao mesmo tempo
+            max_tentativas (int): tentativas por URL antes de registrá-la como falha
+            espera_base (float): espera (s) antes da 2ª tentativa; dobra a cada nova tentativa
+            formato_saida (str): formato do sink de cada partição ('csv', 'jsonl', 'parquet', 'sqlite')
+            pasta_saida (str): pasta do lote (padrão arquivos/lote_<timestamp>)
+            fabrica_scraper (callable): cria o ZapScraper de cada URL; recebe o sink da partição
+            checkpoint (CheckpointStore): tentativas repetidas retomam das páginas já concluídas
+            proxies (PoolProxies): pool compartilhado por todas as URLs (saúde medida no lote inteiro)
+            indice (IndiceAnuncios): crawl incremental; cada partição recebe só anúncios novos ou com preço alterado
+        """
+        self.num_workers = max(1, int(num_workers))
+        self.max_tentativas = max(1, int(max_tentativas))
+        self.espera_base = espera_base
+        self.formato_saida = formato_saida
+        self.lote_id = time.strftime("%Y%m%d-%H%M%S")
+        self.pasta_saida = pasta_saida or os.path.join("arquivos", f"lote_{self.lote_id}")
+        self.fabrica_scraper = fabrica_scraper or self._criar_scraper
+        self.checkpoint = checkpoint
+        self.proxies = proxies
+        self.indice = indice
+        self.resultados = []
+        self._lock = threading.Lock()
+
+    def _criar_scraper(self, sink):
+        """Scraper padrão: navegadores do pool compartilhado entre todas as URLs do lote"""
+        return ZapScraper(pool=obter_pool_drivers(tamanho_maximo=self.num_workers), sink=sink, proxies=self.proxies)
+
+    def caminho_particao(self, item):
+        """Arquivo de saída da URL: <pasta do lote>/<nome>/dados.<formato>"""
+        return os.path.join(self.pasta_saida, item['nome'], f"dados{SINKS[self.formato_saida].extensao}")
+
+    def _executar_item(self, item, tentativa):
+        """Roda uma tentativa de uma URL; retorna o registro do resultado
+
+        Status: 'ok', 'parcial' (parou com páginas pendentes) ou 'falha'; só 'ok' encerra as tentativas.
+        """
+        print(f"\n📦 [{item['nome']}] tentativa {tentativa}/{self.max_tentativas}: {item['url']}")
+        inicio = time.perf_counter()
+        registro = {'nome': item['nome'], 'url': item['url'], 'prioridade': item['prioridade'],
+                    'tentativas': tentativa, 'status': 'falha', 'linhas': 0, 'paginas': 0,
+                    'paginas_mortas': [], 'erro': None, 'saida': self.caminho_particao(item)}
+        sink = criar_sink(self.formato_saida, registro['saida'])
+        scraper = self.fabrica_scraper(sink)
+        if self.checkpoint is not None:
+            scraper.checkpoint = self.checkpoint
+        if self.indice is not None:
+            scraper.indice = self.indice
+        try:
+            run_id = f"lote-{self.lote_id}-{item['nome']}" if self.checkpoint is not None else None
+            saida = scraper.extrair_dados_pagina(item['url'], item['max_paginas'], run_id=run_id)
+            registro['paginas'] = len(scraper.paginas_concluidas)
+            registro['paginas_mortas'] = [morta['pagina'] for morta in scraper.paginas_mortas]
+            pendente = scraper.pagina_pendente()
+            if saida is not None:
+                registro['linhas'] = len(saida)
+            if pendente is not None:
+                registro['erro'] = f"interrompida com páginas pendentes a partir da {pendente}"
+                if registro['linhas']:
+                    registro['status'] = 'parcial'
+            elif registro['linhas']:
+                registro['status'] = 'ok'
+            elif scraper.parada_incremental is not None:
+                registro['status'] = 'ok'  # Incremental sem novidades: nada a gravar, mas não é falha
+            else:
+                registro['erro'] = 'nenhum imóvel coletado'
+        except Exception as e:
+            registro['erro'] = str(e)
+        finally:
+            scraper.fechar_clientes_http()
+        registro['segundos'] = time.perf_counter() - inicio
+        return registro
+
+    def executar(self, itens):
+        """Processa os itens por prioridade em até num_workers URLs simultâneas"""
+        self.resultados = []
+        fila = [(-item['prioridade'], item['ordem'], 1, item) for item in itens]
+        heapq.heapify(fila)
+        agendadas = []  # (instante, entrada da fila): novas tentativas aguardando o backoff fora dos workers
+        inicio = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=self.num_workers) as executor:
+            em_execucao = {}
+            while fila or em_execucao or agendadas:
+                agora = time.monotonic()
+                while agendadas and agendadas[0][0] <= agora:
+                    heapq.heappush(fila, heapq.heappop(agendadas)[1])
+                while fila and len(em_execucao) < self.num_workers:
+                    _, _, tentativa, item = heapq.heappop(fila)
+                    em_execucao[executor.submit(self._executar_item, item, tentativa)] = (item, tentativa)
+                espera = agendadas[0][0] - agora if agendadas else None
+                if not em_execucao:
+                    time.sleep(espera)
+                    continue
+                concluidos, _ = wait(em_execucao, timeout=espera, return_when=FIRST_COMPLETED)
+                for futuro in concluidos:
+                    item, tentativa = em_execucao.pop(futuro)
+                    registro = futuro.result()
+                    if registro['status'] != 'ok' and tentativa < self.max_tentativas:
+                        atraso = self.espera_base * 2 ** (tentativa - 1)
+                        print(f"\n🔁 [{item['nome']}] {registro['status']} ({registro['erro']}); "
+                              f"nova tentativa em {atraso:.1f}s")
+                        entrada = (-item['prioridade'], item['ordem'], tentativa + 1, item)
+                        heapq.heappush(agendadas, (time.monotonic() + atraso, entrada))
+                        continue
+                    with self._lock:
+                        self.resultados.append(registro)
+                    simbolo = {'ok': "✅", 'parcial': "⚠️"}.get(registro['status'], "❌")
+                    print(f"\n{simbolo} [{item['nome']}] {registro['linhas']} imóveis em {registro['segundos']:.1f}s")
+
+        resumo = self.resumir(time.perf_counter() - inicio)
+        self.salvar_resumo(resumo)
+        self.imprimir_resumo(resumo)
+        return resumo
+
+    def resumir(self, segundos_totais):
+        """Consolida vazão e falhas de todas as URLs"""
+        linhas = sum(r['linhas'] for r in self.resultados)
+        paginas = sum(r['paginas'] for r in self.resultados)
+        return {
+            'lote_id': self.lote_id,
+            'urls': len(self.resultados),
+            'sucesso': sum(1 for r in self.resultados if r['status'] == 'ok'),
+            'falhas': [r for r in self.resultados if r['status'] != 'ok'],
+            'linhas': linhas,
+            'paginas': paginas,
+            'segundos': segundos_totais,
+            'linhas_por_minuto': linhas / segundos_totais * 60 if segundos_totais else 0.0,
+            'paginas_por_minuto': paginas / segundos_totais * 60 if segundos_totais else 0.0,
+            'itens': sorted(self.resultados, key=lambda r: r['nome']),
+        }
+
+    def salvar_resumo(self, resumo):
+        if not os.path.exists(self.pasta_saida):
+            os.makedirs(self.pasta_saida)
+        caminho = os.path.join(self.pasta_saida, 'resumo.json')
+        with open(caminho, 'w', encoding='utf-8') as f:
+            json.dump(resumo, f, ensure_ascii=False, indent=2)
+        print(f"\n📝 Resumo do lote salvo em: {caminho}")
+
+    def imprimir_resumo(self, resumo):
+        print("\n📊 RESUMO DO LOTE")
+        print("=" * 40)
+        print(f"🔗 URLs: {resumo['urls']} ({resumo['sucesso']} com sucesso, {len(resumo['falhas'])} com falha)")
+        print(f"🏠 Imóveis: {resumo['linhas']} em {resumo['paginas']} páginas")
+        print(f"⏱️ Tempo total: {resumo['segundos']:.1f}s")
+        print(f"🚀 Vazão: {resumo['linhas_por_minuto']:.1f} imóveis/min, {resumo['paginas_por_minuto']:.1f} páginas/min")
+        for falha in resumo['falhas']:
+            print(f"  ❌ {falha['nome']} ({falha['status']}): {falha['erro']} ({falha['tentativas']} tentativas)")
+        for item in resumo['itens']:
+            if item.get('paginas_mortas'):
+                print(f"  ☠️ {item['nome']}: páginas não coletadas {item['paginas_mortas']}")
+
+
+def main():
+    """Uso: python executor_lote.py <manifesto.json|csv> [num_workers] [formato] [--incremental]"""
+    incremental = '--incremental' in sys.argv
+    if incremental:
+        sys.argv.remove('--incremental')
+    if len(sys.argv) < 2:
+        print("❌ Uso: python executor_lote.py <manifesto.json|manifesto.csv> [num_workers] [csv|jsonl|parquet|sqlite] [--incremental]")
+        print("📝 Colunas do manifesto: url, max_paginas, prioridade, nome")
+        sys.exit(1)
+    itens = carregar_manifesto(sys.argv[1])
+    num_workers = int(sys.argv[2]) if len(sys.argv) > 2 else 2
+    formato = sys.argv[3] if len(sys.argv) > 3 else 'csv'
+    proxies = carregar_proxies()  # Variável ZAP_PROXIES
+    executor = ExecutorLote(num_workers=num_workers, formato_saida=formato, checkpoint=CheckpointStore(),
+                            proxies=PoolProxies(proxies) if proxies else None,
+                            indice=IndiceAnuncios() if incremental else None)
+    resumo = executor.executar(itens)
+    if resumo['falhas']:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
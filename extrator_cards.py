@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Extrator compilado de cards - Percorre a árvore de cada card uma única vez, separando os
+elementos de interesse pelas estratégias do perfil de seletores (perfis_seletores.json), e
+aplica regexes pré-compiladas. Produz o mesmo resultado da extração por seletores
+(ZapScraper._extrair_dados_anuncio_seletores), com qualquer backend de parsers_html
+(html.parser, lxml, selectolax).
+"""
+
+import re
+
+from parsers_html import obter_parser
+from perfis_seletores import obter_perfil
+
+URL_BASE = "https://www.zapimoveis.com.br"
+
+PADRAO_AREA = re.compile(r'(\d+(?:\.|,)?\d*)\s*m²')
+PADRAO_NUMERO = re.compile(r'(\d+)')
+PADRAO_PRECO = re.compile(r'R\$\s*([\d.,]+)')
+PADRAO_CONDOMINIO = re.compile(r'Cond\.\s*R\$\s*([\d.,]+)')
+PADRAO_IPTU = re.compile(r'IPTU\s*R\$\s*([\d.,]+)')
+
+PALAVRAS_URL_IMOVEL = ('imovel', 'casa', 'apartamento', 'venda', 'aluguel', 'sp+', 'rj+', 'mg+')
+PALAVRAS_URL_IGNORADAS = ('facebook', 'twitter', 'instagram', 'linkedin', 'whatsapp', 'mailto:', 'tel:', '#', 'javascript:')
+
+
+def _valor(texto):
+    """'1.350,50' -> 1350.5"""
+    return float(texto.replace('.', '').replace(',', '.'))
+
+
+def _area(texto):
+    match = PADRAO_AREA.search(texto)
+    return _valor(match.group(1)) if match else None
+
+
+def url_generica(url):
+    """URL montada pelos dados quando o card não tem link (/venda/imovel/...): não existe no site"""
+    return '/venda/imovel/' in (url or '')
+
+
+def _url_anuncio(hrefs):
+    """Mesma ordem de tentativas da extração por seletores: /imovel/, URL de imóvel, primeiro link útil"""
+    for href in hrefs:
+        if '/imovel/' in href:
+            return f"{URL_BASE}{href}" if href.startswith('/') else href
+    for href in hrefs:
+        if len(href) > 20 and any(palavra in href.lower() for palavra in PALAVRAS_URL_IMOVEL):
+            return f"{URL_BASE}{href}" if href.startswith('/') else href
+    for href in hrefs:
+        if not any(palavra in href.lower() for palavra in PALAVRAS_URL_IGNORADAS):
+            if href.startswith('/') and len(href) > 10:
+                return f"{URL_BASE}{href}"
+            elif 'zap' in href and len(href) > 20:
+                return href
+    return None
+
+
+def _numero_inteiro(texto):
+    return int(PADRAO_NUMERO.search(texto).group(1))  # Sem número: erro, o card é descartado (como nos seletores)
+
+
+def _preco(texto):
+    match = PADRAO_PRECO.search(texto)
+    return (_valor(match.group(1)) or None) if match else None
+
+
+# Conversão do texto (já com strip) de cada campo; None = a estratégia não serviu, tentar a próxima
+CONVERSORES = {
+    'Descrição': lambda texto: texto.replace("Apartamento para comprar em", "").strip(),
+    'Endereco': lambda texto: texto,
+    'M2': _area,
+    'Quartos': _numero_inteiro,
+    'Banheiros': _numero_inteiro,
+    'Vagas': _numero_inteiro,
+    'Preco': _preco,
+    'Taxas': lambda texto: texto,
+}
+
+
+def varrer_card(card, parser, perfil):
+    """Uma passagem pelos descendentes do card, guardando o 1º elemento de cada estratégia de elemento do perfil
+
+    Retorna ({id da estratégia: elemento}, hrefs).
+    """
+    achados = {}
+    hrefs = []
+    por_tag = perfil.por_tag
+    for nome, atributos, elemento in parser.elementos(card):
+        if nome == 'a':
+            href = atributos.get('href')
+            if href:
+                hrefs.append(href)
+        indices = por_tag.get(nome)
+        if indices is None:
+            continue
+        for chave, por_valor in indices:
+            valor = atributos.get(chave) if chave is not None else None
+            if isinstance(valor, list):  # 'class' (no BeautifulSoup, AttributeValueList)
+                valor = tuple(valor)
+            estrategias = por_valor.get(valor)
+            if estrategias is None:
+                continue
+            for id_estrategia, condicoes in estrategias:
+                if id_estrategia in achados:
+                    continue
+                for atributo, esperado in condicoes:
+                    obtido = atributos.get(atributo)
+                    if (tuple(obtido) if isinstance(obtido, list) else obtido) != esperado:
+                        break
+                else:
+                    achados[id_estrategia] = elemento
+    return achados, hrefs
+
+
+def resolver_campo(estrategias, achados, card, parser, converter):
+    """Valor do campo pela primeira estratégia (na ordem corrente) que der certo: (valor, id) ou (None, None)
+
+    Estratégias de elemento usam o que a passagem achou; a varredura percorre o card de novo.
+    """
+    texto = parser.texto
+    for estrategia in estrategias:
+        if estrategia['tipo'] == 'elemento':
+            achado = achados.get(estrategia['id'])
+            if achado is not None:
+                valor = converter(texto(achado).strip())
+                if valor is not None:
+                    return valor, estrategia['id']
+            continue
+        tags, marcador, max_len = estrategia['tags'], estrategia['contem'], estrategia['max_len']
+        for nome, _, elemento in parser.elementos(card):
+            if nome not in tags:
+                continue
+            conteudo = texto(elemento).strip()
+            if marcador in conteudo and (max_len is None or len(conteudo) < max_len):
+                valor = converter(conteudo)
+                if valor is not None:
+                    return valor, estrategia['id']
+    return None, None
+
+
+def extrair_card(card, parser=None, perfil=None):
+    """Extrai os dados de um card (nó do backend `parser`, padrão BeautifulSoup) com as estratégias
+    do `perfil` (padrão: perfis_seletores.json); None se não houver preço ou em erro
+    """
+    parser = parser or obter_parser('html.parser')
+    perfil = perfil or obter_perfil()
+    dados = {}
+    try:
+        achados, hrefs = varrer_card(card, parser, perfil)
+        resolvidas = []
+        valores = {}
+        for campo, estrategias in perfil.ordem.items():
+            valor, id_estrategia = resolver_campo(estrategias, achados, card, parser, CONVERSORES.get(campo, str))
+            if id_estrategia is not None:
+                valores[campo] = valor
+                resolvidas.append(id_estrategia)
+        perfil.registrar(achados, resolvidas)
+
+        for campo in ('Descrição', 'Endereco', 'M2', 'Quartos', 'Banheiros', 'Vagas'):
+            if campo in valores:
+                dados[campo] = valores[campo]
+
+        if 'Preco' in valores:
+            dados['Preco'] = valores['Preco']
+        else:
+            print("\nNão foi possível encontrar o preço do imóvel")
+            return None
+
+        if 'Taxas' in valores:
+            taxas = valores['Taxas']
+            condominio = PADRAO_CONDOMINIO.search(taxas)
+            iptu = PADRAO_IPTU.search(taxas)
+            if condominio:
+                dados['Condominio'] = _valor(condominio.group(1))
+            if iptu:
+                dados['IPTU'] = _valor(iptu.group(1))
+
+        if 'M2' in dados and dados['M2'] > 0:
+            dados['R$/M2'] = dados['Preco'] / dados['M2']
+
+        url = _url_anuncio(hrefs)
+        if url:
+            dados['URL'] = url
+        else:
+            # Sem URL real: URL genérica baseada nos dados
+            endereco_limpo = dados.get('Endereco', '').replace(' ', '-').lower()
+            cidade_limpa = dados.get('Descrição', '').split(',')[0].replace(' ', '-').lower() if dados.get('Descrição') else 'local'
+            dados['URL'] = f"{URL_BASE}/venda/imovel/{cidade_limpa}/{endereco_limpo}/"
+
+    except Exception as e:
+        print(f"\nErro ao extrair dados do anúncio: {e}")
+        return None
+
+    return dados
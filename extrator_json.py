@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Extrator de anúncios a partir do estado JSON embutido na página (Next.js __NEXT_DATA__),
+sem percorrer o DOM dos cards
+"""
+
+import json
+import re
+
+URL_BASE = "https://www.zapimoveis.com.br"
+
+# O blob fica em um único <script>; uma regex evita montar a árvore HTML inteira
+PADRAO_NEXT_DATA = re.compile(
+    r'<script[^>]*id=["\']__NEXT_DATA__["\'][^>]*>(.*?)</script>',
+    re.DOTALL | re.IGNORECASE,
+)
+
+
+def extrair_estado_next(html):
+    """Retorna o JSON de __NEXT_DATA__ decodificado, ou None se ausente/inválido"""
+    match = PADRAO_NEXT_DATA.search(html)
+    if not match:
+        return None
+    try:
+        return json.loads(match.group(1))
+    except ValueError:
+        return None
+
+
+def encontrar_listagens(estado):
+    """Procura no estado a lista de resultados no formato {'listing': {...}, 'link': {...}}"""
+    pilha = [estado]
+    while pilha:
+        no = pilha.pop()
+        if isinstance(no, dict):
+            pilha.extend(no.values())
+        elif isinstance(no, list):
+            if no and all(isinstance(item, dict) and isinstance(item.get('listing'), dict) for item in no):
+                return no
+            pilha.extend(no)
+    return []
+
+
+def _primeiro(valor):
+    """A API usa listas para áreas/quartos/etc.; retorna o primeiro valor"""
+    if isinstance(valor, list):
+        return valor[0] if valor else None
+    return valor
+
+
+def _numero(valor):
+    """Converte valores numéricos (ou strings numéricas) para float"""
+    valor = _primeiro(valor)
+    if valor in (None, ''):
+        return None
+    try:
+        return float(valor)
+    except (TypeError, ValueError):
+        return None
+
+
+def mapear_listagem(item):
+    """Converte um resultado do estado JSON para o mesmo dicionário de extrair_dados_anuncio"""
+    listing = item.get('listing', {})
+    endereco = listing.get('address') or {}
+    dados = {}
+
+    bairro, cidade = endereco.get('neighborhood'), endereco.get('city')
+    if bairro or cidade:
+        dados['Descrição'] = ", ".join(parte for parte in (bairro, cidade) if parte)
+
+    rua = endereco.get('street')
+    if rua:
+        numero = endereco.get('streetNumber')
+        dados['Endereco'] = f"{rua}, {numero}" if numero else rua
+
+    area = _numero(listing.get('usableAreas')) or _numero(listing.get('totalAreas'))
+    if area:
+        dados['M2'] = area
+
+    for campo, chave in (('Quartos', 'bedrooms'), ('Banheiros', 'bathrooms'), ('Vagas', 'parkingSpaces')):
+        quantidade = _numero(listing.get(chave))
+        if quantidade:
+            dados[campo] = int(quantidade)
+
+    precos = listing.get('pricingInfos') or []
+    preco_venda = next((p for p in precos if p.get('businessType') == 'SALE'), precos[0] if precos else {})
+    preco = _numero(preco_venda.get('price'))
+    if not preco:
+        return None
+    dados['Preco'] = preco
+
+    condominio = _numero(preco_venda.get('monthlyCondoFee'))
+    if condominio:
+        dados['Condominio'] = condominio
+    iptu = _numero(preco_venda.get('yearlyIptu'))
+    if iptu:
+        dados['IPTU'] = iptu
+
+    if 'M2' in dados and dados['M2'] > 0:
+        dados['R$/M2'] = dados['Preco'] / dados['M2']
+
+    href = (item.get('link') or {}).get('href')
+    if href:
+        dados['URL'] = f"{URL_BASE}{href}" if href.startswith('/') else href
+
+    # Campos que o DOM não expõe
+    if listing.get('id'):
+        dados['ID'] = str(listing['id'])
+    ponto = endereco.get('point') or {}
+    if ponto.get('lat') is not None and ponto.get('lon') is not None:
+        dados['Latitude'] = float(ponto['lat'])
+        dados['Longitude'] = float(ponto['lon'])
+
+    return dados
+
+
+def extrair_anuncios_api(payload):
+    """Extrai os anúncios de um JSON já decodificado (estado da página ou resposta da API)"""
+    anuncios = []
+    for item in encontrar_listagens(payload):
+        dados = mapear_listagem(item)
+        if dados:
+            anuncios.append(dados)
+    return anuncios
+
+
+def extrair_anuncios_json(html):
+    """Extrai todos os anúncios do estado JSON da página; lista vazia se não houver estado"""
+    estado = extrair_estado_next(html)
+    if estado is None:
+        return []
+    return extrair_anuncios_api(estado)
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Gera o corpus offline do benchmark (fixtures/corpus): páginas de resultados e cards avulsos
+anonimizados, montados a partir de registros-verdade. O valor esperado de cada card vem do
+registro que o gerou (não de um extrator), então a precisão medida é contra a verdade.
+
+Os arquivos gerados são versionados; só rode de novo para mudar o corpus de propósito
+(e revise o diff do manifesto). Páginas reais entram pelo anonimizar_html.py.
+
+Uso: python gerar_corpus.py [diretorio]
+"""
+
+import json
+import os
+import random
+import sys
+import unicodedata
+
+URL_BASE = "https://www.zapimoveis.com.br"
+DIRETORIO_PADRAO = os.path.join("fixtures", "corpus")
+SEMENTE = 2025
+
+CIDADES = {
+    'São Paulo': ('sp', ['Pinheiros', 'Moema', 'Tatuapé', 'Santana', 'Vila Mariana', 'Perdizes', 'Butantã', 'Mooca']),
+    'Rio de Janeiro': ('rj', ['Copacabana', 'Tijuca', 'Botafogo', 'Méier', 'Flamengo', 'Barra da Tijuca']),
+    'Belo Horizonte': ('mg', ['Savassi', 'Funcionários', 'Buritis', 'Pampulha', 'Lourdes']),
+}
+RUAS = ['Rua Fictícia', 'Avenida Modelo', 'Alameda Teste', 'Rua Anônima', 'Travessa Exemplo', 'Praça Genérica']
+
+CLASSE_PRECO_DESTAQUE = "text-2-25 text-feedback-success-110 font-semibold"
+CLASSE_PRECO = "text-2-25 text-neutral-120 font-semibold"
+CLASSE_TAXAS = "text-1-75 text-neutral-110"
+CLASSE_CARACTERISTICA = "flex row items-center gap-0-5"
+
+# Layouts de card: o atual e mudanças que o site já fez (ou pode fazer) no markup
+LAYOUTS = {
+    'atual': {},
+    'classes_novas': {'classe_preco': "text-3 font-bold text-brand", 'area_sem_data_cy': True},
+    'preco_em_span': {'preco_em_span': True},
+}
+
+
+def _slug(texto):
+    sem_acento = unicodedata.normalize('NFKD', texto).encode('ascii', 'ignore').decode()
+    return '-'.join(sem_acento.lower().replace(',', ' ').split())
+
+
+def _moeda(valor):
+    """215000 -> '215.000'; 1350.5 -> '1.350,50'"""
+    inteiro = f"{int(valor):,}".replace(',', '.')
+    centavos = round((valor - int(valor)) * 100)
+    return f"{inteiro},{centavos:02d}" if centavos else inteiro
+
+
+def _area_texto(m2):
+    return f"{m2:g}".replace('.', ',') + " m²"
+
+
+def sortear_registro(rng, cidade, indice, id_base):
+    """Registro-verdade de um anúncio (com alguns casos de borda sorteados)"""
+    uf, bairros = CIDADES[cidade]
+    bairro = rng.choice(bairros)
+    m2 = rng.choice([38, 45, 52, 64, 72, 80, 95, 110, 140, 210])
+    if rng.random() < 0.15:
+        m2 += 0.5
+    quartos = rng.randint(1, 4)
+    preco = rng.randrange(180, 2600) * 1000
+    registro = {
+        'id': str(id_base + indice * 137),
+        'tipo': 'Casa' if rng.random() < 0.1 else 'Apartamento',
+        'bairro': bairro,
+        'cidade': cidade,
+        'uf': uf,
+        'endereco': f"{rng.choice(RUAS)}, {rng.randint(10, 2400)}",
+        'm2': m2,
+        'quartos': quartos,
+        'banheiros': rng.randint(1, quartos + 1),
+        'vagas': rng.choice([0, 1, 1, 2, 3]),
+        'preco': preco,
+        'condominio': rng.choice([None, 350, 570, 890, 1350, 2100.5]),
+        'iptu': rng.choice([None, 70, 120, 390, 845]),
+        'destaque': rng.random() < 0.5,
+        'link': 'relativo' if rng.random() < 0.85 else 'absoluto',
+    }
+    if rng.random() < 0.05:
+        registro['preco'] = None  # "Sob consulta": o card não vira anúncio
+    return registro
+
+
+def url_do_registro(registro):
+    partes = [f"venda-{registro['tipo'].lower()}"]
+    if registro['quartos'] is not None:
+        partes.append(f"{registro['quartos']}-quartos")
+    partes += [_slug(registro['bairro']), _slug(registro['cidade']), registro['uf']]
+    if registro['m2'] is not None:
+        partes.append(f"{int(registro['m2'])}m2")
+    return f"/imovel/{'-'.join(partes)}-id-{registro['id']}/"
+
+
+def html_do_card(registro, layout='atual'):
+    """Markup do card (mesma estrutura da fixtures/pagina_resultados.html) no layout pedido"""
+    opcoes = LAYOUTS[layout]
+    data_cy_area = '' if opcoes.get('area_sem_data_cy') else ' data-cy="rp-cardProperty-propertyArea-txt"'
+    linhas = [
+        '  <div class="flex flex-col grow min-w-0 content-stretch border-l-2">',
+        f'    <h2 class="l-text" data-cy="rp-cardProperty-location-txt"><span class="block">'
+        f'{registro["tipo"]} para comprar em</span>{registro["bairro"]}, {registro["cidade"]}</h2>',
+        f'    <p class="text-1-75" data-cy="rp-cardProperty-street-txt">{registro["endereco"]}</p>',
+        '    <ul class="flex gap-1">',
+    ]
+    if registro['m2'] is not None:
+        linhas.append(f'      <li class="{CLASSE_CARACTERISTICA}"{data_cy_area}><svg></svg>{_area_texto(registro["m2"])}</li>')
+    quartos = registro['quartos'] if registro['quartos'] is not None else '-'
+    linhas.append(f'      <li class="{CLASSE_CARACTERISTICA}" data-cy="rp-cardProperty-bedroomQuantity-txt"><svg></svg>{quartos}</li>')
+    linhas.append(f'      <li class="{CLASSE_CARACTERISTICA}" data-cy="rp-cardProperty-bathroomQuantity-txt"><svg></svg>{registro["banheiros"]}</li>')
+    if registro['vagas']:
+        linhas.append(f'      <li class="{CLASSE_CARACTERISTICA}" data-cy="rp-cardProperty-parkingSpacesQuantity-txt"><svg></svg>{registro["vagas"]}</li>')
+    linhas.append('    </ul>')
+    linhas.append('    <div class="flex flex-col">')
+    if registro['preco'] is None:
+        linhas.append('      <p class="text-1-75">Sob consulta</p>')
+    else:
+        preco = f"R$ {_moeda(registro['preco'])}"
+        if opcoes.get('preco_em_span'):
+            linhas.append(f'      <span>{preco}</span>')
+        else:
+            classe = opcoes.get('classe_preco') or (CLASSE_PRECO_DESTAQUE if registro['destaque'] else CLASSE_PRECO)
+            linhas.append(f'      <p class="{classe}">{preco}</p>')
+    taxas = []
+    if registro['condominio'] is not None:
+        taxas.append(f"Cond. R$ {_moeda(registro['condominio'])}")
+    if registro['iptu'] is not None:
+        taxas.append(f"IPTU R$ {_moeda(registro['iptu'])}")
+    if taxas:
+        linhas.append(f'      <p class="{CLASSE_TAXAS}">{" • ".join(taxas)}</p>')
+    linhas.append('    </div>')
+    if registro.get('whatsapp_primeiro'):
+        linhas.append('    <a href="https://wa.me/5500000000000" class="hidden">WhatsApp</a>')
+    if registro['link'] == 'relativo':
+        linhas.append(f'    <a href="{url_do_registro(registro)}" class="block">Ver detalhes</a>')
+    elif registro['link'] == 'absoluto':
+        linhas.append(f'    <a href="{URL_BASE}{url_do_registro(registro)}" class="block">Ver detalhes</a>')
+    if not registro.get('whatsapp_primeiro'):
+        linhas.append('    <a href="https://wa.me/5500000000000" class="hidden">WhatsApp</a>')
+    linhas.append('  </div>')
+    return '\n'.join(linhas)
+
+
+def esperado_do_registro(registro):
+    """Linha que extrair_dados_anuncio deveria produzir para o card (None: card sem preço)"""
+    if registro['preco'] is None:
+        return None
+    esperado = {'Descrição': f"{registro['bairro']}, {registro['cidade']}", 'Endereco': registro['endereco']}
+    if registro['m2'] is not None:
+        esperado['M2'] = float(registro['m2'])
+    if registro['quartos'] is not None:
+        esperado['Quartos'] = registro['quartos']
+    esperado['Banheiros'] = registro['banheiros']
+    if registro['vagas']:
+        esperado['Vagas'] = registro['vagas']
+    esperado['Preco'] = float(registro['preco'])
+    if registro['condominio'] is not None:
+        esperado['Condominio'] = float(registro['condominio'])
+    if registro['iptu'] is not None:
+        esperado['IPTU'] = float(registro['iptu'])
+    if 'M2' in esperado:
+        esperado['R$/M2'] = esperado['Preco'] / esperado['M2']
+    if registro['link'] is None:
+        # Sem link: URL genérica montada com bairro e endereço (comportamento documentado do scraper)
+        esperado['URL'] = (f"{URL_BASE}/venda/imovel/{registro['bairro'].replace(' ', '-').lower()}/"
+                           f"{registro['endereco'].replace(' ', '-').lower()}/")
+    else:
+        esperado['URL'] = f"{URL_BASE}{url_do_registro(registro)}"
+    return esperado
+
+
+def html_da_pagina(registros, layout, titulo):
+    itens = [f'<li class="mb-4" data-cy="rp-property-cd">\n{html_do_card(r, layout)}\n</li>' for r in registros]
+    return "\n".join([
+        '<!DOCTYPE html>',
+        '<html lang="pt-BR">',
+        '<head>',
+        '<meta charset="utf-8">',
+        f'<title>{titulo} - Zap Imóveis (corpus anonimizado)</title>',
+        '</head>',
+        '<body>',
+        '<header><nav><a href="/">Zap Imóveis</a><a href="https://www.facebook.com/zapimoveis">Facebook</a></nav></header>',
+        '<main>',
+        '<section class="listing-wrapper">',
+        '<ul class="flex flex-col" data-cy="rp-resultsList">',
+        *itens,
+        '</ul>',
+        '<nav class="pagination" aria-label="paginação">',
+        '  <button data-testid="previous-page" class="disabled" disabled>Anterior</button>',
+        '  <button data-testid="next-page" aria-label="próxima página" class="">Próxima</button>',
+        '</nav>',
+        '</section>',
+        '</main>',
+        '</body>',
+        '</html>',
+        '',
+    ])
+
+
+# (arquivo, cidade, layout, quantidade de cards, descrição)
+PAGINAS = [
+    ('pagina_sp_atual.html', 'São Paulo', 'atual', 48, "Layout atual, São Paulo (destaque/neutro, sem vagas, taxas parciais, casas)"),
+    ('pagina_rj_classes_novas.html', 'Rio de Janeiro', 'classes_novas', 36, "Classes de preço novas e área sem data-cy (caminhos de fallback)"),
+    ('pagina_bh_preco_span.html', 'Belo Horizonte', 'preco_em_span', 24, "Preço em <span> sem classe"),
+]
+
+
+def cards_avulsos(rng):
+    """Casos de borda isolados, um card por arquivo (como o outerHTML do modo por card)"""
+    def base(indice, **alteracoes):
+        registro = sortear_registro(rng, 'São Paulo', indice, 9100000000)
+        registro.update({'tipo': 'Apartamento', 'preco': 640000, 'link': 'relativo'})
+        registro.update(alteracoes)
+        return registro
+
+    return [
+        ('card_sob_consulta.html', base(1, preco=None), 'atual', "Sem preço: descartado"),
+        ('card_area_decimal.html', base(2, m2=87.5), 'atual', "Área com vírgula decimal"),
+        ('card_so_iptu.html', base(3, condominio=None, iptu=845), 'atual', "Só IPTU nas taxas"),
+        ('card_so_condominio.html', base(4, condominio=2100.5, iptu=None), 'atual', "Só condomínio, com centavos"),
+        ('card_sem_link.html', base(5, link=None), 'atual', "Sem link: URL genérica"),
+        ('card_whatsapp_antes.html', base(6, whatsapp_primeiro=True), 'atual', "Link externo antes do link do imóvel"),
+        ('card_milhoes.html', base(7, preco=12450000, m2=480), 'atual', "Preço na casa dos milhões"),
+        ('card_sem_area.html', base(8, m2=None), 'atual', "Sem área: sem M2 nem R$/M2"),
+        ('card_quartos_sem_numero.html', base(9, quartos=None), 'atual', "Quartos '-' (terreno/sala): demais campos valem"),
+        ('card_casa.html', base(10, tipo='Casa'), 'atual', "Casa: prefixo da descrição diferente de apartamento"),
+        ('card_classes_novas.html', base(11), 'classes_novas', "Classes de preço novas e área sem data-cy"),
+        ('card_preco_span.html', base(12), 'preco_em_span', "Preço em <span>"),
+    ]
+
+
+def gerar(diretorio=DIRETORIO_PADRAO):
+    rng = random.Random(SEMENTE)
+    os.makedirs(os.path.join(diretorio, 'cards'), exist_ok=True)
+    entradas = []
+    for indice_pagina, (arquivo, cidade, layout, quantidade, descricao) in enumerate(PAGINAS):
+        registros = [sortear_registro(rng, cidade, i, 2800000000 + indice_pagina * 10000000) for i in range(quantidade)]
+        with open(os.path.join(diretorio, arquivo), 'w', encoding='utf-8') as f:
+            f.write(html_da_pagina(registros, layout, f"Imóveis à venda em {cidade}"))
+        entradas.append({'arquivo': arquivo, 'tipo': 'pagina', 'layout': layout, 'descricao': descricao,
+                         'esperado': [esperado_do_registro(r) for r in registros]})
+    for arquivo, registro, layout, descricao in cards_avulsos(rng):
+        caminho = os.path.join('cards', arquivo)
+        with open(os.path.join(diretorio, caminho), 'w', encoding='utf-8') as f:
+            f.write(html_do_card(registro, layout) + '\n')
+        entradas.append({'arquivo': caminho, 'tipo': 'card', 'layout': layout, 'descricao': descricao,
+                         'esperado': [esperado_do_registro(registro)]})
+
+    manifesto = {'versao': 1, 'gerador': 'gerar_corpus.py', 'semente': SEMENTE, 'arquivos': entradas}
+    with open(os.path.join(diretorio, 'manifesto.json'), 'w', encoding='utf-8') as f:
+        json.dump(manifesto, f, ensure_ascii=False, indent=1)
+        f.write('\n')
+    total = sum(len(e['esperado']) for e in entradas)
+    print(f"✅ Corpus gerado em {diretorio}: {len(entradas)} arquivos, {total} cards")
+    return manifesto
+
+
+if __name__ == "__main__":
+    gerar(sys.argv[1] if len(sys.argv) > 1 else DIRETORIO_PADRAO)
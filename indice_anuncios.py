@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+IndiceAnuncios - Índice persistente (SQLite) dos anúncios já vistos: último preço e datas,
+para o crawl incremental gravar só anúncios novos ou com preço alterado
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from urllib.parse import urlparse, parse_qs, urlencode, urlunparse
+
+CAMINHO_INDICE = os.path.join("arquivos", "indice_anuncios.db")
+
+# Ordenação "mais recentes" da busca: anúncios novos/atualizados vêm nas primeiras páginas
+PARAMETRO_ORDEM = 'ordem'
+ORDEM_MAIS_RECENTES = 'Mais recente'
+
+NOVO = 'novo'
+PRECO_ALTERADO = 'preco_alterado'
+CONHECIDO = 'conhecido'
+
+
+def url_mais_recentes(url):
+    """URL da busca ordenada pelos mais recentes (mantém uma ordenação já escolhida na URL)"""
+    partes = urlparse(url)
+    parametros = parse_qs(partes.query, keep_blank_values=True)
+    parametros.setdefault(PARAMETRO_ORDEM, [ORDEM_MAIS_RECENTES])
+    return urlunparse(partes._replace(query=urlencode(parametros, doseq=True)))
+
+
+class IndiceAnuncios:
+    def __init__(self, caminho=CAMINHO_INDICE):
+        pasta = os.path.dirname(caminho)
+        if pasta and not os.path.exists(pasta):
+            os.makedirs(pasta)
+        self.caminho = caminho
+        self._lock = threading.Lock()  # Workers paralelos consolidam pela mesma conexão
+        self.conexao = sqlite3.connect(caminho, check_same_thread=False)
+        self.conexao.execute("PRAGMA journal_mode=WAL")
+        self.conexao.execute("PRAGMA synchronous=NORMAL")
+        self.conexao.execute("""
+            CREATE TABLE IF NOT EXISTS anuncios (
+                chave TEXT PRIMARY KEY,
+                preco REAL,
+                preco_anterior REAL,
+                url TEXT,
+                primeira_vez REAL NOT NULL,
+                ultima_vez REAL NOT NULL,
+                preco_alterado_em REAL
+            )
+        """)
+        self.conexao.commit()
+
+    def registrar_pagina(self, itens):
+        """Classifica e registra, em uma transação, os (chave, dados) de uma página
+
+        Retorna uma lista paralela de (situacao, preco_anterior), com situacao em
+        'novo', 'preco_alterado' ou 'conhecido'. Todos têm ultima_vez atualizada.
+        """
+        agora = time.time()
+        situacoes = []
+        with self._lock, self.conexao:
+            chaves = [chave for chave, _ in itens]
+            conhecidos = {}
+            for inicio in range(0, len(chaves), 500):  # Limite de parâmetros do SQLite
+                lote = chaves[inicio:inicio + 500]
+                marcadores = ",".join("?" * len(lote))
+                conhecidos.update(self.conexao.execute(
+                    f"SELECT chave, preco FROM anuncios WHERE chave IN ({marcadores})", lote))
+
+            for chave, dados in itens:
+                preco = dados.get('Preco')
+                if chave not in conhecidos:
+                    situacoes.append((NOVO, None))
+                    self.conexao.execute(
+                        """INSERT INTO anuncios (chave, preco, url, primeira_vez, ultima_vez)
+                           VALUES (?, ?, ?, ?, ?)""",
+                        (chave, preco, dados.get('URL'), agora, agora),
+                    )
+                elif preco is not None and conhecidos[chave] != preco:
+                    situacoes.append((PRECO_ALTERADO, conhecidos[chave]))
+                    self.conexao.execute(
+                        """UPDATE anuncios SET preco_anterior = preco, preco = ?, ultima_vez = ?,
+                                               preco_alterado_em = ? WHERE chave = ?""",
+                        (preco, agora, agora, chave),
+                    )
+                else:
+                    situacoes.append((CONHECIDO, None))
+                    self.conexao.execute("UPDATE anuncios SET ultima_vez = ? WHERE chave = ?", (agora, chave))
+                conhecidos[chave] = preco  # Mesma chave repetida na página não conta duas vezes
+        return situacoes
+
+    def obter(self, chave):
+        """Dados do anúncio no índice ou None"""
+        with self._lock:
+            linha = self.conexao.execute(
+                """SELECT chave, preco, preco_anterior, url, primeira_vez, ultima_vez, preco_alterado_em
+                   FROM anuncios WHERE chave = ?""",
+                (chave,),
+            ).fetchone()
+        if linha is None:
+            return None
+        campos = ('chave', 'preco', 'preco_anterior', 'url', 'primeira_vez', 'ultima_vez', 'preco_alterado_em')
+        return dict(zip(campos, linha))
+
+    def __len__(self):
+        with self._lock:
+            return self.conexao.execute("SELECT COUNT(*) FROM anuncios").fetchone()[0]
+
+    def nao_vistos_desde(self, instante):
+        """Chaves não vistas desde o instante (anúncios provavelmente removidos)"""
+        with self._lock:
+            return [c for (c,) in self.conexao.execute(
+                "SELECT chave FROM anuncios WHERE ultima_vez < ?", (instante,))]
+
+    def fechar(self):
+        self.conexao.close()
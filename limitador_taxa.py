@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+LimitadorTaxa - Token bucket por host para as buscas asyncio (páginas de resultados e de detalhe)
+"""
+
+import asyncio
+import time
+from urllib.parse import urlparse
+
+
+class LimitadorTaxa:
+    """Token bucket por host: até `rajada` requisições imediatas, depois `taxa_por_segundo`"""
+
+    def __init__(self, taxa_por_segundo=2.0, rajada=4):
+        self.taxa_por_segundo = taxa_por_segundo
+        self.rajada = rajada
+        self._baldes = {}  # host -> (tokens, instante da última atualização)
+
+    async def aguardar(self, url):
+        """Espera até haver um token disponível para o host da URL"""
+        host = urlparse(url).netloc
+        while True:
+            # Sem await entre leitura e escrita do balde: não precisa de lock no event loop
+            agora = time.monotonic()
+            tokens, ultimo = self._baldes.get(host, (self.rajada, agora))
+            tokens = min(self.rajada, tokens + (agora - ultimo) * self.taxa_por_segundo)
+            if tokens >= 1:
+                self._baldes[host] = (tokens - 1, agora)
+                return
+            self._baldes[host] = (tokens, agora)
+            await asyncio.sleep((1 - tokens) / self.taxa_por_segundo)
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Backends de parse HTML para a extração de cards: html.parser (BeautifulSoup), lxml e
+selectolax (lexbor), atrás do mesmo adaptador mínimo usado pelo extrator compilado:
+
+    cards(html, seletor)  -> nós dos cards da página
+    raiz(html)            -> nó raiz de um fragmento (outerHTML de um card)
+    elementos(no)         -> (nome, atributos, nó) de cada elemento descendente, em ordem
+    texto(no)             -> texto de todos os descendentes (como o .text do BeautifulSoup)
+
+Nos atributos, 'class' vem sempre como lista, como no BeautifulSoup.
+"""
+
+from bs4 import BeautifulSoup
+
+try:
+    import lxml.html
+    LXML_DISPONIVEL = True
+except ImportError:
+    LXML_DISPONIVEL = False
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+    SELECTOLAX_DISPONIVEL = True
+except ImportError:
+    SELECTOLAX_DISPONIVEL = False
+
+
+class ParserBeautifulSoup:
+    """Referência: BeautifulSoup com o html.parser da biblioteca padrão (puro Python)"""
+
+    nome = 'html.parser'
+
+    def cards(self, html, seletor):
+        return BeautifulSoup(html, 'html.parser').select(seletor)
+
+    def raiz(self, html):
+        return BeautifulSoup(html, 'html.parser')
+
+    def elementos(self, no):
+        for elemento in no.descendants:
+            if elemento.name is not None:  # Pula textos e comentários
+                yield elemento.name, elemento.attrs, elemento
+
+    def texto(self, no):
+        return no.text
+
+
+class ParserLxml:
+    """lxml.html (libxml2); cards localizados por XPath equivalente ao seletor de classes"""
+
+    nome = 'lxml'
+
+    def __init__(self):
+        self._xpaths = {}
+
+    def _xpath(self, seletor):
+        """'.a.b' -> XPath de elementos com as classes a e b"""
+        if seletor not in self._xpaths:
+            classes = [c for c in seletor.split('.') if c]
+            if not seletor.startswith('.') or not classes:
+                raise ValueError(f"Backend lxml só aceita seletores de classes (.a.b): {seletor}")
+            condicoes = " and ".join(f"contains(concat(' ', normalize-space(@class), ' '), ' {c} ')" for c in classes)
+            self._xpaths[seletor] = lxml.html.etree.XPath(f"//*[{condicoes}]")
+        return self._xpaths[seletor]
+
+    def cards(self, html, seletor):
+        return self._xpath(seletor)(lxml.html.document_fromstring(html))
+
+    def raiz(self, html):
+        return lxml.html.fragment_fromstring(html, create_parent='div')
+
+    def elementos(self, no):
+        for elemento in no.iterdescendants():
+            nome = elemento.tag
+            if not isinstance(nome, str):
+                continue  # Comentários e instruções de processamento
+            atributos = dict(elemento.attrib)
+            if 'class' in atributos:
+                atributos['class'] = atributos['class'].split()
+            yield nome, atributos, elemento
+
+    def texto(self, no):
+        return str(no.text_content())
+
+
+class ParserSelectolax:
+    """selectolax com o motor lexbor (C)"""
+
+    nome = 'selectolax'
+
+    def cards(self, html, seletor):
+        return LexborHTMLParser(html).css(seletor)
+
+    def raiz(self, html):
+        return LexborHTMLParser(html).body
+
+    def elementos(self, no):
+        percurso = no.traverse(include_text=False)
+        next(percurso, None)  # O primeiro é o próprio nó
+        for elemento in percurso:
+            nome = elemento.tag
+            if nome.startswith('-'):
+                continue  # -comment, -doctype
+            atributos = elemento.attributes
+            classes = atributos.get('class')
+            if classes is not None:
+                atributos['class'] = classes.split()
+            yield nome, atributos, elemento
+
+    def texto(self, no):
+        return no.text(deep=True, separator='', strip=False)
+
+
+PARSERS = {'html.parser': ParserBeautifulSoup}
+if LXML_DISPONIVEL:
+    PARSERS['lxml'] = ParserLxml
+if SELECTOLAX_DISPONIVEL:
+    PARSERS['selectolax'] = ParserSelectolax
+
+# 'auto': o mais rápido instalado
+ORDEM_PREFERENCIA = ('selectolax', 'lxml', 'html.parser')
+
+_instancias = {}
+
+
+def obter_parser(nome='auto'):
+    """Instância (compartilhada) do backend; 'auto' escolhe o mais rápido disponível"""
+    if nome == 'auto':
+        nome = next(n for n in ORDEM_PREFERENCIA if n in PARSERS)
+    if nome not in PARSERS:
+        raise ValueError(f"Parser HTML indisponível: {nome} (instalados: {', '.join(PARSERS)})")
+    if nome not in _instancias:
+        _instancias[nome] = PARSERS[nome]()
+    return _instancias[nome]
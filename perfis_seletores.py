@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+PerfilSeletores - Estratégias de extração de cada campo do card, declaradas em um arquivo
+versionado (perfis_seletores.json), com contadores de qual estratégia acertou, reordenação
+automática (a estratégia mais barata que está acertando roda primeiro) e alerta quando a
+taxa de acerto do caminho rápido de um campo despenca (layout do site mudou).
+
+Tipos de estratégia:
+    {"nome", "tag", "atributos"}            primeiro elemento da tag com esses atributos (custo 1)
+    {"nome", "tags", "contem", "max_len"}   varredura: primeiro elemento das tags cujo texto contém
+                                            o marcador e converte para um valor (custo 10; uma
+                                            passagem extra, só quando chega a vez dela)
+"""
+
+import json
+import os
+import threading
+
+CAMINHO_PERFIS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'perfis_seletores.json')
+VERSAO_PERFIS = 1
+CUSTO_PADRAO = {'elemento': 1, 'varredura': 10}
+
+
+def carregar_perfis(caminho=None):
+    """Lê e valida o arquivo de perfis; ValueError se a versão não for suportada"""
+    caminho = caminho or CAMINHO_PERFIS
+    with open(caminho, encoding='utf-8') as f:
+        config = json.load(f)
+    if config.get('versao') != VERSAO_PERFIS:
+        raise ValueError(f"Versão de perfis não suportada em {caminho}: {config.get('versao')} (esperada {VERSAO_PERFIS})")
+    for nome, perfil in config.get('perfis', {}).items():
+        for campo, estrategias in perfil.get('campos', {}).items():
+            for estrategia in estrategias:
+                if 'tag' not in estrategia and not ('tags' in estrategia and 'contem' in estrategia):
+                    raise ValueError(f"Estratégia inválida em {nome}.{campo}: {estrategia}")
+    return config
+
+
+class PerfilSeletores:
+    def __init__(self, nome, campos, janela=200, limiar_queda=0.5, arquivo=None):
+        """
+        Args:
+            nome (str): nome do perfil
+            campos (dict): campo -> lista de estratégias, na ordem declarada
+            janela (int): cards por janela de medição (reordenação e alerta ao fim de cada uma)
+            limiar_queda (float): alerta quando a taxa do caminho rápido cai abaixo dessa fração da melhor já vista
+            arquivo (str): arquivo de origem (para os processos do pipeline recarregarem o mesmo perfil)
+        """
+        self.nome = nome
+        self.arquivo = arquivo
+        self.janela = max(1, int(janela))
+        self.limiar_queda = limiar_queda
+        self.estrategias = {}  # campo -> [estratégia] na ordem declarada
+        elementos_por_tag = {}  # tag -> {atributo: {valor: [(id, outras condições)]}}
+        for campo, declaradas in campos.items():
+            lista = []
+            for indice, declarada in enumerate(declaradas):
+                tipo = 'elemento' if 'tag' in declarada else 'varredura'
+                estrategia = {
+                    'id': f"{campo}:{declarada['nome']}",
+                    'nome': declarada['nome'],
+                    'campo': campo,
+                    'tipo': tipo,
+                    'indice': indice,
+                    'custo': declarada.get('custo', CUSTO_PADRAO[tipo]),
+                    'contem': declarada.get('contem'),
+                    'max_len': declarada.get('max_len'),
+                    'tags': frozenset(declarada.get('tags', ())),
+                }
+                if tipo == 'elemento':
+                    self._indexar_elemento(elementos_por_tag, estrategia['id'], declarada['tag'],
+                                           declarada.get('atributos', {}))
+                lista.append(estrategia)
+            self.estrategias[campo] = lista
+        # Índice da passagem pela árvore: tag -> ((atributo, {valor: [(id, outras condições)]}), ...)
+        self.por_tag = {tag: tuple(por_atributo.items()) for tag, por_atributo in elementos_por_tag.items()}
+        self.ordem = {campo: list(lista) for campo, lista in self.estrategias.items()}  # Ordem corrente
+        self.rapidas = {campo: {e['id'] for e in lista if e['custo'] == min(x['custo'] for x in lista)}
+                        for campo, lista in self.estrategias.items()}
+        self._lock = threading.Lock()
+        self.cards = 0
+        self._acertos = {e['id']: 0 for lista in self.estrategias.values() for e in lista}
+        self._acertos_janela = dict(self._acertos)
+        self._rapidas_janela = dict.fromkeys(self.estrategias, 0)
+        self._cards_janela = 0
+        self.melhor_taxa = dict.fromkeys(self.estrategias, 0.0)  # Melhor taxa do caminho rápido por janela
+        self.em_queda = set()  # Campos com alerta ativo (rearma quando a taxa se recupera)
+        self.alertas = []  # {'campo', 'taxa', 'referencia', 'card'}
+
+    @staticmethod
+    def _indexar_elemento(elementos_por_tag, id_estrategia, tag, atributos):
+        """Indexa a estratégia pelo atributo mais seletivo (data-cy antes de class); o resto vira condição"""
+        condicoes = [(nome, tuple(valor) if isinstance(valor, list) else valor) for nome, valor in atributos.items()]
+        condicoes.sort(key=lambda condicao: condicao[0] == 'class')
+        por_atributo = elementos_por_tag.setdefault(tag, {})
+        if not condicoes:
+            por_atributo.setdefault(None, {}).setdefault(None, []).append((id_estrategia, ()))
+            return
+        (chave, valor), resto = condicoes[0], tuple(condicoes[1:])
+        por_atributo.setdefault(chave, {}).setdefault(valor, []).append((id_estrategia, resto))
+
+    @classmethod
+    def carregar(cls, caminho=None, nome=None, **kwargs):
+        """Perfil `nome` (padrão: perfil_padrao do arquivo) de perfis_seletores.json"""
+        config = carregar_perfis(caminho)
+        nome = nome or config['perfil_padrao']
+        if nome not in config['perfis']:
+            raise ValueError(f"Perfil de seletores inexistente: {nome} (disponíveis: {', '.join(config['perfis'])})")
+        return cls(nome, config['perfis'][nome]['campos'], arquivo=caminho or CAMINHO_PERFIS, **kwargs)
+
+    def registrar(self, presentes, resolvidas):
+        """Contabiliza um card: `presentes` são os ids das estratégias de elemento que acharam algo
+        na passagem (de graça); `resolvidas` são os ids das estratégias que deram o valor de cada campo.
+        """
+        with self._lock:
+            self.cards += 1
+            self._cards_janela += 1
+            acertadas = set(presentes)
+            acertadas.update(resolvidas)
+            acertos, acertos_janela = self._acertos, self._acertos_janela
+            for id_estrategia in acertadas:
+                acertos[id_estrategia] += 1
+                acertos_janela[id_estrategia] += 1
+            for campo, rapidas in self.rapidas.items():
+                if not rapidas.isdisjoint(acertadas):
+                    self._rapidas_janela[campo] += 1
+            if self._cards_janela >= self.janela:
+                self._fechar_janela()
+
+    def _fechar_janela(self):
+        """Fim da janela: alerta de queda do caminho rápido e reordenação pelas estratégias que acertaram"""
+        for campo, rapidas in self._rapidas_janela.items():
+            taxa = rapidas / self._cards_janela
+            referencia = self.melhor_taxa[campo]
+            if referencia > 0 and taxa < referencia * self.limiar_queda:
+                if campo not in self.em_queda:
+                    self.em_queda.add(campo)
+                    self.alertas.append({'campo': campo, 'taxa': taxa, 'referencia': referencia, 'card': self.cards})
+                    print(f"\n⚠️ Seletor rápido de '{campo}' (perfil {self.nome}) acertou {taxa:.0%} dos últimos "
+                          f"{self._cards_janela} cards (antes {referencia:.0%}): o layout do site mudou? "
+                          f"Revise {os.path.basename(self.arquivo or CAMINHO_PERFIS)}")
+            elif campo in self.em_queda:
+                self.em_queda.discard(campo)
+                print(f"\n✅ Seletor rápido de '{campo}' voltou a acertar ({taxa:.0%})")
+            self.melhor_taxa[campo] = max(referencia, taxa)
+
+        for campo, lista in self.estrategias.items():
+            janela = self._acertos_janela
+            self.ordem[campo] = sorted(
+                lista,
+                key=lambda e: (0, e['custo'], -janela[e['id']], e['indice']) if janela[e['id']] else (1, e['indice']),
+            )
+        self._acertos_janela = dict.fromkeys(self._acertos_janela, 0)
+        self._rapidas_janela = dict.fromkeys(self._rapidas_janela, 0)
+        self._cards_janela = 0
+
+    def ordem_ids(self):
+        """Ordem corrente das estratégias por campo (ids), para os processos de parse seguirem a mesma"""
+        with self._lock:
+            return {campo: [e['id'] for e in lista] for campo, lista in self.ordem.items()}
+
+    def aplicar_ordem(self, ordem_ids):
+        """Adota a ordem calculada em outro processo (ver ordem_ids)"""
+        por_id = {e['id']: e for lista in self.estrategias.values() for e in lista}
+        with self._lock:
+            self.ordem = {campo: [por_id[i] for i in ids] for campo, ids in ordem_ids.items()}
+
+    def relatorio(self):
+        """Por campo: ordem corrente das estratégias, acertos de cada uma e se o caminho rápido está em queda"""
+        with self._lock:
+            return {
+                campo: {
+                    'ordem': [e['nome'] for e in self.ordem[campo]],
+                    'acertos': {e['nome']: self._acertos[e['id']] for e in self.estrategias[campo]},
+                    'em_queda': campo in self.em_queda,
+                }
+                for campo in self.estrategias
+            }
+
+    def imprimir_relatorio(self):
+        if not self.cards:
+            return
+        print(f"\n🎯 ESTRATÉGIAS DE SELETORES (perfil {self.nome}, {self.cards} cards)")
+        for campo, info in self.relatorio().items():
+            acertos = " | ".join(f"{nome}: {info['acertos'][nome]}" for nome in info['ordem'])
+            print(f"  {'⚠️' if info['em_queda'] else '✅'} {campo}: {acertos}")
+
+
+_perfis = {}
+_lock_perfis = threading.Lock()
+
+
+def obter_perfil(caminho=None, nome=None):
+    """Perfil compartilhado (carregado uma vez por processo) usado quando o chamador não passa o seu"""
+    chave = (caminho or CAMINHO_PERFIS, nome)
+    with _lock_perfis:
+        if chave not in _perfis:
+            _perfis[chave] = PerfilSeletores.carregar(caminho, nome)
+        return _perfis[chave]
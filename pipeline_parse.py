@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+PipelineParse - Sobrepõe a navegação ao parse: a thread do navegador entrega o HTML bruto
+de cada página, um ProcessPoolExecutor o transforma em anúncios (em vários núcleos) e uma
+thread coletora consolida os resultados na ordem de entrega. A fila de páginas entre a
+navegação e o coletor é limitada: com os processos atrasados, a navegação espera.
+"""
+
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from extrator_json import extrair_anuncios_json
+from extrator_cards import extrair_card
+from parsers_html import obter_parser
+from perfis_seletores import obter_perfil
+
+
+class AcertosPagina:
+    """Perfil visto pelo extrator num processo de parse: estratégias na ordem do processo principal,
+    e os acertos de cada card guardados para o coletor somar no perfil do processo principal
+    """
+
+    def __init__(self, perfil):
+        self._perfil = perfil
+        self.acertos = []  # (presentes, resolvidas) de cada card, na ordem da página
+
+    def __getattr__(self, nome):
+        return getattr(self._perfil, nome)
+
+    def registrar(self, presentes, resolvidas):
+        self.acertos.append((tuple(presentes), tuple(resolvidas)))
+
+
+def analisar_html(html, seletor, parser_html='auto', usar_estado_json=True, arquivo_perfis=None,
+                  perfil_seletores=None, ordem=None):
+    """Executada nos processos de parse: estado JSON ou, sem ele, cards do DOM (extrator compilado)
+
+    Retorna (anuncios, acertos): os contadores do perfil de seletores não ficam no processo de
+    parse, voltam por página para o processo principal (ordem = ordem corrente de lá).
+    """
+    if usar_estado_json:
+        try:
+            anuncios = extrair_anuncios_json(html)
+            if anuncios:
+                return anuncios, []
+        except Exception as e:
+            print(f"\nErro ao ler estado JSON da página, usando o DOM: {e}")
+    parser = obter_parser(parser_html)
+    perfil = obter_perfil(arquivo_perfis, perfil_seletores)
+    if ordem is not None:
+        perfil.aplicar_ordem(ordem)
+    pagina = AcertosPagina(perfil)
+    anuncios = []
+    for card in parser.cards(html, seletor):
+        dados = extrair_card(card, parser, pagina)
+        if dados:
+            anuncios.append(dados)
+    return anuncios, pagina.acertos
+
+
+class PipelineParse:
+    def __init__(self, consolidar, processos=None, tamanho_fila=None, perfil=None, **opcoes):
+        """
+        Args:
+            consolidar (callable): consolidar(pagina, anuncios, erro), chamado pelo coletor na ordem de entrega
+            processos (int): processos de parse (padrão: núcleos da máquina)
+            tamanho_fila (int): páginas aguardando o coletor antes de a navegação esperar (padrão: 2 por processo)
+            perfil (PerfilSeletores): perfil do processo principal; os processos seguem a ordem dele e o
+                coletor soma nele os acertos de cada página (relatório e alerta de queda)
+            **opcoes: argumentos de analisar_html (seletor, parser_html, usar_estado_json)
+        """
+        self.consolidar = consolidar
+        self.perfil = perfil
+        if perfil is not None:
+            opcoes.setdefault('arquivo_perfis', perfil.arquivo)
+            opcoes.setdefault('perfil_seletores', perfil.nome)
+        self.processos = max(1, int(processos or os.cpu_count() or 1))
+        self.tamanho_fila = max(1, int(tamanho_fila or 2 * self.processos))
+        self.opcoes = opcoes
+        self._fila = queue.Queue(maxsize=self.tamanho_fila)  # (pagina, futuro) em ordem de entrega
+        self._executor = None
+        self._coletor = None
+        self.paginas_enviadas = 0
+        self.espera_fila = 0.0  # Tempo (s) que a navegação passou bloqueada com a fila cheia
+
+    def iniciar(self):
+        self._executor = ProcessPoolExecutor(max_workers=self.processos)
+        self._coletor = threading.Thread(target=self._coletar, name='coletor-parse', daemon=True)
+        self._coletor.start()
+        return self
+
+    def enviar(self, pagina, html):
+        """Chamado pela navegação: agenda o parse e segue para a próxima página (espera se a fila estiver cheia)"""
+        ordem = self.perfil.ordem_ids() if self.perfil is not None else None
+        futuro = self._executor.submit(analisar_html, html, ordem=ordem, **self.opcoes)
+        inicio = time.perf_counter()
+        self._fila.put((pagina, futuro))
+        self.espera_fila += time.perf_counter() - inicio
+        self.paginas_enviadas += 1
+
+    def _coletar(self):
+        while True:
+            item = self._fila.get()
+            if item is None:
+                return
+            pagina, futuro = item
+            try:
+                (anuncios, acertos), erro = futuro.result(), None
+            except Exception as e:
+                anuncios, acertos, erro = [], [], e
+            if self.perfil is not None:
+                for presentes, resolvidas in acertos:
+                    self.perfil.registrar(presentes, resolvidas)
+            try:
+                self.consolidar(pagina, anuncios, erro)
+            except Exception as e:
+                print(f"\nErro ao consolidar a página {pagina}: {e}")
+
+    def encerrar(self):
+        """Espera o coletor consolidar tudo o que foi enviado e fecha os processos"""
+        if self._coletor is not None:
+            self._fila.put(None)
+            self._coletor.join()
+            self._coletor = None
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self):
+        return self.iniciar()
+
+    def __exit__(self, *exc):
+        self.encerrar()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+PlanejadorPaginas - Páginas de resultados como itens independentes: a URL da página N vem
+da URL da busca, as páginas podem ser buscadas em qualquer ordem, falhas voltam para a fila
+com espera exponencial e, esgotadas as tentativas, vão para a lista de páginas mortas
+"""
+
+import heapq
+import threading
+import time
+from urllib.parse import urlparse, parse_qs, urlencode, urlunparse
+
+
+def url_da_pagina(url, pagina):
+    """URL da página N da busca (parâmetro ?pagina=N; a página 1 fica sem o parâmetro)"""
+    partes = urlparse(url)
+    parametros = parse_qs(partes.query, keep_blank_values=True)
+    if pagina <= 1:
+        parametros.pop('pagina', None)
+    else:
+        parametros['pagina'] = [str(pagina)]
+    return urlunparse(partes._replace(query=urlencode(parametros, doseq=True)))
+
+
+class PlanejadorPaginas:
+    def __init__(self, url, paginas, max_tentativas=3, espera_base=2.0, espera_maxima=60.0):
+        """
+        Args:
+            url (str): URL da busca
+            paginas (iterable): números das páginas a buscar
+            max_tentativas (int): tentativas por página antes de ir para as páginas mortas
+            espera_base (float): espera (s) antes da 2ª tentativa; dobra a cada nova tentativa
+            espera_maxima (float): limite da espera entre tentativas
+        """
+        self.url = url
+        self.max_tentativas = max(1, int(max_tentativas))
+        self.espera_base = espera_base
+        self.espera_maxima = espera_maxima
+        self._condicao = threading.Condition()  # Workers paralelos disputam a mesma fila
+        self._fila = [(0.0, pagina, 1) for pagina in sorted(set(paginas))]  # (pronta_em, página, tentativa)
+        heapq.heapify(self._fila)
+        self.em_andamento = {}  # página -> tentativa
+        self.concluidas = set()
+        self.mortas = []  # {'pagina', 'url', 'tentativas', 'erro'}
+        self.ultima_pagina = None  # Fim dos resultados, quando conhecido
+
+    def espera(self, tentativa):
+        """Espera antes da tentativa N (a 1ª não espera)"""
+        if tentativa <= 1:
+            return 0.0
+        return min(self.espera_maxima, self.espera_base * 2 ** (tentativa - 2))
+
+    def proxima(self):
+        """Próxima página pronta {'pagina', 'url', 'tentativa'}, esperando o fim de uma espera
+
+        Retorna None quando não há mais páginas pendentes nem em andamento (que poderiam voltar).
+        """
+        with self._condicao:
+            while True:
+                if self._fila:
+                    pronta_em, pagina, tentativa = self._fila[0]
+                    restante = pronta_em - time.monotonic()
+                    if restante <= 0:
+                        heapq.heappop(self._fila)
+                        self.em_andamento[pagina] = tentativa
+                        return {'pagina': pagina, 'url': url_da_pagina(self.url, pagina), 'tentativa': tentativa}
+                    self._condicao.wait(restante)
+                elif self.em_andamento:
+                    self._condicao.wait()
+                else:
+                    return None
+
+    def concluir(self, pagina):
+        with self._condicao:
+            self.em_andamento.pop(pagina, None)
+            self.concluidas.add(pagina)
+            self._condicao.notify_all()
+
+    def falhar(self, pagina, erro=None):
+        """Devolve a página à fila com espera exponencial; retorna False se ela foi para as mortas"""
+        with self._condicao:
+            tentativa = self.em_andamento.pop(pagina, None)
+            self._condicao.notify_all()
+            if tentativa is None:
+                return False  # Descartada por encerrar_apos() enquanto era buscada
+            if tentativa >= self.max_tentativas:
+                self.mortas.append({'pagina': pagina, 'url': url_da_pagina(self.url, pagina),
+                                    'tentativas': tentativa, 'erro': str(erro) if erro else None})
+                print(f"☠️ Página {pagina} desistida após {tentativa} tentativas: {erro}")
+                return False
+            espera = self.espera(tentativa + 1)
+            heapq.heappush(self._fila, (time.monotonic() + espera, pagina, tentativa + 1))
+            print(f"🔁 Página {pagina} volta para a fila em {espera:.1f}s (tentativa {tentativa + 1}/{self.max_tentativas})")
+            return True
+
+    def encerrar_apos(self, pagina):
+        """Fim dos resultados (ou parada incremental) na página N: descarta as posteriores"""
+        with self._condicao:
+            if self.ultima_pagina is not None and self.ultima_pagina <= pagina:
+                return
+            self.ultima_pagina = pagina
+            self._fila = [item for item in self._fila if item[1] <= pagina]
+            heapq.heapify(self._fila)
+            for posterior in [p for p in self.em_andamento if p > pagina]:
+                del self.em_andamento[posterior]
+            self._condicao.notify_all()
+
+    def cancelar(self):
+        """Esvazia a fila (ex.: navegador fechado); as páginas seguem pendentes no checkpoint"""
+        with self._condicao:
+            self._fila = []
+            self.em_andamento = {}
+            self._condicao.notify_all()
+
+    def pendentes(self):
+        with self._condicao:
+            return sorted({item[1] for item in self._fila} | set(self.em_andamento))
@@ -6,15 +6,25 @@ Executa o scraping e gera automaticamente um arquivo Excel formatado
 """
 
 import sys
-from zap_scraper import ZapScraper
+from zap_scraper import ZapScraper, obter_pool_drivers
+from checkpoint import CheckpointStore
+from sinks import SINKS, criar_sink
+from pool_proxies import PoolProxies, carregar_proxies
+from indice_anuncios import IndiceAnuncios
 
-def executar_scraper_automatico(url, max_paginas=5):
+def executar_scraper_automatico(url, max_paginas=5, num_workers=1, run_id=None, formato_saida=None, proxies=None,
+                                incremental=False):
     """
     Executa o scraper automaticamente com geração de Excel
     
     Args:
         url (str): URL do Zap Imóveis para análise
         max_paginas (int): Número de páginas para processar
+        num_workers (int): Número de navegadores em paralelo
+        run_id (str): Execução do checkpoint a retomar (None cria uma nova)
+        formato_saida (str): Gravar as linhas página a página em 'csv', 'jsonl', 'parquet' ou 'sqlite'
+        proxies (list): Proxies a distribuir entre as requisições (None lê a variável ZAP_PROXIES)
+        incremental (bool): Só anúncios novos ou com preço alterado desde as execuções anteriores
     
     Returns:
         pandas.DataFrame: DataFrame com os dados coletados ou None se houver erro
@@ -23,14 +33,29 @@ def executar_scraper_automatico(url, max_paginas=5):
     print("=" * 40)
     print(f"🔗 URL: {url}")
     print(f"📄 Páginas: {max_paginas}")
+    print(f"🧵 Navegadores em paralelo: {num_workers}")
+    if formato_saida:
+        print(f"💾 Gravação contínua em: {formato_saida}")
+    proxies = proxies if proxies is not None else carregar_proxies()
+    if proxies:
+        print(f"🌐 Proxies: {len(proxies)}")
+    if incremental:
+        print("🔁 Modo incremental: para na primeira página já conhecida")
     print("⏳ Iniciando processo automático...")
     
     try:
         # Criar instância do scraper
-        scraper = ZapScraper()
+        scraper = ZapScraper(
+            num_workers=num_workers,
+            pool=obter_pool_drivers(tamanho_maximo=num_workers),
+            checkpoint=CheckpointStore(),
+            sink=criar_sink(formato_saida) if formato_saida else None,
+            proxies=PoolProxies(proxies) if proxies else None,
+            indice=IndiceAnuncios() if incremental else None,
+        )
         
         # Executar análise completa (inclui geração automática de Excel)
-        df_resultado = scraper.analisar_site(url, max_paginas)
+        df_resultado = scraper.analisar_site(url, max_paginas, run_id=run_id)
         
         if df_resultado is not None and not df_resultado.empty:
             print(f"\n🎉 PROCESSO CONCLUÍDO COM SUCESSO!")
@@ -57,16 +82,50 @@ def executar_scraper_automatico(url, max_paginas=5):
 
 def main():
     """Função principal para execução via linha de comando"""
+    # --formato=<csv|jsonl|parquet|sqlite>, --proxies=<arquivo> e --incremental podem aparecer em qualquer posição
+    formato_saida = None
+    proxies = None
+    incremental = False
+    for arg in list(sys.argv[1:]):
+        if arg.startswith('--formato='):
+            formato_saida = arg.split('=', 1)[1]
+            sys.argv.remove(arg)
+        elif arg.startswith('--proxies='):
+            proxies = carregar_proxies(arg.split('=', 1)[1])
+            sys.argv.remove(arg)
+        elif arg == '--incremental':
+            incremental = True
+            sys.argv.remove(arg)
+    if formato_saida and formato_saida not in SINKS:
+        print(f"❌ Formato desconhecido: {formato_saida} (use {', '.join(SINKS)})")
+        sys.exit(1)
+    
     if len(sys.argv) < 2:
-        print("❌ Uso: python scraper_automatico.py <URL> [max_paginas]")
-        print("📝 Exemplo: python scraper_automatico.py 'https://www.zapimoveis.com.br/venda/apartamentos/sp+sao-paulo/' 3")
+        print("❌ Uso: python scraper_automatico.py <URL> [max_paginas] [num_workers] [--formato=csv|jsonl|parquet|sqlite] [--proxies=arquivo] [--incremental]")
+        print("        python scraper_automatico.py --resume <run-id> [num_workers] [--formato=...]")
+        print("📝 Exemplo: python scraper_automatico.py 'https://www.zapimoveis.com.br/venda/apartamentos/sp+sao-paulo/' 3 2")
         return
     
-    url = sys.argv[1]
-    max_paginas = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    if sys.argv[1] == '--resume':
+        if len(sys.argv) < 3:
+            print("❌ Informe o run-id a retomar: python scraper_automatico.py --resume <run-id>")
+            sys.exit(1)
+        run_id = sys.argv[2]
+        execucao = CheckpointStore().obter_execucao(run_id)
+        if execucao is None:
+            print(f"❌ Execução {run_id} não encontrada no checkpoint")
+            sys.exit(1)
+        url = execucao['url']
+        max_paginas = execucao['max_paginas']
+        num_workers = int(sys.argv[3]) if len(sys.argv) > 3 else 1
+    else:
+        run_id = None
+        url = sys.argv[1]
+        max_paginas = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+        num_workers = int(sys.argv[3]) if len(sys.argv) > 3 else 1
     
     # Executar scraper automático
-    resultado = executar_scraper_automatico(url, max_paginas)
+    resultado = executar_scraper_automatico(url, max_paginas, num_workers, run_id, formato_saida, proxies, incremental)
     
     if resultado is not None:
         print(f"\n🎯 Processo finalizado com sucesso!")
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Sinks de linhas - Gravam os imóveis em disco página a página (CSV, JSONL, Parquet ou SQLite),
+em lotes com flush ao fim de cada página, para a memória não crescer com o tamanho do crawl
+"""
+
+import csv
+import json
+import os
+import sqlite3
+import time
+
+import pandas as pd
+
+# Ordem das colunas gravadas; chaves extras entram ao final, na ordem em que aparecem
+COLUNAS_PADRAO = ['Descrição', 'Endereco', 'M2', 'Quartos', 'Banheiros', 'Vagas', 'Preco',
+                  'Condominio', 'IPTU', 'R$/M2', 'URL', 'ID', 'Latitude', 'Longitude']
+COLUNAS_TEXTO = {'Descrição', 'Endereco', 'URL', 'ID'}
+COLUNAS_INTEIRAS = {'Quartos', 'Banheiros', 'Vagas'}
+
+
+class SinkLinhas:
+    """Base: acumula linhas em um buffer e grava em lotes de `tamanho_lote`"""
+
+    extensao = ''
+
+    def __init__(self, caminho, tamanho_lote=200):
+        pasta = os.path.dirname(caminho)
+        if pasta and not os.path.exists(pasta):
+            os.makedirs(pasta)
+        self.caminho = caminho
+        self.tamanho_lote = tamanho_lote
+        self.colunas = None
+        self.total_gravado = 0
+        self._buffer = []
+
+    def _atualizar_colunas(self, linhas):
+        """Acrescenta às colunas as chaves novas do lote; retorna as que não existiam"""
+        if self.colunas is None:
+            self.colunas = list(COLUNAS_PADRAO)
+        conhecidas = set(self.colunas)
+        novas = []
+        for linha in linhas:
+            for chave in linha:
+                if chave not in conhecidas:
+                    conhecidas.add(chave)
+                    novas.append(chave)
+        self.colunas.extend(novas)
+        return novas
+
+    def _ampliar_colunas(self, novas):
+        """Chamado quando um lote traz colunas que o já gravado não tem (formatos com esquema fixo)"""
+
+    def escrever(self, linhas):
+        """Adiciona linhas ao buffer, gravando sempre que o lote enche"""
+        self._buffer.extend(linhas)
+        if len(self._buffer) >= self.tamanho_lote:
+            self.flush()
+
+    def flush(self):
+        """Grava o buffer pendente em disco"""
+        if not self._buffer:
+            return
+        novas = self._atualizar_colunas(self._buffer)
+        if novas and self.total_gravado:
+            self._ampliar_colunas(novas)
+        self._gravar(self._buffer)
+        self.total_gravado += len(self._buffer)
+        self._buffer = []
+
+    def _gravar(self, linhas):
+        raise NotImplementedError
+
+    def fechar(self):
+        """Grava o que restou e libera o arquivo"""
+        self.flush()
+
+    def carregar(self):
+        """Lê tudo o que foi gravado como DataFrame"""
+        raise NotImplementedError
+
+
+class SinkCSV(SinkLinhas):
+    extensao = '.csv'
+
+    def __init__(self, caminho, tamanho_lote=200):
+        super().__init__(caminho, tamanho_lote)
+        self._arquivo = None
+        self._escritor = None
+
+    def _gravar(self, linhas):
+        if self._escritor is None:
+            self._arquivo = open(self.caminho, 'w', newline='', encoding='utf-8')
+            self._escritor = csv.DictWriter(self._arquivo, fieldnames=self.colunas)
+            self._escritor.writeheader()
+        self._escritor.writerows(linhas)
+        self._arquivo.flush()
+
+    def _ampliar_colunas(self, novas):
+        """Reescreve o arquivo com o cabeçalho ampliado (as linhas já gravadas ficam vazias nas novas colunas)"""
+        print(f"🧱 Novas colunas no CSV: {', '.join(novas)}; reescrevendo {self.total_gravado} linhas")
+        self._arquivo.close()
+        temporario = self.caminho + '.tmp'
+        with open(self.caminho, newline='', encoding='utf-8') as origem, \
+                open(temporario, 'w', newline='', encoding='utf-8') as destino:
+            escritor = csv.DictWriter(destino, fieldnames=self.colunas)
+            escritor.writeheader()
+            escritor.writerows(csv.DictReader(origem))
+        os.replace(temporario, self.caminho)
+        self._arquivo = open(self.caminho, 'a', newline='', encoding='utf-8')
+        self._escritor = csv.DictWriter(self._arquivo, fieldnames=self.colunas)
+
+    def fechar(self):
+        super().fechar()
+        if self._arquivo:
+            self._arquivo.close()
+            self._arquivo = None
+            self._escritor = None
+
+    def carregar(self):
+        return pd.read_csv(self.caminho) if os.path.exists(self.caminho) else pd.DataFrame()
+
+
+class SinkJSONL(SinkLinhas):
+    extensao = '.jsonl'
+
+    def __init__(self, caminho, tamanho_lote=200):
+        super().__init__(caminho, tamanho_lote)
+        self._arquivo = None
+
+    def _gravar(self, linhas):
+        if self._arquivo is None:
+            self._arquivo = open(self.caminho, 'w', encoding='utf-8')
+        self._arquivo.writelines(json.dumps(linha, ensure_ascii=False) + '\n' for linha in linhas)
+        self._arquivo.flush()
+
+    def fechar(self):
+        super().fechar()
+        if self._arquivo:
+            self._arquivo.close()
+            self._arquivo = None
+
+    def carregar(self):
+        return pd.read_json(self.caminho, lines=True) if os.path.exists(self.caminho) else pd.DataFrame()
+
+
+class SinkParquet(SinkLinhas):
+    """Pasta com um arquivo parte-NNNNN.parquet por flush (requer pyarrow)
+
+    O rodapé do Parquet só é escrito ao fechar o arquivo; uma parte por flush mantém
+    cada página legível em disco mesmo se a execução for interrompida.
+    """
+
+    extensao = '.parquet'
+
+    def __init__(self, caminho, tamanho_lote=1000):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("`pyarrow` não instalado. Instale com `pip install pyarrow` para gravar Parquet.")
+        super().__init__(os.path.join(caminho, ''), tamanho_lote)
+        self.caminho = caminho
+        self._pa, self._pq = pa, pq
+        self.schema = None
+        self._partes = 0
+
+    def _criar_schema(self):
+        pa = self._pa
+        campos = []
+        for coluna in self.colunas:
+            if coluna in COLUNAS_INTEIRAS:
+                tipo = pa.int64()
+            elif coluna in COLUNAS_PADRAO and coluna not in COLUNAS_TEXTO:
+                tipo = pa.float64()
+            else:
+                tipo = pa.string()
+            campos.append(pa.field(coluna, tipo))
+        return pa.schema(campos)
+
+    def _ampliar_colunas(self, novas):
+        """Acrescenta as colunas novas (nulas) às partes já gravadas: todas as partes com o mesmo esquema"""
+        print(f"🧱 Novas colunas no Parquet: {', '.join(novas)}; reescrevendo {self._partes} partes")
+        self.schema = self._criar_schema()
+        for numero in range(1, self._partes + 1):
+            parte = os.path.join(self.caminho, f"parte-{numero:05d}.parquet")
+            tabela = self._pq.read_table(parte)
+            for campo in self.schema:
+                if campo.name not in tabela.column_names:
+                    tabela = tabela.append_column(campo, self._pa.nulls(tabela.num_rows, campo.type))
+            self._pq.write_table(tabela.select(self.schema.names), parte)
+
+    def _gravar(self, linhas):
+        pa = self._pa
+        if self.schema is None:
+            self.schema = self._criar_schema()
+        colunas = {}
+        for campo in self.schema:
+            valores = [linha.get(campo.name) for linha in linhas]
+            if pa.types.is_string(campo.type):
+                valores = [None if v is None else str(v) for v in valores]
+            colunas[campo.name] = valores
+        self._partes += 1
+        parte = os.path.join(self.caminho, f"parte-{self._partes:05d}.parquet")
+        self._pq.write_table(pa.table(colunas, schema=self.schema), parte)
+
+    def carregar(self):
+        return pd.read_parquet(self.caminho) if self._partes else pd.DataFrame()
+
+
+class SinkSQLite(SinkLinhas):
+    """Tabela `imoveis` com as colunas padrão e a linha completa em JSON"""
+
+    extensao = '.db'
+
+    def __init__(self, caminho, tamanho_lote=200, tabela='imoveis'):
+        super().__init__(caminho, tamanho_lote)
+        self.tabela = tabela
+        self.conexao = sqlite3.connect(caminho)
+        colunas = ", ".join(f'"{c}" {"TEXT" if c in COLUNAS_TEXTO else "REAL"}' for c in COLUNAS_PADRAO)
+        self.conexao.execute(f'CREATE TABLE IF NOT EXISTS "{tabela}" ({colunas}, dados_json TEXT)')
+        self.conexao.commit()
+
+    def _gravar(self, linhas):
+        marcadores = ", ".join("?" for _ in range(len(COLUNAS_PADRAO) + 1))
+        nomes = ", ".join(f'"{c}"' for c in COLUNAS_PADRAO)
+        with self.conexao:
+            self.conexao.executemany(
+                f'INSERT INTO "{self.tabela}" ({nomes}, dados_json) VALUES ({marcadores})',
+                [[linha.get(c) for c in COLUNAS_PADRAO] + [json.dumps(linha, ensure_ascii=False)] for linha in linhas],
+            )
+
+    def fechar(self):
+        super().fechar()
+        self.conexao.close()
+
+    def carregar(self):
+        with sqlite3.connect(self.caminho) as conexao:
+            linhas = [json.loads(d) for (d,) in conexao.execute(f'SELECT dados_json FROM "{self.tabela}" ORDER BY rowid')]
+        return pd.DataFrame(linhas)
+
+
+class SaidaSink:
+    """Resultado de uma coleta gravada por um sink: caminho e total de linhas, sem os dados
+
+    As linhas ficam no disco; carregar() as lê só quando quem chamou precisar delas.
+    """
+
+    def __init__(self, sink):
+        self.sink = sink
+        self.caminho = sink.caminho
+        self.linhas = sink.total_gravado
+
+    def __len__(self):
+        return self.linhas
+
+    def carregar(self):
+        """Lê as linhas gravadas como DataFrame"""
+        return self.sink.carregar()
+
+
+SINKS = {'csv': SinkCSV, 'jsonl': SinkJSONL, 'parquet': SinkParquet, 'sqlite': SinkSQLite}
+
+
+def criar_sink(formato='csv', caminho=None, tamanho_lote=None):
+    """Cria o sink do formato pedido; sem caminho, grava em arquivos/dados_stream_<timestamp>"""
+    if formato not in SINKS:
+        raise ValueError(f"Formato de sink desconhecido: {formato} (use {', '.join(SINKS)})")
+    classe = SINKS[formato]
+    if caminho is None:
+        caminho = os.path.join("arquivos", f"dados_stream_{time.strftime('%Y%m%d-%H%M%S')}{classe.extensao}")
+    if tamanho_lote is None:
+        return classe(caminho)
+    return classe(caminho, tamanho_lote=tamanho_lote)
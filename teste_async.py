@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste do ZapScraperAsync contra um servidor HTTP local com páginas de fixture: limite do
+semáforo, taxa do token bucket, parada na primeira página vazia, duplicatas no stream e
+páginas bloqueadas
+"""
+
+import asyncio
+import io
+import os
+import threading
+import time
+from contextlib import redirect_stdout
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+from zap_scraper import ZapScraper
+from zap_scraper_async import ZapScraperAsync
+from limitador_taxa import LimitadorTaxa
+
+PAGINAS = {}
+for numero, nome in enumerate(('pagina_sp_atual', 'pagina_rj_classes_novas'), 1):
+    with open(os.path.join('fixtures', 'corpus', f'{nome}.html'), encoding='utf-8') as f:
+        PAGINAS[numero] = f.read()
+PAGINAS[3] = PAGINAS[1]  # Página 3 repete os anúncios da 1: o stream deve descartá-los
+with open('fixtures/pagina_bloqueio.html', encoding='utf-8') as f:
+    PAGINA_BLOQUEIO = f.read()
+
+PAGINA_VAZIA = "<html><body><p>Nenhum imóvel encontrado</p></body></html>"
+LATENCIA = 0.1
+MAX_SIMULTANEAS = 2
+
+
+class Servidor(BaseHTTPRequestHandler):
+    """/busca/ serve 3 páginas de cards e depois vazio; /bloqueado/ dá 403 na página 2;
+    /so_js/ não tem cards no HTML estático (conteúdo renderizado só com JS)
+
+    Registra as páginas pedidas e o pico de requisições simultâneas.
+    """
+    lock = threading.Lock()
+    pedidas = []
+    em_andamento = 0
+    pico = 0
+
+    def do_GET(self):
+        partes = urlparse(self.path)
+        pagina = int(parse_qs(partes.query).get('pagina', ['1'])[0])
+        with Servidor.lock:
+            Servidor.pedidas.append(pagina)
+            Servidor.em_andamento += 1
+            Servidor.pico = max(Servidor.pico, Servidor.em_andamento)
+        time.sleep(LATENCIA)
+        with Servidor.lock:
+            Servidor.em_andamento -= 1
+        status, corpo = 200, PAGINAS.get(pagina, PAGINA_VAZIA)
+        if partes.path == '/so_js/':
+            corpo = PAGINA_VAZIA
+        if partes.path == '/bloqueado/' and pagina == 2:
+            status, corpo = 403, PAGINA_BLOQUEIO
+        corpo = corpo.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def log_message(self, *args):
+        pass
+
+    @classmethod
+    def zerar(cls):
+        cls.pedidas = []
+        cls.pico = 0
+
+
+def iniciar_servidor():
+    """Sobe o servidor em uma porta livre e retorna (servidor, url_base)"""
+    servidor = ThreadingHTTPServer(('127.0.0.1', 0), Servidor)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor, f"http://127.0.0.1:{servidor.server_address[1]}"
+
+
+def criar_scraper():
+    # Taxa alta: nestes testes só o semáforo limita
+    return ZapScraperAsync(max_paginas_simultaneas=MAX_SIMULTANEAS, taxa_por_segundo=1000, rajada=1000)
+
+
+def contagem_esperada():
+    """(anúncios únicos, anúncios extraídos) das páginas de /busca/, pelo detector de duplicatas do ZapScraper"""
+    scraper = ZapScraper()
+    with redirect_stdout(io.StringIO()):
+        anuncios = [a for pagina in sorted(PAGINAS) for a in scraper.extrair_anuncios_html(PAGINAS[pagina])]
+        unicos = sum(1 for anuncio in anuncios if not scraper.verificar_duplicata(anuncio))
+    return unicos, len(anuncios)
+
+
+def testar_limitador_taxa():
+    """Depois da rajada, as requisições ao mesmo host saem na taxa configurada; outro host não espera"""
+    print("🧪 TESTE DO TOKEN BUCKET POR HOST")
+
+    async def medir():
+        limitador = LimitadorTaxa(taxa_por_segundo=20, rajada=2)
+        inicio = time.perf_counter()
+        for _ in range(8):
+            await limitador.aguardar('http://a.exemplo/pagina')
+        mesmo_host = time.perf_counter() - inicio
+        inicio = time.perf_counter()
+        await limitador.aguardar('http://b.exemplo/pagina')
+        return mesmo_host, time.perf_counter() - inicio
+
+    mesmo_host, outro_host = asyncio.run(medir())
+    esperado = (8 - 2) / 20
+    ok = esperado * 0.9 <= mesmo_host < esperado * 1.5 and outro_host < 0.01
+    print(f"  8 requisições (rajada 2, 20/s): {mesmo_host:.2f}s (esperado ~{esperado:.2f}s); outro host: {outro_host * 1000:.1f} ms")
+    print("✅ TESTE PASSOU!" if ok else "❌ TESTE FALHOU!")
+    return ok
+
+
+def testar_semaforo_e_parada(url_base):
+    """No máximo MAX_SIMULTANEAS páginas ao mesmo tempo; depois da página vazia as seguintes não são pedidas"""
+    print("\n🧪 TESTE DO SEMÁFORO E DA PARADA NA PÁGINA VAZIA")
+    Servidor.zerar()
+    scraper = criar_scraper()
+    with redirect_stdout(io.StringIO()):
+        asyncio.run(scraper.coletar(f"{url_base}/busca/", max_paginas=12))
+    ok = 1 < Servidor.pico <= MAX_SIMULTANEAS
+    # Só as páginas já em voo quando a 4 (vazia) terminou podem ter sido pedidas além dela
+    ok = ok and max(Servidor.pedidas) <= 4 + MAX_SIMULTANEAS and scraper._ultima_pagina == 4
+    print(f"  pico simultâneo: {Servidor.pico} (limite {MAX_SIMULTANEAS}) | páginas pedidas: {sorted(Servidor.pedidas)}")
+    print("✅ TESTE PASSOU!" if ok else "❌ TESTE FALHOU!")
+    return ok
+
+
+def testar_stream_sem_duplicatas(url_base):
+    """async for ... in stream(...) entrega cada anúncio uma vez, mesmo repetido em outra página"""
+    print("\n🧪 TESTE DE DUPLICATAS NO STREAM")
+    scraper = criar_scraper()
+
+    async def consumir():
+        return [anuncio async for anuncio in scraper.stream(f"{url_base}/busca/", max_paginas=5)]
+
+    with redirect_stdout(io.StringIO()):
+        anuncios = asyncio.run(consumir())
+    esperado, extraidos = contagem_esperada()
+    chaves = [scraper.scraper.criar_identificador_imovel(anuncio) for anuncio in anuncios]
+    ok = len(anuncios) == esperado and len(set(chaves)) == len(chaves)
+    ok = ok and scraper.scraper.duplicatas_detectadas == extraidos - esperado > 0
+    print(f"  {len(anuncios)} anúncios únicos (esperado {esperado}), {scraper.scraper.duplicatas_detectadas} duplicatas descartadas")
+    print("✅ TESTE PASSOU!" if ok else "❌ TESTE FALHOU!")
+    return ok
+
+
+def testar_paginas_bloqueadas(url_base):
+    """A página bloqueada é informada por coletar() e refeita no Chrome por extrair_dados_pagina()"""
+    print("\n🧪 TESTE DE PÁGINAS BLOQUEADAS")
+    scraper = criar_scraper()
+    saida = io.StringIO()
+    with redirect_stdout(saida):
+        asyncio.run(scraper.coletar(f"{url_base}/bloqueado/", max_paginas=6))
+    ok = scraper.paginas_bloqueadas == [2] and 'páginas bloqueadas ficaram de fora' in saida.getvalue()
+
+    escaladas = []
+    scraper.scraper._extrair_dados_selenium = lambda url, paginas: escaladas.append(list(paginas))
+    scraper.scraper.salvar_dados = lambda: None
+    with redirect_stdout(io.StringIO()):
+        scraper.extrair_dados_pagina(f"{url_base}/bloqueado/", max_paginas=6)
+    ok = ok and escaladas == [[2]]
+    print(f"  bloqueadas: {scraper.paginas_bloqueadas} | escaladas para o Chrome: {escaladas}")
+    print("✅ TESTE PASSOU!" if ok else "❌ TESTE FALHOU!")
+    return ok
+
+
+def testar_primeira_pagina_sem_cards(url_base):
+    """Sem cards no HTML estático da página 1, a busca inteira é refeita no Chrome"""
+    print("\n🧪 TESTE DE PRIMEIRA PÁGINA SEM CARDS")
+    scraper = criar_scraper()
+    escaladas = []
+    scraper.scraper._extrair_dados_selenium = lambda url, paginas: escaladas.append(list(paginas))
+    scraper.scraper.salvar_dados = lambda: None
+    with redirect_stdout(io.StringIO()):
+        scraper.extrair_dados_pagina(f"{url_base}/so_js/", max_paginas=4)
+    ok = scraper.paginas_bloqueadas == [1] and escaladas == [[1, 2, 3, 4]]
+    print(f"  bloqueadas: {scraper.paginas_bloqueadas} | escaladas para o Chrome: {escaladas}")
+    print("✅ TESTE PASSOU!" if ok else "❌ TESTE FALHOU!")
+    return ok
+
+
+if __name__ == "__main__":
+    servidor, url_base = iniciar_servidor()
+    try:
+        resultados = [
+            testar_limitador_taxa(),
+            testar_semaforo_e_parada(url_base),
+            testar_stream_sem_duplicatas(url_base),
+            testar_paginas_bloqueadas(url_base),
+            testar_primeira_pagina_sem_cards(url_base),
+        ]
+    finally:
+        servidor.shutdown()
+
+    if all(resultados):
+        print("\n🎉 Todos os testes passaram!")
+    else:
+        print("\n⚠️ Alguns testes falharam.")
+        raise SystemExit(1)
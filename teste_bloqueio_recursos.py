@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste do bloqueio de recursos e das métricas de rede com um navegador falso: padrões enviados
+em Network.setBlockedURLs e bytes/requisições somados a partir de eventos Network.* sintéticos
+"""
+
+import io
+import json
+from contextlib import redirect_stdout
+
+from zap_scraper import ZapScraper, PADROES_BLOQUEIO_PADRAO
+
+
+def evento(metodo, **params):
+    """Entrada do log de performance como o chromedriver entrega"""
+    return {'message': json.dumps({'message': {'method': metodo, 'params': params}}), 'level': 'INFO'}
+
+
+class NavegadorBloqueio:
+    """Guarda os comandos CDP recebidos e entrega lotes de eventos de rede no get_log"""
+
+    def __init__(self, options=None, lotes=None):
+        self.argumentos = list(options.arguments) if options is not None else []
+        self.capacidades = options.to_capabilities() if options is not None else {}
+        self.lotes = list(lotes or [])
+        self.comandos = []  # (comando, parâmetros) na ordem recebida
+        self.urls = []
+        self.fechado = False
+
+    def execute_cdp_cmd(self, comando, parametros):
+        self.comandos.append((comando, parametros))
+        return {}
+
+    def bloqueadas(self):
+        """URLs do último Network.setBlockedURLs (None se nunca enviado)"""
+        enviados = [p['urls'] for c, p in self.comandos if c == 'Network.setBlockedURLs']
+        return enviados[-1] if enviados else None
+
+    def get_log(self, tipo):
+        return self.lotes.pop(0) if self.lotes else []
+
+    def get(self, url):
+        self.urls.append(url)
+
+    def execute_script(self, script, *args):
+        return {'bytes': 250000, 'recursos': 42, 'carregamento_ms': 1800}
+
+    def execute_async_script(self, script, *args):
+        return {'cards': 30}
+
+    def set_script_timeout(self, segundos):
+        pass
+
+    def set_page_load_timeout(self, segundos):
+        pass
+
+    def implicitly_wait(self, segundos):
+        pass
+
+    def set_window_size(self, largura, altura):
+        pass
+
+    def quit(self):
+        self.fechado = True
+
+
+def eventos_pagina(carregados, bloqueados):
+    """Lotes de uma carga: recursos baixados (bytes de cada um) e requisições bloqueadas"""
+    lotes = [[evento('Network.requestWillBeSent', requestId='doc', request={'url': 'https://www.zapimoveis.com.br/'})]]
+    lotes.append([evento('Network.loadingFinished', requestId=f'r{i}', encodedDataLength=tamanho)
+                  for i, tamanho in enumerate(carregados)])
+    lotes.append([evento('Network.loadingFailed', requestId=f'b{i}', errorText='net::ERR_BLOCKED_BY_CLIENT',
+                         blockedReason='inspector') for i in range(bloqueados)])
+    return lotes
+
+
+def testar_padroes_enviados():
+    """setBlockedURLs recebe os padrões do scraper com bloqueio ligado e lista vazia com ele desligado"""
+    print("🧪 TESTE DOS PADRÕES ENVIADOS EM Network.setBlockedURLs")
+    scraper = ZapScraper()
+    scraper.bloquear_recursos = True
+    navegador = NavegadorBloqueio()
+    ok = scraper.aplicar_bloqueio_recursos(navegador)
+    ok = ok and navegador.comandos[0] == ('Network.enable', {})
+    ok = ok and navegador.bloqueadas() == list(PADROES_BLOQUEIO_PADRAO)
+
+    scraper.padroes_bloqueados = ['*.png', '*hotjar.com*']
+    navegador = NavegadorBloqueio()
+    scraper.aplicar_bloqueio_recursos(navegador)
+    ok = ok and navegador.bloqueadas() == ['*.png', '*hotjar.com*']
+
+    # Lista explícita vence o padrão; sem bloqueio, nada é bloqueado
+    navegador = NavegadorBloqueio()
+    scraper.aplicar_bloqueio_recursos(navegador, [])
+    ok = ok and navegador.bloqueadas() == []
+    scraper.bloquear_recursos = False
+    navegador = NavegadorBloqueio()
+    scraper.aplicar_bloqueio_recursos(navegador)
+    ok = ok and navegador.bloqueadas() == []
+    print("✅ TESTE PASSOU!" if ok else f"❌ TESTE FALHOU! {navegador.comandos}")
+    return ok
+
+
+def testar_criacao_driver():
+    """criar_driver desliga imagens na partida e envia os padrões só com bloqueio; o log de
+    performance é pedido para a medição
+    """
+    print("\n🧪 TESTE DO BLOQUEIO NA CRIAÇÃO DO NAVEGADOR")
+    scraper = ZapScraper()
+    scraper.bloquear_recursos = True
+    scraper._iniciar_chrome = lambda options, version_main=None, porta_debug=None: NavegadorBloqueio(options)
+    com = scraper.criar_driver(log_performance=True)
+    sem = scraper.criar_driver(bloquear_recursos=False)
+    ok = '--blink-settings=imagesEnabled=false' in com.argumentos
+    ok = ok and com.bloqueadas() == list(PADROES_BLOQUEIO_PADRAO)
+    ok = ok and com.capacidades.get('goog:loggingPrefs') == {'performance': 'ALL'}
+    ok = ok and '--blink-settings=imagesEnabled=false' not in sem.argumentos
+    ok = ok and sem.bloqueadas() == [] and 'goog:loggingPrefs' not in sem.capacidades
+    print("✅ TESTE PASSOU!" if ok else "❌ TESTE FALHOU!")
+    return ok
+
+
+def testar_leitura_eventos():
+    """Bytes e requisições vêm de loadingFinished; bloqueadas são os loadingFailed com blockedReason"""
+    print("\n🧪 TESTE DA LEITURA DOS EVENTOS DE REDE")
+    lotes = eventos_pagina([1000, 2500, 500], 2)
+    # Falha de rede sem bloqueio e entrada malformada não contam
+    lotes.append([evento('Network.loadingFailed', requestId='x', errorText='net::ERR_TIMED_OUT'),
+                  {'level': 'INFO'}, {'message': 'não é json'}])
+    totais = ZapScraper().ler_eventos_rede(NavegadorBloqueio(lotes=lotes), quietude=0.2, timeout=5)
+    ok = totais == {'bytes': 4000, 'requisicoes': 3, 'bloqueadas': 2}
+
+    # Sem eventos, a leitura termina depois da quietude com tudo zerado
+    ok = ok and ZapScraper().ler_eventos_rede(NavegadorBloqueio(), quietude=0.2, timeout=5) == {
+        'bytes': 0, 'requisicoes': 0, 'bloqueadas': 0}
+    print(f"  {totais}")
+    print("✅ TESTE PASSOU!" if ok else "❌ TESTE FALHOU!")
+    return ok
+
+
+def testar_economia_bloqueio():
+    """Duas passagens em navegadores novos (sem e com bloqueio): economia é a diferença dos bytes"""
+    print("\n🧪 TESTE DA MEDIÇÃO DA ECONOMIA DO BLOQUEIO")
+    scraper = ZapScraper()
+    navegadores = []
+    pedidos = []
+
+    def criar_driver(captura_rede=False, log_performance=False, bloquear_recursos=None):
+        pedidos.append((log_performance, bloquear_recursos))
+        if bloquear_recursos:
+            lotes = eventos_pagina([40000, 15000], 7)
+        else:
+            lotes = eventos_pagina([40000, 15000, 120000, 60000, 8000, 3000], 0)
+        navegadores.append(NavegadorBloqueio(lotes=lotes))
+        return navegadores[-1]
+
+    scraper.criar_driver = criar_driver
+    leitura = scraper.ler_eventos_rede
+    scraper.ler_eventos_rede = lambda driver: leitura(driver, quietude=0.2, timeout=5)
+    url = "https://www.zapimoveis.com.br/venda/imoveis/sp+sao-paulo/"
+    with redirect_stdout(io.StringIO()):
+        economia = scraper.medir_economia_bloqueio(url)
+    ok = economia is not None and economia is scraper.economia_bloqueio
+    ok = ok and pedidos == [(True, False), (True, True)]
+    ok = ok and economia['bytes'] == 191000 and economia['bloqueadas'] == 7
+    ok = ok and economia['medidas']['sem_bloqueio']['requisicoes'] == 6
+    ok = ok and economia['medidas']['com_bloqueio']['requisicoes'] == 2
+    ok = ok and all(n.fechado and n.urls == [url] for n in navegadores)
+    print(f"  {economia and {k: v for k, v in economia.items() if k != 'medidas'}}")
+    print("✅ TESTE PASSOU!" if ok else "❌ TESTE FALHOU!")
+    return ok
+
+
+def testar_metricas_pagina():
+    """As métricas do Resource Timing de cada página vão para metricas_rede com o número da página"""
+    print("\n🧪 TESTE DAS MÉTRICAS DE REDE POR PÁGINA")
+    scraper = ZapScraper()
+    scraper.driver = NavegadorBloqueio()
+    scraper.registrar_metricas_rede(1)
+    scraper.registrar_metricas_rede(2, NavegadorBloqueio())
+    ok = [m['pagina'] for m in scraper.metricas_rede] == [1, 2]
+    ok = ok and all(m['bytes'] == 250000 and m['recursos'] == 42 for m in scraper.metricas_rede)
+    print("✅ TESTE PASSOU!" if ok else "❌ TESTE FALHOU!")
+    return ok
+
+
+if __name__ == "__main__":
+    resultados = [
+        testar_padroes_enviados(),
+        testar_criacao_driver(),
+        testar_leitura_eventos(),
+        testar_economia_bloqueio(),
+        testar_metricas_pagina(),
+    ]
+    if all(resultados):
+        print("\n🎉 Todos os testes passaram!")
+    else:
+        print("\n⚠️ Alguns testes falharam.")
+        raise SystemExit(1)
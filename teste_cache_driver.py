@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste dos caches da partida do Chrome (cache_driver) numa pasta temporária: pool de
+user-agents (memória, disco, expiração) e chromedriver patcheado (acerto, binário ausente
+ou não patcheado que precisa ser patcheado de novo)
+"""
+
+import io
+import json
+import os
+import shutil
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+import undetected_chromedriver.patcher
+
+import cache_driver
+
+MARCA_PATCH = b"patcheado"
+
+
+class GeradorFalso:
+    """Substitui o fake_useragent: conta quantas vezes o pool foi gerado"""
+
+    def __init__(self):
+        self.chamadas = 0
+
+    def __call__(self, tamanho):
+        self.chamadas += 1
+        return [f"Mozilla/5.0 (teste {self.chamadas}.{i})" for i in range(3)]
+
+
+def criar_patcher_falso(pasta, downloads):
+    """Patcher do undetected_chromedriver sem rede: auto() "baixa" um binário já patcheado e
+    is_binary_patched() procura a marca do patch no arquivo
+    """
+
+    class PatcherFalso:
+        def __init__(self, executable_path=None, version_main=0):
+            self.executable_path = executable_path or os.path.join(pasta, f"baixado_{len(downloads)}")
+            self.version_main = version_main
+
+        def is_binary_patched(self):
+            with open(self.executable_path, 'rb') as f:
+                return MARCA_PATCH in f.read()
+
+        def auto(self):
+            downloads.append(self.version_main)
+            with open(self.executable_path, 'wb') as f:
+                f.write(b"chromedriver " + MARCA_PATCH)
+
+    return PatcherFalso
+
+
+def testar_cache_user_agents():
+    """Falta gera e grava; acerto em memória e em disco não gera; pool expirado é renovado"""
+    print("🧪 TESTE DO CACHE DE USER-AGENTS")
+    pasta = tempfile.mkdtemp()
+    caminho = os.path.join(pasta, "cache", "user_agents.json")
+    gerar_original = cache_driver._gerar_user_agents
+    gerador = GeradorFalso()
+    cache_driver._gerar_user_agents = gerador
+    cache_driver._user_agents = None
+    try:
+        # Falta: nem memória nem disco
+        pool = cache_driver.carregar_user_agents(caminho)
+        ok = gerador.chamadas == 1 and os.path.exists(caminho)
+        with open(caminho, encoding='utf-8') as f:
+            ok = ok and json.load(f)['user_agents'] == pool
+
+        # Acerto em memória e, depois de esvaziar a memória, em disco
+        ok = ok and cache_driver.carregar_user_agents(caminho) is pool and gerador.chamadas == 1
+        cache_driver._user_agents = None
+        ok = ok and cache_driver.carregar_user_agents(caminho) == pool and gerador.chamadas == 1
+        ok = ok and cache_driver.user_agent_aleatorio() in pool
+
+        # Expiração: pool em disco mais velho que a validade é gerado de novo e regravado
+        with open(caminho, 'w', encoding='utf-8') as f:
+            json.dump({'criado_em': time.time() - cache_driver.VALIDADE_USER_AGENTS - 1, 'user_agents': pool}, f)
+        cache_driver._user_agents = None
+        renovado = cache_driver.carregar_user_agents(caminho)
+        ok = ok and gerador.chamadas == 2 and renovado != pool
+        with open(caminho, encoding='utf-8') as f:
+            dados = json.load(f)
+        ok = ok and dados['user_agents'] == renovado and time.time() - dados['criado_em'] < 60
+
+        # Sem fake_useragent, a lista de reserva vale só nesta execução (não vai para o disco)
+        def falhar(tamanho):
+            raise RuntimeError("sem rede")
+        cache_driver._gerar_user_agents = falhar
+        with redirect_stdout(io.StringIO()):
+            reserva = cache_driver.carregar_user_agents(caminho, forcar=True)
+        ok = ok and reserva == cache_driver.USER_AGENTS_RESERVA
+        with open(caminho, encoding='utf-8') as f:
+            ok = ok and json.load(f)['user_agents'] == renovado
+
+        cache_driver.limpar_cache_user_agents(caminho)
+        ok = ok and cache_driver._user_agents is None and not os.path.exists(caminho)
+    finally:
+        cache_driver._gerar_user_agents = gerar_original
+        cache_driver._user_agents = None
+        shutil.rmtree(pasta)
+    print("✅ TESTE PASSOU!" if ok else "❌ TESTE FALHOU!")
+    return ok
+
+
+def testar_cache_chromedriver():
+    """Binário patcheado em cache é reaproveitado; ausente ou sem patch, é baixado e patcheado de novo"""
+    print("\n🧪 TESTE DO CACHE DO CHROMEDRIVER PATCHEADO")
+    pasta = tempfile.mkdtemp()
+    downloads = []
+    pasta_original = cache_driver.PASTA_CACHE
+    patcher_original = undetected_chromedriver.patcher.Patcher
+    cache_driver.PASTA_CACHE = os.path.join(pasta, "cache")
+    undetected_chromedriver.patcher.Patcher = criar_patcher_falso(pasta, downloads)
+    try:
+        with redirect_stdout(io.StringIO()):
+            # Falta: baixa, patcheia e copia para a pasta do cache, executável
+            destino = cache_driver.obter_chromedriver_patcheado(124)
+            ok = downloads == [124] and destino == cache_driver.caminho_chromedriver(124)
+            ok = ok and os.path.dirname(destino) == os.path.abspath(cache_driver.PASTA_CACHE)
+            ok = ok and os.access(destino, os.X_OK)
+
+            # Acerto: nenhum download novo; outra versão do Chrome tem o próprio binário
+            ok = ok and cache_driver.obter_chromedriver_patcheado(124) == destino and downloads == [124]
+            outro = cache_driver.obter_chromedriver_patcheado()
+            ok = ok and outro != destino and downloads == [124, 0]
+
+            # Binário em cache sem o patch (ex.: substituído por um chromedriver original)
+            with open(destino, 'wb') as f:
+                f.write(b"chromedriver original")
+            ok = ok and cache_driver.obter_chromedriver_patcheado(124) == destino and downloads == [124, 0, 124]
+            with open(destino, 'rb') as f:
+                ok = ok and MARCA_PATCH in f.read()
+
+            # Descartado (Chrome atualizado): o caminho em cache some e o próximo pedido patcheia de novo
+            cache_driver.descartar_chromedriver(124)
+            ok = ok and not os.path.exists(destino)
+            ok = ok and cache_driver.obter_chromedriver_patcheado(124) == destino and len(downloads) == 4
+            ok = ok and os.path.exists(outro)
+    finally:
+        cache_driver.PASTA_CACHE = pasta_original
+        undetected_chromedriver.patcher.Patcher = patcher_original
+        shutil.rmtree(pasta)
+    print(f"  downloads por versão: {downloads}")
+    print("✅ TESTE PASSOU!" if ok else "❌ TESTE FALHOU!")
+    return ok
+
+
+if __name__ == "__main__":
+    resultados = [
+        testar_cache_user_agents(),
+        testar_cache_chromedriver(),
+    ]
+    if all(resultados):
+        print("\n🎉 Todos os testes passaram!")
+    else:
+        print("\n⚠️ Alguns testes falharam.")
+        raise SystemExit(1)
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste da captura de rede (CDP): um navegador falso entrega eventos Network.* no log de
+performance e corpos em Network.getResponseBody; os anúncios saem das respostas da API e,
+sem API capturada, do DOM
+"""
+
+import base64
+import functools
+import io
+import json
+from contextlib import redirect_stdout
+
+from zap_scraper import ZapScraper
+from extrator_json import extrair_estado_next, extrair_anuncios_api
+from teste_pipeline import ler, html_da_pagina, FIXTURE_DOM, FIXTURE_JSON
+
+ESTADO_API = extrair_estado_next(ler(FIXTURE_JSON))
+PAGINA_BLOQUEIO = ler('fixtures/pagina_bloqueio.html')
+URL_API = "https://glue-api.zapimoveis.com.br/v2/listings?page={pagina}"
+
+
+def evento(metodo, **params):
+    """Entrada do log de performance como o chromedriver entrega"""
+    return {'message': json.dumps({'message': {'method': metodo, 'params': params}}), 'level': 'INFO'}
+
+
+class NavegadorRede:
+    """Por página: 'api' (resposta JSON da API, corpo em base64 nas páginas pares), 'dom' (sem API,
+    cards no HTML), 'desafio' ou 'vazia'. Os eventos de cada resposta chegam em leituras
+    separadas do log, como no Chrome.
+    """
+
+    def __init__(self, roteiro):
+        self.roteiro = roteiro
+        self.lotes = []  # Listas de entradas entregues a cada get_log
+        self.corpos = {}  # requestId -> resultado de Network.getResponseBody
+        self.page_source = ""
+        self.fechado = False
+
+    def get(self, url):
+        pagina = int(url.split('pagina=')[1]) if 'pagina=' in url else 1
+        tipo = self.roteiro.get(pagina, 'vazia')
+        self.page_source = {
+            'dom': html_da_pagina(ler(FIXTURE_DOM), pagina),
+            'desafio': PAGINA_BLOQUEIO,
+        }.get(tipo, "<html><body></body></html>")
+        # Recursos que não são da API aparecem sempre e devem ser ignorados
+        self.lotes = [[
+            evento('Network.responseReceived', requestId=f'img{pagina}',
+                   response={'url': 'https://resizedimgs.zapimoveis.com.br/foto.jpg', 'mimeType': 'image/jpeg'}),
+            evento('Network.loadingFinished', requestId=f'img{pagina}', encodedDataLength=5000),
+        ]]
+        if tipo == 'api':
+            corpo = json.dumps(ESTADO_API)
+            if pagina % 2 == 0:
+                self.corpos[f'api{pagina}'] = {'body': base64.b64encode(corpo.encode('utf-8')).decode('ascii'),
+                                               'base64Encoded': True}
+            else:
+                self.corpos[f'api{pagina}'] = {'body': corpo, 'base64Encoded': False}
+            self.lotes.append([evento('Network.responseReceived', requestId=f'api{pagina}',
+                                      response={'url': URL_API.format(pagina=pagina), 'mimeType': 'application/json'})])
+            self.lotes.append([evento('Network.loadingFinished', requestId=f'api{pagina}', encodedDataLength=len(corpo))])
+
+    def get_log(self, tipo):
+        return self.lotes.pop(0) if self.lotes else []
+
+    def execute_cdp_cmd(self, comando, parametros):
+        if comando == 'Network.getResponseBody':
+            return self.corpos[parametros['requestId']]
+        return {}
+
+    def execute_async_script(self, script, *args):
+        return {'cards': self.page_source.count('data-cy="rp-property-cd"')}
+
+    def execute_script(self, script, *args):
+        return {'bytes': 0, 'recursos': 0, 'carregamento_ms': None}
+
+    def set_script_timeout(self, segundos):
+        pass
+
+    def quit(self):
+        self.fechado = True
+
+
+def criar_scraper(navegador):
+    scraper = ZapScraper()
+    scraper.captura_rede = True
+    scraper.throttle.atraso = scraper.throttle.atraso_minimo = 0
+    scraper.configure_driver = lambda: setattr(scraper, 'driver', navegador) or True
+    # Sem API na página, a captura desiste em meio segundo (no Chrome, 15 s)
+    scraper.capturar_respostas_api = functools.partial(ZapScraper.capturar_respostas_api, scraper, timeout=0.5)
+    return scraper
+
+
+def testar_captura_api():
+    """Só a resposta JSON da API é lida, depois do loadingFinished; corpo em base64 é decodificado"""
+    print("🧪 TESTE DA CAPTURA DAS RESPOSTAS DA API")
+    ok = True
+    for pagina in (1, 2):  # Corpo em texto e em base64
+        navegador = NavegadorRede({pagina: 'api'})
+        navegador.get(f"https://www.zapimoveis.com.br/venda/?pagina={pagina}")
+        payloads = ZapScraper().capturar_respostas_api(navegador, timeout=2)
+        ok = ok and payloads == [ESTADO_API]
+    ok = ok and len(extrair_anuncios_api(ESTADO_API)) > 0
+
+    navegador = NavegadorRede({1: 'dom'})
+    navegador.get("https://www.zapimoveis.com.br/venda/")
+    ok = ok and ZapScraper().capturar_respostas_api(navegador, timeout=0.3) == []
+    print("✅ TESTE PASSOU!" if ok else "❌ TESTE FALHOU!")
+    return ok
+
+
+def testar_extracao_pela_rede():
+    """Página 1 pela API, página 2 pelo DOM (API não capturada), página 3 vazia: fim dos resultados"""
+    print("\n🧪 TESTE DA EXTRAÇÃO PELA REDE COM QUEDA PARA O DOM")
+    navegador = NavegadorRede({1: 'api', 2: 'dom'})
+    scraper = criar_scraper(navegador)
+    with redirect_stdout(io.StringIO()):
+        scraper._extrair_dados_rede("https://www.zapimoveis.com.br/venda/imoveis/sp+sao-paulo/", [1, 2, 3, 4])
+        referencia = ZapScraper()
+        referencia.consolidar_pagina(1, extrair_anuncios_api(ESTADO_API))
+        referencia.consolidar_pagina(2, referencia.extrair_anuncios_html(html_da_pagina(ler(FIXTURE_DOM), 2)))
+    ok = scraper.paginas_concluidas == {1, 2} and scraper.pagina_interrompida is None
+    ok = ok and scraper.data_list == referencia.data_list and len(scraper.data_list) > 0
+    ok = ok and [m['etapa'] for m in scraper.metricas_tempo] == ['captura_rede'] * 3 and navegador.fechado
+    print(f"  {len(scraper.data_list)} anúncios de {sorted(scraper.paginas_concluidas)}")
+    print("✅ TESTE PASSOU!" if ok else "❌ TESTE FALHOU!")
+    return ok
+
+
+def testar_desafio_interrompe():
+    """Sem API e com desafio no lugar dos cards, a página fica pendente (interrupção)"""
+    print("\n🧪 TESTE DE DESAFIO NA CAPTURA DE REDE")
+    navegador = NavegadorRede({1: 'api', 2: 'desafio'})
+    scraper = criar_scraper(navegador)
+    with redirect_stdout(io.StringIO()):
+        scraper._extrair_dados_rede("https://www.zapimoveis.com.br/venda/imoveis/sp+sao-paulo/", [1, 2, 3])
+    ok = scraper.paginas_concluidas == {1} and scraper.pagina_interrompida == 2
+    print("✅ TESTE PASSOU!" if ok else f"❌ TESTE FALHOU! interrompida={scraper.pagina_interrompida}")
+    return ok
+
+
+if __name__ == "__main__":
+    resultados = [
+        testar_captura_api(),
+        testar_extracao_pela_rede(),
+        testar_desafio_interrompe(),
+    ]
+    if all(resultados):
+        print("\n🎉 Todos os testes passaram!")
+    else:
+        print("\n⚠️ Alguns testes falharam.")
+        raise SystemExit(1)
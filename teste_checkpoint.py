@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste do checkpoint contra um servidor HTTP local: uma execução que para num bloqueio fica
+'interrompida', a retomada coleta só as páginas pendentes e o resultado é igual ao de uma
+execução nova sem interrupção
+"""
+
+import io
+import os
+import tempfile
+import threading
+from contextlib import redirect_stdout
+from http.server import HTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+from checkpoint import CheckpointStore
+from zap_scraper import ZapScraper
+
+PAGINAS = {}
+for numero, nome in enumerate(('pagina_sp_atual', 'pagina_rj_classes_novas', 'pagina_bh_preco_span'), 1):
+    with open(os.path.join('fixtures', 'corpus', f'{nome}.html'), encoding='utf-8') as f:
+        PAGINAS[numero] = f.read()
+with open('fixtures/pagina_bloqueio.html', encoding='utf-8') as f:
+    PAGINA_BLOQUEIO = f.read()
+
+PAGINA_VAZIA = "<html><body><p>Nenhum imóvel encontrado</p></body></html>"
+
+
+class ServidorBusca(BaseHTTPRequestHandler):
+    """/busca/ serve 3 páginas de cards distintas e depois vazio; a página 2 dá 403 enquanto `bloquear`"""
+
+    bloquear = True
+
+    def do_GET(self):
+        pagina = int(parse_qs(urlparse(self.path).query).get('pagina', ['1'])[0])
+        status, corpo = 200, PAGINAS.get(pagina, PAGINA_VAZIA)
+        if pagina == 2 and ServidorBusca.bloquear:
+            status, corpo = 403, PAGINA_BLOQUEIO
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.end_headers()
+        self.wfile.write(corpo.encode('utf-8'))
+
+    def log_message(self, *args):
+        pass
+
+
+def iniciar_servidor():
+    """Sobe o servidor em uma porta livre e retorna (servidor, url_base)"""
+    servidor = HTTPServer(('127.0.0.1', 0), ServidorBusca)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor, f"http://127.0.0.1:{servidor.server_address[1]}"
+
+
+def executar(url, checkpoint, run_id=None):
+    """Roda uma extração só por HTTP e retorna o scraper (com data_list e run_id)"""
+    scraper = ZapScraper(checkpoint=checkpoint)
+    scraper.modo_fetch = 'http'
+    with redirect_stdout(io.StringIO()):
+        scraper.extrair_dados_pagina(url, max_paginas=5, run_id=run_id)
+    scraper.fechar_clientes_http()
+    return scraper
+
+
+def testar_run_id_unico():
+    """Execuções iniciadas no mesmo segundo recebem identificadores diferentes"""
+    print("🧪 TESTE DE RUN_ID ÚNICO")
+    ids = {CheckpointStore.novo_run_id() for _ in range(50)}
+    ok = len(ids) == 50
+    print("✅ TESTE PASSOU!" if ok else f"❌ TESTE FALHOU! {50 - len(ids)} repetidos")
+    return ok
+
+
+def testar_retomada(url_base):
+    """Parar na página 2 bloqueada, retomar sem bloqueio e comparar com uma execução nova"""
+    print("\n🧪 TESTE DE RETOMADA APÓS BLOQUEIO")
+    url = f"{url_base}/busca/"
+    with tempfile.TemporaryDirectory() as pasta:
+        store = CheckpointStore(os.path.join(pasta, 'checkpoints.db'))
+        ServidorBusca.bloquear = True
+        interrompida = executar(url, store)
+        execucao = store.obter_execucao(interrompida.run_id)
+        paginas, _, _ = store.carregar(interrompida.run_id)
+        ok = execucao['status'] == 'interrompida' and paginas == {1}
+        print(f"  1ª execução: status={execucao['status']}, páginas={sorted(paginas)}")
+
+        ServidorBusca.bloquear = False
+        retomada = executar(url, store, run_id=interrompida.run_id)
+        execucao = store.obter_execucao(retomada.run_id)
+        paginas, _, _ = store.carregar(retomada.run_id)
+        ok = ok and execucao['status'] == 'concluida' and paginas == {1, 2, 3}
+        print(f"  retomada: status={execucao['status']}, páginas={sorted(paginas)}")
+
+        nova = executar(url, CheckpointStore(os.path.join(pasta, 'nova.db')))
+        ok = ok and len(nova.data_list) > 0 and retomada.data_list == nova.data_list
+        print(f"  linhas: retomada={len(retomada.data_list)}, execução nova={len(nova.data_list)}")
+        store.fechar()
+    print("✅ TESTE PASSOU!" if ok else "❌ TESTE FALHOU!")
+    return ok
+
+
+if __name__ == "__main__":
+    servidor, url_base = iniciar_servidor()
+    try:
+        resultados = [
+            testar_run_id_unico(),
+            testar_retomada(url_base),
+        ]
+    finally:
+        servidor.shutdown()
+
+    if all(resultados):
+        print("\n🎉 Todos os testes passaram!")
+    else:
+        print("\n⚠️ Alguns testes falharam.")
+        raise SystemExit(1)
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste do corpus offline: reprodutibilidade do gerador, integridade do manifesto, métrica de
+precisão, detecção de regressão contra a linha de base e anonimização de páginas reais
+"""
+
+import copy
+import filecmp
+import io
+import tempfile
+from contextlib import redirect_stdout
+
+from bs4 import BeautifulSoup
+
+from gerar_corpus import gerar, DIRETORIO_PADRAO
+from anonimizar_html import anonimizar, id_ficticio
+from parsers_html import PARSERS, obter_parser
+from benchmark_corpus import (carregar_corpus, criar_scraper, extrair_corpus, precisao,
+                              comparar_com_linha_base, carregar_linha_base, configuracoes)
+from zap_scraper import ZapScraper, SELETOR_CARD_CSS
+
+PAGINA_REAL = """<html><head><meta name="viewport" content="x"><script>window.dados = {"telefone": "11987654321"}</script>
+<style>.x{}</style></head><body><!-- sessão 8f7a -->
+<div class="flex flex-col grow min-w-0" id="card-123" data-track="abc" style="color:red">
+  <h2 data-cy="rp-cardProperty-location-txt">Apartamento para comprar emJardins, São Paulo</h2>
+  <p data-cy="rp-cardProperty-street-txt">Rua Oscar Freire, 1500</p>
+  <li class="flex row items-center gap-0-5" data-cy="rp-cardProperty-propertyArea-txt"><svg><path d="M0"/></svg>90 m²</li>
+  <p class="text-2-25 text-neutral-120 font-semibold">R$ 1.990.000</p>
+  <p>Fale com Maria: (11) 98765-4321 ou maria.silva@imobiliaria.com.br, CEP 01426-001</p>
+  <img src="https://resizedimgs.zapimoveis.com.br/foto.jpg">
+  <a href="/imovel/venda-apartamento-jardins-sao-paulo-sp-90m2-id-2712345678/?source=ranking#fotos">Ver</a>
+  <a href="https://wa.me/5511987654321?text=oi">WhatsApp</a>
+</div></body></html>"""
+
+
+def testar_corpus_reproduzivel():
+    """O gerador recria, byte a byte, os arquivos versionados (o corpus não foi editado à mão)"""
+    print("🧪 TESTE DE REPRODUTIBILIDADE DO CORPUS")
+    with tempfile.TemporaryDirectory() as diretorio:
+        with redirect_stdout(io.StringIO()):
+            manifesto = gerar(diretorio)
+        arquivos = ['manifesto.json'] + [e['arquivo'] for e in manifesto['arquivos']]
+        _, diferentes, faltando = filecmp.cmpfiles(DIRETORIO_PADRAO, diretorio, arquivos, shallow=False)
+    ok = not diferentes and not faltando
+    print(f"  {len(arquivos)} arquivos comparados, {len(diferentes) + len(faltando)} diferentes")
+    print("✅ TESTE PASSOU!" if ok else f"❌ TESTE FALHOU! {diferentes + faltando}")
+    return ok
+
+
+def testar_manifesto():
+    """Cada arquivo tem tantos cards quantos valores esperados, em todos os backends"""
+    print("\n🧪 TESTE DE INTEGRIDADE DO MANIFESTO")
+    corpus = carregar_corpus()
+    ok = len(corpus) > 0
+    for nome in PARSERS:
+        parser = obter_parser(nome)
+        contagens = [len(parser.cards(html, SELETOR_CARD_CSS)) == len(e['esperado']) for e, html in corpus]
+        ok = ok and all(contagens)
+        print(f"  {'✅' if all(contagens) else '❌'} {nome}: {sum(contagens)}/{len(corpus)} arquivos com a contagem certa")
+    descartados = sum(1 for e, _ in corpus for esperado in e['esperado'] if esperado is None)
+    ok = ok and descartados > 0  # O corpus cobre cards que devem ser descartados
+    print("✅ TESTE PASSOU!" if ok else "❌ TESTE FALHOU!")
+    return ok
+
+
+def testar_precisao():
+    """Resultado perfeito dá 100%; valor errado, card a mais e card aceito indevidamente são contados"""
+    print("\n🧪 TESTE DA MÉTRICA DE PRECISÃO")
+    corpus = carregar_corpus()
+    perfeito = [copy.deepcopy(e['esperado']) for e, _ in corpus]
+    valores, erros = precisao(corpus, perfeito)
+    ok = all(v == 1.0 for v in valores.values()) and not erros
+
+    errado = copy.deepcopy(perfeito)
+    errado[0][0]['Preco'] += 1
+    errado[0].append({'Preco': 1.0})  # Card a mais na página
+    indice_descartado = next(i for i, e in enumerate(corpus[0][0]['esperado']) if e is None)
+    errado[0][indice_descartado] = {'Preco': 350.0}  # Card "sob consulta" aceito
+    valores, erros = precisao(corpus, errado)
+    campos_com_erro = sorted({e[2] for e in erros})
+    ok = ok and valores['Preco'] < 1.0 and valores['Registro'] < 1.0 and valores['Endereco'] == 1.0
+    ok = ok and campos_com_erro == ['Preco', 'Registro'] and len([e for e in erros if e[2] == 'Registro']) == 2
+    print(f"  campos com erro: {campos_com_erro}")
+
+    # Os caminhos de extração concordam entre si (paridade), logo têm a mesma precisão
+    scraper_ref = criar_scraper('html.parser', False)
+    ref, _ = precisao(corpus, extrair_corpus(scraper_ref, obter_parser('html.parser'), corpus))
+    for nome, parser_html, compilada in configuracoes():
+        obtido, _ = precisao(corpus, extrair_corpus(criar_scraper(parser_html, compilada), obter_parser(parser_html), corpus))
+        ok = ok and obtido == ref
+    print("✅ TESTE PASSOU!" if ok else "❌ TESTE FALHOU!")
+    return ok
+
+
+def testar_regressao():
+    """Queda de vazão além da tolerância ou de precisão em um campo vira regressão; igual, não"""
+    print("\n🧪 TESTE DE DETECÇÃO DE REGRESSÃO")
+    linha_base = carregar_linha_base()
+    ok = linha_base is not None and set(linha_base['configuracoes']) >= {'compilado/html.parser', 'seletores/html.parser'}
+    medicoes = {nome: {'vazao_relativa': base['vazao_relativa'], 'precisao': dict(base['precisao'])}
+                for nome, base in linha_base['configuracoes'].items()}
+    with redirect_stdout(io.StringIO()):
+        ok = ok and comparar_com_linha_base(medicoes, linha_base, 0.25) == []
+        medicoes['compilado/html.parser']['vazao_relativa'] *= 0.8  # Dentro da tolerância
+        ok = ok and comparar_com_linha_base(medicoes, linha_base, 0.25) == []
+        medicoes['compilado/html.parser']['vazao_relativa'] *= 0.8  # 36% abaixo
+        medicoes['seletores/html.parser']['precisao']['Preco'] -= 0.01
+        regressoes = comparar_com_linha_base(medicoes, linha_base, 0.25)
+    ok = ok and len(regressoes) == 2
+    for regressao in regressoes:
+        print(f"  {regressao}")
+    print("✅ TESTE PASSOU!" if ok else "❌ TESTE FALHOU!")
+    return ok
+
+
+def testar_anonimizacao():
+    """Dados pessoais, IDs reais e rastreio somem; cards e valores do imóvel continuam extraíveis"""
+    print("\n🧪 TESTE DE ANONIMIZAÇÃO DE PÁGINA REAL")
+    anonimo = anonimizar(PAGINA_REAL)
+    proibidos = ['Oscar Freire', '98765-4321', '987654321', 'maria.silva', '01426-001', '2712345678',
+                 'source=ranking', 'sessão', 'data-track', 'style=', 'resizedimgs', '<script', 'card-123', '<path']
+    vazados = [texto for texto in proibidos if texto in anonimo]
+    ok = not vazados and anonimizar(PAGINA_REAL) == anonimo  # Determinística
+
+    scraper = ZapScraper()
+    with redirect_stdout(io.StringIO()):
+        original = [scraper._extrair_dados_anuncio_seletores(c) for c in BeautifulSoup(PAGINA_REAL, 'html.parser').select(SELETOR_CARD_CSS)]
+        limpo = [scraper._extrair_dados_anuncio_seletores(c) for c in BeautifulSoup(anonimo, 'html.parser').select(SELETOR_CARD_CSS)]
+    ok = ok and len(limpo) == len(original) == 1
+    ok = ok and all(limpo[0][campo] == original[0][campo] for campo in ('Descrição', 'M2', 'Preco'))
+    ok = ok and limpo[0]['Endereco'].endswith(', 1500') and id_ficticio('2712345678') in limpo[0]['URL']
+    print(f"  endereço: {limpo[0]['Endereco'] if limpo else None}")
+    print("✅ TESTE PASSOU!" if ok else f"❌ TESTE FALHOU! vazados: {vazados}")
+    return ok
+
+
+if __name__ == "__main__":
+    resultados = [
+        testar_corpus_reproduzivel(),
+        testar_manifesto(),
+        testar_precisao(),
+        testar_regressao(),
+        testar_anonimizacao(),
+    ]
+    if all(resultados):
+        print("\n🎉 Todos os testes passaram!")
+    else:
+        print("\n⚠️ Alguns testes falharam.")
+        raise SystemExit(1)
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste do enriquecimento pelas páginas de detalhe (extração, concorrência limitada e cache em disco)
+"""
+
+import os
+import re
+import tempfile
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from enriquecedor_detalhes import CacheDetalhes, EnriquecedorDetalhes, extrair_campos_detalhe, selecionar_comparaveis
+
+with open('fixtures/pagina_detalhe.html', encoding='utf-8') as f:
+    PAGINA_DETALHE = f.read()
+
+TOTAL_ANUNCIOS = 12
+MAX_SIMULTANEOS = 3
+LATENCIA = 0.1
+
+ESPERADO = {
+    'Area_Total': 95.0,
+    'Condominio': 1350.0,
+    'IPTU': 390.0,
+    'Data_Publicacao': '2024-03-12',
+    'Detalhes_Condominio': 'Piscina, Academia, Elevador, Salão de festas, Portaria 24h',
+    'Comodidades': 'Varanda gourmet, Ar-condicionado, Aceita pets',
+}
+
+
+class Servidor(BaseHTTPRequestHandler):
+    """Páginas de detalhe com latência; conta requisições e o pico de requisições simultâneas"""
+    lock = threading.Lock()
+    requisicoes = 0
+    em_andamento = 0
+    pico = 0
+
+    def do_GET(self):
+        with Servidor.lock:
+            Servidor.requisicoes += 1
+            Servidor.em_andamento += 1
+            Servidor.pico = max(Servidor.pico, Servidor.em_andamento)
+        time.sleep(LATENCIA)
+        with Servidor.lock:
+            Servidor.em_andamento -= 1
+        corpo = PAGINA_DETALHE.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def log_message(self, *args):
+        pass
+
+
+def anuncios(url_base):
+    # Um anúncio repetido (a mesma URL só pode ser buscada uma vez) e um com a URL genérica
+    # montada sem link (não pode ser buscado)
+    lista = [{'URL': f"{url_base}/imovel/venda-{i}/", 'M2': 80 + i} for i in range(TOTAL_ANUNCIOS)]
+    return lista + [dict(lista[0]), {'URL': f"{url_base}/venda/imovel/jardins/rua-x/", 'M2': 90}]
+
+
+def testar_extracao():
+    """Campos iguais pelo estado JSON e pelo DOM (sem __NEXT_DATA__)"""
+    print("🧪 TESTE DE EXTRAÇÃO DA PÁGINA DE DETALHE")
+    pelo_json = extrair_campos_detalhe(PAGINA_DETALHE)
+    sem_estado = re.sub(r'<script id="__NEXT_DATA__".*?</script>', '', PAGINA_DETALHE, flags=re.S)
+    pelo_dom = extrair_campos_detalhe(sem_estado)
+    ok = all(pelo_json.get(campo) == valor for campo, valor in ESPERADO.items())
+    ok = ok and pelo_json['Descricao_Completa'].startswith('Apartamento reformado') and '\n' in pelo_json['Descricao_Completa']
+    ok = ok and pelo_dom == pelo_json
+    print("✅ TESTE PASSOU!" if ok else f"❌ TESTE FALHOU!\n  json: {pelo_json}\n  dom:  {pelo_dom}")
+    return ok
+
+
+def testar_comparaveis():
+    """Os N mais próximos em área vêm primeiro"""
+    print("\n🧪 TESTE DE SELEÇÃO DE COMPARÁVEIS")
+    lista = [{'URL': f"u{m2}", 'M2': m2} for m2 in (40, 120, 95, 70, 100)] + [{'M2': 95}]
+    selecionados = [a['M2'] for a in selecionar_comparaveis(lista, n=3, area=95)]
+    ok = selecionados == [95, 100, 120]
+    # Área ausente ou NaN (linha de DataFrame) não pode ficar entre os mais próximos
+    lista = [{'URL': 'nan', 'M2': float('nan')}, {'URL': 'vazio', 'M2': None}] + lista
+    ok = ok and [a['URL'] for a in selecionar_comparaveis(lista, n=7, area=95)][-2:] == ['nan', 'vazio']
+    # URL genérica (card sem link) não tem página de detalhe
+    lista.append({'URL': 'https://www.zapimoveis.com.br/venda/imovel/jardins/rua-x/', 'M2': 95})
+    ok = ok and all('/venda/imovel/' not in a['URL'] for a in selecionar_comparaveis(lista, n=10, area=95))
+    print("✅ TESTE PASSOU!" if ok else f"❌ TESTE FALHOU! {selecionados}")
+    return ok
+
+
+def testar_concorrencia_e_cache(url_base, caminho_cache):
+    """Respeita o limite de simultâneas; 2ª execução sai do cache; cache vencido busca de novo"""
+    print("\n🧪 TESTE DE CONCORRÊNCIA LIMITADA E CACHE")
+    cache = CacheDetalhes(caminho_cache)
+    enriquecedor = EnriquecedorDetalhes(max_simultaneos=MAX_SIMULTANEOS, cache=cache, taxa_por_segundo=100, rajada=100)
+
+    primeira = enriquecedor.enriquecer(anuncios(url_base))
+    requisicoes_primeira = Servidor.requisicoes
+    ok = requisicoes_primeira == TOTAL_ANUNCIOS and 1 < Servidor.pico <= MAX_SIMULTANEOS
+    ok = ok and all(a.get('Condominio') == 1350.0 for a in primeira[:-1]) and 'Condominio' not in primeira[-1]
+
+    segunda = enriquecedor.enriquecer(anuncios(url_base))
+    ok = ok and Servidor.requisicoes == requisicoes_primeira and enriquecedor.estatisticas['cache'] == TOTAL_ANUNCIOS
+    ok = ok and enriquecedor.estatisticas['falhas'] == 0
+    ok = ok and segunda == primeira
+
+    cache.validade = 0
+    enriquecedor.enriquecer(anuncios(url_base))
+    ok = ok and Servidor.requisicoes == 2 * TOTAL_ANUNCIOS
+    cache.fechar()
+
+    print(f"  requisições: {Servidor.requisicoes} | pico simultâneo: {Servidor.pico} (limite {MAX_SIMULTANEOS})")
+    print("✅ TESTE PASSOU!" if ok else "❌ TESTE FALHOU!")
+    return ok
+
+
+if __name__ == "__main__":
+    servidor = ThreadingHTTPServer(('127.0.0.1', 0), Servidor)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    pasta = tempfile.mkdtemp()
+    try:
+        resultados = [
+            testar_extracao(),
+            testar_comparaveis(),
+            testar_concorrencia_e_cache(f"http://127.0.0.1:{servidor.server_address[1]}",
+                                        os.path.join(pasta, 'detalhes.db')),
+        ]
+    finally:
+        servidor.shutdown()
+
+    if all(resultados):
+        print("\n🎉 Todos os testes passaram!")
+    else:
+        print("\n⚠️ Alguns testes falharam.")
+        raise SystemExit(1)
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste do DriverPool com um driver falso: checkout e devolução, limite de navegadores,
+descarte de navegadores mortos e reciclagem por páginas e por heap JS
+"""
+
+import threading
+import time
+
+from driver_pool import DriverPool
+
+
+class DriverFalso:
+    """Navegador falso: `vivo` controla current_url/window_handles, `heap_mb` o performance.memory
+    e `lentidao` quanto cada conversa com o navegador demora (navegador travado)
+    """
+
+    def __init__(self, numero):
+        self.numero = numero
+        self.vivo = True
+        self.heap_mb = 100
+        self.fechado = False
+        self.lentidao = 0
+
+    @property
+    def current_url(self):
+        time.sleep(self.lentidao)
+        if not self.vivo:
+            raise RuntimeError("chrome not reachable")
+        return "about:blank"
+
+    @property
+    def window_handles(self):
+        return ['aba'] if self.vivo else []
+
+    def execute_script(self, script):
+        return self.heap_mb * 1024 * 1024
+
+    def quit(self):
+        time.sleep(self.lentidao)
+        self.fechado = True
+
+
+def criar_pool(**opcoes):
+    criados = []
+
+    def fabrica():
+        criados.append(DriverFalso(len(criados) + 1))
+        return criados[-1]
+
+    return DriverPool(fabrica, **opcoes), criados
+
+
+def testar_checkout_devolucao():
+    """O navegador devolvido volta no próximo checkout; o pool não passa do tamanho máximo"""
+    print("🧪 TESTE DE CHECKOUT E DEVOLUÇÃO")
+    pool, criados = criar_pool(tamanho_maximo=1)
+    primeiro = pool.checkout()
+    pool.devolver(primeiro, paginas_processadas=2)
+    segundo = pool.checkout()
+    ok = segundo is primeiro and len(criados) == 1
+    ok = ok and pool.estatisticas['criados'] == 1 and pool.estatisticas['reutilizados'] == 1
+
+    # Pool cheio: o checkout espera a devolução (ou estoura o timeout)
+    try:
+        pool.checkout(timeout=0.05)
+        ok = False
+    except TimeoutError:
+        pass
+    threading.Timer(0.1, pool.devolver, args=(segundo,)).start()
+    inicio = time.perf_counter()
+    terceiro = pool.checkout(timeout=2)
+    ok = ok and terceiro is primeiro and time.perf_counter() - inicio >= 0.05
+
+    pool.devolver(terceiro)
+    pool.fechar()
+    ok = ok and primeiro.fechado
+    try:
+        pool.checkout()
+        ok = False
+    except RuntimeError:
+        pass
+    print("✅ TESTE PASSOU!" if ok else f"❌ TESTE FALHOU! {pool.estatisticas}")
+    return ok
+
+
+def testar_descarte_mortos():
+    """Navegador que morreu no pool ou em uso é fechado e substituído por um novo"""
+    print("\n🧪 TESTE DE DESCARTE DE NAVEGADORES MORTOS")
+    pool, criados = criar_pool(tamanho_maximo=1)
+    driver = pool.checkout()
+    pool.devolver(driver)
+    driver.vivo = False  # Morreu enquanto estava livre
+    novo = pool.checkout()
+    ok = novo is not driver and driver.fechado and pool.estatisticas['mortos'] == 1
+
+    novo.vivo = False  # Morreu em uso
+    pool.devolver(novo)
+    ok = ok and novo.fechado and pool.estatisticas['mortos'] == 2
+
+    try:
+        with pool.driver() as driver:
+            driver.vivo = False
+            raise RuntimeError("erro na página")
+    except RuntimeError:
+        pass
+    ok = ok and driver.fechado and len(criados) == 3
+    ok = ok and pool.checkout() is criados[-1] and len(criados) == 4
+    print("✅ TESTE PASSOU!" if ok else f"❌ TESTE FALHOU! {pool.estatisticas}")
+    return ok
+
+
+def testar_reciclagem():
+    """Navegador é reciclado ao atingir o limite de páginas ou de heap JS"""
+    print("\n🧪 TESTE DE RECICLAGEM POR PÁGINAS E POR MEMÓRIA")
+    pool, criados = criar_pool(tamanho_maximo=1, max_paginas_por_driver=5, limite_memoria_mb=500)
+    driver = pool.checkout()
+    pool.devolver(driver, paginas_processadas=3)
+    ok = pool.checkout() is driver and not driver.fechado
+    pool.devolver(driver, paginas_processadas=2)  # 5 páginas no total
+    ok = ok and driver.fechado and pool.estatisticas['reciclados'] == 1
+
+    pesado = pool.checkout()
+    pesado.heap_mb = 800
+    pool.devolver(pesado, paginas_processadas=1)
+    ok = ok and pesado is not driver and pesado.fechado and pool.estatisticas['reciclados'] == 2
+    ok = ok and pool.checkout() is not pesado and len(criados) == 3
+    print(f"  estatísticas: {pool.estatisticas}")
+    print("✅ TESTE PASSOU!" if ok else "❌ TESTE FALHOU!")
+    return ok
+
+
+def testar_navegador_lento_nao_trava_pool():
+    """Verificação de saúde e quit() de um navegador lento não seguram o checkout e a devolução dos outros"""
+    print("\n🧪 TESTE DE NAVEGADOR LENTO FORA DO LOCK")
+    pool, criados = criar_pool(tamanho_maximo=2)
+    lento, rapido = pool.checkout(), pool.checkout()
+    lento.lentidao = 0.5
+    devolucao = threading.Thread(target=pool.devolver, args=(lento,))
+    devolucao.start()
+    time.sleep(0.05)  # A devolução do lento já está na verificação de saúde
+    inicio = time.perf_counter()
+    pool.devolver(rapido)
+    ok = pool.checkout(timeout=1) is rapido
+    segundos = time.perf_counter() - inicio
+    devolucao.join()
+    ok = ok and segundos < 0.2 and pool.checkout(timeout=1) is lento
+
+    # quit() lento ao fechar um navegador reciclado também fica fora do lock
+    pool.devolver(lento, descartar=True)
+    fechamento = threading.Thread(target=pool.devolver, args=(rapido,), kwargs={'descartar': True})
+    rapido.lentidao = 0.5
+    fechamento.start()
+    time.sleep(0.05)
+    inicio = time.perf_counter()
+    novo = pool.checkout(timeout=1)
+    ok = ok and time.perf_counter() - inicio < 0.2 and novo not in (lento, rapido)
+    fechamento.join()
+    ok = ok and rapido.fechado and len(criados) <= 4
+    print(f"  devolução + checkout durante a verificação do lento: {segundos * 1000:.0f} ms")
+    print("✅ TESTE PASSOU!" if ok else f"❌ TESTE FALHOU! {pool.estatisticas}")
+    return ok
+
+
+if __name__ == "__main__":
+    resultados = [
+        testar_checkout_devolucao(),
+        testar_descarte_mortos(),
+        testar_reciclagem(),
+        testar_navegador_lento_nao_trava_pool(),
+    ]
+    if all(resultados):
+        print("\n🎉 Todos os testes passaram!")
+    else:
+        print("\n⚠️ Alguns testes falharam.")
+        raise SystemExit(1)
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste do extrator de estado JSON (__NEXT_DATA__) comparado à extração pelo DOM
+"""
+
+import io
+import time
+from contextlib import redirect_stdout
+
+from zap_scraper import ZapScraper
+from extrator_json import extrair_anuncios_json
+
+CAMPOS_COMUNS = ['Descrição', 'Endereco', 'M2', 'Quartos', 'Banheiros', 'Vagas',
+                 'Preco', 'Condominio', 'IPTU', 'R$/M2', 'URL']
+
+
+def testar_paridade_json_dom():
+    """O JSON deve produzir os mesmos campos que o DOM, mais ID e coordenadas"""
+    print("🧪 TESTE DE PARIDADE JSON x DOM")
+    print("=" * 50)
+
+    with open('fixtures/pagina_resultados_next.html', encoding='utf-8') as f:
+        html = f.read()
+
+    scraper = ZapScraper()
+    scraper.usar_estado_json = False
+    with redirect_stdout(io.StringIO()):
+        anuncios_dom = scraper.extrair_anuncios_html(html)[:-1]  # último card é duplicata
+    anuncios_json = extrair_anuncios_json(html)
+
+    divergencias = 0
+    for dom, js in zip(anuncios_dom, anuncios_json):
+        for campo in CAMPOS_COMUNS:
+            if dom.get(campo) != js.get(campo):
+                divergencias += 1
+                print(f"❌ {campo}: DOM={dom.get(campo)!r} JSON={js.get(campo)!r}")
+    sem_extras = [a for a in anuncios_json if not ('ID' in a and 'Latitude' in a)]
+
+    ok = len(anuncios_dom) == len(anuncios_json) and divergencias == 0 and not sem_extras
+    if ok:
+        print(f"✅ TESTE PASSOU! {len(anuncios_json)} anúncios idênticos, com ID e coordenadas")
+    else:
+        print(f"❌ TESTE FALHOU! DOM={len(anuncios_dom)} JSON={len(anuncios_json)} divergências={divergencias}")
+    return ok
+
+
+def testar_fallback_dom():
+    """Sem __NEXT_DATA__ a extração deve cair para o DOM"""
+    print("\n🧪 TESTE DE FALLBACK PARA O DOM")
+    with open('fixtures/pagina_resultados.html', encoding='utf-8') as f:
+        html = f.read()
+    scraper = ZapScraper()
+    with redirect_stdout(io.StringIO()):
+        anuncios = scraper.extrair_anuncios_html(html)
+    ok = extrair_anuncios_json(html) == [] and len(anuncios) == 31
+    print("✅ TESTE PASSOU!" if ok else f"❌ TESTE FALHOU! {len(anuncios)} anúncios")
+    return ok
+
+
+def comparar_tempo(repeticoes=20):
+    """Mostra o tempo por página de cada caminho"""
+    with open('fixtures/pagina_resultados_next.html', encoding='utf-8') as f:
+        html = f.read()
+    scraper = ZapScraper()
+    tempos = {}
+    for nome, usar_json in (('DOM', False), ('JSON', True)):
+        scraper.usar_estado_json = usar_json
+        inicio = time.perf_counter()
+        with redirect_stdout(io.StringIO()):
+            for _ in range(repeticoes):
+                scraper.extrair_anuncios_html(html)
+        tempos[nome] = (time.perf_counter() - inicio) / repeticoes
+    print(f"\n⏱️ DOM: {tempos['DOM'] * 1000:.1f} ms/página | JSON: {tempos['JSON'] * 1000:.2f} ms/página "
+          f"({tempos['DOM'] / tempos['JSON']:.0f}x)")
+
+
+if __name__ == "__main__":
+    resultados = [testar_paridade_json_dom(), testar_fallback_dom()]
+    comparar_tempo()
+    if all(resultados):
+        print("\n🎉 Todos os testes passaram!")
+    else:
+        print("\n⚠️ Alguns testes falharam.")
+        raise SystemExit(1)
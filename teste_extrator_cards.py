@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste de paridade do extrator compilado de cards com a extração por seletores,
+nas fixtures e em variantes que forçam cada caminho alternativo (área, preço, URL)
+"""
+
+import io
+import re
+from contextlib import redirect_stdout
+
+from bs4 import BeautifulSoup
+
+from zap_scraper import ZapScraper, SELETOR_CARD_CSS
+from extrator_cards import extrair_card
+
+FIXTURES = ['fixtures/pagina_resultados.html', 'fixtures/pagina_resultados_next.html']
+
+# Cada variante quebra um seletor principal para exercitar o caminho alternativo
+VARIANTES = {
+    'sem data-cy de área': lambda h: h.replace('data-cy="rp-cardProperty-propertyArea-txt"', ''),
+    'sem classe de preço': lambda h: h.replace('text-2-25 text-feedback-success-110 font-semibold', 'preco')
+                                      .replace('text-2-25 text-neutral-120 font-semibold', 'preco'),
+    'preço em span': lambda h: re.sub(r'<p class="text-2-25[^"]*">(.*?)</p>', r'<span>\1</span>', h, flags=re.S),
+    'sem link /imovel/': lambda h: h.replace('/imovel/', '/anuncio/'),
+    'só links externos': lambda h: re.sub(r'href="/[^"]*"', 'href="https://facebook.com/x"', h),
+    'sem links': lambda h: re.sub(r'<a [^>]*>.*?</a>', '', h, flags=re.S),
+    'quartos sem número': lambda h: re.sub(r'(bedroomQuantity-txt">\s*(?:<svg></svg>)?\s*)\d+', r'\1-', h),
+    'classes de características trocadas': lambda h: h.replace('flex row items-center gap-0-5', 'flex row items-center'),
+    'sem taxas': lambda h: h.replace('text-1-75 text-neutral-110', 'x'),
+    'área com vírgula': lambda h: re.sub(r'(\d+) m²', r'\1,5 m²', h),
+}
+
+
+def cards_de(html):
+    return BeautifulSoup(html, 'html.parser').select(SELETOR_CARD_CSS)
+
+
+def comparar(cards, scraper):
+    """Retorna a lista de divergências (índice, seletores, compilado)"""
+    with redirect_stdout(io.StringIO()):
+        referencia = [scraper._extrair_dados_anuncio_seletores(card) for card in cards]
+        compilado = [extrair_card(card) for card in cards]
+    return [(i, a, b) for i, (a, b) in enumerate(zip(referencia, compilado)) if a != b]
+
+
+def testar_paridade_fixtures():
+    print("🧪 TESTE DE PARIDADE NAS FIXTURES")
+    scraper = ZapScraper()
+    ok = True
+    for caminho in FIXTURES:
+        with open(caminho, encoding='utf-8') as f:
+            cards = cards_de(f.read())
+        divergencias = comparar(cards, scraper)
+        ok = ok and not divergencias and len(cards) > 0
+        print(f"  {caminho}: {len(cards)} cards, {len(divergencias)} divergências")
+        for indice, referencia, compilado in divergencias[:3]:
+            print(f"    card {indice}: seletores={referencia} compilado={compilado}")
+    print("✅ TESTE PASSOU!" if ok else "❌ TESTE FALHOU!")
+    return ok
+
+
+def testar_paridade_variantes():
+    print("\n🧪 TESTE DE PARIDADE NOS CAMINHOS ALTERNATIVOS")
+    scraper = ZapScraper()
+    with open(FIXTURES[0], encoding='utf-8') as f:
+        html = f.read()
+    ok = True
+    for nome, transformar in VARIANTES.items():
+        cards = cards_de(transformar(html))
+        divergencias = comparar(cards, scraper)
+        ok = ok and not divergencias
+        simbolo = "✅" if not divergencias else "❌"
+        print(f"  {simbolo} {nome}: {len(cards)} cards, {len(divergencias)} divergências")
+        for indice, referencia, compilado in divergencias[:2]:
+            print(f"    card {indice}: seletores={referencia} compilado={compilado}")
+    print("✅ TESTE PASSOU!" if ok else "❌ TESTE FALHOU!")
+    return ok
+
+
+def testar_extracao_pagina():
+    """extrair_anuncios_html usa o extrator compilado e dá o mesmo resultado com ele desligado"""
+    print("\n🧪 TESTE DA PÁGINA INTEIRA PELOS DOIS CAMINHOS")
+    with open(FIXTURES[0], encoding='utf-8') as f:
+        html = f.read()
+    scraper = ZapScraper()
+    with redirect_stdout(io.StringIO()):
+        compilado = scraper.extrair_anuncios_html(html)
+        scraper.extracao_compilada = False
+        seletores = scraper.extrair_anuncios_html(html)
+    ok = compilado == seletores and len(compilado) == 31
+    print("✅ TESTE PASSOU!" if ok else f"❌ TESTE FALHOU! {len(compilado)} x {len(seletores)}")
+    return ok
+
+
+if __name__ == "__main__":
+    resultados = [testar_paridade_fixtures(), testar_paridade_variantes(), testar_extracao_pagina()]
+    if all(resultados):
+        print("\n🎉 Todos os testes passaram!")
+    else:
+        print("\n⚠️ Alguns testes falharam.")
+        raise SystemExit(1)
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste do modo HTTP-first contra um servidor HTTP local com páginas de fixture
+"""
+
+import io
+import threading
+from contextlib import redirect_stdout
+from http.server import HTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+from zap_scraper import ZapScraper
+from cliente_http import pagina_bloqueada
+from throttle_adaptativo import detectar_bloqueio
+
+with open('fixtures/pagina_resultados.html', encoding='utf-8') as f:
+    PAGINA_RESULTADOS = f.read()
+with open('fixtures/pagina_bloqueio.html', encoding='utf-8') as f:
+    PAGINA_BLOQUEIO = f.read()
+
+PAGINA_VAZIA = "<html><body><p>Nenhum imóvel encontrado</p></body></html>"
+# Página de resultados legítima com um widget de reCAPTCHA (formulário de contato) no topo
+PAGINA_COM_RECAPTCHA = PAGINA_RESULTADOS.replace(
+    '<body>', '<body><div class="g-recaptcha" data-sitekey="x"></div>', 1)
+
+
+class ServidorFixtures(BaseHTTPRequestHandler):
+    """/resultados serve 2 páginas com cards e depois vazio; /bloqueado serve um desafio na página 2
+    (403 em /bloqueado/, 200 em /desafio/); /recaptcha serve resultados com widget de reCAPTCHA;
+    /erro dá 502 na página 2 e /removida dá 404 na página 2
+    """
+
+    def do_GET(self):
+        partes = urlparse(self.path)
+        pagina = int(parse_qs(partes.query).get('pagina', ['1'])[0])
+        status, corpo = 200, PAGINA_VAZIA
+        if partes.path == '/resultados/' and pagina <= 2:
+            corpo = PAGINA_RESULTADOS
+        elif partes.path == '/bloqueado/':
+            status, corpo = (200, PAGINA_RESULTADOS) if pagina == 1 else (403, PAGINA_BLOQUEIO)
+        elif partes.path == '/desafio/':
+            corpo = PAGINA_RESULTADOS if pagina == 1 else PAGINA_BLOQUEIO
+        elif partes.path == '/recaptcha/' and pagina <= 2:
+            corpo = PAGINA_COM_RECAPTCHA
+        elif partes.path in ('/erro/', '/removida/'):
+            erro = 502 if partes.path == '/erro/' else 404
+            status, corpo = (200, PAGINA_RESULTADOS) if pagina == 1 else (erro, "<html><body>Erro</body></html>")
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.end_headers()
+        self.wfile.write(corpo.encode('utf-8'))
+
+    def log_message(self, *args):
+        pass
+
+
+def iniciar_servidor():
+    """Sobe o servidor em uma porta livre e retorna (servidor, url_base)"""
+    servidor = HTTPServer(('127.0.0.1', 0), ServidorFixtures)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor, f"http://127.0.0.1:{servidor.server_address[1]}"
+
+
+def testar_deteccao_bloqueio():
+    """Triagem pelo status antes do parse; o conteúdo só é julgado com a contagem de cards"""
+    print("🧪 TESTE DE DETECÇÃO DE BLOQUEIO")
+    ok = pagina_bloqueada(status=429) and not pagina_bloqueada(200)
+    ok = ok and detectar_bloqueio(PAGINA_BLOQUEIO, 200, 0) and not detectar_bloqueio(PAGINA_RESULTADOS, 200, 31)
+    ok = ok and not detectar_bloqueio(PAGINA_COM_RECAPTCHA, 200, 31)
+    print("✅ TESTE PASSOU!" if ok else "❌ TESTE FALHOU!")
+    return ok
+
+
+def testar_coleta_http(url_base):
+    """Coleta via HTTP até a página vazia, sem precisar do Chrome"""
+    print("\n🧪 TESTE DE COLETA VIA HTTP")
+    scraper = ZapScraper()
+    resultados, pagina_bloqueio = scraper.coletar_paginas_http(f"{url_base}/resultados/", max_paginas=5)
+    ok = pagina_bloqueio is None and sorted(resultados) == [1, 2] and len(resultados[1]) == 31
+    scraper.obter_cliente_http().fechar()
+    print("✅ TESTE PASSOU!" if ok else f"❌ TESTE FALHOU! páginas={sorted(resultados)} bloqueio={pagina_bloqueio}")
+    return ok
+
+
+def testar_escalonamento(url_base):
+    """Um desafio na página 2 deve interromper o HTTP e indicar a página para o Chrome"""
+    print("\n🧪 TESTE DE ESCALONAMENTO PARA O CHROME")
+    scraper = ZapScraper()
+    resultados, pagina_bloqueio = scraper.coletar_paginas_http(f"{url_base}/bloqueado/", max_paginas=5)
+    ok = pagina_bloqueio == 2 and sorted(resultados) == [1]
+    scraper.obter_cliente_http().fechar()
+    print("✅ TESTE PASSOU!" if ok else f"❌ TESTE FALHOU! páginas={sorted(resultados)} bloqueio={pagina_bloqueio}")
+    return ok
+
+
+def testar_recaptcha_com_cards(url_base):
+    """Página com cards e widget de reCAPTCHA é resultado; o desafio com status 200 ainda escala"""
+    print("\n🧪 TESTE DE reCAPTCHA EM PÁGINA COM ANÚNCIOS")
+    scraper = ZapScraper()
+    resultados, pagina_bloqueio = scraper.coletar_paginas_http(f"{url_base}/recaptcha/", max_paginas=5)
+    ok = pagina_bloqueio is None and sorted(resultados) == [1, 2] and len(resultados[1]) == 31
+    desafio, pagina_desafio = scraper.coletar_paginas_http(f"{url_base}/desafio/", max_paginas=5)
+    ok = ok and pagina_desafio == 2 and sorted(desafio) == [1]
+    scraper.obter_cliente_http().fechar()
+    print("✅ TESTE PASSOU!" if ok else f"❌ TESTE FALHOU! páginas={sorted(resultados)} bloqueio={pagina_bloqueio} "
+          f"desafio={pagina_desafio}")
+    return ok
+
+
+def testar_erro_servidor(url_base):
+    """Um 502 na página 2 não é o fim dos resultados: a página fica pendente; um 404 encerra"""
+    print("\n🧪 TESTE DE ERRO DO SERVIDOR (5xx)")
+    scraper = ZapScraper()
+    resultados, pagina_erro = scraper.coletar_paginas_http(f"{url_base}/erro/", max_paginas=5)
+    ok = pagina_erro == 2 and sorted(resultados) == [1]
+    removida, pagina_removida = scraper.coletar_paginas_http(f"{url_base}/removida/", max_paginas=5)
+    ok = ok and pagina_removida is None and sorted(removida) == [1]
+
+    scraper.modo_fetch = 'http'
+    scraper.salvar_dados = lambda: None
+    with redirect_stdout(io.StringIO()):
+        scraper.extrair_dados_pagina(f"{url_base}/erro/", max_paginas=5)
+    ok = ok and scraper.pagina_interrompida == 2
+    scraper.obter_cliente_http().fechar()
+    print("✅ TESTE PASSOU!" if ok else f"❌ TESTE FALHOU! erro={pagina_erro} 404={pagina_removida} "
+          f"interrompida={scraper.pagina_interrompida}")
+    return ok
+
+
+if __name__ == "__main__":
+    servidor, url_base = iniciar_servidor()
+    try:
+        resultados = [
+            testar_deteccao_bloqueio(),
+            testar_coleta_http(url_base),
+            testar_escalonamento(url_base),
+            testar_recaptcha_com_cards(url_base),
+            testar_erro_servidor(url_base),
+        ]
+    finally:
+        servidor.shutdown()
+
+    if all(resultados):
+        print("\n🎉 Todos os testes passaram!")
+    else:
+        print("\n⚠️ Alguns testes falharam.")
+        raise SystemExit(1)
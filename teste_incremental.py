@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste do crawl incremental: duas "semanas" contra um servidor local ordenado pelos mais recentes
+"""
+
+import json
+import os
+import tempfile
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+from zap_scraper import ZapScraper
+from indice_anuncios import IndiceAnuncios, url_mais_recentes, ORDEM_MAIS_RECENTES, PRECO_ALTERADO
+from throttle_adaptativo import ThrottleAdaptativo
+
+POR_PAGINA = 10
+
+
+def listagem(numero, preco):
+    return {
+        'listing': {
+            'id': str(2700000000 + numero), 'usableAreas': [50 + numero % 40], 'bedrooms': [2], 'bathrooms': [1],
+            'address': {'city': 'São Paulo', 'neighborhood': 'Pinheiros', 'street': 'Rua Teste', 'streetNumber': str(numero)},
+            'pricingInfos': [{'businessType': 'SALE', 'price': str(preco)}],
+        },
+        'link': {'href': f"/imovel/venda-apartamento-id-{2700000000 + numero}/"},
+    }
+
+
+class Catalogo(BaseHTTPRequestHandler):
+    """Anúncios do mais recente ao mais antigo; registra as páginas pedidas e a ordenação"""
+    anuncios = []
+    paginas_servidas = []
+    ordens = set()
+
+    def do_GET(self):
+        parametros = parse_qs(urlparse(self.path).query)
+        pagina = int(parametros.get('pagina', ['1'])[0])
+        Catalogo.paginas_servidas.append(pagina)
+        Catalogo.ordens.update(parametros.get('ordem', []))
+        itens = Catalogo.anuncios[(pagina - 1) * POR_PAGINA:pagina * POR_PAGINA]
+        estado = {'props': {'pageProps': {'initialState': {'results': {'listings': itens}}}}}
+        corpo = (f'<html><body><script id="__NEXT_DATA__" type="application/json">{json.dumps(estado)}</script>'
+                 f'</body></html>').encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def log_message(self, *args):
+        pass
+
+
+def rodar(url_busca, caminho_indice, max_paginas=10):
+    """Uma execução incremental; retorna (linhas de saída, páginas pedidas ao servidor, scraper)"""
+    Catalogo.paginas_servidas = []
+    indice = IndiceAnuncios(caminho_indice)
+    scraper = ZapScraper(indice=indice)
+    scraper.modo_fetch = 'http'
+    scraper.throttle = ThrottleAdaptativo(atraso_inicial=0, atraso_minimo=0, cooldown_base=0)
+    scraper.salvar_dados = lambda: list(scraper.data_list)  # Sem CSV em disco
+    linhas = scraper.extrair_dados_pagina(url_busca, max_paginas)
+    scraper.fechar_clientes_http()
+    indice.fechar()
+    return linhas, sorted(Catalogo.paginas_servidas), scraper
+
+
+def testar_url_ordenada():
+    """A busca é ordenada pelos mais recentes, sem sobrescrever uma ordenação explícita"""
+    print("🧪 TESTE DA ORDENAÇÃO PELOS MAIS RECENTES")
+    ok = 'ordem=Mais+recente' in url_mais_recentes("https://x/venda/?transacao=venda")
+    ok = ok and url_mais_recentes("https://x/venda/?ordem=Menor+pre%C3%A7o").count('ordem=') == 1
+    ok = ok and 'Menor' in url_mais_recentes("https://x/venda/?ordem=Menor+pre%C3%A7o")
+    print("✅ TESTE PASSOU!" if ok else "❌ TESTE FALHOU!")
+    return ok
+
+
+def testar_duas_semanas(url_base, caminho_indice):
+    """1ª semana: tudo novo. 2ª semana: só os 5 novos e o preço alterado, parando na página 2"""
+    print("\n🧪 TESTE DE DUAS EXECUÇÕES INCREMENTAIS")
+    Catalogo.anuncios = [listagem(n, 500000 + n * 1000) for n in range(60, 10, -1)]  # 50 anúncios, 5 páginas
+    primeira, paginas_primeira, _ = rodar(f"{url_base}/venda/", caminho_indice)
+    ok = len(primeira) == 50 and all(l['Situacao'] == 'novo' for l in primeira)
+    ok = ok and paginas_primeira == [1, 2, 3, 4, 5, 6] and Catalogo.ordens == {ORDEM_MAIS_RECENTES}
+    print(f"  semana 1: {len(primeira)} linhas, páginas {paginas_primeira}")
+
+    # Semana 2: 5 anúncios novos no topo e uma redução de preço em um anúncio da 1ª página
+    Catalogo.anuncios = [listagem(n, 600000 + n) for n in range(65, 60, -1)] + Catalogo.anuncios
+    Catalogo.anuncios[7] = listagem(58, 450000)
+    segunda, paginas_segunda, scraper = rodar(f"{url_base}/venda/", caminho_indice)
+    situacoes = sorted(l['Situacao'] for l in segunda)
+    alterado = next((l for l in segunda if l['Situacao'] == 'preco_alterado'), {})
+    ok = ok and situacoes == ['novo'] * 5 + ['preco_alterado'] and paginas_segunda == [1, 2]
+    ok = ok and alterado.get('Preco') == 450000 and alterado.get('Preco_Anterior') == 558000
+    ok = ok and scraper.parada_incremental == 2
+
+    indice = IndiceAnuncios(caminho_indice)
+    registro = indice.obter('id:2700000058')
+    ok = ok and len(indice) == 55 and registro['preco'] == 450000 and registro['preco_anterior'] == 558000
+    ok = ok and registro['ultima_vez'] > registro['primeira_vez']
+    indice.fechar()
+    print(f"  semana 2: {len(segunda)} linhas ({', '.join(situacoes)}), páginas {paginas_segunda}")
+    print("✅ TESTE PASSOU!" if ok else "❌ TESTE FALHOU!")
+    return ok
+
+
+def testar_chave_sem_id(caminho_indice):
+    """Anúncio sem ID nem URL do imóvel: a chave pelas características ignora o preço"""
+    print("\n🧪 TESTE DE PREÇO ALTERADO EM ANÚNCIO SEM ID")
+    scraper = ZapScraper()
+    anuncio = {'Descrição': 'Apartamento em Pinheiros', 'Endereco': 'Rua Teste, 10', 'M2': 70.0,
+               'Quartos': 2, 'Banheiros': 1, 'Vagas': 1, 'Preco': 800000.0, 'URL': ''}
+    reduzido = dict(anuncio, Preco=760000.0)
+    ok = scraper.chave_anuncio(anuncio) == scraper.chave_anuncio(reduzido)
+    ok = ok and scraper.chave_anuncio(anuncio) != scraper.chave_anuncio(dict(anuncio, M2=71.0))
+
+    indice = IndiceAnuncios(caminho_indice)
+    indice.registrar_pagina([(scraper.chave_anuncio(anuncio), anuncio)])
+    situacao, anterior = indice.registrar_pagina([(scraper.chave_anuncio(reduzido), reduzido)])[0]
+    indice.fechar()
+    ok = ok and situacao == PRECO_ALTERADO and anterior == 800000.0
+    print("✅ TESTE PASSOU!" if ok else f"❌ TESTE FALHOU! {situacao}")
+    return ok
+
+
+if __name__ == "__main__":
+    servidor = ThreadingHTTPServer(('127.0.0.1', 0), Catalogo)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    pasta = tempfile.mkdtemp()
+    try:
+        resultados = [
+            testar_url_ordenada(),
+            testar_duas_semanas(f"http://127.0.0.1:{servidor.server_address[1]}", os.path.join(pasta, 'indice.db')),
+            testar_chave_sem_id(os.path.join(pasta, 'indice_sem_id.db')),
+        ]
+    finally:
+        servidor.shutdown()
+
+    if all(resultados):
+        print("\n🎉 Todos os testes passaram!")
+    else:
+        print("\n⚠️ Alguns testes falharam.")
+        raise SystemExit(1)
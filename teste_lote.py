@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste do executor em lote contra o servidor HTTP local de fixtures
+"""
+
+import json
+import os
+import tempfile
+
+from zap_scraper import ZapScraper
+from executor_lote import ExecutorLote, carregar_manifesto
+from teste_fetch_http import iniciar_servidor
+
+
+def criar_scraper_http(sink):
+    """Scraper só HTTP, sem Chrome"""
+    scraper = ZapScraper(sink=sink)
+    scraper.modo_fetch = 'http'
+    return scraper
+
+
+def testar_manifesto_csv(pasta):
+    """CSV sem nome gera nome a partir da URL; nomes repetidos ganham sufixo"""
+    print("🧪 TESTE DE LEITURA DO MANIFESTO")
+    caminho = os.path.join(pasta, 'manifesto.csv')
+    with open(caminho, 'w', encoding='utf-8') as f:
+        f.write("url,max_paginas,prioridade,nome\n")
+        f.write("https://www.zapimoveis.com.br/venda/apartamentos/sp+sao-paulo/,3,1,\n")
+        f.write("https://www.zapimoveis.com.br/venda/apartamentos/sp+sao-paulo/?quartos=2,,,\n")
+    itens = carregar_manifesto(caminho)
+    nomes = [i['nome'] for i in itens]
+    ok = nomes == ['venda_apartamentos_sp_sao_paulo', 'venda_apartamentos_sp_sao_paulo_2']
+    ok = ok and itens[0]['max_paginas'] == 3 and itens[1]['max_paginas'] == 5 and itens[0]['prioridade'] == 1
+    print("✅ TESTE PASSOU!" if ok else f"❌ TESTE FALHOU! {itens}")
+    return ok
+
+
+def testar_lote(pasta, url_base):
+    """Duas URLs com dados, uma interrompida na página 2 e uma vazia: partições separadas,
+    falha e parcial após as tentativas e resumo
+    """
+    print("\n🧪 TESTE DE EXECUÇÃO EM LOTE")
+    caminho = os.path.join(pasta, 'manifesto.json')
+    with open(caminho, 'w', encoding='utf-8') as f:
+        json.dump([
+            {'url': f"{url_base}/resultados/", 'max_paginas': 4, 'nome': 'resultados'},
+            {'url': f"{url_base}/bloqueado/", 'max_paginas': 1, 'prioridade': 5, 'nome': 'bloqueado'},
+            {'url': f"{url_base}/vazio/", 'max_paginas': 2, 'nome': 'vazio'},
+            {'url': f"{url_base}/bloqueado/", 'max_paginas': 3, 'nome': 'parcial'},
+        ], f)
+    executor = ExecutorLote(num_workers=2, max_tentativas=2, espera_base=0, formato_saida='jsonl',
+                            pasta_saida=os.path.join(pasta, 'lote'), fabrica_scraper=criar_scraper_http)
+    resumo = executor.executar(carregar_manifesto(caminho))
+    itens = {r['nome']: r for r in resumo['itens']}
+
+    ok = resumo['urls'] == 4 and resumo['sucesso'] == 2 and resumo['linhas'] == 90
+    ok = ok and itens['vazio']['status'] == 'falha' and itens['vazio']['tentativas'] == 2
+    ok = ok and itens['parcial']['status'] == 'parcial' and itens['parcial']['tentativas'] == 2
+    ok = ok and sorted(f['nome'] for f in resumo['falhas']) == ['parcial', 'vazio']
+    ok = ok and all(os.path.exists(itens[n]['saida']) for n in ('resultados', 'bloqueado'))
+    ok = ok and os.path.exists(os.path.join(pasta, 'lote', 'resumo.json'))
+    print("✅ TESTE PASSOU!" if ok else f"❌ TESTE FALHOU! {resumo}")
+    return ok
+
+
+def testar_backoff_fora_do_worker(pasta, url_base):
+    """Durante o backoff da nova tentativa o único worker atende a próxima URL da fila"""
+    print("\n🧪 TESTE DE BACKOFF SEM OCUPAR O WORKER")
+    ordem = []
+
+    def fabrica(sink):
+        ordem.append(os.path.basename(os.path.dirname(sink.caminho)))
+        return criar_scraper_http(sink)
+
+    executor = ExecutorLote(num_workers=1, max_tentativas=2, espera_base=0.5, formato_saida='jsonl',
+                            pasta_saida=os.path.join(pasta, 'backoff'), fabrica_scraper=fabrica)
+    itens = [
+        {'url': f"{url_base}/vazio/", 'max_paginas': 1, 'prioridade': 5, 'nome': 'vazio', 'ordem': 0},
+        {'url': f"{url_base}/resultados/", 'max_paginas': 2, 'prioridade': 0, 'nome': 'resultados', 'ordem': 1},
+    ]
+    resumo = executor.executar(itens)
+    ok = ordem == ['vazio', 'resultados', 'vazio'] and resumo['sucesso'] == 1
+    print("✅ TESTE PASSOU!" if ok else f"❌ TESTE FALHOU! ordem={ordem}")
+    return ok
+
+
+if __name__ == "__main__":
+    servidor, url_base = iniciar_servidor()
+    try:
+        with tempfile.TemporaryDirectory() as pasta:
+            resultados = [
+                testar_manifesto_csv(pasta),
+                testar_lote(pasta, url_base),
+                testar_backoff_fora_do_worker(pasta, url_base),
+            ]
+    finally:
+        servidor.shutdown()
+
+    if all(resultados):
+        print("\n🎉 Todos os testes passaram!")
+    else:
+        print("\n⚠️ Alguns testes falharam.")
+        raise SystemExit(1)
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste do SCRIPT_PAGINA_PRONTA rodando no Node com um DOM mínimo: página sem cards conclui
+após a quietude quando há aviso de busca vazia ou paginação, e só então; sem nenhum dos
+dois, espera o limite (os cards ainda podem renderizar)
+"""
+
+import json
+import shutil
+import subprocess
+
+from zap_scraper import SCRIPT_PAGINA_PRONTA, SELETOR_CARD_CSS
+
+QUIETUDE_MS = 200
+LIMITE_MS = 3000
+
+# DOM mínimo: querySelector acha um elemento se alguma parte do seletor está em `elementos`;
+# `mudancas` troca o número de cards em instantes dados e avisa o MutationObserver
+PROGRAMA = """
+const cenario = %(cenario)s;
+let cards = 0;
+const observadores = [];
+global.MutationObserver = class {
+    constructor(callback) { this.callback = callback; observadores.push(this); }
+    observe() {}
+    disconnect() { this.callback = null; }
+};
+const elemento = {hasAttribute: () => false, getBoundingClientRect: () => ({width: 80, height: 30})};
+global.document = {
+    readyState: 'complete',
+    documentElement: {},
+    body: {textContent: cenario.texto || ''},
+    querySelectorAll: () => ({length: cards}),
+    querySelector: (seletor) => seletor.split(',').some(p => cenario.elementos.includes(p.trim())) ? elemento : null,
+};
+for (const [ms, n] of cenario.mudancas) {
+    setTimeout(() => { cards = n; observadores.forEach(o => o.callback && o.callback()); }, ms);
+}
+new Function(%(script)s)(%(seletor)s, %(quietude)d, %(limite)d, (resultado) => {
+    console.log(JSON.stringify(resultado));
+    process.exit(0);
+});
+"""
+
+
+def executar(elementos=(), texto='', mudancas=()):
+    """Roda o script no cenário e retorna o objeto entregue ao callback"""
+    programa = PROGRAMA % {
+        'cenario': json.dumps({'elementos': list(elementos), 'texto': texto, 'mudancas': list(mudancas)}),
+        'script': json.dumps(SCRIPT_PAGINA_PRONTA),
+        'seletor': json.dumps(SELETOR_CARD_CSS),
+        'quietude': QUIETUDE_MS,
+        'limite': LIMITE_MS,
+    }
+    saida = subprocess.run(['node', '-'], input=programa, capture_output=True, text=True, timeout=30, check=True)
+    return json.loads(saida.stdout)
+
+
+def testar_pagina_vazia_conclui():
+    """Zero cards com aviso de vazio, texto de vazio ou paginação: conclui na quietude, sem timeout"""
+    print("🧪 TESTE DE PÁGINA SEM RESULTADOS")
+    cenarios = {
+        'aviso': {'elementos': ['[data-testid*="empty"]']},
+        'paginação': {'elementos': ['nav[aria-label*="página" i]']},
+        'texto': {'texto': 'Não encontramos resultados para a sua busca'},
+    }
+    ok = True
+    for nome, cenario in cenarios.items():
+        resultado = executar(**cenario)
+        print(f"  {nome}: {resultado}")
+        ok = ok and resultado['cards'] == 0 and resultado['vazia'] and not resultado['timeout']
+        ok = ok and QUIETUDE_MS <= resultado['ms'] < LIMITE_MS / 3
+    print("✅ TESTE PASSOU!" if ok else "❌ TESTE FALHOU!")
+    return ok
+
+
+def testar_sem_marcador_espera():
+    """Zero cards sem nenhum marcador: nada permite concluir "fim dos resultados" antes do limite"""
+    print("\n🧪 TESTE DE PÁGINA SEM CARDS E SEM MARCADOR")
+    resultado = executar(texto='Carregando...')
+    print(f"  {resultado}")
+    ok = resultado['cards'] == 0 and resultado['timeout'] and not resultado['vazia']
+    ok = ok and resultado['ms'] >= LIMITE_MS
+    print("✅ TESTE PASSOU!" if ok else "❌ TESTE FALHOU!")
+    return ok
+
+
+def testar_cards_depois_da_paginacao():
+    """Paginação já na tela e cards chegando antes da quietude: conclui com os cards, não como vazia"""
+    print("\n🧪 TESTE DE CARDS QUE CHEGAM DEPOIS DA PAGINAÇÃO")
+    resultado = executar(elementos=['button[data-testid="next-page"]'], mudancas=[(100, 12), (150, 30)])
+    print(f"  {resultado}")
+    ok = resultado['cards'] == 30 and not resultado['vazia'] and not resultado['timeout']
+    ok = ok and resultado['ms'] >= 150 + QUIETUDE_MS
+    print("✅ TESTE PASSOU!" if ok else "❌ TESTE FALHOU!")
+    return ok
+
+
+if __name__ == "__main__":
+    if shutil.which('node') is None:
+        print("⚠️ Node não encontrado: o script de prontidão não pode ser executado fora do Chrome.")
+        raise SystemExit(1)
+    resultados = [
+        testar_pagina_vazia_conclui(),
+        testar_sem_marcador_espera(),
+        testar_cards_depois_da_paginacao(),
+    ]
+    if all(resultados):
+        print("\n🎉 Todos os testes passaram!")
+    else:
+        print("\n⚠️ Alguns testes falharam.")
+        raise SystemExit(1)
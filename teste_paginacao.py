@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste do detector de paginação sem espera implícita, com um driver falso que cobra
+a espera implícita em toda busca sem resultado (como o Selenium)
+"""
+
+import time
+
+from zap_scraper import ZapScraper, SCRIPT_ESTADO_PAGINACAO
+
+ESPERA_IMPLICITA = 0.5  # Escala reduzida dos 10 s do navegador real
+
+
+class BotaoFalso:
+    def __init__(self, classe='', habilitado=True):
+        self.classe = classe
+        self.habilitado = habilitado
+
+    def is_enabled(self):
+        return self.habilitado
+
+    def get_attribute(self, nome):
+        return self.classe if nome == 'class' else None
+
+
+class DriverFalso:
+    """find_element(s) espera a espera implícita quando nada é encontrado; execute_script responde na hora"""
+
+    def __init__(self, botoes=None, estado_script=None, script_quebrado=False):
+        self.botoes = botoes or {}  # seletor -> [BotaoFalso]
+        self.estado_script = estado_script
+        self.script_quebrado = script_quebrado
+        self.espera = ESPERA_IMPLICITA
+        self.chamadas = []
+        self.page_source = "<html><body></body></html>"
+
+    def implicitly_wait(self, segundos):
+        self.chamadas.append(('implicitly_wait', segundos))
+        self.espera = ESPERA_IMPLICITA if segundos else 0
+
+    def execute_script(self, script, *args):
+        self.chamadas.append(('execute_script', script is SCRIPT_ESTADO_PAGINACAO))
+        if self.script_quebrado:
+            raise RuntimeError("javascript error")
+        return self.estado_script
+
+    def find_elements(self, by, seletor):
+        self.chamadas.append(('find_elements', seletor))
+        encontrados = self.botoes.get(seletor, [])
+        if not encontrados:
+            time.sleep(self.espera)
+        return encontrados
+
+
+def criar_scraper():
+    scraper = ZapScraper()
+    scraper.espera_implicita = ESPERA_IMPLICITA
+    return scraper
+
+
+def cronometrar(funcao, *args):
+    inicio = time.perf_counter()
+    resultado = funcao(*args)
+    return resultado, time.perf_counter() - inicio
+
+
+def testar_ultima_pagina_em_uma_consulta():
+    """Na última página a resposta vem de um único execute_script, sem find_element"""
+    print("🧪 TESTE DE ÚLTIMA PÁGINA EM UMA CONSULTA")
+    scraper = criar_scraper()
+    ultima = DriverFalso(estado_script={'proxima': False, 'habilitada': False, 'estrategia': None,
+                                        'href': None, 'cards': 31})
+    meio = DriverFalso(estado_script={'proxima': True, 'habilitada': True, 'estrategia': 'testid',
+                                      'href': None, 'cards': 31})
+    existe_ultima, segundos = cronometrar(scraper.existe_proxima_pagina, ultima)
+    existe_meio, _ = cronometrar(scraper.existe_proxima_pagina, meio)
+    ok = existe_ultima is False and existe_meio is True and segundos < 0.05
+    ok = ok and ultima.chamadas == [('execute_script', True)]
+    print(f"  última página respondida em {segundos * 1000:.1f} ms")
+    print("✅ TESTE PASSOU!" if ok else f"❌ TESTE FALHOU! {ultima.chamadas}")
+    return ok
+
+
+def testar_fallback_sem_espera():
+    """Se o script falhar, os seletores rodam com a espera implícita desligada e ela é restaurada"""
+    print("\n🧪 TESTE DO FALLBACK POR SELETORES SEM ESPERA IMPLÍCITA")
+    scraper = criar_scraper()
+    sem_botao = DriverFalso(script_quebrado=True)
+    estado, segundos = cronometrar(scraper.estado_paginacao, sem_botao)
+    ok = estado['proxima'] is False and segundos < ESPERA_IMPLICITA
+    ok = ok and sem_botao.chamadas[1] == ('implicitly_wait', 0)
+    ok = ok and sem_botao.chamadas[-1] == ('implicitly_wait', ESPERA_IMPLICITA)
+
+    desabilitado = DriverFalso(script_quebrado=True,
+                               botoes={'button[aria-label*="próxima"]': [BotaoFalso('btn disabled')]})
+    estado = scraper.estado_paginacao(desabilitado)
+    ok = ok and estado['proxima'] and estado['estrategia'] == 'aria' and not estado['habilitada']
+    print(f"  sem botão: {segundos * 1000:.1f} ms (espera implícita de {ESPERA_IMPLICITA * 1000:.0f} ms por seletor)")
+    print("✅ TESTE PASSOU!" if ok else f"❌ TESTE FALHOU! {sem_botao.chamadas}")
+    return ok
+
+
+def testar_bloqueio_sem_espera():
+    """Contar cards de uma página de desafio não paga a espera implícita"""
+    print("\n🧪 TESTE DE DETECÇÃO DE BLOQUEIO SEM ESPERA")
+    scraper = criar_scraper()
+    driver = DriverFalso()
+    _, segundos = cronometrar(scraper.pagina_atual_bloqueada, driver)
+    ok = segundos < 0.05 and driver.chamadas[-1] == ('implicitly_wait', ESPERA_IMPLICITA)
+    print("✅ TESTE PASSOU!" if ok else f"❌ TESTE FALHOU! {segundos:.2f}s")
+    return ok
+
+
+if __name__ == "__main__":
+    resultados = [
+        testar_ultima_pagina_em_uma_consulta(),
+        testar_fallback_sem_espera(),
+        testar_bloqueio_sem_espera(),
+    ]
+    if all(resultados):
+        print("\n🎉 Todos os testes passaram!")
+    else:
+        print("\n⚠️ Alguns testes falharam.")
+        raise SystemExit(1)
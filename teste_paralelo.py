@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste da coleta paralela (um navegador por worker) com uma fábrica de navegadores falsos:
+páginas divididas entre os workers, resultado sem duplicatas e uma porta de remote
+debugging livre e distinta para cada navegador
+"""
+
+import io
+import socket
+import threading
+from contextlib import redirect_stdout
+
+from zap_scraper import ZapScraper, porta_livre
+from teste_pipeline import NavegadorFalso, ler, FIXTURE_DOM
+
+PAGINAS = 6
+WORKERS = 3
+
+
+class NavegadorWorker(NavegadorFalso):
+    """Navegador falso com o que o worker usa além da navegação"""
+
+    def __init__(self, base, porta):
+        super().__init__(base, ultima_pagina=PAGINAS)
+        self.porta = porta
+        self.paginas = []
+        self.fechado = False
+
+    def get(self, url):
+        super().get(url)
+        self.paginas.append(self.pagina)
+
+    def set_page_load_timeout(self, segundos):
+        pass
+
+    def quit(self):
+        self.fechado = True
+
+
+def criar_scraper(navegadores):
+    """Scraper cuja criação de navegador devolve NavegadorWorker e guarda a porta pedida"""
+    base = ler(FIXTURE_DOM)
+    lock = threading.Lock()
+    scraper = ZapScraper()
+    scraper.throttle.atraso = scraper.throttle.atraso_minimo = 0
+
+    def criar(version_main=None, porta_debug=None):
+        with lock:
+            navegadores.append(NavegadorWorker(base, porta_debug))
+            return navegadores[-1]
+
+    scraper._criar_driver_com_opcoes = criar
+    return scraper
+
+
+def testar_porta_livre():
+    """A porta devolvida está livre: dá para escutar nela logo em seguida"""
+    print("🧪 TESTE DE PORTA LIVRE")
+    ok = True
+    for _ in range(5):
+        porta = porta_livre()
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            try:
+                sock.bind(('127.0.0.1', porta))
+                sock.listen()
+            except OSError:
+                ok = False
+    print("✅ TESTE PASSOU!" if ok else "❌ TESTE FALHOU!")
+    return ok
+
+
+def testar_coleta_paralela():
+    """Cada página é coletada uma vez por algum worker; cada navegador tem a própria porta e é fechado"""
+    print("\n🧪 TESTE DA COLETA PARALELA")
+    navegadores = []
+    scraper = criar_scraper(navegadores)
+    with redirect_stdout(io.StringIO()):
+        resultados = scraper.coletar_paginas_paralelo(
+            "https://www.zapimoveis.com.br/venda/imoveis/sp+sao-paulo/", list(range(1, PAGINAS + 1)), WORKERS)
+    portas = [n.porta for n in navegadores]
+    visitadas = sorted(p for n in navegadores for p in n.paginas)
+    ok = len(navegadores) == WORKERS and len(set(portas)) == WORKERS and None not in portas
+    ok = ok and visitadas == list(range(1, PAGINAS + 1)) and all(n.fechado for n in navegadores)
+    ok = ok and sorted(resultados) == visitadas and scraper.paginas_concluidas == set(visitadas)
+    # 31 cards por página, um deles repetido na própria página
+    ok = ok and len(scraper.data_list) == 30 * PAGINAS and not scraper.paginas_mortas
+    print(f"  portas: {portas} | páginas por navegador: {[n.paginas for n in navegadores]}")
+    print("✅ TESTE PASSOU!" if ok else f"❌ TESTE FALHOU! {len(scraper.data_list)} linhas")
+    return ok
+
+
+def testar_dois_scrapers_simultaneos():
+    """Dois scrapers paralelos ao mesmo tempo (ex.: dois lotes) não pedem a mesma porta"""
+    print("\n🧪 TESTE DE DOIS SCRAPERS AO MESMO TEMPO")
+    navegadores = []
+    scrapers = [criar_scraper(navegadores) for _ in range(2)]
+    url = "https://www.zapimoveis.com.br/venda/imoveis/sp+sao-paulo/"
+    with redirect_stdout(io.StringIO()):
+        execucoes = [threading.Thread(target=s.coletar_paginas_paralelo, args=(url, list(range(1, PAGINAS + 1)), WORKERS))
+                     for s in scrapers]
+        for execucao in execucoes:
+            execucao.start()
+        for execucao in execucoes:
+            execucao.join()
+    portas = [n.porta for n in navegadores]
+    ok = len(portas) == 2 * WORKERS and len(set(portas)) == len(portas)
+    ok = ok and all(len(s.data_list) == 30 * PAGINAS for s in scrapers)
+    print(f"  portas: {sorted(portas)}")
+    print("✅ TESTE PASSOU!" if ok else "❌ TESTE FALHOU!")
+    return ok
+
+
+if __name__ == "__main__":
+    resultados = [
+        testar_porta_livre(),
+        testar_coleta_paralela(),
+        testar_dois_scrapers_simultaneos(),
+    ]
+    if all(resultados):
+        print("\n🎉 Todos os testes passaram!")
+    else:
+        print("\n⚠️ Alguns testes falharam.")
+        raise SystemExit(1)
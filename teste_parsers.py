@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste de paridade dos backends de parse HTML (parsers_html): cada backend instalado
+deve produzir exatamente os mesmos anúncios que o html.parser do BeautifulSoup
+"""
+
+import io
+from contextlib import redirect_stdout
+
+from bs4 import BeautifulSoup
+
+from parsers_html import PARSERS, ORDEM_PREFERENCIA, obter_parser
+from zap_scraper import ZapScraper, SELETOR_CARD_CSS
+from extrator_cards import extrair_card
+from teste_extrator_cards import FIXTURES, VARIANTES
+
+REFERENCIA = 'html.parser'
+
+
+def extrair_com(nome, html):
+    parser = obter_parser(nome)
+    with redirect_stdout(io.StringIO()):
+        return [extrair_card(card, parser) for card in parser.cards(html, SELETOR_CARD_CSS)]
+
+
+def backends_alternativos():
+    faltando = [nome for nome in ORDEM_PREFERENCIA if nome not in PARSERS]
+    for nome in faltando:
+        print(f"  ⚠️ Backend {nome} não instalado, pulando")
+    return [nome for nome in PARSERS if nome != REFERENCIA]
+
+
+def comparar_backends(html):
+    """Retorna {backend: (cards, divergências)} contra a referência"""
+    referencia = extrair_com(REFERENCIA, html)
+    resultado = {}
+    for nome in backends_alternativos():
+        obtidos = extrair_com(nome, html)
+        divergencias = len(obtidos) != len(referencia) or any(a != b for a, b in zip(referencia, obtidos))
+        resultado[nome] = (len(obtidos), divergencias)
+    return len(referencia), resultado
+
+
+def testar_paridade_fixtures():
+    print("🧪 TESTE DE PARIDADE DOS BACKENDS NAS FIXTURES")
+    ok = True
+    for caminho in FIXTURES:
+        with open(caminho, encoding='utf-8') as f:
+            total, resultado = comparar_backends(f.read())
+        for nome, (cards, divergente) in resultado.items():
+            ok = ok and not divergente and total > 0
+            print(f"  {'❌' if divergente else '✅'} {caminho} [{nome}]: {cards} cards (referência: {total})")
+    print("✅ TESTE PASSOU!" if ok else "❌ TESTE FALHOU!")
+    return ok
+
+
+def testar_paridade_variantes():
+    print("\n🧪 TESTE DE PARIDADE DOS BACKENDS NOS CAMINHOS ALTERNATIVOS")
+    with open(FIXTURES[0], encoding='utf-8') as f:
+        html = f.read()
+    ok = True
+    for variante, transformar in VARIANTES.items():
+        _, resultado = comparar_backends(transformar(html))
+        divergentes = [nome for nome, (_, divergente) in resultado.items() if divergente]
+        ok = ok and not divergentes
+        print(f"  {'❌' if divergentes else '✅'} {variante}" + (f": divergem {', '.join(divergentes)}" if divergentes else ""))
+    print("✅ TESTE PASSOU!" if ok else "❌ TESTE FALHOU!")
+    return ok
+
+
+def testar_card_isolado():
+    """Modo outerHTML por card: raiz() de cada backend dá o mesmo resultado do BeautifulSoup"""
+    print("\n🧪 TESTE DE PARIDADE COM OUTERHTML POR CARD")
+    with open(FIXTURES[0], encoding='utf-8') as f:
+        html_cards = [str(card) for card in BeautifulSoup(f.read(), 'html.parser').select(SELETOR_CARD_CSS)]
+    with redirect_stdout(io.StringIO()):
+        referencia = [extrair_card(obter_parser(REFERENCIA).raiz(h)) for h in html_cards]
+    ok = True
+    for nome in backends_alternativos():
+        parser = obter_parser(nome)
+        with redirect_stdout(io.StringIO()):
+            obtidos = [extrair_card(parser.raiz(h), parser) for h in html_cards]
+        ok = ok and obtidos == referencia
+        print(f"  {'✅' if obtidos == referencia else '❌'} {nome}: {len(obtidos)} cards")
+    print("✅ TESTE PASSOU!" if ok else "❌ TESTE FALHOU!")
+    return ok
+
+
+def testar_configuracao_scraper():
+    """parser_html do ZapScraper: 'auto' e cada backend dão a mesma página; seletores forçam o BeautifulSoup"""
+    print("\n🧪 TESTE DA CONFIGURAÇÃO parser_html DO SCRAPER")
+    with open(FIXTURES[0], encoding='utf-8') as f:
+        html = f.read()
+    scraper = ZapScraper()
+    scraper.usar_estado_json = False
+    ok = scraper.obter_parser_html().nome == next(n for n in ORDEM_PREFERENCIA if n in PARSERS)
+    with redirect_stdout(io.StringIO()):
+        scraper.parser_html = REFERENCIA
+        referencia = scraper.extrair_anuncios_html(html)
+        for nome in PARSERS:
+            scraper.parser_html = nome
+            ok = ok and scraper.extrair_anuncios_html(html) == referencia
+        scraper.extracao_compilada = False
+        ok = ok and scraper.obter_parser_html().nome == REFERENCIA
+        ok = ok and scraper.extrair_anuncios_html(html) == referencia
+    try:
+        obter_parser('inexistente')
+        ok = False
+    except ValueError:
+        pass
+    ok = ok and len(referencia) == 31
+    print("✅ TESTE PASSOU!" if ok else "❌ TESTE FALHOU!")
+    return ok
+
+
+if __name__ == "__main__":
+    resultados = [
+        testar_paridade_fixtures(),
+        testar_paridade_variantes(),
+        testar_card_isolado(),
+        testar_configuracao_scraper(),
+    ]
+    if all(resultados):
+        print("\n🎉 Todos os testes passaram!")
+    else:
+        print("\n⚠️ Alguns testes falharam.")
+        raise SystemExit(1)
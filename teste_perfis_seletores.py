@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste dos perfis de seletores: carga do arquivo versionado, contadores por estratégia,
+reordenação pela taxa de acerto e alerta quando o caminho rápido para de acertar
+"""
+
+import io
+import json
+import os
+import tempfile
+from contextlib import redirect_stdout
+
+from bs4 import BeautifulSoup
+
+from perfis_seletores import PerfilSeletores, carregar_perfis, CAMINHO_PERFIS
+from extrator_cards import extrair_card
+from zap_scraper import ZapScraper, SELETOR_CARD_CSS
+from teste_extrator_cards import VARIANTES
+
+FIXTURE = 'fixtures/pagina_resultados.html'
+
+
+def cards_de(html):
+    return BeautifulSoup(html, 'html.parser').select(SELETOR_CARD_CSS)
+
+
+def extrair_todos(cards, perfil):
+    saida = io.StringIO()
+    with redirect_stdout(saida):
+        resultado = [extrair_card(card, perfil=perfil) for card in cards]
+    return resultado, saida.getvalue()
+
+
+def gravar_config(config):
+    arquivo = tempfile.NamedTemporaryFile('w', suffix='.json', delete=False, encoding='utf-8')
+    with arquivo:
+        json.dump(config, arquivo, ensure_ascii=False)
+    return arquivo.name
+
+
+def testar_carga_e_versao():
+    print("🧪 TESTE DE CARGA DO ARQUIVO DE PERFIS")
+    config = carregar_perfis()
+    perfil = PerfilSeletores.carregar()
+    ok = perfil.nome == config['perfil_padrao'] and perfil.arquivo == CAMINHO_PERFIS
+    ok = ok and set(perfil.estrategias) >= {'Descrição', 'M2', 'Preco', 'Taxas'}
+
+    invalidos = [dict(config, versao=99)]
+    quebrado = json.loads(json.dumps(config))
+    quebrado['perfis'][config['perfil_padrao']]['campos']['Preco'].append({'nome': 'sem-tipo'})
+    invalidos.append(quebrado)
+    for invalido in invalidos:
+        caminho = gravar_config(invalido)
+        try:
+            carregar_perfis(caminho)
+            ok = False
+        except ValueError as e:
+            print(f"  recusado: {e}")
+        finally:
+            os.remove(caminho)
+    try:
+        PerfilSeletores.carregar(nome='inexistente')
+        ok = False
+    except ValueError:
+        pass
+    print("✅ TESTE PASSOU!" if ok else "❌ TESTE FALHOU!")
+    return ok
+
+
+def testar_contadores():
+    """Cada estratégia de elemento conta os cards em que o elemento existe; a varredura, os que ela resolveu"""
+    print("\n🧪 TESTE DOS CONTADORES POR ESTRATÉGIA")
+    with open(FIXTURE, encoding='utf-8') as f:
+        cards = cards_de(f.read())
+    perfil = PerfilSeletores.carregar(janela=1000)
+    resultado, _ = extrair_todos(cards, perfil)
+    acertos = perfil.relatorio()['Preco']['acertos']
+    print(f"  Preco: {acertos}")
+    destaque = sum(1 for card in cards if card.find('p', class_='text-2-25 text-feedback-success-110 font-semibold'))
+    neutro = sum(1 for card in cards if card.find('p', class_='text-2-25 text-neutral-120 font-semibold'))
+    ok = perfil.cards == len(cards)
+    ok = ok and acertos['p-preco-destaque'] == destaque and acertos['p-preco'] == neutro
+    ok = ok and 0 < acertos['varredura-rs'] < destaque
+    ok = ok and sum(acertos.values()) == sum(1 for dados in resultado if dados)  # Um acerto de preço por card extraído
+    print("✅ TESTE PASSOU!" if ok else "❌ TESTE FALHOU!")
+    return ok
+
+
+def testar_queda_e_recuperacao():
+    """Classes de preço trocadas: alerta, varredura passa à frente; com as classes de volta, tudo se desfaz"""
+    print("\n🧪 TESTE DE ALERTA, REORDENAÇÃO E RECUPERAÇÃO")
+    with open(FIXTURE, encoding='utf-8') as f:
+        html = f.read()
+    normais = cards_de(html)
+    quebrados = cards_de(VARIANTES['sem classe de preço'](html))
+    perfil = PerfilSeletores.carregar(janela=len(normais))
+    scraper = ZapScraper()
+
+    extrair_todos(normais, perfil)
+    ok = not perfil.alertas and perfil.ordem['Preco'][-1]['nome'] == 'varredura-rs'
+
+    resultado, saida = extrair_todos(quebrados, perfil)
+    with redirect_stdout(io.StringIO()):
+        referencia = [scraper._extrair_dados_anuncio_seletores(card) for card in quebrados]
+    ok = ok and resultado == referencia
+    ok = ok and [a['campo'] for a in perfil.alertas] == ['Preco'] and "Seletor rápido de 'Preco'" in saida
+    ok = ok and perfil.ordem['Preco'][0]['nome'] == 'varredura-rs'
+    print(f"  ordem após a quebra: {[e['nome'] for e in perfil.ordem['Preco']]}")
+
+    _, saida = extrair_todos(normais, perfil)
+    ok = ok and 'Preco' not in perfil.em_queda and "voltou a acertar" in saida
+    ok = ok and perfil.ordem['Preco'][-1]['nome'] == 'varredura-rs' and len(perfil.alertas) == 1
+    print(f"  ordem após a volta:  {[e['nome'] for e in perfil.ordem['Preco']]}")
+    print("✅ TESTE PASSOU!" if ok else "❌ TESTE FALHOU!")
+    return ok
+
+
+def testar_ordem_por_taxa():
+    """Entre estratégias de mesmo custo que acertam, a de maior taxa passa à frente"""
+    print("\n🧪 TESTE DE ORDEM PELA TAXA DE ACERTO")
+    with open(FIXTURE, encoding='utf-8') as f:
+        cards = cards_de(f.read())
+    perfil = PerfilSeletores.carregar(janela=len(cards))
+    extrair_todos(cards, perfil)
+    acertos = perfil.relatorio()['Preco']['acertos']
+    esperada = sorted(['p-preco-destaque', 'p-preco'], key=lambda nome: -acertos[nome])
+    ok = [e['nome'] for e in perfil.ordem['Preco']][:2] == esperada
+    print(f"  {acertos} -> {[e['nome'] for e in perfil.ordem['Preco']]}")
+    print("✅ TESTE PASSOU!" if ok else "❌ TESTE FALHOU!")
+    return ok
+
+
+def testar_perfil_editado():
+    """Uma classe nova declarada no arquivo (sem mudar código) evita a varredura"""
+    print("\n🧪 TESTE DE PERFIL EDITADO NO ARQUIVO")
+    config = carregar_perfis()
+    campos = config['perfis'][config['perfil_padrao']]['campos']
+    campos['Preco'].insert(2, {'nome': 'p-preco-novo', 'tag': 'p', 'atributos': {'class': ['preco']}})
+    caminho = gravar_config(config)
+    try:
+        perfil = PerfilSeletores.carregar(caminho, janela=1000)
+    finally:
+        os.remove(caminho)
+    with open(FIXTURE, encoding='utf-8') as f:
+        html = f.read()
+    cards = cards_de(VARIANTES['sem classe de preço'](html))
+    resultado, _ = extrair_todos(cards, perfil)
+    padrao = PerfilSeletores.carregar(janela=1000)
+    esperado, _ = extrair_todos(cards, padrao)
+    original = PerfilSeletores.carregar(janela=1000)
+    extrair_todos(cards_de(html), original)
+    acertos = perfil.relatorio()['Preco']['acertos']
+    # Com a classe nova, a varredura só é usada nos mesmos cards que já precisavam dela no layout original
+    ok = resultado == esperado
+    ok = ok and acertos['varredura-rs'] == original.relatorio()['Preco']['acertos']['varredura-rs']
+    ok = ok and padrao.relatorio()['Preco']['acertos']['varredura-rs'] > acertos['varredura-rs']
+    print(f"  Preco: {acertos}")
+    print("✅ TESTE PASSOU!" if ok else "❌ TESTE FALHOU!")
+    return ok
+
+
+if __name__ == "__main__":
+    resultados = [
+        testar_carga_e_versao(),
+        testar_contadores(),
+        testar_queda_e_recuperacao(),
+        testar_ordem_por_taxa(),
+        testar_perfil_editado(),
+    ]
+    if all(resultados):
+        print("\n🎉 Todos os testes passaram!")
+    else:
+        print("\n⚠️ Alguns testes falharam.")
+        raise SystemExit(1)
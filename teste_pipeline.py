@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste do pipeline de parse (navegação -> processos de parse -> coletor) com um navegador
+falso que leva LATENCIA segundos para abrir cada página
+"""
+
+import io
+import time
+from contextlib import redirect_stdout
+
+from bs4 import BeautifulSoup
+
+from zap_scraper import (ZapScraper, SELETOR_CARD_CSS, SCRIPT_PAGINA_PRONTA, SCRIPT_PASSO_SCROLL,
+                         SCRIPT_ESTADO_PAGINACAO)
+from pipeline_parse import PipelineParse, analisar_html
+from planejador_paginas import PlanejadorPaginas
+from teste_extrator_cards import VARIANTES
+
+FIXTURE_DOM = 'fixtures/pagina_resultados.html'
+FIXTURE_JSON = 'fixtures/pagina_resultados_next.html'
+LATENCIA = 0.08
+PAGINAS = 6
+
+
+def ler(caminho):
+    with open(caminho, encoding='utf-8') as f:
+        return f.read()
+
+
+def html_da_pagina(base, pagina):
+    """Mesma página com IDs próprios, para as páginas não serem duplicatas umas das outras"""
+    return base.replace('27000', f'{pagina}7000').replace('São Paulo', f'São Paulo {pagina}')
+
+
+class NavegadorFalso:
+    """get() leva LATENCIA; scripts respondem como o Chrome numa página já renderizada"""
+
+    def __init__(self, base, ultima_pagina=PAGINAS):
+        self.base = base
+        self.ultima_pagina = ultima_pagina
+        self.pagina = 1
+        self.latencia = LATENCIA
+        self.page_source = ""
+        self._cards = None
+        self.current_url = ""
+
+    def get(self, url):
+        time.sleep(self.latencia)
+        self.current_url = url
+        self.pagina = int(url.split('pagina=')[1]) if 'pagina=' in url else 1
+        self.page_source = html_da_pagina(self.base, self.pagina)
+        self._cards = None
+
+    def cards(self):
+        # Uma vez por página: no Chrome os outerHTML saem do navegador, não do processo Python
+        if self._cards is None:
+            self._cards = [str(card) for card in BeautifulSoup(self.page_source, 'html.parser').select(SELETOR_CARD_CSS)]
+        return self._cards
+
+    def find_element(self, by, seletor):
+        return object()
+
+    def find_elements(self, by, seletor):
+        return self.cards()
+
+    def execute_async_script(self, script, *args):
+        if script is SCRIPT_PAGINA_PRONTA:
+            return {'cards': len(self.cards())}
+        if script is SCRIPT_PASSO_SCROLL:
+            return {'cards': self.cards(), 'fim': True}
+        return {}
+
+    def execute_script(self, script, *args):
+        if script is SCRIPT_ESTADO_PAGINACAO:
+            proxima = self.pagina < self.ultima_pagina
+            return {'proxima': proxima, 'habilitada': proxima, 'estrategia': 'testid', 'href': None, 'cards': 31}
+        if 'outerHTML' in script:
+            return self.cards()
+        return {'bytes': 0, 'recursos': 0, 'carregamento_ms': None}
+
+    def set_script_timeout(self, segundos):
+        pass
+
+    def implicitly_wait(self, segundos):
+        pass
+
+
+class PoolFalso:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def checkout(self):
+        return self.driver
+
+    def devolver(self, driver, paginas=0):
+        pass
+
+
+def coletar(base, pipeline, parser_html='auto', paginas=PAGINAS, latencia=LATENCIA):
+    """Roda o caminho sequencial do Chrome com o navegador falso; retorna (linhas, segundos, scraper)"""
+    navegador = NavegadorFalso(base, ultima_pagina=paginas)
+    navegador.latencia = latencia
+    scraper = ZapScraper(pool=PoolFalso(navegador))
+    scraper.modo_fetch = 'selenium'
+    scraper.pipeline_parse = pipeline
+    scraper.parser_html = parser_html
+    scraper.throttle.atraso = scraper.throttle.atraso_minimo = 0
+    inicio = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        scraper._extrair_dados_selenium("https://www.zapimoveis.com.br/venda/imoveis/sp+sao-paulo/",
+                                        list(range(1, paginas + 1)))
+    return scraper.data_list, time.perf_counter() - inicio, scraper
+
+
+def testar_analise_igual_ao_scraper():
+    """A função dos processos de parse dá o mesmo resultado de extrair_anuncios_html"""
+    print("🧪 TESTE DE analisar_html x extrair_anuncios_html")
+    scraper = ZapScraper()
+    ok = True
+    with redirect_stdout(io.StringIO()):
+        for caminho in (FIXTURE_DOM, FIXTURE_JSON):
+            html = ler(caminho)
+            esperado = scraper.extrair_anuncios_html(html)
+            obtido, _ = analisar_html(html, SELETOR_CARD_CSS, scraper.parser_html, scraper.usar_estado_json)
+            ok = ok and esperado == obtido and len(obtido) > 0
+    print("✅ TESTE PASSOU!" if ok else "❌ TESTE FALHOU!")
+    return ok
+
+
+def testar_ordem_e_fila_limitada():
+    """O coletor consolida na ordem de entrega; com a fila cheia, enviar() espera o coletor"""
+    print("\n🧪 TESTE DE ORDEM E FILA LIMITADA")
+    html = ler(FIXTURE_DOM)
+    consolidadas = []
+
+    def consolidar(pagina, anuncios, erro):
+        time.sleep(0.05)  # Coletor lento
+        consolidadas.append((pagina, len(anuncios), erro))
+
+    with redirect_stdout(io.StringIO()):
+        with PipelineParse(consolidar, processos=1, tamanho_fila=1, seletor=SELETOR_CARD_CSS) as pipeline:
+            for pagina in range(1, 6):
+                pipeline.enviar(pagina, html)
+            pipeline.enviar(6, None)  # Erro de parse chega ao coletor como erro da página
+    ok = [c[0] for c in consolidadas] == [1, 2, 3, 4, 5, 6]
+    ok = ok and all(n == 31 and erro is None for _, n, erro in consolidadas[:5])
+    ok = ok and consolidadas[5][2] is not None
+    ok = ok and pipeline.espera_fila > 0.05
+    print(f"  navegação esperou {pipeline.espera_fila:.2f}s pela fila")
+    print("✅ TESTE PASSOU!" if ok else f"❌ TESTE FALHOU! {consolidadas}")
+    return ok
+
+
+def testar_mesmo_resultado_com_pipeline():
+    """Caminho do Chrome com e sem pipeline: mesmas linhas, na mesma ordem, pelo estado JSON e pelo scroll"""
+    print("\n🧪 TESTE DE PARIDADE COM E SEM PIPELINE")
+    ok = True
+    for caminho in (FIXTURE_JSON, FIXTURE_DOM):
+        base = ler(caminho)
+        sem, _, _ = coletar(base, False)
+        com, _, scraper = coletar(base, True)
+        iguais = sem == com and len(com) == 30 * PAGINAS  # 31 cards, 1 duplicata por página
+        ok = ok and iguais and scraper.paginas_concluidas == set(range(1, PAGINAS + 1))
+        print(f"  {'✅' if iguais else '❌'} {caminho}: {len(sem)} x {len(com)} linhas")
+    print("✅ TESTE PASSOU!" if ok else "❌ TESTE FALHOU!")
+    return ok
+
+
+def testar_perfil_no_processo_principal():
+    """Com pipeline, os acertos dos seletores chegam ao perfil do processo principal: mesmo
+    relatório do caminho sem pipeline, e o alerta de queda dispara quando o layout muda
+    """
+    print("\n🧪 TESTE DO PERFIL DE SELETORES COM PIPELINE")
+    base = ler(FIXTURE_DOM)
+    _, _, sem = coletar(base, False, 'html.parser')
+    _, _, com = coletar(base, True, 'html.parser')
+    ok = com.perfil_seletores.cards == sem.perfil_seletores.cards > 0
+    ok = ok and com.perfil_seletores.relatorio() == sem.perfil_seletores.relatorio()
+
+    # Layout novo a partir da página 4: o preço sai do seletor rápido
+    mudado = VARIANTES['sem classe de preço'](base)
+    navegador = NavegadorFalso(base, ultima_pagina=8)
+    get_original = navegador.get
+
+    def get(url):
+        get_original(url)
+        if navegador.pagina >= 4:
+            navegador.page_source = html_da_pagina(mudado, navegador.pagina)
+
+    navegador.get = get
+    scraper = ZapScraper(pool=PoolFalso(navegador))
+    scraper.modo_fetch = 'selenium'
+    scraper.pipeline_parse = True
+    scraper.parser_html = 'html.parser'
+    scraper.throttle.atraso = scraper.throttle.atraso_minimo = 0
+    scraper.perfil_seletores.janela = 31
+    with redirect_stdout(io.StringIO()):
+        scraper._extrair_dados_selenium("https://www.zapimoveis.com.br/venda/imoveis/sp+sao-paulo/", list(range(1, 9)))
+    campos_em_alerta = {alerta['campo'] for alerta in scraper.perfil_seletores.alertas}
+    ok = ok and 'Preco' in campos_em_alerta
+    print(f"  {com.perfil_seletores.cards} cards no perfil principal | alertas: {sorted(campos_em_alerta)}")
+    print("✅ TESTE PASSOU!" if ok else "❌ TESTE FALHOU!")
+    return ok
+
+
+def testar_falha_de_parse_refaz_pagina():
+    """Página sem anúncios no parse volta ao planejador; a repetida do scroll não vira duplicata"""
+    print("\n🧪 TESTE DO COLETOR: FALHA, DUPLICATAS E PARADA")
+    scraper = ZapScraper()
+    planejador = PlanejadorPaginas("https://www.zapimoveis.com.br/venda/", [1, 2, 3], espera_base=0)
+    with redirect_stdout(io.StringIO()):
+        for _ in range(3):
+            planejador.proxima()
+        anuncios = scraper.extrair_anuncios_html(ler(FIXTURE_DOM))
+        scraper.consolidar_pagina_pipeline(planejador, 1, anuncios + anuncios[:5])
+        scraper.consolidar_pagina_pipeline(planejador, 2, [])
+        scraper.parada_incremental = 1
+        scraper.consolidar_pagina_pipeline(planejador, 3, anuncios)
+    ok = len(scraper.data_list) == 30 and scraper.duplicatas_detectadas == 0  # Repetidos da página são unidos pela chave
+    ok = ok and planejador.concluidas == {1} and planejador.pendentes() == [2, 3]
+    print("✅ TESTE PASSOU!" if ok else f"❌ TESTE FALHOU! {len(scraper.data_list)} {planejador.pendentes()}")
+    return ok
+
+
+def testar_sobreposicao():
+    """Com pipeline, o parse de uma página corre enquanto a próxima carrega
+
+    Navegação da ordem do parse de uma página e páginas suficientes para pagar a partida dos processos.
+    """
+    print("\n🧪 TESTE DE SOBREPOSIÇÃO NAVEGAÇÃO x PARSE")
+    base = ler(FIXTURE_DOM)
+    _, sem, _ = coletar(base, False, 'html.parser', paginas=12, latencia=0.2)
+    _, com, _ = coletar(base, True, 'html.parser', paginas=12, latencia=0.2)
+    ok = com < sem
+    print(f"  sem pipeline: {sem:.2f}s | com pipeline: {com:.2f}s ({sem / com:.1f}x)")
+    print("✅ TESTE PASSOU!" if ok else "❌ TESTE FALHOU!")
+    return ok
+
+
+class ListaVirtualizada:
+    """Rolagem de uma lista virtualizada: cada passo mostra uma janela de cards que se sobrepõe à anterior"""
+
+    def __init__(self, cards, janela=12, avanco=8):
+        self.janelas = [cards[i:i + janela] for i in range(0, len(cards), avanco)]
+        self.passo = 0
+
+    def set_script_timeout(self, segundos):
+        pass
+
+    def execute_script(self, script, *args):
+        return self.janelas[0]
+
+    def execute_async_script(self, script, *args):
+        self.passo = min(self.passo + 1, len(self.janelas) - 1)
+        return {'cards': self.janelas[self.passo], 'fim': self.passo == len(self.janelas) - 1}
+
+
+def testar_colheita_sem_reparse():
+    """Na colheita incremental cada card é parseado uma vez, mesmo aparecendo em vários passos"""
+    print("\n🧪 TESTE DE COLHEITA SEM RE-PARSE")
+    scraper = ZapScraper()
+    cards = [str(card) for card in BeautifulSoup(ler(FIXTURE_DOM), 'html.parser').select(SELETOR_CARD_CSS)]
+    parseados = []  # Cards entregues ao parse em cada passo
+    extrair = scraper.extrair_anuncios_html
+
+    def extrair_contando(html):
+        parseados.append(len(BeautifulSoup(html, 'html.parser').select(SELETOR_CARD_CSS)))
+        return extrair(html)
+
+    scraper.extrair_anuncios_html = extrair_contando
+    with redirect_stdout(io.StringIO()):
+        colhidos = scraper.colher_com_scroll(ListaVirtualizada(cards))
+        referencia = ZapScraper().extrair_anuncios_html(ler(FIXTURE_DOM))
+    ok = sum(parseados) == len(set(cards))
+    ok = ok and len(colhidos) == len({scraper.chave_anuncio(dados) for dados in referencia})
+    print(f"  {len(set(cards))} cards distintos, {sum(parseados)} parseados em {len(parseados)} passos, {len(colhidos)} anúncios")
+    print("✅ TESTE PASSOU!" if ok else "❌ TESTE FALHOU!")
+    return ok
+
+
+if __name__ == "__main__":
+    resultados = [
+        testar_analise_igual_ao_scraper(),
+        testar_ordem_e_fila_limitada(),
+        testar_mesmo_resultado_com_pipeline(),
+        testar_perfil_no_processo_principal(),
+        testar_falha_de_parse_refaz_pagina(),
+        testar_sobreposicao(),
+        testar_colheita_sem_reparse(),
+    ]
+    if all(resultados):
+        print("\n🎉 Todos os testes passaram!")
+    else:
+        print("\n⚠️ Alguns testes falharam.")
+        raise SystemExit(1)
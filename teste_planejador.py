@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste do planejador de páginas: URLs derivadas da busca, ordem livre, novas tentativas
+com espera exponencial, páginas mortas e fim dos resultados
+"""
+
+import threading
+import time
+
+from planejador_paginas import PlanejadorPaginas, url_da_pagina
+
+URL_BUSCA = "https://www.zapimoveis.com.br/venda/apartamentos/sp+sao-paulo/?transacao=venda&pagina=3"
+
+
+def consumir(planejador, falhas, tentativas, num_workers=3):
+    """Workers que pegam páginas do planejador; `falhas[p]` = quantas vezes a página p falha antes de dar certo"""
+    lock = threading.Lock()
+    ordem = []
+
+    def worker():
+        while True:
+            item = planejador.proxima()
+            if item is None:
+                return
+            pagina = item['pagina']
+            with lock:
+                ordem.append(pagina)
+                tentativas.setdefault(pagina, []).append(time.monotonic())
+            time.sleep(0.01)
+            if len(tentativas[pagina]) <= falhas.get(pagina, 0):
+                planejador.falhar(pagina, "falha simulada")
+            else:
+                planejador.concluir(pagina)
+
+    threads = [threading.Thread(target=worker) for _ in range(num_workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+    return ordem
+
+
+def testar_urls():
+    """A página 1 não leva ?pagina=; as demais substituem o parâmetro existente"""
+    print("🧪 TESTE DAS URLS DERIVADAS DA BUSCA")
+    ok = url_da_pagina(URL_BUSCA, 1) == "https://www.zapimoveis.com.br/venda/apartamentos/sp+sao-paulo/?transacao=venda"
+    ok = ok and url_da_pagina(URL_BUSCA, 7).endswith("?transacao=venda&pagina=7")
+    planejador = PlanejadorPaginas(URL_BUSCA, [2, 1])
+    ok = ok and planejador.proxima() == {'pagina': 1, 'url': url_da_pagina(URL_BUSCA, 1), 'tentativa': 1}
+    print("✅ TESTE PASSOU!" if ok else "❌ TESTE FALHOU!")
+    return ok
+
+
+def testar_novas_tentativas():
+    """Páginas instáveis são refeitas fora de ordem, com espera crescente; a sempre quebrada vira página morta"""
+    print("\n🧪 TESTE DE NOVAS TENTATIVAS E PÁGINAS MORTAS")
+    planejador = PlanejadorPaginas(URL_BUSCA, range(1, 9), max_tentativas=3, espera_base=0.1)
+    tentativas = {}
+    ordem = consumir(planejador, {3: 1, 5: 2, 6: 99}, tentativas)
+
+    intervalos_5 = [b - a for a, b in zip(tentativas[5], tentativas[5][1:])]
+    ok = planejador.concluidas == {1, 2, 3, 4, 5, 7, 8}
+    ok = ok and [m['pagina'] for m in planejador.mortas] == [6] and planejador.mortas[0]['tentativas'] == 3
+    ok = ok and ordem.index(8) < len(ordem) - 1  # A página 8 não esperou as refeitas
+    ok = ok and intervalos_5[0] >= 0.1 and intervalos_5[1] >= 0.2  # Espera exponencial
+    ok = ok and planejador.pendentes() == []
+    print(f"  ordem: {ordem}")
+    print("✅ TESTE PASSOU!" if ok else f"❌ TESTE FALHOU! concluídas={planejador.concluidas} mortas={planejador.mortas}")
+    return ok
+
+
+def testar_fim_dos_resultados():
+    """encerrar_apos descarta as páginas posteriores, inclusive as já em andamento"""
+    print("\n🧪 TESTE DE FIM DOS RESULTADOS")
+    planejador = PlanejadorPaginas(URL_BUSCA, range(1, 11), espera_base=0.05)
+    itens = [planejador.proxima() for _ in range(3)]
+    planejador.falhar(3, "sem cards")  # Volta para a fila...
+    planejador.encerrar_apos(2)  # ...mas a busca só tem 2 páginas
+    planejador.concluir(1)
+    planejador.concluir(2)
+    ok = [i['pagina'] for i in itens] == [1, 2, 3] and planejador.proxima() is None
+    ok = ok and planejador.concluidas == {1, 2} and planejador.mortas == [] and planejador.ultima_pagina == 2
+    print("✅ TESTE PASSOU!" if ok else "❌ TESTE FALHOU!")
+    return ok
+
+
+if __name__ == "__main__":
+    resultados = [testar_urls(), testar_novas_tentativas(), testar_fim_dos_resultados()]
+    if all(resultados):
+        print("\n🎉 Todos os testes passaram!")
+    else:
+        print("\n⚠️ Alguns testes falharam.")
+        raise SystemExit(1)
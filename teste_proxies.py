@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste do pool de proxies com proxies de encaminhamento locais (um deles sempre bloqueado)
+"""
+
+import os
+import tempfile
+import threading
+import time
+import urllib.request
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+from zap_scraper import ZapScraper, obter_pool_drivers
+from pool_proxies import PoolProxies, carregar_proxies
+from throttle_adaptativo import ThrottleAdaptativo
+
+with open('fixtures/pagina_resultados.html', encoding='utf-8') as f:
+    PAGINA_RESULTADOS = f.read()
+with open('fixtures/pagina_bloqueio.html', encoding='utf-8') as f:
+    PAGINA_BLOQUEIO = f.read()
+
+TOTAL_PAGINAS = 11  # Com a página vazia do fim, 12 requisições: 3 rodadas cheias em 4 proxies
+LATENCIA_PROXY = 0.25  # Latência simulada de cada proxy saudável
+SEM_PROXY = urllib.request.build_opener(urllib.request.ProxyHandler({}))
+
+
+class Origem(BaseHTTPRequestHandler):
+    """Site de origem: TOTAL_PAGINAS páginas com cards, depois vazio"""
+
+    def do_GET(self):
+        pagina = int(parse_qs(urlparse(self.path).query).get('pagina', ['1'])[0])
+        corpo = PAGINA_RESULTADOS if pagina <= TOTAL_PAGINAS else "<html><body></body></html>"
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.end_headers()
+        self.wfile.write(corpo.encode('utf-8'))
+
+    def log_message(self, *args):
+        pass
+
+
+def criar_proxy(bloqueado=False):
+    """Proxy de encaminhamento HTTP (GET com URL absoluta); o bloqueado responde 403 com desafio"""
+
+    class Proxy(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if bloqueado:
+                status, corpo = 403, PAGINA_BLOQUEIO.encode('utf-8')
+            else:
+                time.sleep(LATENCIA_PROXY)
+                with SEM_PROXY.open(self.path) as resposta:
+                    status, corpo = resposta.status, resposta.read()
+            self.send_response(status)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(corpo)))
+            self.end_headers()
+            self.wfile.write(corpo)
+
+        def log_message(self, *args):
+            pass
+
+    return Proxy
+
+
+def iniciar(handler):
+    servidor = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor, f"http://127.0.0.1:{servidor.server_address[1]}"
+
+
+def coletar(url_origem, proxies, **opcoes):
+    """Coleta todas as páginas pelo pool; retorna (segundos, resultados, pagina_bloqueio, pool)"""
+    pool = PoolProxies(proxies, **opcoes)
+    scraper = ZapScraper(proxies=pool)
+    scraper.throttle = ThrottleAdaptativo(atraso_inicial=0, atraso_minimo=0, cooldown_base=0)
+    inicio = time.perf_counter()
+    resultados, pagina_bloqueio = scraper.coletar_paginas_http(f"{url_origem}/busca/", TOTAL_PAGINAS + 1)
+    segundos = time.perf_counter() - inicio
+    scraper.fechar_clientes_http()
+    return segundos, resultados, pagina_bloqueio, pool
+
+
+def testar_carregar_proxies():
+    """Arquivo com comentários e env separada por vírgulas; esquema http:// implícito"""
+    print("🧪 TESTE DE LEITURA DOS PROXIES")
+    with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as f:
+        f.write("# proxies\n10.0.0.1:3128\nhttp://u:s@10.0.0.2:8080  # autenticado\n\n10.0.0.1:3128\n")
+    try:
+        do_arquivo = carregar_proxies(f.name)
+    finally:
+        os.remove(f.name)
+    os.environ['ZAP_PROXIES_TESTE'] = "10.0.0.3:1, socks5://10.0.0.4:2"
+    do_env = carregar_proxies(variavel='ZAP_PROXIES_TESTE')
+    ok = do_arquivo == ['http://10.0.0.1:3128', 'http://u:s@10.0.0.2:8080']
+    ok = ok and do_env == ['http://10.0.0.3:1', 'socks5://10.0.0.4:2']
+    ok = ok and PoolProxies.mascarar('http://u:s@10.0.0.2:8080') == 'http://***@10.0.0.2:8080'
+    print("✅ TESTE PASSOU!" if ok else f"❌ TESTE FALHOU! {do_arquivo} {do_env}")
+    return ok
+
+
+def testar_escala(url_origem, saudaveis):
+    """Vazão cresce com o número de proxies saudáveis (1 conexão por proxy)"""
+    print("\n🧪 TESTE DE ESCALA COM O NÚMERO DE PROXIES")
+    tempo_um, resultados_um, _, _ = coletar(url_origem, saudaveis[:1], max_conexoes_por_proxy=1)
+    tempo_quatro, resultados_quatro, _, _ = coletar(url_origem, saudaveis, max_conexoes_por_proxy=1)
+    ganho = tempo_um / tempo_quatro
+    ok = len(resultados_um) == len(resultados_quatro) == TOTAL_PAGINAS and ganho >= 2.5
+    print(f"  1 proxy: {tempo_um:.2f}s | {len(saudaveis)} proxies: {tempo_quatro:.2f}s ({ganho:.1f}x)")
+    print("✅ TESTE PASSOU!" if ok else "❌ TESTE FALHOU!")
+    return ok
+
+
+def testar_rebaixamento(url_origem, saudaveis, bloqueado):
+    """O proxy bloqueado é rebaixado e as páginas são refeitas pelos saudáveis"""
+    print("\n🧪 TESTE DE REBAIXAMENTO DE PROXY BLOQUEADO")
+    _, resultados, pagina_bloqueio, pool = coletar(
+        url_origem, [bloqueado] + saudaveis[:2], max_conexoes_por_proxy=2, minimo_amostras=2)
+    resumo = {linha['proxy']: linha for linha in pool.resumo()}
+    ok = pagina_bloqueio is None and len(resultados) == TOTAL_PAGINAS
+    ok = ok and resumo[bloqueado]['rebaixado'] and resumo[bloqueado]['rebaixamentos'] >= 1
+    ok = ok and all(resumo[p]['taxa_bloqueio'] == 0 and not resumo[p]['rebaixado'] for p in saudaveis[:2])
+    print("✅ TESTE PASSOU!" if ok else f"❌ TESTE FALHOU! bloqueio={pagina_bloqueio} {pool.resumo()}")
+    return ok
+
+
+class DriverFalso:
+    """Só o que a criação do driver usa; guarda as opções de partida do Chrome"""
+
+    def __init__(self, options):
+        self.argumentos = list(options.arguments)
+
+    def execute_cdp_cmd(self, comando, parametros):
+        return {}
+
+
+def testar_navegadores_com_proxy():
+    """Com proxies, o Chrome não sai do pool compartilhado: nasce com o proxy deste scraper;
+    pools são separados por configuração do navegador (headless, bloqueio de recursos)
+    """
+    print("\n🧪 TESTE DOS NAVEGADORES COM PROXY E POOLS POR CONFIGURAÇÃO")
+    proxies = PoolProxies(['http://10.0.0.1:3128', 'http://10.0.0.2:3128'])
+    scraper = ZapScraper(pool=obter_pool_drivers(), proxies=proxies)
+    scraper._iniciar_chrome = lambda options, version_main=None, porta_debug=None: DriverFalso(options)
+    driver = scraper._criar_driver_com_opcoes()
+    ok = scraper.pool_drivers() is None and driver.proxy_zap in proxies.estado
+    ok = ok and f"--proxy-server={driver.proxy_zap}" in driver.argumentos
+
+    padrao = ZapScraper(pool=obter_pool_drivers())
+    ok = ok and padrao.pool_drivers() is obter_pool_drivers()
+    headless = ZapScraper(pool=obter_pool_drivers())
+    headless.headless = True
+    headless.bloquear_recursos = False
+    pool = headless.pool_drivers()
+    ok = ok and pool is not obter_pool_drivers() and pool is headless.pool_drivers()
+    ok = ok and pool.fabrica.__self__.headless and not pool.fabrica.__self__.bloquear_recursos
+    ok = ok and pool is obter_pool_drivers(headless=True, bloquear_recursos=False)
+    print("✅ TESTE PASSOU!" if ok else "❌ TESTE FALHOU!")
+    return ok
+
+
+if __name__ == "__main__":
+    servidores = []
+    try:
+        origem, url_origem = iniciar(Origem)
+        servidores.append(origem)
+        saudaveis = []
+        for _ in range(4):
+            servidor, url = iniciar(criar_proxy())
+            servidores.append(servidor)
+            saudaveis.append(url)
+        servidor, bloqueado = iniciar(criar_proxy(bloqueado=True))
+        servidores.append(servidor)
+
+        resultados = [
+            testar_carregar_proxies(),
+            testar_escala(url_origem, saudaveis),
+            testar_rebaixamento(url_origem, saudaveis, bloqueado),
+            testar_navegadores_com_proxy(),
+        ]
+    finally:
+        for servidor in servidores:
+            servidor.shutdown()
+
+    if all(resultados):
+        print("\n🎉 Todos os testes passaram!")
+    else:
+        print("\n⚠️ Alguns testes falharam.")
+        raise SystemExit(1)
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste dos sinks de linhas: gravação página a página em CSV, JSONL, Parquet e SQLite
+"""
+
+import os
+import tempfile
+
+from zap_scraper import ZapScraper
+from sinks import SINKS, SaidaSink, criar_sink
+from teste_fetch_http import iniciar_servidor
+
+with open('fixtures/pagina_resultados.html', encoding='utf-8') as f:
+    PAGINA_RESULTADOS = f.read()
+
+
+def formatos_disponiveis():
+    """Parquet só entra se o pyarrow estiver instalado"""
+    formatos = [f for f in SINKS if f != 'parquet']
+    try:
+        import pyarrow  # noqa: F401
+        formatos.append('parquet')
+    except ImportError:
+        print("⚠️ pyarrow não instalado: sink Parquet não testado")
+    return formatos
+
+
+def testar_flush_por_pagina(pasta, formato):
+    """Ao consolidar uma página as linhas já devem estar em disco, sem ficar em data_list"""
+    print(f"\n🧪 TESTE DE FLUSH POR PÁGINA ({formato})")
+    sink = criar_sink(formato, os.path.join(pasta, f"flush{SINKS[formato].extensao}"))
+    scraper = ZapScraper(sink=sink)
+    anuncios = scraper.extrair_anuncios_html(PAGINA_RESULTADOS)
+    novos = scraper.consolidar_pagina(1, anuncios)
+    gravadas = len(sink.carregar())
+    ok = len(novos) == 30 and gravadas == 30 and scraper.data_list == []
+    sink.fechar()
+    print("✅ TESTE PASSOU!" if ok else f"❌ TESTE FALHOU! novos={len(novos)} gravadas={gravadas}")
+    return ok
+
+
+def testar_extracao_com_sink(pasta, formato, url_base):
+    """Extração HTTP completa com sink: retorna caminho e total de linhas sem ler o disco;
+    o DataFrame só é lido quando pedido, sem duplicatas
+    """
+    print(f"\n🧪 TESTE DE EXTRAÇÃO COM SINK ({formato})")
+    sink = criar_sink(formato, os.path.join(pasta, f"extracao{SINKS[formato].extensao}"))
+    leituras = []
+    carregar = sink.carregar
+    sink.carregar = lambda: leituras.append(1) or carregar()
+    scraper = ZapScraper(sink=sink)
+    scraper.modo_fetch = 'http'
+    saida = scraper.extrair_dados_pagina(f"{url_base}/resultados/", max_paginas=4)
+    scraper.obter_cliente_http().fechar()
+    ok = isinstance(saida, SaidaSink) and not leituras
+    ok = ok and saida.caminho == sink.caminho and saida.linhas == len(saida) == sink.total_gravado == 30
+    df = saida.carregar() if ok else None
+    ok = ok and len(leituras) == 1 and len(df) == 30 and 'Preco' in df.columns and df['Preco'].notna().all()
+    print("✅ TESTE PASSOU!" if ok else f"❌ TESTE FALHOU! saida={saida!r} leituras={len(leituras)}")
+    return ok
+
+
+def testar_colunas_novas(pasta, formato):
+    """Uma chave que só aparece depois do primeiro flush não é perdida (ex.: Situacao do crawl incremental)"""
+    print(f"\n🧪 TESTE DE COLUNAS NOVAS DEPOIS DO PRIMEIRO FLUSH ({formato})")
+    sink = criar_sink(formato, os.path.join(pasta, f"colunas{SINKS[formato].extensao}"))
+    sink.escrever([{'Preco': 500000.0, 'URL': 'https://exemplo.com/1'}])
+    sink.flush()
+    sink.escrever([{'Preco': 650000.0, 'URL': 'https://exemplo.com/2', 'Situacao': 'preco_alterado'}])
+    sink.flush()
+    sink.escrever([{'Preco': 700000.0, 'URL': 'https://exemplo.com/3'}])
+    sink.fechar()
+    df = sink.carregar()
+    ok = len(df) == 3 and 'Situacao' in df.columns and list(df['Preco']) == [500000.0, 650000.0, 700000.0]
+    ok = ok and df['Situacao'].tolist()[1] == 'preco_alterado' and df['Situacao'].isna().tolist() == [True, False, True]
+    print("✅ TESTE PASSOU!" if ok else f"❌ TESTE FALHOU!\n{df}")
+    return ok
+
+
+if __name__ == "__main__":
+    servidor, url_base = iniciar_servidor()
+    resultados = []
+    try:
+        with tempfile.TemporaryDirectory() as pasta:
+            for formato in formatos_disponiveis():
+                resultados.append(testar_flush_por_pagina(pasta, formato))
+                resultados.append(testar_extracao_com_sink(pasta, formato, url_base))
+                resultados.append(testar_colunas_novas(pasta, formato))
+    finally:
+        servidor.shutdown()
+
+    if all(resultados):
+        print("\n🎉 Todos os testes passaram!")
+    else:
+        print("\n⚠️ Alguns testes falharam.")
+        raise SystemExit(1)
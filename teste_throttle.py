@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste do throttle adaptativo: detecção de bloqueio, ajustes AIMD e cooldown por worker
+"""
+
+import threading
+import time
+
+from throttle_adaptativo import ThrottleAdaptativo, detectar_bloqueio
+from planejador_paginas import PlanejadorPaginas
+from zap_scraper import ZapScraper
+
+with open('fixtures/pagina_resultados.html', encoding='utf-8') as f:
+    PAGINA_RESULTADOS = f.read()
+with open('fixtures/pagina_bloqueio.html', encoding='utf-8') as f:
+    PAGINA_BLOQUEIO = f.read()
+
+PAGINA_VAZIA = "<html><body><p>Nenhum imóvel encontrado</p></body></html>"
+
+
+def testar_detector():
+    """Desafio sem cards é bloqueio; busca vazia e página com cards não são"""
+    print("🧪 TESTE DO DETECTOR DE BLOQUEIO")
+    ok = detectar_bloqueio(PAGINA_BLOQUEIO, 200, 0)
+    ok = ok and not detectar_bloqueio(PAGINA_VAZIA, 200, 0)
+    ok = ok and not detectar_bloqueio(PAGINA_RESULTADOS, 200, 32)
+    ok = ok and detectar_bloqueio(PAGINA_RESULTADOS, 429, 32)
+    print("✅ TESTE PASSOU!" if ok else "❌ TESTE FALHOU!")
+    return ok
+
+
+def testar_aimd():
+    """Bloqueio: pausa dobra e concorrência cai pela metade; sucessos a recuperam aos poucos"""
+    print("\n🧪 TESTE DO CONTROLE AIMD")
+    throttle = ThrottleAdaptativo(atraso_inicial=0.4, atraso_minimo=0.1, passo_atraso=0.1,
+                                  concorrencia_maxima=4, sucessos_para_aumentar=2, cooldown_base=0)
+    throttle.registrar(0, 'bloqueio')
+    ok = throttle.atraso == 0.8 and throttle.concorrencia == 2
+    for _ in range(4):
+        throttle.registrar(0, 'sucesso', linhas=30)
+    ok = ok and abs(throttle.atraso - 0.4) < 1e-9 and throttle.concorrencia == 4
+    ok = ok and throttle.total_linhas == 120
+    eventos = [d['evento'] for d in throttle.decisoes]
+    ok = ok and eventos == ['bloqueio', 'sucesso', 'aumento', 'sucesso', 'aumento']
+    print("✅ TESTE PASSOU!" if ok else f"❌ TESTE FALHOU! atraso={throttle.atraso} concorrencia={throttle.concorrencia}")
+    return ok
+
+
+def testar_cooldown_por_worker():
+    """Só o worker bloqueado fica parado; os demais seguem"""
+    print("\n🧪 TESTE DE COOLDOWN POR WORKER")
+    throttle = ThrottleAdaptativo(atraso_inicial=0, atraso_minimo=0, concorrencia_maxima=2, cooldown_base=0.5)
+    throttle.registrar(0, 'bloqueio')
+    inicio = time.perf_counter()
+    throttle.esperar(1)
+    livre = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    throttle.esperar(0)
+    bloqueado = time.perf_counter() - inicio
+    throttle.registrar(0, 'bloqueio')  # Segundo bloqueio seguido dobra o cooldown
+    ok = livre < 0.1 and bloqueado >= 0.4 and throttle.decisoes[-1]['cooldown'] == 1.0
+    print("✅ TESTE PASSOU!" if ok else f"❌ TESTE FALHOU! livre={livre:.2f}s bloqueado={bloqueado:.2f}s")
+    return ok
+
+
+def testar_limite_concorrencia():
+    """slot() não deixa passar mais requisições simultâneas que a concorrência atual"""
+    print("\n🧪 TESTE DO LIMITE DE CONCORRÊNCIA")
+    throttle = ThrottleAdaptativo(atraso_inicial=0, atraso_minimo=0, concorrencia_maxima=4, cooldown_base=0)
+    throttle.registrar(0, 'bloqueio')  # 4 -> 2
+    ativos, pico, lock = [0], [0], threading.Lock()
+
+    def requisicao(worker):
+        with throttle.slot(worker):
+            with lock:
+                ativos[0] += 1
+                pico[0] = max(pico[0], ativos[0])
+            time.sleep(0.05)
+            with lock:
+                ativos[0] -= 1
+
+    threads = [threading.Thread(target=requisicao, args=(i,)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    ok = pico[0] == 2
+    print("✅ TESTE PASSOU!" if ok else f"❌ TESTE FALHOU! pico={pico[0]}")
+    return ok
+
+
+class DriverDesafio:
+    """Navegador falso numa página de desafio que ainda tem o contêiner de cards, mas sem anúncios"""
+
+    def __init__(self):
+        self.page_source = PAGINA_BLOQUEIO.replace('<body>', '<body><div class="card"></div>', 1)
+
+    def get(self, url):
+        pass
+
+    def implicitly_wait(self, segundos):
+        pass
+
+    def find_elements(self, by, seletor):
+        return [object()]
+
+
+def testar_desafio_no_navegador():
+    """Desafio sem anúncios extraídos no Chrome conta como bloqueio no throttle, não como erro"""
+    print("\n🧪 TESTE DE DESAFIO NO CAMINHO DO NAVEGADOR")
+    scraper = ZapScraper()
+    scraper.aguardar_cards = lambda driver: True
+    scraper.aguardar_pagina_pronta = lambda driver: 1
+    scraper.coletar_anuncios_carregados = lambda pagina, driver: []
+    scraper.debug_salvar_html = lambda nome: None
+    planejador = PlanejadorPaginas('https://exemplo.com/busca/', [2], max_tentativas=1, espera_base=0)
+    item = planejador.proxima()
+    anuncios = scraper._processar_pagina_navegador(planejador, item, driver=DriverDesafio())
+    ok = anuncios == [] and scraper.throttle.total_bloqueios == 1
+    ok = ok and [d['evento'] for d in scraper.throttle.decisoes] == ['bloqueio']
+    print("✅ TESTE PASSOU!" if ok else f"❌ TESTE FALHOU! {[d['evento'] for d in scraper.throttle.decisoes]}")
+    return ok
+
+
+if __name__ == "__main__":
+    resultados = [
+        testar_detector(),
+        testar_aimd(),
+        testar_cooldown_por_worker(),
+        testar_limite_concorrencia(),
+        testar_desafio_no_navegador(),
+    ]
+
+    if all(resultados):
+        print("\n🎉 Todos os testes passaram!")
+    else:
+        print("\n⚠️ Alguns testes falharam.")
+        raise SystemExit(1)
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ThrottleAdaptativo - Controle AIMD de atraso e concorrência entre requisições, com detecção
+de bloqueio/captcha e cooldown por worker, no lugar das pausas aleatórias fixas
+"""
+
+import json
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+from cliente_http import MARCADORES_BLOQUEIO, STATUS_BLOQUEIO
+
+
+def detectar_bloqueio(html, status=200, num_cards=None):
+    """Indica se a página é um bloqueio/desafio
+
+    Status de bloqueio bastam; sem eles, só conta como bloqueio uma página sem cards
+    que contenha marcadores de desafio (uma busca legítima sem resultados não é bloqueio).
+    """
+    if status in STATUS_BLOQUEIO:
+        return True
+    if not html:
+        return True
+    if num_cards:
+        return False
+    return bool(MARCADORES_BLOQUEIO.search(html))
+
+
+class ThrottleAdaptativo:
+    def __init__(self, atraso_inicial=0.5, atraso_minimo=0.1, atraso_maximo=30.0, passo_atraso=0.05,
+                 concorrencia_maxima=1, sucessos_para_aumentar=5, fator_reducao=0.5,
+                 cooldown_base=30.0, cooldown_maximo=600.0, jitter=0.2, caminho_log=None):
+        """
+        Args:
+            atraso_inicial (float): pausa (s) antes de cada requisição no início
+            atraso_minimo / atraso_maximo (float): limites da pausa
+            passo_atraso (float): redução aditiva da pausa a cada sucesso
+            concorrencia_maxima (int): requisições simultâneas permitidas no máximo
+            sucessos_para_aumentar (int): sucessos seguidos para liberar +1 de concorrência
+            fator_reducao (float): fator multiplicativo aplicado à concorrência em um bloqueio
+                                   (a pausa é dividida por ele)
+            cooldown_base (float): pausa do worker após o primeiro bloqueio; dobra a cada bloqueio seguido
+            cooldown_maximo (float): limite do cooldown por worker
+            jitter (float): variação relativa aleatória da pausa (evita um ritmo fixo detectável)
+            caminho_log (str): arquivo JSONL opcional onde cada decisão é registrada
+        """
+        self.atraso = atraso_inicial
+        self.atraso_minimo = atraso_minimo
+        self.atraso_maximo = atraso_maximo
+        self.passo_atraso = passo_atraso
+        self.concorrencia_maxima = max(1, int(concorrencia_maxima))
+        self.concorrencia = self.concorrencia_maxima
+        self.sucessos_para_aumentar = sucessos_para_aumentar
+        self.fator_reducao = fator_reducao
+        self.cooldown_base = cooldown_base
+        self.cooldown_maximo = cooldown_maximo
+        self.jitter = jitter
+        self.caminho_log = caminho_log
+        self.decisoes = []  # {'instante', 'evento', 'worker', 'atraso', 'concorrencia', ...}
+        self._condicao = threading.Condition()
+        self._em_uso = 0
+        self._sucessos_seguidos = 0
+        self._cooldown_ate = {}  # worker -> instante (monotonic) em que pode voltar
+        self._bloqueios_seguidos = {}  # worker -> bloqueios consecutivos
+        self._inicio = time.monotonic()
+        self.total_linhas = 0
+        self.total_bloqueios = 0
+
+    def ajustar_concorrencia_maxima(self, concorrencia_maxima):
+        """Atualiza o teto de concorrência (ex.: número de workers da extração)"""
+        with self._condicao:
+            self.concorrencia_maxima = max(1, int(concorrencia_maxima))
+            self.concorrencia = min(self.concorrencia, self.concorrencia_maxima)
+            self._condicao.notify_all()
+
+    def vazao_por_minuto(self):
+        """Imóveis por minuto desde a criação do throttle"""
+        decorrido = time.monotonic() - self._inicio
+        return self.total_linhas / decorrido * 60 if decorrido else 0.0
+
+    def _registrar_decisao(self, evento, worker, **dados):
+        decisao = {'instante': time.time(), 'evento': evento, 'worker': worker,
+                   'atraso': round(self.atraso, 3), 'concorrencia': self.concorrencia,
+                   'vazao_por_minuto': round(self.vazao_por_minuto(), 1), **dados}
+        self.decisoes.append(decisao)
+        if self.caminho_log:
+            with open(self.caminho_log, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(decisao, ensure_ascii=False) + '\n')
+        if evento != 'sucesso':
+            extras = " ".join(f"{k}={v}" for k, v in dados.items())
+            print(f"🎚️ Throttle [{evento}] worker {worker}: atraso {self.atraso:.2f}s, "
+                  f"concorrência {self.concorrencia}/{self.concorrencia_maxima} {extras}".rstrip())
+
+    def esperar(self, worker=0):
+        """Aguarda o cooldown do worker (se houver) e a pausa atual entre requisições"""
+        with self._condicao:
+            restante = self._cooldown_ate.get(worker, 0) - time.monotonic()
+            atraso = self.atraso
+        if restante > 0:
+            print(f"🧊 Worker {worker} em cooldown por {restante:.1f}s")
+            time.sleep(restante)
+        time.sleep(atraso * random.uniform(1 - self.jitter, 1 + self.jitter))
+
+    @contextmanager
+    def slot(self, worker=0):
+        """Ocupa uma vaga de concorrência (respeitando o limite atual) e aplica esperar()"""
+        with self._condicao:
+            while self._em_uso >= self.concorrencia:
+                self._condicao.wait()
+            self._em_uso += 1
+        try:
+            self.esperar(worker)
+            yield
+        finally:
+            with self._condicao:
+                self._em_uso -= 1
+                self._condicao.notify_all()
+
+    def registrar(self, worker=0, resultado='sucesso', linhas=0):
+        """Ajusta atraso/concorrência a partir do resultado de uma requisição
+
+        'sucesso': redução aditiva da pausa e +1 de concorrência a cada N sucessos seguidos
+        'bloqueio': pausa multiplicada, concorrência reduzida e cooldown exponencial do worker
+        'erro': falha sem indício de bloqueio; só zera a sequência de sucessos
+        """
+        with self._condicao:
+            if resultado == 'sucesso':
+                self.total_linhas += linhas
+                self._bloqueios_seguidos[worker] = 0
+                self._sucessos_seguidos += 1
+                self.atraso = max(self.atraso_minimo, self.atraso - self.passo_atraso)
+                if (self._sucessos_seguidos >= self.sucessos_para_aumentar
+                        and self.concorrencia < self.concorrencia_maxima):
+                    self.concorrencia += 1
+                    self._sucessos_seguidos = 0
+                    self._registrar_decisao('aumento', worker)
+                    self._condicao.notify_all()
+                else:
+                    self._registrar_decisao('sucesso', worker, linhas=linhas)
+            elif resultado == 'bloqueio':
+                self.total_bloqueios += 1
+                self._sucessos_seguidos = 0
+                self.atraso = min(self.atraso_maximo, max(self.atraso, self.atraso_minimo) / self.fator_reducao)
+                self.concorrencia = max(1, int(self.concorrencia * self.fator_reducao))
+                seguidos = self._bloqueios_seguidos.get(worker, 0) + 1
+                self._bloqueios_seguidos[worker] = seguidos
+                cooldown = min(self.cooldown_maximo, self.cooldown_base * 2 ** (seguidos - 1))
+                self._cooldown_ate[worker] = time.monotonic() + cooldown
+                self._registrar_decisao('bloqueio', worker, cooldown=round(cooldown, 1),
+                                        bloqueios_seguidos=seguidos)
+            else:
+                self._sucessos_seguidos = 0
+                self._registrar_decisao('erro', worker)
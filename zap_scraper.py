@@ -1,18 +1,41 @@
 import pandas as pd
 import re
+import json
+import base64
+import copy
+import hashlib
 import numpy as np
 import time
 import random
 import os
+import socket
+import threading
+import atexit
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlparse
 from scipy.stats import zscore
 import warnings
 import undetected_chromedriver as uc
-from fake_useragent import UserAgent
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from bs4 import BeautifulSoup
+from selenium.common.exceptions import TimeoutException
 from excel_formatter import ExcelFormatter
+from driver_pool import DriverPool
+from cliente_http import ClienteHTTP, resposta_com_erro
+from throttle_adaptativo import ThrottleAdaptativo, detectar_bloqueio
+from extrator_json import extrair_anuncios_json, extrair_anuncios_api, PADRAO_NEXT_DATA
+from extrator_cards import extrair_card, url_generica
+from parsers_html import obter_parser
+from perfis_seletores import PerfilSeletores
+from pipeline_parse import PipelineParse
+from checkpoint import CheckpointStore
+from sinks import SaidaSink
+from planejador_paginas import PlanejadorPaginas, url_da_pagina
+from indice_anuncios import url_mais_recentes, NOVO, PRECO_ALTERADO, CONHECIDO
+from pool_proxies import PoolProxies
+from cache_driver import user_agent_aleatorio, obter_chromedriver_patcheado, descartar_chromedriver
 from agno.agent import Agent
 from agno.tools.tavily import TavilyTools
 from dotenv import load_dotenv
@@ -21,17 +44,223 @@ load_dotenv()
 
 warnings.filterwarnings("ignore")
 
+# Seletor dos cards de imóveis na página de resultados
+SELETOR_CARD = "flex.flex-col.grow.min-w-0"
+SELETOR_CARD_CSS = "." + SELETOR_CARD  # Mesmo seletor para os parsers HTML (parsers_html)
+
+# Script assíncrono de prontidão: resolve quando a lista de cards para de mudar por
+# `quietude` ms e o botão de próxima página (se existir) está visível e não ocupado.
+# Sem cards, resolve após a quietude se a página já mostra o aviso de busca vazia ou a
+# paginação (última página real), em vez de esperar o limite inteiro
+SCRIPT_PAGINA_PRONTA = """
+var seletor = arguments[0], quietude = arguments[1], limite = arguments[2];
+var concluir = arguments[arguments.length - 1];
+var inicio = performance.now(), ultimaMudanca = performance.now();
+function contar() { return document.querySelectorAll(seletor).length; }
+function paginacaoPronta() {
+    var b = document.querySelector('button[data-testid="next-page"]') ||
+            document.querySelector('button[aria-label*="próxima"]');
+    if (!b) { return true; }
+    var r = b.getBoundingClientRect();
+    return !b.hasAttribute('aria-busy') && r.width > 0 && r.height > 0;
+}
+function semResultados() {
+    if (document.querySelector('[data-testid*="empty"], [data-cy*="empty"], [data-cy*="no-results"], ' +
+                               '[class*="empty-state"], [class*="no-results"]')) { return true; }
+    if (document.querySelector('button[data-testid="next-page"], button[aria-label*="próxima"], ' +
+                               'nav[aria-label*="pagina" i], nav[aria-label*="página" i], ' +
+                               '[data-testid*="pagination"]')) { return true; }
+    var texto = document.body ? document.body.textContent : '';
+    return /nenhum (imóvel|resultado|anúncio) encontrado|não encontramos/i.test(texto);
+}
+var total = contar();
+var observador = new MutationObserver(function () {
+    var atual = contar();
+    if (atual !== total) { total = atual; ultimaMudanca = performance.now(); }
+});
+observador.observe(document.documentElement, {childList: true, subtree: true});
+(function verificar() {
+    var agora = performance.now();
+    var estavel = document.readyState !== 'loading' && agora - ultimaMudanca >= quietude &&
+                  (total > 0 ? paginacaoPronta() : semResultados());
+    if (estavel || agora - inicio >= limite) {
+        observador.disconnect();
+        concluir({cards: total, ms: agora - inicio, timeout: !estavel, vazia: estavel && total === 0});
+        return;
+    }
+    setTimeout(verificar, 50);
+})();
+"""
+
+# Assinatura da página atual, usada para detectar que a navegação de fato trocou os cards
+SCRIPT_ASSINATURA_PAGINA = """
+var card = document.querySelector(arguments[0]);
+return location.href + '|' + (card ? card.textContent.slice(0, 200) : '');
+"""
+
+# Botão "próxima página": mesmas estratégias do script de paginação, na mesma ordem (do mais barato ao mais amplo)
+SELETORES_PROXIMA = (
+    (By.CSS_SELECTOR, 'button[data-testid="next-page"]'),
+    (By.CSS_SELECTOR, 'button[aria-label*="próxima"]'),
+    (By.XPATH, "//button[contains(text(), 'Próxima') or contains(text(), 'Next')]"),
+)
+
+# Estado da paginação em uma única chamada, sem espera: há próxima página, está habilitada, onde está
+SCRIPT_ESTADO_PAGINACAO = """
+var seletorCard = arguments[0];
+var botao = document.querySelector('button[data-testid="next-page"]'), estrategia = 'testid';
+if (!botao) { botao = document.querySelector('button[aria-label*="próxima" i]'); estrategia = 'aria'; }
+if (!botao) {
+    estrategia = 'texto';
+    botao = Array.prototype.find.call(document.querySelectorAll('button'), function (b) {
+        var texto = b.textContent || '';
+        return texto.indexOf('Próxima') !== -1 || texto.indexOf('Next') !== -1;
+    }) || null;
+}
+var habilitada = !!botao && !botao.disabled && botao.getAttribute('aria-disabled') !== 'true' &&
+                 (botao.getAttribute('class') || '').indexOf('disabled') === -1;
+var link = botao && botao.closest('a');
+return {
+    proxima: !!botao,
+    habilitada: habilitada,
+    estrategia: botao ? estrategia : null,
+    href: link ? link.href : null,
+    cards: document.querySelectorAll(seletorCard).length
+};
+"""
+
+# URLs das respostas XHR/fetch que trazem os resultados da busca (API glue do Grupo OLX)
+PADRAO_API_LISTAGENS = re.compile(r"glue-api\.|/v\d+/listings", re.IGNORECASE)
+
+# Recursos bloqueados via CDP Network.setBlockedURLs: imagens, fontes, mídia, anúncios e analytics
+PADROES_BLOQUEIO_PADRAO = (
+    "*.jpg", "*.jpeg", "*.png", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.mp4", "*.webm",
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*googlesyndication.com*", "*facebook.net*", "*connect.facebook.com*",
+    "*hotjar.com*", "*clarity.ms*", "*criteo.com*", "*taboola.com*", "*outbrain.com*",
+    "*tiktok.com*", "*newrelic.com*", "*nr-data.net*", "*sentry.io*",
+)
+
+# Um passo da colheita incremental: rola a página, espera o DOM assentar e devolve os cards renderizados
+SCRIPT_PASSO_SCROLL = """
+var seletor = arguments[0], passo = arguments[1], quietude = arguments[2], limite = arguments[3];
+var concluir = arguments[arguments.length - 1];
+var inicio = performance.now(), ultimaMudanca = null;
+var observador = new MutationObserver(function () { ultimaMudanca = performance.now(); });
+observador.observe(document.documentElement, {childList: true, subtree: true});
+window.scrollBy(0, passo > 0 ? passo : Math.round(window.innerHeight * 0.9));
+(function verificar() {
+    var agora = performance.now();
+    var assentou = ultimaMudanca !== null && agora - ultimaMudanca >= quietude;
+    if (assentou || agora - inicio >= limite) {
+        observador.disconnect();
+        var raiz = document.scrollingElement || document.documentElement;
+        concluir({
+            cards: Array.prototype.map.call(document.querySelectorAll(seletor), function (e) { return e.outerHTML; }),
+            fim: window.innerHeight + window.scrollY >= raiz.scrollHeight - 2
+        });
+        return;
+    }
+    setTimeout(verificar, 50);
+})();
+"""
+
+# Bytes transferidos e tempo de carregamento desde a última medição (Resource/Navigation Timing)
+SCRIPT_METRICAS_REDE = """
+performance.setResourceTimingBufferSize(5000);
+var bytes = 0, recursos = performance.getEntriesByType('resource');
+recursos.forEach(function (r) { bytes += r.transferSize || 0; });
+var nav = performance.getEntriesByType('navigation')[0];
+var carregamento = null;
+if (nav && !window.__zapNavMedida) {
+    bytes += nav.transferSize || 0;
+    carregamento = nav.loadEventEnd > 0 ? nav.loadEventEnd - nav.startTime : performance.now();
+    window.__zapNavMedida = true;
+}
+performance.clearResourceTimings();
+return {bytes: bytes, recursos: recursos.length, carregamento_ms: carregamento};
+"""
+
+# Serviços de fundo do Chrome que só atrasam a partida (atualizações, sync, apps padrão)
+ARGUMENTOS_PARTIDA_RAPIDA = [
+    '--disable-background-networking',
+    '--disable-component-update',
+    '--disable-sync',
+    '--disable-default-apps',
+]
+
+
+def porta_livre():
+    """Porta TCP livre no momento (bind na porta 0): o remote debugging de cada navegador paralelo,
+    sem colidir com outros scrapers ou lotes rodando na mesma máquina
+    """
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+
 class ZapScraper:
-    def __init__(self):
+    def __init__(self, num_workers=1, pool=None, checkpoint=None, sink=None, proxies=None, indice=None):
         self.driver = None
+        self.pool = pool  # DriverPool opcional para reaproveitar navegadores entre execuções
+        self.checkpoint = checkpoint  # CheckpointStore opcional para retomar extrações interrompidas
+        self.run_id = None  # Execução corrente no checkpoint
+        self.paginas_concluidas = set()  # Páginas já consolidadas nesta execução
+        self.pagina_interrompida = None  # Primeira página deixada pendente por bloqueio ou falha (execução incompleta)
+        self._lock_consolidacao = threading.Lock()  # Workers paralelos consolidam páginas concorrentemente
+        self.sink = sink  # SinkLinhas opcional: grava as linhas em disco a cada página
+        self.manter_em_memoria = sink is None  # Com sink, não acumular as linhas em data_list
+        self.total_coletado = 0  # Linhas novas consolidadas (em memória ou no sink)
+        self.indice = indice  # IndiceAnuncios opcional: crawl incremental (só anúncios novos ou com preço alterado)
+        self.parada_incremental = None  # Primeira página inteiramente conhecida e sem mudanças
+        self.contagem_incremental = {NOVO: 0, PRECO_ALTERADO: 0, CONHECIDO: 0}
         self.data_list = []
         self.debug = True  # Ativar debug para análise
         self.excel_formatter = ExcelFormatter()
         self.imoveis_unicos = set()  # Set para armazenar identificadores únicos
         self.duplicatas_detectadas = 0  # Contador de duplicatas
+        self.num_workers = max(1, int(num_workers))  # Número de navegadores em paralelo
+        self.modo_snapshot = True  # Um único page_source por página em vez de outerHTML por card
+        self.quietude_ms = 500  # Tempo sem mudanças na lista de cards para considerar a página pronta
+        self.throttle = ThrottleAdaptativo(concorrencia_maxima=self.num_workers)  # Pausas e concorrência adaptativas (AIMD)
+        self.scroll_incremental = True  # Rolar em passos colhendo os cards (listas virtualizadas/lazy)
+        self.max_passos_scroll = 60  # Limite de passos da colheita incremental por página
+        self.metricas_tempo = []  # Tempo de cada etapa por página: {'pagina', 'etapa', 'segundos'}
+        self.modo_fetch = 'auto'  # 'auto' (HTTP, Chrome se bloqueado), 'http' ou 'selenium'
+        self.cliente_http = None  # ClienteHTTP criado sob demanda
+        self.proxies = proxies  # PoolProxies opcional: requisições HTTP e navegadores distribuídos entre proxies
+        self.clientes_proxy = {}  # proxy -> ClienteHTTP (conexões keep-alive por proxy)
+        self.max_tentativas_pagina = 3  # Tentativas de cada página no Chrome antes de ir para as páginas mortas
+        self.espera_base_pagina = 5.0  # Espera (s) antes de refazer uma página; dobra a cada nova tentativa
+        self.paginas_mortas = []  # Páginas desistidas: {'pagina', 'url', 'tentativas', 'erro'}
+        self.tentativas_proxy = 3  # Proxies diferentes tentados por página antes de desistir dela
+        self.extracao_compilada = True  # Cards extraídos em uma passagem pela árvore (extrator_cards)
+        self.pipeline_parse = False  # Opt-in: no Chrome sequencial, parse das páginas em processos enquanto a próxima carrega
+        self.processos_parse = None  # Processos do pipeline de parse (None = núcleos da máquina)
+        self.tamanho_fila_parse = None  # Páginas em espera entre a navegação e o coletor (None = 2 por processo)
+        self.parser_html = 'auto'  # Backend do parse dos cards: 'auto' (mais rápido instalado), 'selectolax', 'lxml' ou 'html.parser'
+        self.perfil_seletores = PerfilSeletores.carregar()  # Estratégias por campo (perfis_seletores.json), com contadores de acerto
+        self.usar_estado_json = True  # Tentar o JSON embutido (__NEXT_DATA__) antes do DOM
+        self.captura_rede = False  # Ler os resultados das respostas da API via CDP, sem esperar renderização
+        self.headless = False  # Opt-in: Chrome sem janela (--headless=new), partida mais rápida
+        self.reusar_chromedriver = True  # Usar o chromedriver patcheado em cache em vez de patchear a cada driver
+        self.espera_implicita = 10  # implicitly_wait (s) dos navegadores; consultas de "existe?" a desligam
+        self.bloquear_recursos = True  # Bloquear imagens, fontes e rastreadores no Chrome
+        self.padroes_bloqueados = list(PADROES_BLOQUEIO_PADRAO)  # Padrões de URL bloqueados (formato CDP)
+        self.metricas_rede = []  # Bytes e tempo de carregamento por página: {'pagina', 'bytes', 'recursos', 'carregamento_ms'}
+        self.medir_economia = False  # Opt-in: medir na primeira página do Chrome quanto o bloqueio de recursos economiza
+        self.economia_bloqueio = None  # Resultado de medir_economia_bloqueio(), por página
+        self._lock_criacao_driver = threading.Lock()  # uc.Chrome não é thread-safe ao patchear o binário
+        self._pool_driver = None  # Pool de onde veio self.driver (ver pool_drivers)
     
-    def criar_identificador_imovel(self, dados):
-        """Cria um identificador único para o imóvel baseado em suas características"""
+    def criar_identificador_imovel(self, dados, incluir_preco=True):
+        """Cria um identificador único para o imóvel baseado em suas características
+        
+        incluir_preco=False dá a identidade do anúncio (chave_anuncio): o mesmo imóvel com
+        outro preço continua sendo o mesmo anúncio.
+        """
         try:
             # Usar características principais para criar identificador único
             identificador_parts = []
@@ -50,7 +279,7 @@ class ZapScraper:
                 identificador_parts.append(f"{dados['M2']:.1f}")
             
             # Preço
-            if 'Preco' in dados:
+            if incluir_preco and 'Preco' in dados:
                 identificador_parts.append(f"{dados['Preco']:.0f}")
             
             # Quartos, banheiros, vagas
@@ -61,9 +290,9 @@ class ZapScraper:
             if 'Vagas' in dados:
                 identificador_parts.append(f"V{dados['Vagas']}")
             
-            # Criar hash do identificador
+            # Criar hash do identificador (estável entre processos, para o checkpoint)
             identificador = "|".join(identificador_parts)
-            return hash(identificador)
+            return hashlib.sha1(identificador.encode('utf-8')).hexdigest()
             
         except Exception as e:
             print(f"Erro ao criar identificador: {e}")
@@ -126,12 +355,10 @@ class ZapScraper:
             print(f"Erro ao verificar Chrome: {e}")
             return False
     
-    def _criar_driver_com_opcoes(self, version_main=None):
+    def _criar_driver_com_opcoes(self, version_main=None, porta_debug=None):
         """Cria um novo driver com opções frescas para evitar reutilização"""
         options = uc.ChromeOptions()
-        ua = UserAgent()
-        user_agent = ua.random
-        options.add_argument(f'user-agent={user_agent}')
+        options.add_argument(f'user-agent={user_agent_aleatorio()}')
         options.add_argument('--disable-gpu')
         options.add_argument('--no-sandbox')
         options.add_argument('--disable-dev-shm-usage')
@@ -140,11 +367,13 @@ class ZapScraper:
         options.add_argument('--disable-blink-features=AutomationControlled')
         options.add_argument('--disable-web-security')
         options.add_argument('--disable-features=VizDisplayCompositor')
-        options.add_argument('--remote-debugging-port=9222')
+        proxy = self._configurar_proxy_chrome(options)
         options.add_argument('--disable-extensions')
         options.add_argument('--disable-plugins')
-        options.add_argument('--disable-images')
-        options.add_argument('--disable-javascript')
+        for argumento in ARGUMENTOS_PARTIDA_RAPIDA:
+            options.add_argument(argumento)
+        if self.bloquear_recursos:
+            options.add_argument('--blink-settings=imagesEnabled=false')
         options.add_experimental_option("excludeSwitches", ["enable-automation"])
         options.add_experimental_option('useAutomationExtension', False)
         
@@ -155,47 +384,216 @@ class ZapScraper:
         options.add_argument('--disable-features=TranslateUI')
         options.add_argument('--disable-ipc-flooding-protection')
         
+        driver = self._iniciar_chrome(options, version_main, porta_debug)
+        driver.proxy_zap = proxy
+        self.aplicar_bloqueio_recursos(driver)
+        return driver
+    
+    def _configurar_proxy_chrome(self, options):
+        """Fixa no navegador o proxy mais saudável do pool (o Chrome não aceita usuário/senha no --proxy-server)"""
+        if not self.proxies:
+            return None
+        proxy = self.proxies.melhor()
+        endereco = urlparse(proxy)
+        if endereco.username:
+            print(f"⚠️ Proxy {PoolProxies.mascarar(proxy)} exige autenticação, que o Chrome não aceita por argumento")
+        options.add_argument(f'--proxy-server={endereco.scheme}://{endereco.hostname}:{endereco.port}')
+        return proxy
+    
+    def _iniciar_chrome(self, options, version_main=None, porta_debug=None):
+        """Inicia o uc.Chrome reaproveitando o chromedriver patcheado em cache (e headless, se ativado)"""
+        argumentos = {'options': options, 'headless': self.headless}
         if version_main is not None:
-            return uc.Chrome(options=options, version_main=version_main)
-        else:
-            return uc.Chrome(options=options)
+            argumentos['version_main'] = version_main
+        if porta_debug is not None:
+            # O uc.Chrome acrescenta o próprio --remote-debugging-port (porta livre qualquer);
+            # um argumento nas opções seria sobrescrito, só o `port` fixa a porta
+            argumentos['port'] = porta_debug
+        # Criação serializada: vários workers patchando o chromedriver ao mesmo tempo corrompem o binário
+        with self._lock_criacao_driver:
+            if not self.reusar_chromedriver:
+                return uc.Chrome(**argumentos)
+            reserva = copy.deepcopy(options)  # O uc.Chrome não aceita reutilizar o mesmo ChromeOptions
+            try:
+                return uc.Chrome(driver_executable_path=obter_chromedriver_patcheado(version_main), **argumentos)
+            except Exception as e:
+                # Chrome atualizado não aceita o chromedriver antigo: baixar e patchear de novo
+                print(f"Chromedriver em cache falhou ({e}); atualizando o cache...")
+                descartar_chromedriver(version_main)
+                argumentos['options'] = reserva
+                return uc.Chrome(driver_executable_path=obter_chromedriver_patcheado(version_main), **argumentos)
 
+    def criar_driver(self, captura_rede=False, log_performance=False, bloquear_recursos=None):
+        """Cria um driver do Chrome configurado com opções para evitar detecção
+        
+        bloquear_recursos=None segue self.bloquear_recursos; medir_economia_bloqueio força um ou outro.
+        """
+        bloquear = self.bloquear_recursos if bloquear_recursos is None else bloquear_recursos
+        options = uc.ChromeOptions()
+        if captura_rede or log_performance:
+            # Log de performance traz os eventos Network.* do DevTools
+            options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+        if captura_rede:
+            options.page_load_strategy = 'none'  # O get() não espera o load: as respostas da API bastam
+        options.add_argument(f'user-agent={user_agent_aleatorio()}')
+        proxy = self._configurar_proxy_chrome(options)
+        options.add_argument('--disable-gpu')
+        options.add_argument('--no-sandbox')
+        options.add_argument('--disable-dev-shm-usage')
+        options.add_argument('--disable-notifications')
+        options.add_argument('--disable-popup-blocking')
+        options.add_argument('--disable-blink-features=AutomationControlled')
+        for argumento in ARGUMENTOS_PARTIDA_RAPIDA:
+            options.add_argument(argumento)
+        if bloquear:
+            # Imagens sem extensão (CDN com query string) escapam dos padrões de URL
+            options.add_argument('--blink-settings=imagesEnabled=false')
+        
+        driver = self._iniciar_chrome(options)
+        driver.proxy_zap = proxy  # Proxy fixado neste navegador (None sem pool de proxies)
+        
+        # Configurar timeout e outras propriedades
+        driver.set_page_load_timeout(30)
+        driver.implicitly_wait(self.espera_implicita)
+        
+        width = random.randint(1050, 1200)
+        height = random.randint(800, 960)
+        driver.set_window_size(width, height)
+        
+        # Executar script para ocultar automação
+        driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        
+        if captura_rede:
+            driver.execute_cdp_cmd('Network.enable', {})
+        self.aplicar_bloqueio_recursos(driver, None if bloquear else [])
+        
+        return driver
+    
+    def aplicar_bloqueio_recursos(self, driver, padroes=None):
+        """Bloqueia no navegador as URLs que casam com os padrões (CDP Network.setBlockedURLs)"""
+        if padroes is None:
+            padroes = self.padroes_bloqueados if self.bloquear_recursos else []
+        try:
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': list(padroes)})
+            return True
+        except Exception as e:
+            print(f"Erro ao configurar bloqueio de recursos: {e}")
+            return False
+    
+    def registrar_metricas_rede(self, pagina, driver=None):
+        """Registra bytes transferidos e tempo de carregamento da página atual"""
+        driver = driver or self.driver
+        try:
+            metricas = driver.execute_script(SCRIPT_METRICAS_REDE)
+            metricas['pagina'] = pagina
+            self.metricas_rede.append(metricas)
+            return metricas
+        except Exception as e:
+            print(f"\nErro ao medir rede: {e}")
+            return None
+    
+    def ler_eventos_rede(self, driver, quietude=0.5, timeout=10):
+        """Soma os eventos de rede do log de performance até ficarem `quietude` segundos sem novos
+        
+        Bytes vêm de Network.loadingFinished.encodedDataLength, que conta também os recursos de
+        outras origens (no Resource Timing o transferSize deles é 0 sem Timing-Allow-Origin);
+        bloqueadas são os Network.loadingFailed com blockedReason.
+        """
+        totais = {'bytes': 0, 'requisicoes': 0, 'bloqueadas': 0}
+        limite = time.time() + timeout
+        ultimo_evento = time.time()
+        while time.time() < limite and time.time() - ultimo_evento < quietude:
+            for entrada in driver.get_log('performance'):
+                try:
+                    mensagem = json.loads(entrada['message'])['message']
+                except (KeyError, ValueError):
+                    continue
+                ultimo_evento = time.time()
+                params = mensagem.get('params', {})
+                if mensagem.get('method') == 'Network.loadingFinished':
+                    totais['bytes'] += params.get('encodedDataLength', 0)
+                    totais['requisicoes'] += 1
+                elif mensagem.get('method') == 'Network.loadingFailed' and params.get('blockedReason'):
+                    totais['bloqueadas'] += 1
+            time.sleep(0.1)
+        return totais
+    
+    def medir_economia_bloqueio(self, url):
+        """Carrega a mesma URL sem e com bloqueio de recursos e mede bytes e tempo economizados
+        
+        Cada passagem usa um navegador novo (cache vazio): o --blink-settings que desliga imagens
+        só vale na partida do Chrome, então não dá para alternar o bloqueio no mesmo driver.
+        """
+        medidas = {}
+        try:
+            for nome, bloquear in (('sem_bloqueio', False), ('com_bloqueio', True)):
+                driver = self.criar_driver(log_performance=True, bloquear_recursos=bloquear)
+                try:
+                    inicio = time.perf_counter()
+                    driver.get(url)
+                    self.aguardar_pagina_pronta(driver)
+                    segundos = time.perf_counter() - inicio
+                    medidas[nome] = dict(self.ler_eventos_rede(driver), segundos=segundos)
+                finally:
+                    driver.quit()
+        except Exception as e:
+            print(f"\nErro ao medir economia do bloqueio: {e}")
+            return None
+        
+        self.economia_bloqueio = {
+            'bytes': medidas['sem_bloqueio']['bytes'] - medidas['com_bloqueio']['bytes'],
+            'segundos': medidas['sem_bloqueio']['segundos'] - medidas['com_bloqueio']['segundos'],
+            'bloqueadas': medidas['com_bloqueio']['bloqueadas'],
+            'medidas': medidas,
+        }
+        print(f"\n🚫 Bloqueio de recursos economiza {self.economia_bloqueio['bytes'] / 1024:.0f} KB "
+              f"e {self.economia_bloqueio['segundos']:.2f}s por página "
+              f"({self.economia_bloqueio['bloqueadas']} requisições bloqueadas)")
+        return self.economia_bloqueio
+    
+    def configuracao_driver(self):
+        """Opções que mudam o navegador criado: um pool só compartilha navegadores de mesma configuração"""
+        return {
+            'headless': self.headless,
+            'bloquear_recursos': self.bloquear_recursos,
+            'padroes_bloqueados': tuple(self.padroes_bloqueados),
+            'espera_implicita': self.espera_implicita,
+        }
+    
+    def pool_drivers(self):
+        """Pool de onde tirar navegadores para esta configuração, ou None para criar um próprio
+        
+        Drivers do pool não têm o log de performance (a captura de rede usa um driver próprio) nem
+        proxy deste scraper: com proxies, cada navegador fixa ao nascer o proxy mais saudável do
+        PoolProxies, então não há pool. Pools de obter_pool_drivers são separados por configuração.
+        """
+        if self.pool is None or self.captura_rede or self.proxies:
+            return None
+        configuracao = getattr(self.pool, 'configuracao', None)
+        if configuracao is not None and configuracao != self.configuracao_driver():
+            return obter_pool_drivers(self.pool.tamanho_maximo, self.pool.max_paginas_por_driver,
+                                      self.pool.limite_memoria_mb, **self.configuracao_driver())
+        return self.pool
+    
     def configure_driver(self):
-        """Configura o driver do Chrome com opções para evitar detecção"""
+        """Configura o driver do Chrome (do pool, se houver) com opções para evitar detecção"""
         try:
+            self._pool_driver = self.pool_drivers()
+            if self._pool_driver is not None:
+                print("Obtendo navegador do pool...")
+                self.driver = self._pool_driver.checkout()
+                return True
+            
             # Verificar se o Chrome está instalado
             if not self.verificar_chrome_instalado():
                 return False
             
-            # Configuração simples e robusta
-            options = uc.ChromeOptions()
-            ua = UserAgent()
-            user_agent = ua.random
-            options.add_argument(f'user-agent={user_agent}')
-            options.add_argument('--disable-gpu')
-            options.add_argument('--no-sandbox')
-            options.add_argument('--disable-dev-shm-usage')
-            options.add_argument('--disable-notifications')
-            options.add_argument('--disable-popup-blocking')
-            options.add_argument('--disable-blink-features=AutomationControlled')
-            
             # Tentar criar o driver
             try:
                 print("Tentando criar driver...")
-                self.driver = uc.Chrome(options=options)
+                self.driver = self.criar_driver(captura_rede=self.captura_rede)
                 print("Driver criado com sucesso!")
-                
-                # Configurar timeout e outras propriedades
-                self.driver.set_page_load_timeout(30)
-                self.driver.implicitly_wait(10)
-                
-                width = random.randint(1050, 1200)
-                height = random.randint(800, 960)
-                self.driver.set_window_size(width, height)
-                
-                # Executar script para ocultar automação
-                self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-                
                 return True
                 
             except Exception as e:
@@ -206,6 +604,21 @@ class ZapScraper:
             print(f"Erro ao configurar o driver: {e}")
             return False
     
+    def liberar_driver(self, paginas_processadas=0):
+        """Devolve o driver ao pool ou fecha o navegador quando não há pool"""
+        driver, self.driver = self.driver, None
+        if driver is None:
+            return
+        try:
+            if self._pool_driver is not None:
+                print("\nDevolvendo navegador ao pool...")
+                self._pool_driver.devolver(driver, paginas_processadas)
+            else:
+                print("\nFechando navegador...")
+                driver.quit()
+        except Exception as e:
+            print(f"Erro ao fechar navegador: {e}")
+    
     def add_random_actions(self):
         """Adiciona ações aleatórias para simular comportamento humano"""
         try:
@@ -219,58 +632,237 @@ class ZapScraper:
                 });
                 document.dispatchEvent(event);
             """, random.randint(0, 800), random.randint(0, 600))
-            time.sleep(random.uniform(0.5, 1.5))
         except Exception as e:
             print(f"Erro nas ações aleatórias: {e}")
     
+    def registrar_tempo(self, pagina, etapa, inicio):
+        """Registra quanto tempo uma etapa da página levou desde `inicio`"""
+        segundos = time.perf_counter() - inicio
+        self.metricas_tempo.append({'pagina': pagina, 'etapa': etapa, 'segundos': segundos})
+        return segundos
+    
+    def resumo_tempos(self):
+        """Retorna o tempo médio e total por etapa registrada"""
+        resumo = {}
+        for registro in self.metricas_tempo:
+            etapa = resumo.setdefault(registro['etapa'], {'total': 0.0, 'paginas': 0})
+            etapa['total'] += registro['segundos']
+            etapa['paginas'] += 1
+        for etapa in resumo.values():
+            etapa['media'] = etapa['total'] / etapa['paginas']
+        return resumo
+    
+    def imprimir_resumo_tempos(self):
+        """Imprime o tempo médio por etapa e por página"""
+        resumo = self.resumo_tempos()
+        if not resumo:
+            return
+        print("\n⏱️ Tempo médio por etapa:")
+        for nome, etapa in resumo.items():
+            print(f"  {nome}: {etapa['media']:.2f}s ({etapa['paginas']} páginas, {etapa['total']:.1f}s no total)")
+        
+        if self.metricas_rede:
+            total_bytes = sum(m['bytes'] for m in self.metricas_rede)
+            media_kb = total_bytes / len(self.metricas_rede) / 1024
+            print(f"🌐 Rede: {media_kb:.0f} KB por página ({total_bytes / 1024 / 1024:.1f} MB no total, "
+                  f"bloqueio {'ativo' if self.bloquear_recursos else 'inativo'})")
+            if self.economia_bloqueio and self.bloquear_recursos:
+                paginas = len(self.metricas_rede)
+                print(f"🚫 Economia estimada: {self.economia_bloqueio['bytes'] / 1024:.0f} KB, "
+                      f"{self.economia_bloqueio['segundos']:.2f}s e {self.economia_bloqueio['bloqueadas']} requisições por página "
+                      f"(~{self.economia_bloqueio['bytes'] * paginas / 1024 / 1024:.1f} MB e "
+                      f"{self.economia_bloqueio['segundos'] * paginas:.0f}s no total)")
+    
+    def aguardar_pagina_pronta(self, driver=None, timeout=15):
+        """Aguarda até a lista de cards estabilizar e a paginação estar interativa"""
+        driver = driver or self.driver
+        try:
+            driver.set_script_timeout(timeout + 5)
+            resultado = driver.execute_async_script(
+                SCRIPT_PAGINA_PRONTA, SELETOR_CARD_CSS, self.quietude_ms, timeout * 1000
+            )
+            if resultado.get('timeout'):
+                print(f"\nTimeout de prontidão com {resultado.get('cards', 0)} elementos")
+            return int(resultado.get('cards', 0))
+        except Exception as e:
+            print(f"\nErro ao aguardar prontidão da página: {e}")
+            with self.sem_espera_implicita(driver):
+                return len(driver.find_elements(By.CLASS_NAME, SELETOR_CARD))
+    
+    def assinatura_pagina(self, driver=None):
+        """Retorna uma assinatura (URL + primeiro card) da página atual"""
+        driver = driver or self.driver
+        try:
+            return driver.execute_script(SCRIPT_ASSINATURA_PAGINA, SELETOR_CARD_CSS)
+        except Exception:
+            return None
+    
+    def aguardar_troca_pagina(self, assinatura_anterior, driver=None, timeout=15):
+        """Aguarda a navegação trocar os cards da página anterior"""
+        driver = driver or self.driver
+        try:
+            WebDriverWait(driver, timeout, poll_frequency=0.1).until(
+                lambda d: self.assinatura_pagina(d) not in (None, assinatura_anterior)
+            )
+            return True
+        except Exception:
+            print("\nA página não mudou após o clique")
+            return False
+    
     def verificar_carregamento_completo(self, timeout=15):
         """Verifica se a página carregou completamente"""
         print("\nVerificando carregamento completo...")
-        last_count = 0
-        stable_count = 0
-        start_time = time.time()
-        
-        while time.time() - start_time < timeout:
-            elementos = self.driver.find_elements(By.CLASS_NAME, "flex.flex-col.grow.min-w-0")
-            current_count = len(elementos)
-            print(f"\rElementos encontrados: {current_count}", end="")
-            
-            if current_count == last_count:
-                stable_count += 1
-                if stable_count >= 3:
-                    print(f"\nCarregamento estabilizou com {current_count} elementos")
-                    return current_count
-            else:
-                stable_count = 0
-                last_count = current_count
-                start_time = time.time()
-            
-            time.sleep(1)
-        
-        print(f"\nTimeout atingido. Último número de elementos: {last_count}")
-        return last_count
+        total = self.aguardar_pagina_pronta(timeout=timeout)
+        print(f"Carregamento estabilizou com {total} elementos")
+        return total
     
-    def scroll_page(self):
+    def scroll_page(self, driver=None):
         """Faz scroll na página para carregar todos os elementos"""
+        driver = driver or self.driver
         try:
             print("Iniciando scroll da página...")
             
-            # Scroll simples e eficaz
-            self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(3)
+            # Scroll simples e eficaz; aguarda os cards lazy pararem de chegar
+            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+            num_elementos = self.aguardar_pagina_pronta(driver)
+            print(f"Elementos encontrados após scroll: {num_elementos}")
             
-            # Verificar quantos elementos temos agora
-            elementos = self.driver.find_elements(By.CLASS_NAME, "flex.flex-col.grow.min-w-0")
-            print(f"Elementos encontrados após scroll: {len(elementos)}")
-            
-            return len(elementos)
+            return num_elementos
             
         except Exception as e:
             print(f"Erro durante a rolagem: {e}")
             return 0
     
-    def extrair_dados_anuncio(self, anuncio_soup):
-        """Extrai dados de um anúncio específico"""
+    def chave_anuncio(self, dados):
+        """Chave estável do anúncio: ID, URL real do imóvel ou identificador pelas características (sem o preço)"""
+        if dados.get('ID'):
+            return f"id:{dados['ID']}"
+        if '/imovel/' in dados.get('URL', '') and not url_generica(dados['URL']):
+            return f"url:{dados['URL']}"
+        return f"hash:{self.criar_identificador_imovel(dados, incluir_preco=False)}"
+    
+    def colher_com_scroll(self, driver=None, passo=0, quietude_ms=150, limite_ms=800):
+        """Rola a página em passos e extrai os cards novos de cada passo
+        
+        Como em colher_html_com_scroll, um card já visto (mesmo outerHTML) não é parseado de novo;
+        a chave do anúncio ainda junta o mesmo imóvel re-renderizado com outro HTML.
+        """
+        colhidos = {}
+        vistos = set()  # outerHTML já parseado
+        
+        def colher(html_cards):
+            ineditos = [html_card for html_card in dict.fromkeys(html_cards) if html_card not in vistos]
+            if not ineditos:
+                return 0
+            vistos.update(ineditos)
+            novos = 0
+            for dados in self.extrair_anuncios_html(f"<div>{''.join(ineditos)}</div>"):
+                chave = self.chave_anuncio(dados)
+                if chave not in colhidos:
+                    colhidos[chave] = dados
+                    novos += 1
+            return novos
+        
+        numero_passo = self._rolar_colhendo(colher, driver, passo, quietude_ms, limite_ms)
+        print(f"Colheita incremental: {len(colhidos)} anúncios em {numero_passo} passos")
+        return list(colhidos.values())
+    
+    def colher_html_com_scroll(self, driver=None, passo=0, quietude_ms=150, limite_ms=800):
+        """Como colher_com_scroll, mas sem parse: junta o outerHTML distinto dos cards de cada passo
+
+        Um card é novo pelo seu outerHTML; o parse e as duplicatas ficam para o pipeline de parse.
+        """
+        colhidos = {}
+        
+        def colher(html_cards):
+            novos = 0
+            for html_card in html_cards:
+                if html_card not in colhidos:
+                    colhidos[html_card] = True
+                    novos += 1
+            return novos
+        
+        numero_passo = self._rolar_colhendo(colher, driver, passo, quietude_ms, limite_ms)
+        print(f"Colheita incremental: {len(colhidos)} cards em {numero_passo} passos")
+        return f"<div>{''.join(colhidos)}</div>" if colhidos else ""
+    
+    def _rolar_colhendo(self, colher, driver=None, passo=0, quietude_ms=150, limite_ms=800):
+        """Rola a página em passos entregando o outerHTML dos cards de cada passo a colher(), que conta os novos.
+        
+        Para quando um passo não traz nada novo e a página chegou ao fim (ou dois passos
+        seguidos vêm vazios), sem sleeps fixos. Retorna o número de passos.
+        """
+        driver = driver or self.driver
+        passos_vazios = 0
+        driver.set_script_timeout(limite_ms / 1000 + 10)
+        
+        # Passo 0 só colhe o que já está renderizado, sem rolar
+        html_cards = driver.execute_script(
+            "return Array.prototype.map.call(document.querySelectorAll(arguments[0]), function (e) { return e.outerHTML; });",
+            SELETOR_CARD_CSS,
+        )
+        fim = False
+        for numero_passo in range(self.max_passos_scroll + 1):
+            novos = colher(html_cards) if html_cards else 0
+            
+            passos_vazios = 0 if novos else passos_vazios + 1
+            if numero_passo > 0 and passos_vazios and (fim or passos_vazios >= 2):
+                break
+            
+            resultado = driver.execute_async_script(SCRIPT_PASSO_SCROLL, SELETOR_CARD_CSS, passo, quietude_ms, limite_ms)
+            html_cards, fim = resultado.get('cards', []), resultado.get('fim', False)
+        return numero_passo
+    
+    def coletar_anuncios_carregados(self, pagina, driver=None):
+        """Rola e extrai os anúncios da página já carregada no navegador"""
+        driver = driver or self.driver
+        inicio = time.perf_counter()
+        if self.scroll_incremental:
+            # O estado JSON já traz a página inteira; só rola se ele não existir
+            anuncios = extrair_anuncios_json(driver.page_source) if self.usar_estado_json else []
+            if not anuncios:
+                anuncios = self.colher_com_scroll(driver)
+            self.registrar_tempo(pagina, 'colheita', inicio)
+        else:
+            num_elementos = self.scroll_page(driver)
+            self.registrar_tempo(pagina, 'scroll', inicio)
+            if num_elementos == 0:
+                return []
+            inicio = time.perf_counter()
+            anuncios = self.extrair_anuncios_driver(driver)
+            self.registrar_tempo(pagina, 'extracao', inicio)
+        self.registrar_metricas_rede(pagina, driver)
+        return anuncios
+    
+    def capturar_html_carregado(self, pagina, driver=None):
+        """Como coletar_anuncios_carregados, mas sem parse: o HTML bruto da página para o pipeline de parse"""
+        driver = driver or self.driver
+        inicio = time.perf_counter()
+        if self.scroll_incremental:
+            # Com o estado JSON a página inteira já está no page_source; sem ele, colher os cards rolando
+            html = driver.page_source
+            if not (self.usar_estado_json and PADRAO_NEXT_DATA.search(html)):
+                html = self.colher_html_com_scroll(driver)
+            self.registrar_tempo(pagina, 'colheita', inicio)
+        else:
+            num_elementos = self.scroll_page(driver)
+            self.registrar_tempo(pagina, 'scroll', inicio)
+            html = driver.page_source if num_elementos else ""
+        self.registrar_metricas_rede(pagina, driver)
+        return html
+    
+    def obter_parser_html(self):
+        """Backend de parse configurado; a extração por seletores só funciona com o BeautifulSoup"""
+        return obter_parser(self.parser_html if self.extracao_compilada else 'html.parser')
+    
+    def extrair_dados_anuncio(self, anuncio_soup, parser=None):
+        """Extrai dados de um anúncio específico (nó do backend `parser`, padrão BeautifulSoup)"""
+        if self.extracao_compilada:
+            return extrair_card(anuncio_soup, parser, self.perfil_seletores)
+        return self._extrair_dados_anuncio_seletores(anuncio_soup)
+    
+    def _extrair_dados_anuncio_seletores(self, anuncio_soup):
+        """Extração por seletores (uma busca na árvore por campo); referência do extrator compilado"""
         dados = {}
         
         try:
@@ -416,120 +1008,706 @@ class ZapScraper:
             
         return dados
     
-    def extrair_dados_pagina(self, url, max_paginas=10):
-        """Extrai dados de múltiplas páginas do Zap Imóveis"""
+    def extrair_anuncios_html(self, html):
+        """Extrai todos os anúncios de um snapshot HTML da página com um único parse"""
+        if self.usar_estado_json:
+            try:
+                anuncios = extrair_anuncios_json(html)
+                if anuncios:
+                    return anuncios
+            except Exception as e:
+                print(f"\nErro ao ler estado JSON da página, usando o DOM: {e}")
+        
+        parser = self.obter_parser_html()
+        anuncios = []
+        for idx, card in enumerate(parser.cards(html, SELETOR_CARD_CSS), 1):
+            try:
+                dados = self.extrair_dados_anuncio(card, parser)
+                if dados:
+                    anuncios.append(dados)
+            except Exception as e:
+                print(f"\nErro ao processar elemento {idx}: {e}")
+        return anuncios
+    
+    def extrair_anuncios_driver(self, driver=None):
+        """Extrai os anúncios visíveis no navegador (snapshot único ou outerHTML por card)"""
+        driver = driver or self.driver
+        if self.modo_snapshot:
+            return self.extrair_anuncios_html(driver.page_source)
+        
+        parser = self.obter_parser_html()
+        anuncios = []
+        for idx, elemento in enumerate(driver.find_elements(By.CLASS_NAME, SELETOR_CARD), 1):
+            try:
+                html_content = elemento.get_attribute('outerHTML')
+                dados = self.extrair_dados_anuncio(parser.raiz(html_content), parser)
+                if dados:
+                    anuncios.append(dados)
+            except Exception as e:
+                print(f"\nErro ao processar elemento {idx}: {e}")
+        return anuncios
+    
+    def extrair_dados_pagina(self, url, max_paginas=10, num_workers=None, run_id=None):
+        """Extrai dados de múltiplas páginas do Zap Imóveis (DataFrame, ou SaidaSink com sink)"""
+        num_workers = self.num_workers if num_workers is None else max(1, int(num_workers))
         self.data_list = []
+        self.metricas_tempo = []
+        self.metricas_rede = []
+        self.paginas_concluidas = set()
+        self.pagina_interrompida = None
+        self.total_coletado = 0
         self.resetar_contadores_duplicatas()  # Resetar contadores de duplicatas
-        pagina_atual = 1
+        self.parada_incremental = None
+        self.contagem_incremental = {NOVO: 0, PRECO_ALTERADO: 0, CONHECIDO: 0}
+        self.paginas_mortas = []
+        if self.indice is not None:
+            url = url_mais_recentes(url)  # Novidades primeiro: a paginação para na primeira página conhecida
+            print(f"\n🔁 Crawl incremental: {len(self.indice)} anúncios no índice")
+        if self.checkpoint is not None:
+            self.retomar_checkpoint(url, max_paginas, run_id)
+        
+        pendentes = self.paginas_pendentes(max_paginas)
+        
+        # HTTP puro primeiro; o Chrome só é usado se a resposta for um bloqueio/desafio
+        if pendentes and self.modo_fetch in ('auto', 'http'):
+            _, pagina_bloqueio = self.coletar_paginas_http(url, max_paginas, pendentes)
+            if pagina_bloqueio is None or self.modo_fetch == 'http':
+                if pagina_bloqueio is not None:
+                    self.marcar_interrupcao(pagina_bloqueio)
+                pendentes = []
+            else:
+                print(f"\n🔁 Escalando para o Chrome a partir da página {pagina_bloqueio}")
+                pendentes = [p for p in self.paginas_pendentes(max_paginas) if p >= pagina_bloqueio]
+        
+        if pendentes and self.medir_economia and self.bloquear_recursos and self.economia_bloqueio is None:
+            self.medir_economia_bloqueio(self.montar_url_pagina(url, pendentes[0]))
         
+        if pendentes and self.captura_rede:
+            self._extrair_dados_rede(url, pendentes)
+        elif pendentes and num_workers > 1 and len(pendentes) > 1:
+            self.coletar_paginas_paralelo(url, pendentes, num_workers)
+        elif pendentes:
+            self._extrair_dados_selenium(url, pendentes)
+        
+        if self.checkpoint is not None:
+            self.finalizar_checkpoint()
+        if self.indice is not None:
+            self.imprimir_resumo_incremental()
+        self.imprimir_paginas_mortas()
+        self.perfil_seletores.imprimir_relatorio()
+        self.imprimir_resumo_tempos()
+        return self.salvar_dados()
+    
+    def marcar_interrupcao(self, pagina):
+        """Registra que a execução parou antes do fim dos resultados, com `pagina` ainda pendente"""
+        if self.pagina_interrompida is None or pagina < self.pagina_interrompida:
+            self.pagina_interrompida = pagina
+    
+    def marcar_interrupcao_restantes(self, paginas):
+        """Marca a interrupção na primeira das `paginas` ainda não consolidada, se houver"""
+        restantes = sorted(set(paginas) - self.paginas_concluidas)
+        if restantes:
+            self.marcar_interrupcao(restantes[0])
+    
+    def pagina_pendente(self):
+        """Primeira página que a última execução deixou sem coletar (bloqueio, falha ou página morta), ou None"""
+        pendentes = [m['pagina'] for m in self.paginas_mortas]
+        if self.pagina_interrompida is not None:
+            pendentes.append(self.pagina_interrompida)
+        return min(pendentes) if pendentes else None
+    
+    def finalizar_checkpoint(self):
+        """Fecha a execução no checkpoint: 'concluida' ou 'interrompida' (bloqueio, falha ou páginas mortas)"""
+        pendente = self.pagina_pendente()
+        if pendente is None:
+            self.checkpoint.finalizar(self.run_id)
+            return
+        self.checkpoint.finalizar(self.run_id, 'interrompida')
+        print(f"\n⏸️ Execução {self.run_id} interrompida com páginas pendentes a partir da {pendente}; "
+              f"retome com --resume {self.run_id}")
+    
+    def retomar_checkpoint(self, url, max_paginas, run_id=None):
+        """Inicia a execução no checkpoint ou, se já existir, restaura páginas, linhas e chaves"""
+        self.run_id = run_id or CheckpointStore.novo_run_id()
+        if self.checkpoint.obter_execucao(self.run_id) is not None:
+            paginas, linhas, chaves = self.checkpoint.carregar(self.run_id)
+            self.paginas_concluidas = paginas
+            self.imoveis_unicos = chaves
+            self.total_coletado = len(linhas)
+            if self.sink is not None:
+                self.sink.escrever(linhas)
+                self.sink.flush()
+            if self.manter_em_memoria:
+                self.data_list = linhas
+            print(f"\n♻️ Retomando execução {self.run_id}: {len(paginas)} páginas e {len(linhas)} imóveis já coletados")
+        else:
+            print(f"\n💾 Checkpoint da execução: {self.run_id}")
+        self.checkpoint.iniciar(self.run_id, url, max_paginas)
+    
+    def paginas_pendentes(self, max_paginas):
+        """Páginas de 1 a max_paginas ainda não consolidadas"""
+        return [p for p in range(1, max_paginas + 1) if p not in self.paginas_concluidas]
+    
+    def consolidar_pagina(self, pagina, anuncios):
+        """Adiciona os anúncios da página sem duplicatas e grava o checkpoint da página"""
+        with self._lock_consolidacao:
+            unicos = [dados for dados in anuncios if not self.verificar_duplicata(dados)]
+            novos = self.filtrar_incremental(pagina, unicos) if self.indice is not None else unicos
+            if self.manter_em_memoria:
+                self.data_list.extend(novos)
+            if self.sink is not None:
+                self.sink.escrever(novos)
+                self.sink.flush()  # Página consolidada = página em disco
+            self.total_coletado += len(novos)
+            self.paginas_concluidas.add(pagina)
+            if self.checkpoint is not None and self.run_id is not None:
+                chaves = [self.criar_identificador_imovel(dados) for dados in unicos]
+                self.checkpoint.salvar_pagina(self.run_id, pagina, novos, chaves)
+            print(f"\nPágina {pagina}: {len(novos)} novos. Total de dados coletados até agora: {self.total_coletado}")
+            return novos
+    
+    def filtrar_incremental(self, pagina, anuncios):
+        """Atualiza o índice e mantém só os anúncios novos ou com preço alterado (com o lock de consolidação)
+
+        Uma página com anúncios e nenhum novo/alterado marca a parada da paginação.
+        """
+        situacoes = self.indice.registrar_pagina([(self.chave_anuncio(dados), dados) for dados in anuncios])
+        saida = []
+        for dados, (situacao, preco_anterior) in zip(anuncios, situacoes):
+            self.contagem_incremental[situacao] += 1
+            if situacao != CONHECIDO:
+                saida.append(dict(dados, Situacao=situacao, Preco_Anterior=preco_anterior))
+        if anuncios and not saida and (self.parada_incremental is None or pagina < self.parada_incremental):
+            self.parada_incremental = pagina
+            print(f"\n⏹️ Página {pagina} inteiramente conhecida e sem mudanças: fim do crawl incremental")
+        return saida
+    
+    def imprimir_paginas_mortas(self):
+        """Lista as páginas desistidas (ficam pendentes no checkpoint para um --resume)"""
+        if not self.paginas_mortas:
+            return
+        print(f"\n☠️ {len(self.paginas_mortas)} páginas não coletadas após as novas tentativas:")
+        for morta in sorted(self.paginas_mortas, key=lambda m: m['pagina']):
+            print(f"  Página {morta['pagina']} ({morta['tentativas']} tentativas): {morta['erro']}")
+    
+    def alem_da_parada(self, pagina):
+        """Crawl incremental: a página vem depois da primeira página inteiramente conhecida"""
+        return self.parada_incremental is not None and pagina > self.parada_incremental
+    
+    def imprimir_resumo_incremental(self):
+        contagem = self.contagem_incremental
+        print("\n🔁 RESUMO DO CRAWL INCREMENTAL")
+        print(f"  Novos: {contagem[NOVO]} | Preço alterado: {contagem[PRECO_ALTERADO]} | "
+              f"Já conhecidos: {contagem[CONHECIDO]}")
+        if self.parada_incremental is not None:
+            print(f"  Paginação encerrada na página {self.parada_incremental}")
+    
+    def consolidar_paginas(self, resultados):
+        """Adiciona os anúncios de {pagina: [anuncios]} em ordem de página, removendo duplicatas"""
+        for numero_pagina in sorted(resultados):
+            self.consolidar_pagina(numero_pagina, resultados[numero_pagina])
+    
+    def obter_cliente_http(self, proxy=None):
+        """Retorna o cliente HTTP (conexões keep-alive reaproveitadas entre páginas), um por proxy"""
+        if proxy is not None:
+            with self._lock_consolidacao:
+                if proxy not in self.clientes_proxy:
+                    self.clientes_proxy[proxy] = ClienteHTTP(user_agent=user_agent_aleatorio(), proxy=proxy)
+                return self.clientes_proxy[proxy]
+        if self.cliente_http is None:
+            self.cliente_http = ClienteHTTP(user_agent=user_agent_aleatorio())
+        return self.cliente_http
+    
+    def fechar_clientes_http(self):
+        """Fecha o cliente direto e os clientes por proxy"""
+        for cliente in [self.cliente_http, *self.clientes_proxy.values()]:
+            if cliente is not None:
+                cliente.fechar()
+        self.cliente_http = None
+        self.clientes_proxy = {}
+    
+    def coletar_paginas_http(self, url, max_paginas=10, paginas=None):
+        """Coleta páginas via HTTP; retorna ({pagina: anuncios}, página bloqueada ou None)"""
+        if self.proxies:
+            return self.coletar_paginas_http_proxies(url, max_paginas, paginas)
+        cliente = self.obter_cliente_http()
+        resultados = {}
+        for pagina in (paginas or range(1, max_paginas + 1)):
+            url_pagina = self.montar_url_pagina(url, pagina)
+            print(f"\nProcessando página {pagina} via HTTP")
+            self.throttle.esperar('http')
+            inicio = time.perf_counter()
+            try:
+                html, status, bloqueada = cliente.obter(url_pagina)
+            except Exception as e:
+                print(f"Erro HTTP na página {pagina}: {e}")
+                self.throttle.registrar('http', 'erro')
+                return resultados, pagina
+            if resposta_com_erro(status):
+                # 5xx e afins não têm cards, mas não são o fim dos resultados
+                print(f"Erro HTTP na página {pagina}: status {status}")
+                self.throttle.registrar('http', 'erro')
+                return resultados, pagina
+            
+            anuncios = [] if bloqueada else self.extrair_anuncios_html(html)
+            if bloqueada or detectar_bloqueio(html, status, len(anuncios)):
+                print(f"🛑 Página {pagina} bloqueada ou com desafio (status {status})")
+                self.throttle.registrar('http', 'bloqueio')
+                return resultados, pagina
+            
+            self.registrar_tempo(pagina, 'http', inicio)
+            self.throttle.registrar('http', 'sucesso', len(anuncios))
+            if not anuncios:
+                if pagina == 1:
+                    # Sem cards logo na primeira página: conteúdo provavelmente só renderiza com JS
+                    print("Nenhum card no HTML estático da primeira página")
+                    return resultados, pagina
+                print("Nenhum anúncio encontrado. Fim dos resultados.")
+                break
+            
+            resultados[pagina] = anuncios
+            print(f"{len(anuncios)} anúncios extraídos (status {status})")
+            self.consolidar_pagina(pagina, anuncios)
+            if self.alem_da_parada(pagina + 1):
+                break
+        return resultados, None
+    
+    def _buscar_pagina_proxy(self, url, pagina, ultima_pagina):
+        """Busca uma página pelo melhor proxy livre, trocando de proxy em erro/bloqueio
+
+        Retorna (anuncios, 'ok' | 'falha' | 'ignorada'); ultima_pagina[0] guarda a primeira página vazia.
+        """
+        url_pagina = self.montar_url_pagina(url, pagina)
+        for tentativa in range(1, self.tentativas_proxy + 1):
+            if (ultima_pagina[0] is not None and pagina > ultima_pagina[0]) or self.alem_da_parada(pagina):
+                return [], 'ignorada'
+            proxy = self.proxies.checkout()
+            resultado, anuncios = 'erro', []
+            inicio = time.perf_counter()
+            try:
+                self.throttle.esperar(proxy)
+                inicio = time.perf_counter()
+                html, status, bloqueada = self.obter_cliente_http(proxy).obter(url_pagina)
+                if resposta_com_erro(status):
+                    raise RuntimeError(f"status {status}")
+                anuncios = [] if bloqueada else self.extrair_anuncios_html(html)
+                if bloqueada or detectar_bloqueio(html, status, len(anuncios)):
+                    resultado = 'bloqueio'
+                    print(f"🛑 Página {pagina} bloqueada via {PoolProxies.mascarar(proxy)} (status {status})")
+                else:
+                    resultado = 'sucesso'
+                    self.registrar_tempo(pagina, 'http', inicio)
+            except Exception as e:
+                print(f"Erro HTTP na página {pagina} via {PoolProxies.mascarar(proxy)}: {e}")
+            finally:
+                self.proxies.devolver(proxy, resultado, time.perf_counter() - inicio if resultado != 'erro' else None)
+                self.throttle.registrar(proxy, resultado, len(anuncios))
+            if resultado == 'sucesso':
+                if not anuncios and pagina > 1:
+                    with self._lock_consolidacao:
+                        if ultima_pagina[0] is None or pagina < ultima_pagina[0]:
+                            ultima_pagina[0] = pagina
+                return anuncios, 'ok'
+        return [], 'falha'
+    
+    def coletar_paginas_http_proxies(self, url, max_paginas=10, paginas=None):
+        """Coleta páginas via HTTP em paralelo, tantas simultâneas quanto os proxies saudáveis suportam"""
+        paginas = list(paginas or range(1, max_paginas + 1))
+        num_threads = max(1, min(len(paginas), self.proxies.capacidade()))
+        print(f"\nColetando {len(paginas)} páginas via {len(self.proxies)} proxies ({num_threads} simultâneas)")
+        ultima_pagina = [None]
+        resultados = {}
+        with ThreadPoolExecutor(max_workers=num_threads) as executor:
+            futuros = [executor.submit(self._buscar_pagina_proxy, url, p, ultima_pagina) for p in paginas]
+            # Consolida em ordem de página: a primeira falha ou página vazia encerra a coleta HTTP
+            for pagina, futuro in zip(paginas, futuros):
+                anuncios, situacao = futuro.result()
+                if situacao == 'falha':
+                    print(f"🛑 Página {pagina} falhou em {self.tentativas_proxy} proxies")
+                    for restante in futuros:
+                        restante.cancel()
+                    return resultados, pagina
+                if situacao == 'ignorada':
+                    continue
+                if not anuncios:
+                    if pagina == 1:
+                        print("Nenhum card no HTML estático da primeira página")
+                        return resultados, pagina
+                    print("Nenhum anúncio encontrado. Fim dos resultados.")
+                    break
+                resultados[pagina] = anuncios
+                self.consolidar_pagina(pagina, anuncios)
+                if self.alem_da_parada(pagina + 1):
+                    for restante in futuros:
+                        restante.cancel()
+                    break
+        return resultados, None
+    
+    def capturar_respostas_api(self, driver=None, timeout=15):
+        """Lê os eventos de rede do DevTools até receber as respostas da API de listagens"""
+        driver = driver or self.driver
+        limite = time.time() + timeout
+        pendentes = set()  # requestIds cuja resposta chegou mas o corpo ainda está sendo baixado
+        payloads = []
+        while time.time() < limite:
+            for entrada in driver.get_log('performance'):
+                try:
+                    mensagem = json.loads(entrada['message'])['message']
+                except (KeyError, ValueError):
+                    continue
+                metodo = mensagem.get('method')
+                params = mensagem.get('params', {})
+                
+                if metodo == 'Network.responseReceived':
+                    resposta = params.get('response', {})
+                    if 'json' in resposta.get('mimeType', '') and PADRAO_API_LISTAGENS.search(resposta.get('url', '')):
+                        pendentes.add(params.get('requestId'))
+                elif metodo == 'Network.loadingFinished' and params.get('requestId') in pendentes:
+                    pendentes.discard(params['requestId'])
+                    try:
+                        corpo = driver.execute_cdp_cmd('Network.getResponseBody', {'requestId': params['requestId']})
+                        texto = corpo.get('body', '')
+                        if corpo.get('base64Encoded'):
+                            texto = base64.b64decode(texto).decode('utf-8')
+                        payloads.append(json.loads(texto))
+                    except Exception as e:
+                        print(f"\nErro ao ler resposta da API: {e}")
+            
+            if payloads and not pendentes:
+                break
+            time.sleep(0.1)
+        return payloads
+    
+    def _extrair_dados_rede(self, url, paginas):
+        """Navega pelas URLs das páginas e extrai os anúncios das respostas da API capturadas via CDP"""
+        paginas_processadas = 0
         try:
             if not self.configure_driver():
-                return None
+                self.marcar_interrupcao_restantes(paginas)
+                return
+            
+            for pagina in paginas:
+                print(f"\nProcessando página {pagina} (captura de rede)")
+                self.throttle.esperar(0)
+                inicio = time.perf_counter()
+                self.driver.get_log('performance')  # Descarta eventos da página anterior
+                self.driver.get(self.montar_url_pagina(url, pagina))
+                
+                anuncios = []
+                for payload in self.capturar_respostas_api():
+                    anuncios.extend(extrair_anuncios_api(payload))
+                
+                if not anuncios:
+                    # API não capturada (mudou de endereço?): cair para o DOM nesta página
+                    print("Nenhuma resposta da API capturada, extraindo pelo DOM...")
+                    self.aguardar_pagina_pronta()
+                    anuncios = self.extrair_anuncios_driver()
+                self.registrar_tempo(pagina, 'captura_rede', inicio)
+                self.registrar_metricas_rede(pagina)
+                paginas_processadas += 1
+                
+                if not anuncios:
+                    if detectar_bloqueio(self.driver.page_source, num_cards=0):
+                        print(f"🛑 Página {pagina} bloqueada ou com desafio")
+                        self.throttle.registrar(0, 'bloqueio')
+                        self.marcar_interrupcao(pagina)
+                    else:
+                        print("Nenhum anúncio encontrado. Fim dos resultados.")
+                    break
+                self.throttle.registrar(0, 'sucesso', len(anuncios))
+                self.consolidar_pagina(pagina, anuncios)
+                if self.alem_da_parada(pagina + 1):
+                    break
+        
+        except Exception as e:
+            print(f"\nErro durante a captura de rede: {e}")
+            self.marcar_interrupcao_restantes(paginas)
+        
+        finally:
+            self.liberar_driver(paginas_processadas)
+    
+    def _extrair_dados_selenium(self, url, paginas):
+        """Percorre as páginas no Chrome abrindo a URL de cada uma, com novas tentativas por página"""
+        planejador = self.criar_planejador(url, paginas)
+        paginas_processadas = 0
+        pipeline = None
+        
+        try:
+            if not self.configure_driver():
+                self.marcar_interrupcao_restantes(paginas)
+                return
                 
             print("Driver configurado com sucesso!")
-            self.driver.get(url)
-            time.sleep(5)  # Aumentar tempo de espera inicial
-            
-            while pagina_atual <= max_paginas:
+            pipeline = self.criar_pipeline_parse(planejador)
+            while True:
+                item = planejador.proxima()
+                if item is None:
+                    break
                 try:
                     # Verificar se o driver ainda está ativo
                     self.driver.current_url
                 except Exception as e:
                     print(f"\nNavegador foi fechado ou perdeu conexão: {e}")
                     print("Salvando dados coletados até agora...")
-                    return self.salvar_dados()
-                    
-                print(f"\nProcessando página {pagina_atual}")
-                print("Para parar: feche o navegador")
+                    self.marcar_interrupcao(item['pagina'])
+                    planejador.cancelar()
+                    return
                 
-                try:
-                    # Aguardar carregamento da página com timeout maior
-                    WebDriverWait(self.driver, 20).until(
-                        EC.presence_of_element_located((By.CLASS_NAME, "flex.flex-col.grow.min-w-0"))
-                    )
-                    
-                    num_elementos = self.scroll_page()
-                    if num_elementos == 0:
-                        print("Nenhum elemento encontrado após scroll")
-                        # Salvar HTML para debug
-                        self.debug_salvar_html(f"debug_page_{pagina_atual}.html")
-                        break
-                        
-                    print(f"\nIniciando extração de {num_elementos} elementos...")
-                    
-                    elementos = self.driver.find_elements(By.CLASS_NAME, "flex.flex-col.grow.min-w-0")
-                    for idx, elemento in enumerate(elementos, 1):
-                        try:
-                            print(f"\rProcessando elemento {idx}/{num_elementos}", end="")
-                            html_content = elemento.get_attribute('outerHTML')
-                            soup = BeautifulSoup(html_content, 'html.parser')
-                            dados = self.extrair_dados_anuncio(soup)
-                            
-                            if dados:
-                                # Verificar se é duplicata antes de adicionar
-                                if not self.verificar_duplicata(dados):
-                                    self.data_list.append(dados)
-                                else:
-                                    print(f"\rDuplicata ignorada - elemento {idx}/{num_elementos}", end="")
-                        except Exception as e:
-                            print(f"\nErro ao processar elemento {idx}: {e}")
-                            continue
-                    
-                    print(f"\nTotal de dados coletados até agora: {len(self.data_list)}")
-                    
-                    # Tentar encontrar botão de próxima página com múltiplos seletores
-                    next_button = None
-                    try:
-                        # Primeira tentativa: seletor original
-                        next_button = self.driver.find_element(By.CSS_SELECTOR, 'button[data-testid="next-page"]')
-                    except:
-                        try:
-                            # Segunda tentativa: seletor alternativo
-                            next_button = self.driver.find_element(By.CSS_SELECTOR, 'button[aria-label*="próxima"]')
-                        except:
-                            try:
-                                # Terceira tentativa: procurar por texto
-                                next_button = self.driver.find_element(By.XPATH, "//button[contains(text(), 'Próxima') or contains(text(), 'Next')]")
-                            except:
-                                pass
-                    
-                    if next_button:
-                        if not (next_button.is_enabled() and "disabled" not in next_button.get_attribute("class")):
-                            print("\nNão há mais páginas para processar")
-                            break
-                            
-                        self.driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", next_button)
-                        time.sleep(random.uniform(1, 2))
-                        next_button.click()
-                        time.sleep(random.uniform(4, 6))
-                        pagina_atual += 1
-                    else:
-                        print("\nBotão de próxima página não encontrado. Finalizando extração.")
-                        break
-                        
-                except Exception as e:
-                    print(f"\nErro ao processar página {pagina_atual}: {e}")
-                    # Tentar continuar com a próxima página se possível
-                    if pagina_atual < max_paginas:
-                        print("Tentando continuar com a próxima página...")
-                        pagina_atual += 1
-                        time.sleep(5)
-                        continue
-                    else:
-                        break
+                tentativa = f" (tentativa {item['tentativa']})" if item['tentativa'] > 1 else ""
+                print(f"\nProcessando página {item['pagina']}{tentativa}")
+                print("Para parar: feche o navegador")
+                self.throttle.esperar(0)
+                paginas_processadas += 1
+                anuncios = self._processar_pagina_navegador(planejador, item, pipeline=pipeline)
+                if anuncios and not self.existe_proxima_pagina():
+                    print("\nNão há mais páginas para processar")
+                    planejador.encerrar_apos(item['pagina'])
         
         except Exception as e:
             print(f"\nErro durante a extração: {e}")
+            self.marcar_interrupcao_restantes(paginas)
+        
+        finally:
+            if pipeline is not None:
+                pipeline.encerrar()  # Consolida as páginas ainda em parse
+                print(f"\n⚙️ Pipeline de parse: {pipeline.paginas_enviadas} páginas em {pipeline.processos} processos, "
+                      f"navegação esperou {pipeline.espera_fila:.1f}s pela fila")
+            self.registrar_paginas_mortas(planejador)
+            self.liberar_driver(paginas_processadas)
+    
+    def criar_pipeline_parse(self, planejador):
+        """Pipeline navegação -> processos de parse -> coletor, se ativado; None no modo sem pipeline"""
+        if not self.pipeline_parse:
+            return None
+        if not self.extracao_compilada:
+            print("⚠️ Pipeline de parse requer a extração compilada; parse na thread do navegador")
+            return None
+        return PipelineParse(
+            lambda pagina, anuncios, erro: self.consolidar_pagina_pipeline(planejador, pagina, anuncios, erro),
+            self.processos_parse, self.tamanho_fila_parse, perfil=self.perfil_seletores,
+            seletor=SELETOR_CARD_CSS, parser_html=self.parser_html, usar_estado_json=self.usar_estado_json,
+        ).iniciar()
+    
+    def consolidar_pagina_pipeline(self, planejador, pagina, anuncios, erro=None, id_worker=0):
+        """Coletor do pipeline de parse: consolida a página e informa o resultado ao planejador"""
+        if self.alem_da_parada(pagina):
+            return  # Carregada antes de o coletor achar a parada incremental; já descartada pelo planejador
+        if erro is None and not anuncios:
+            erro = RuntimeError("nenhum anúncio encontrado após o scroll")
+        if erro is not None:
+            print(f"\n[coletor] Erro ao processar página {pagina}: {erro}")
+            self.throttle.registrar(id_worker, 'erro')
+            planejador.falhar(pagina, erro)
+            return
+        
+        # A colheita bruta junta o mesmo anúncio de passos diferentes do scroll
+        por_chave = {}
+        for dados in anuncios:
+            por_chave.setdefault(self.chave_anuncio(dados), dados)
+        self.throttle.registrar(id_worker, 'sucesso', len(por_chave))
+        self.consolidar_pagina(pagina, list(por_chave.values()))
+        planejador.concluir(pagina)
+        if self.parada_incremental is not None:
+            planejador.encerrar_apos(self.parada_incremental)
+    
+    def criar_planejador(self, url, paginas):
+        """Planejador das páginas pendentes: URL derivada da busca, novas tentativas e páginas mortas"""
+        return PlanejadorPaginas(url, paginas, self.max_tentativas_pagina, self.espera_base_pagina)
+    
+    def registrar_paginas_mortas(self, planejador):
+        with self._lock_consolidacao:
+            self.paginas_mortas.extend(planejador.mortas)
+    
+    def aguardar_cards(self, driver=None, timeout=20):
+        """Espera o primeiro card da página; False se nenhum apareceu no tempo"""
+        driver = driver or self.driver
+        try:
+            WebDriverWait(driver, timeout).until(
+                EC.presence_of_element_located((By.CLASS_NAME, SELETOR_CARD))
+            )
+            return True
+        except TimeoutException:
+            return False
+    
+    def _processar_pagina_navegador(self, planejador, item, driver=None, id_worker=0, pipeline=None):
+        """Abre uma página do planejador, consolida seus anúncios e informa o resultado ao planejador
+
+        Uma página sem cards e sem bloqueio depois da 1ª é o fim dos resultados; qualquer outra
+        falha devolve a página ao planejador (nova tentativa com espera ou página morta).
+        Com pipeline, só entrega o HTML bruto: o parse e a consolidação ficam com o coletor.
+        """
+        driver = driver or self.driver
+        pagina = item['pagina']
+        inicio = time.perf_counter()
+        bloqueada = False
+        try:
+            driver.get(item['url'])
+            if not self.aguardar_cards(driver):
+                if pagina > 1 and not self.pagina_atual_bloqueada(driver):
+                    print(f"\nPágina {pagina} sem anúncios. Fim dos resultados.")
+                    planejador.encerrar_apos(pagina - 1)
+                    return []
+                raise RuntimeError("nenhum card carregado")
+            self.aguardar_pagina_pronta(driver)
+            self.registrar_tempo(pagina, 'carregamento', inicio)
+            
+            if pipeline is not None:
+                anuncios = self.capturar_html_carregado(pagina, driver)
+            else:
+                anuncios = self.coletar_anuncios_carregados(pagina, driver)
+            if not anuncios:
+                # Nenhum anúncio extraído: julgar o conteúdo como página sem cards
+                bloqueada = self.pagina_atual_bloqueada(driver, num_cards=0)
+                if bloqueada:
+                    raise RuntimeError("desafio/captcha no lugar dos anúncios")
+                self.debug_salvar_html(f"debug_page_{pagina}.html")
+                raise RuntimeError("nenhum anúncio encontrado após o scroll")
+        except Exception as e:
+            print(f"\n[worker {id_worker}] Erro ao processar página {pagina}: {e}")
+            resultado = 'bloqueio' if bloqueada or self.pagina_atual_bloqueada(driver) else 'erro'
+            self.throttle.registrar(id_worker, resultado)
+            self.registrar_resultado_proxy(driver, resultado)
+            planejador.falhar(pagina, e)
+            return []
+        
+        if pipeline is not None:
+            self.registrar_resultado_proxy(driver, 'sucesso', time.perf_counter() - inicio)
+            pipeline.enviar(pagina, anuncios)
+            return anuncios  # HTML bruto: a página segue em andamento no planejador até o coletor
+        
+        self.throttle.registrar(id_worker, 'sucesso', len(anuncios))
+        self.registrar_resultado_proxy(driver, 'sucesso', time.perf_counter() - inicio)
+        self.consolidar_pagina(pagina, anuncios)
+        planejador.concluir(pagina)
+        if self.parada_incremental is not None:
+            planejador.encerrar_apos(self.parada_incremental)
+        return anuncios
+    
+    @contextmanager
+    def sem_espera_implicita(self, driver=None):
+        """Desliga o implicitly_wait durante consultas em que "não encontrado" é uma resposta válida"""
+        driver = driver or self.driver
+        driver.implicitly_wait(0)
+        try:
+            yield driver
+        finally:
+            driver.implicitly_wait(self.espera_implicita)
+    
+    def estado_paginacao(self, driver=None):
+        """Há próxima página e onde: {'proxima', 'habilitada', 'estrategia', 'href', 'cards'}
+
+        Uma única chamada execute_script; se o script falhar, find_elements sem espera implícita.
+        """
+        driver = driver or self.driver
+        try:
+            estado = driver.execute_script(SCRIPT_ESTADO_PAGINACAO, SELETOR_CARD_CSS)
+            if isinstance(estado, dict):
+                return estado
+        except Exception as e:
+            print(f"\nErro no script de paginação, consultando pelos seletores: {e}")
+        
+        estado = {'proxima': False, 'habilitada': False, 'estrategia': None, 'href': None, 'cards': 0}
+        with self.sem_espera_implicita(driver):
+            estado['cards'] = len(driver.find_elements(By.CSS_SELECTOR, SELETOR_CARD_CSS))
+            for estrategia, (by, seletor) in zip(('testid', 'aria', 'texto'), SELETORES_PROXIMA):
+                botoes = driver.find_elements(by, seletor)
+                if botoes:
+                    botao = botoes[0]
+                    estado.update(proxima=True, estrategia=estrategia,
+                                  habilitada=botao.is_enabled() and "disabled" not in (botao.get_attribute("class") or ""))
+                    break
+        return estado
+    
+    def existe_proxima_pagina(self, driver=None):
+        """Verifica, sem esperas, se há uma página seguinte habilitada"""
+        estado = self.estado_paginacao(driver)
+        if not estado['proxima']:
+            print("\nBotão de próxima página não encontrado.")
+            return False
+        return bool(estado['habilitada'])
+    
+    def registrar_resultado_proxy(self, driver, resultado, latencia=None):
+        """Contabiliza no pool de proxies o resultado de uma página carregada pelo navegador"""
+        proxy = getattr(driver, 'proxy_zap', None)
+        if self.proxies and proxy in self.proxies.estado:
+            self.proxies.registrar(proxy, resultado, latencia)
+    
+    def pagina_atual_bloqueada(self, driver=None, num_cards=None):
+        """Verifica se a página aberta no navegador é um desafio/captcha (sem cards + marcadores)
         
+        num_cards=None conta os cards no DOM; quem já sabe quantos anúncios extraiu o informa.
+        """
+        driver = driver or self.driver
+        try:
+            if num_cards is None:
+                with self.sem_espera_implicita(driver):
+                    num_cards = len(driver.find_elements(By.CSS_SELECTOR, SELETOR_CARD_CSS))
+            return detectar_bloqueio(driver.page_source, num_cards=num_cards)
+        except Exception:
+            return False
+    
+    def montar_url_pagina(self, url, pagina):
+        """Monta a URL de uma página de resultados a partir da URL de busca"""
+        return url_da_pagina(url, pagina)
+    
+    def _worker_paginas(self, id_worker, planejador):
+        """Busca páginas do planejador em um navegador próprio até a fila esvaziar"""
+        resultados = {}
+        driver = None
+        item = None
+        pool = self.pool_drivers()
+        try:
+            if pool is not None:
+                driver = pool.checkout()
+                print(f"\n[worker {id_worker}] Navegador iniciado")
+            else:
+                porta = porta_livre()
+                driver = self._criar_driver_com_opcoes(porta_debug=porta)
+                driver.set_page_load_timeout(30)
+                driver.implicitly_wait(self.espera_implicita)
+                print(f"\n[worker {id_worker}] Navegador iniciado (remote debugging na porta {porta})")
+            
+            while True:
+                item = planejador.proxima()
+                if item is None:
+                    break
+                with self.throttle.slot(id_worker):
+                    registros = self._processar_pagina_navegador(planejador, item, driver, id_worker)
+                if registros:
+                    print(f"\n[worker {id_worker}] Página {item['pagina']}: {len(registros)} anúncios")
+                    resultados[item['pagina']] = registros
+                item = None
+        except Exception as e:
+            print(f"\n[worker {id_worker}] Erro no navegador: {e}")
+            if item is not None:
+                planejador.falhar(item['pagina'], e)  # Outro worker pode refazer a página
         finally:
             try:
-                if self.driver:
-                    print("\nFechando navegador...")
-                    self.driver.quit()
+                if driver and pool is not None:
+                    pool.devolver(driver, len(resultados))
+                elif driver:
+                    driver.quit()
             except Exception as e:
-                print(f"Erro ao fechar navegador: {e}")
+                print(f"[worker {id_worker}] Erro ao fechar navegador: {e}")
+        return resultados
+    
+    def coletar_paginas_paralelo(self, url, paginas, num_workers=None):
+        """Coleta as páginas indicadas em paralelo, com um navegador por worker (cada página é consolidada ao terminar)"""
+        num_workers = self.num_workers if num_workers is None else max(1, int(num_workers))
+        num_workers = min(num_workers, len(paginas))
+        self.throttle.ajustar_concorrencia_maxima(num_workers)
         
-        return self.salvar_dados()
+        # Fila compartilhada: cada worker pega a próxima página pronta, em qualquer ordem
+        planejador = self.criar_planejador(url, paginas)
+        print(f"\nExtração paralela: {len(paginas)} páginas em {num_workers} navegadores")
+        
+        resultados = {}
+        with ThreadPoolExecutor(max_workers=num_workers) as executor:
+            futuros = [executor.submit(self._worker_paginas, i, planejador) for i in range(num_workers)]
+            for futuro in as_completed(futuros):
+                resultados.update(futuro.result())
+        self.registrar_paginas_mortas(planejador)
+        return resultados
     
     def debug_salvar_html(self, filename="debug_page.html"):
         """Salva o HTML da página atual para debug"""
@@ -545,7 +1723,16 @@ class ZapScraper:
                 print(f"Erro ao salvar HTML (janela pode ter sido fechada): {e}")
     
     def salvar_dados(self):
-        """Salva os dados coletados em CSV"""
+        """Salva os dados coletados em CSV e retorna o DataFrame
+
+        Com sink, as linhas já foram gravadas página a página: fecha o sink e retorna um
+        SaidaSink (caminho e total de linhas), sem ler o arquivo de volta para a memória.
+        """
+        if self.sink is not None:
+            self.sink.fechar()
+            print(f"\nDados gravados em: {self.sink.caminho} ({self.sink.total_gravado} linhas)")
+            if not self.manter_em_memoria:
+                return SaidaSink(self.sink) if self.sink.total_gravado else None
         if self.data_list:
             # Criar pasta arquivos se não existir
             pasta_arquivos = "arquivos"
@@ -611,13 +1798,15 @@ class ZapScraper:
                 break
         return df
     
-    def analisar_site(self, url_inicial, max_paginas=10):
+    def analisar_site(self, url_inicial, max_paginas=10, run_id=None):
         """Método principal para análise completa do site"""
         try:
             print("Iniciando extração de dados...")
             print("Para parar a extração, feche o navegador")
             
-            df = self.extrair_dados_pagina(url_inicial, max_paginas)
+            df = self.extrair_dados_pagina(url_inicial, max_paginas, run_id=run_id)
+            if isinstance(df, SaidaSink):
+                df = df.carregar()  # Estatísticas e Excel precisam das linhas em memória
             if df is not None and not df.empty:
                 # Mostrar estatísticas de duplicatas
                 stats_duplicatas = self.obter_estatisticas_duplicatas()
@@ -701,6 +1890,39 @@ class ZapScraper:
             print(f"❌ Erro ao gerar Excel: {e}")
             return None
 
+# Pools compartilhados pelo processo (sobrevivem aos reruns do Streamlit, que reexecutam o script mas não
+# reimportam módulos), um por configuração de navegador (headless, bloqueio de recursos...)
+_pools_drivers = {}
+_lock_pool_drivers = threading.Lock()
+
+def _fabrica_drivers(configuracao):
+    """Cria drivers com as opções da configuração (um ZapScraper sem proxies, só para criar navegadores)"""
+    scraper = ZapScraper()
+    for nome, valor in configuracao.items():
+        setattr(scraper, nome, list(valor) if nome == 'padroes_bloqueados' else valor)
+    return scraper.criar_driver
+
+def obter_pool_drivers(tamanho_maximo=2, max_paginas_por_driver=50, limite_memoria_mb=1024, **configuracao):
+    """Retorna o DriverPool do processo para a configuração de navegador (ZapScraper.configuracao_driver),
+    criando-o na primeira chamada; sem configuração, a padrão do ZapScraper
+    """
+    configuracao = {**ZapScraper().configuracao_driver(), **configuracao}
+    configuracao['padroes_bloqueados'] = tuple(configuracao['padroes_bloqueados'])
+    chave = tuple(sorted(configuracao.items()))
+    with _lock_pool_drivers:
+        if chave not in _pools_drivers:
+            pool = DriverPool(
+                _fabrica_drivers(configuracao),
+                tamanho_maximo=tamanho_maximo,
+                max_paginas_por_driver=max_paginas_por_driver,
+                limite_memoria_mb=limite_memoria_mb,
+            )
+            pool.configuracao = configuracao
+            atexit.register(pool.fechar)
+            _pools_drivers[chave] = pool
+        return _pools_drivers[chave]
+
+
 def agno_tavily():
     agent = Agent(tools=[TavilyTools()])
     agent.print_response("Search tavily for 'Higienopolis'", markdown=True)
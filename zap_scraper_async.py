@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ZapScraperAsync - Versão asyncio do scraper: páginas de resultados e de detalhe buscadas
+em paralelo, com concorrência limitada por semáforos e limite de taxa por host
+"""
+
+import asyncio
+import time
+
+import httpx
+
+from zap_scraper import ZapScraper
+from cliente_http import CABECALHOS_PADRAO, HTTP2_DISPONIVEL, pagina_bloqueada, resposta_com_erro
+from throttle_adaptativo import detectar_bloqueio
+from cache_driver import user_agent_aleatorio
+from enriquecedor_detalhes import EnriquecedorDetalhes, tem_pagina_detalhe
+from limitador_taxa import LimitadorTaxa
+
+_FIM_PAGINA = object()  # Sentinela: uma tarefa de página terminou
+
+
+class ZapScraperAsync:
+    def __init__(self, max_paginas_simultaneas=4, max_detalhes_simultaneos=8,
+                 taxa_por_segundo=2.0, rajada=4, timeout=20):
+        self.scraper = ZapScraper()  # Reaproveita parsing, paginação e detecção de duplicatas
+        self.max_paginas_simultaneas = max_paginas_simultaneas
+        self.max_detalhes_simultaneos = max_detalhes_simultaneos
+        self.limitador = LimitadorTaxa(taxa_por_segundo, rajada)
+        self.timeout = timeout
+        self.paginas_bloqueadas = []  # Páginas com bloqueio/desafio ou erro na última coleta (antes do fim dos resultados)
+        self.escalar_bloqueadas = True  # extrair_dados_pagina refaz as páginas bloqueadas no Chrome
+        self.cache_detalhes = None  # CacheDetalhes opcional para as páginas de detalhe
+        self.enriquecedor = None  # EnriquecedorDetalhes da coleta em andamento (busca, cache e desafios)
+        self._ultima_pagina = None  # Primeira página vazia encontrada: as seguintes são ignoradas
+
+    def _criar_cliente(self):
+        cabecalhos = dict(CABECALHOS_PADRAO)
+        cabecalhos['User-Agent'] = user_agent_aleatorio()
+        limite = self.max_paginas_simultaneas + self.max_detalhes_simultaneos
+        return httpx.AsyncClient(
+            http2=HTTP2_DISPONIVEL,
+            headers=cabecalhos,
+            timeout=self.timeout,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=limite, max_keepalive_connections=limite),
+        )
+
+    async def _buscar(self, cliente, url):
+        """GET respeitando o limite de taxa do host; retorna (html, status, bloqueada pelo status)"""
+        await self.limitador.aguardar(url)
+        resposta = await cliente.get(url)
+        return resposta.text, resposta.status_code, pagina_bloqueada(resposta.status_code)
+
+    async def _enriquecer(self, cliente, semaforo, anuncio):
+        """Busca a página de detalhe do anúncio e mescla os campos encontrados"""
+        anuncio.update(await self.enriquecedor.obter_campos(cliente, semaforo, anuncio['URL']))
+        return anuncio
+
+    async def _processar_pagina(self, cliente, url, pagina, fila, sem_paginas, sem_detalhes, buscar_detalhes):
+        """Busca uma página de resultados e envia seus anúncios para a fila"""
+        try:
+            async with sem_paginas:
+                if self._ultima_pagina is not None and pagina > self._ultima_pagina:
+                    return
+                url_pagina = self.scraper.montar_url_pagina(url, pagina)
+                inicio = time.perf_counter()
+                html, status, bloqueada = await self._buscar(cliente, url_pagina)
+                if resposta_com_erro(status):
+                    print(f"\n🛑 Erro HTTP na página {pagina} (status {status})")
+                    self.paginas_bloqueadas.append(pagina)
+                    return
+                anuncios = [] if bloqueada else await asyncio.to_thread(self.scraper.extrair_anuncios_html, html)
+                if bloqueada or detectar_bloqueio(html, status, len(anuncios)):
+                    print(f"\n🛑 Página {pagina} bloqueada ou com desafio (status {status})")
+                    self.paginas_bloqueadas.append(pagina)
+                    return
+                self.scraper.registrar_tempo(pagina, 'http', inicio)
+
+            if not anuncios:
+                if pagina == 1:
+                    # Sem cards logo na primeira página: conteúdo provavelmente só renderiza com JS
+                    print("\nNenhum card no HTML estático da primeira página")
+                    self.paginas_bloqueadas.append(pagina)
+                    return
+                if self._ultima_pagina is None or pagina < self._ultima_pagina:
+                    self._ultima_pagina = pagina
+                return
+            print(f"\nPágina {pagina}: {len(anuncios)} anúncios")
+
+            if buscar_detalhes:
+                tarefas = [self._enriquecer(cliente, sem_detalhes, a) for a in anuncios if tem_pagina_detalhe(a)]
+                for tarefa in asyncio.as_completed(tarefas):
+                    await fila.put(await tarefa)
+                anuncios = [a for a in anuncios if not tem_pagina_detalhe(a)]
+            for anuncio in anuncios:
+                await fila.put(anuncio)
+        except Exception as e:
+            print(f"\nErro ao processar página {pagina}: {e}")
+            self.paginas_bloqueadas.append(pagina)  # Fica pendente, como as bloqueadas
+        finally:
+            await fila.put(_FIM_PAGINA)
+
+    async def stream(self, url, max_paginas=10, buscar_detalhes=False):
+        """Gera os anúncios (sem duplicatas) à medida que as páginas são concluídas
+
+        Uso: async for anuncio in scraper.stream(url): ...
+        """
+        self.scraper.resetar_contadores_duplicatas()
+        self.scraper.metricas_tempo = []
+        self.paginas_bloqueadas = []
+        self._ultima_pagina = None
+        self.enriquecedor = EnriquecedorDetalhes(self.max_detalhes_simultaneos, cache=self.cache_detalhes or False,
+                                                 limitador=self.limitador)
+        sem_paginas = asyncio.Semaphore(self.max_paginas_simultaneas)
+        sem_detalhes = asyncio.Semaphore(self.max_detalhes_simultaneos)
+        fila = asyncio.Queue()
+
+        async with self._criar_cliente() as cliente:
+            tarefas = [
+                asyncio.create_task(self._processar_pagina(
+                    cliente, url, pagina, fila, sem_paginas, sem_detalhes, buscar_detalhes
+                ))
+                for pagina in range(1, max_paginas + 1)
+            ]
+            pendentes = len(tarefas)
+            try:
+                while pendentes:
+                    item = await fila.get()
+                    if item is _FIM_PAGINA:
+                        pendentes -= 1
+                    elif not self.scraper.verificar_duplicata(item):
+                        yield item
+                # Bloqueios depois do fim dos resultados não deixam nada pendente
+                self.paginas_bloqueadas = sorted(p for p in self.paginas_bloqueadas
+                                                 if self._ultima_pagina is None or p < self._ultima_pagina)
+            finally:
+                for tarefa in tarefas:
+                    tarefa.cancel()
+                await asyncio.gather(*tarefas, return_exceptions=True)
+
+    async def coletar(self, url, max_paginas=10, buscar_detalhes=False):
+        """Coleta todos os anúncios em uma lista (as páginas bloqueadas ficam em self.paginas_bloqueadas)"""
+        anuncios = [anuncio async for anuncio in self.stream(url, max_paginas, buscar_detalhes)]
+        if self.paginas_bloqueadas:
+            print(f"\n🛑 {len(self.paginas_bloqueadas)} páginas bloqueadas ficaram de fora: {self.paginas_bloqueadas}")
+        return anuncios
+
+    def extrair_dados_pagina(self, url, max_paginas=10, buscar_detalhes=False):
+        """Equivalente síncrono de ZapScraper.extrair_dados_pagina (DataFrame, ou SaidaSink com sink)
+
+        Páginas bloqueadas no HTTP são refeitas no Chrome, como no modo 'auto' do ZapScraper
+        (sem o enriquecimento pelas páginas de detalhe). Sem cards na primeira página, o Chrome
+        refaz a busca inteira.
+        """
+        self.scraper.data_list = asyncio.run(self.coletar(url, max_paginas, buscar_detalhes))
+        if self.paginas_bloqueadas and self.escalar_bloqueadas:
+            paginas = self.paginas_bloqueadas
+            if paginas[0] == 1:
+                paginas = list(range(1, max_paginas + 1))
+            print(f"\n🔁 Escalando para o Chrome as páginas {paginas}")
+            self.scraper._extrair_dados_selenium(url, paginas)
+        self.scraper.imprimir_resumo_tempos()
+        return self.scraper.salvar_dados()